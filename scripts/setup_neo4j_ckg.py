@@ -20,7 +20,7 @@ except ImportError:
     logger.error("Neo4j driver not installed. Please install with: pip install neo4j")
     sys.exit(1)
 
-from agents.ckg_operations import CKGQueryInterfaceAgent, ConnectionConfig
+from agents.ckg_operations import CKGQueryInterfaceAgent, ConnectionConfig, CKGSchema
 
 
 class Neo4jCKGSetup:
@@ -181,6 +181,14 @@ class Neo4jCKGSetup:
                 logger.debug(f"Created index: {index}")
             except Exception as e:
                 logger.warning(f"Failed to create index: {str(e)}")
+        
+        # Constraints/indexes cho mọi NodeType label (Java, Dart, Kotlin, ...)
+        for statement in CKGSchema.get_cypher_schema_bootstrap():
+            try:
+                session.run(statement)
+                logger.debug(f"Created schema object: {statement}")
+            except Exception as e:
+                logger.warning(f"Failed to create schema object: {str(e)}")
     
     def _create_initial_data(self, session):
         """Tạo dữ liệu khởi tạo nếu cần."""
@@ -19,20 +19,38 @@ from .code_parser_coordinator import (
     ParseResult
 )
 
+from .parse_cache import ParseCache, ParseCacheEntry
+
 from .ast_to_ckg_builder import (
     ASTtoCKGBuilderAgent,
     CKGBuildResult
 )
 
+from .ckg_bulk_loader import (
+    CKGBulkLoader,
+    BulkLoadStats
+)
+
 from .ckg_query_interface import (
     CKGQueryInterfaceAgent,
     CKGQueryResult,
+    CKGQueryPage,
     ConnectionConfig
 )
 
+from .query_cache import QueryResultCache, invalidate_query_caches
+from .neo4j_driver_registry import Neo4jDriverRegistry, get_driver_registry
+from .graph_cycles import DependencyCycle, find_dependency_cycles, strongly_connected_components
+from .graph_snapshot import GraphSnapshot, GraphSnapshotBuilder
+from .storage_backend import CKGStorageBackend
+from .sqlite_backend import SQLiteCKGBackend
+
 # Main CKG Operations Agent (aggregator)
 from .ckg_operations_agent import CKGOperationsAgent
 
+# Python support
+from .python_parser import PythonParseInfo, extract_python_parse_info
+
 # Java support
 from .java_parser import JavaParserAgent, JavaNode, JavaParseInfo
 
@@ -54,15 +72,35 @@ __all__ = [
     'CodeParserCoordinatorAgent',
     'ParsedFile',
     'ParseResult',
+    'ParseCache',
+    'ParseCacheEntry',
     
     # CKG Builder
     'ASTtoCKGBuilderAgent',
     'CKGBuildResult',
+    'CKGBulkLoader',
+    'BulkLoadStats',
     
     # Query Interface
     'CKGQueryInterfaceAgent',
     'CKGQueryResult',
+    'CKGQueryPage',
     'ConnectionConfig',
+    'QueryResultCache',
+    'invalidate_query_caches',
+    'Neo4jDriverRegistry',
+    'get_driver_registry',
+    'DependencyCycle',
+    'find_dependency_cycles',
+    'strongly_connected_components',
+    'GraphSnapshot',
+    'GraphSnapshotBuilder',
+    'CKGStorageBackend',
+    'SQLiteCKGBackend',
+    
+    # Python Support
+    'PythonParseInfo',
+    'extract_python_parse_info',
     
     # Java Support
     'JavaParserAgent',
@@ -8,7 +8,7 @@ Chuyển đổi thông tin từ AST thành nodes và relationships trong Neo4j.
 
 import ast
 import os
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from loguru import logger
 
@@ -16,6 +16,13 @@ from .ckg_schema import (
     NodeType, RelationshipType, NodeProperties, RelationshipProperties, CKGSchema
 )
 from .code_parser_coordinator import ParseResult, ParsedFile
+from .ckg_bulk_loader import CKGBulkLoader
+from .query_cache import invalidate_query_caches
+from .storage_backend import CKGStorageBackend
+from .python_parser import (
+    PythonParseInfo, PythonImportInfo, PythonClassInfo, PythonFunctionInfo,
+    PythonParameterInfo, extract_python_parse_info
+)
 
 # Import Java-specific types
 try:
@@ -63,12 +70,14 @@ class ASTtoCKGBuilderAgent:
         - Node creation cho files, modules, classes, functions, methods
         - Relationship creation cho imports, calls, inheritance, containment
         - Property extraction từ AST nodes
-        - Bulk operations cho performance optimization
+        - Bulk operations cho performance optimization (UNWIND batches)
 
     Args:
-        neo4j_uri (str): Neo4j database connection URI.
-        neo4j_user (str): Neo4j database username.
-        neo4j_password (str): Neo4j database password.
+        neo4j_connection: Neo4j driver instance.
+        bulk_load (bool): Ghi CKG bằng UNWIND batches thay vì từng query.
+        batch_size (int): Số rows tối đa trong một batch khi bulk_load.
+        storage_backend (CKGStorageBackend): Backend embedded (vd. SQLite) dùng
+            khi không có Neo4j connection.
 
     Attributes:
         schema (CKGSchema): Schema definition cho graph structure.
@@ -90,18 +99,30 @@ class ASTtoCKGBuilderAgent:
         Supports both Python và Java AST processing.
     """
     
-    def __init__(self, neo4j_connection=None):
+    def __init__(self, neo4j_connection=None, bulk_load: bool = False,
+                 batch_size: int = CKGBulkLoader.DEFAULT_BATCH_SIZE,
+                 storage_backend: Optional[CKGStorageBackend] = None):
         """
         Khởi tạo ASTtoCKGBuilderAgent.
         
         Args:
             neo4j_connection: Connection đến Neo4j database
+            bulk_load: Bật chế độ bulk load với UNWIND batches
+            batch_size: Kích thước batch cho bulk load
+            storage_backend: Backend embedded, dùng khi không có neo4j_connection
         """
         self.neo4j_connection = neo4j_connection
+        self.storage_backend = storage_backend
+        self.bulk_load = bulk_load
+        self.batch_size = batch_size
         self.schema = CKGSchema()
         self.node_id_counter = 0
         self.created_nodes = {}  # Mapping từ node_id đến NodeProperties
         self.created_relationships = []  # Danh sách RelationshipProperties
+        # Chỉ tạo CREATE strings khi cần trả queries ra ngoài (không có database);
+        # khi có database, nodes/relationships được ghi bằng parameterized queries
+        self._export_queries = True
+        self._schema_bootstrapped = False
         
     def build_ckg_from_parse_result(self, parse_result: ParseResult) -> CKGBuildResult:
         """
@@ -119,6 +140,7 @@ class ASTtoCKGBuilderAgent:
         self.node_id_counter = 0
         self.created_nodes = {}
         self.created_relationships = []
+        self._export_queries = not (self.neo4j_connection or self.storage_backend)
         
         cypher_queries = []
         error_messages = []
@@ -131,9 +153,12 @@ class ASTtoCKGBuilderAgent:
                     cypher_queries.extend(file_queries)
             
             # Thực thi queries nếu có Neo4j connection
-            queries_executed = 0
             if self.neo4j_connection:
-                queries_executed = self._execute_cypher_queries(cypher_queries)
+                queries_executed = self._write_to_neo4j(error_messages)
+                self.refresh_in_degree_index()
+            elif self.storage_backend:
+                queries_executed = self._write_to_backend()
+                self.refresh_in_degree_index()
             else:
                 logger.warning("Không có Neo4j connection - chỉ tạo queries")
                 queries_executed = len(cypher_queries)
@@ -165,6 +190,103 @@ class ASTtoCKGBuilderAgent:
                 build_stats={}
             )
     
+    def update_ckg_incremental(self, parse_result: ParseResult,
+                               deleted_files: Optional[List[str]] = None) -> CKGBuildResult:
+        """
+        Cập nhật CKG chỉ cho các files đã thay đổi thay vì build lại toàn bộ.
+        
+        Các bước:
+        1. Lưu lại cross-file relationships (IMPORTS/CALLS/INHERITS_FROM) từ
+           files khác trỏ vào các files bị ảnh hưởng
+        2. Xóa subgraph của các files đã đổi và đã xóa
+        3. Build lại nodes/relationships cho các files trong parse_result
+        4. Nối lại các relationships đã lưu (không suy ra edges mà full build
+           không tạo, nên kết quả giống build lại toàn bộ)
+        
+        Args:
+            parse_result: Kết quả parse của các files đã thêm/sửa
+            deleted_files: Đường dẫn (cùng dạng ParsedFile.file_path) của các files đã xóa
+            
+        Returns:
+            CKGBuildResult: Kết quả cập nhật
+        """
+        changed_files = [f.file_path for f in parse_result.parsed_files]
+        affected_files = changed_files + list(deleted_files or [])
+        logger.info(f"Cập nhật CKG incremental: {len(changed_files)} files thay đổi, "
+                    f"{len(deleted_files or [])} files bị xóa")
+        
+        self.node_id_counter = 0
+        self.created_nodes = {}
+        self.created_relationships = []
+        self._export_queries = False
+        error_messages = []
+        
+        if not self.neo4j_connection and not self.storage_backend:
+            return CKGBuildResult(
+                project_path=parse_result.project_path,
+                total_nodes_created=0,
+                total_relationships_created=0,
+                cypher_queries_executed=0,
+                build_success=False,
+                error_messages=["Không có Neo4j connection"],
+                build_stats={}
+            )
+        
+        try:
+            self.ensure_schema()
+            
+            incoming_links = []
+            in_degree_scope = {'paths': affected_files, 'ids': [], 'ref_names': []}
+            if affected_files:
+                incoming_links = self._collect_incoming_links(affected_files)
+                in_degree_scope = self._collect_in_degree_scope(affected_files)
+                self._delete_file_subgraphs(affected_files)
+            
+            for parsed_file in parse_result.parsed_files:
+                if parsed_file.parse_success and parsed_file.ast_tree:
+                    self._process_file(parsed_file)
+            
+            if self.neo4j_connection:
+                queries_executed = self._write_to_neo4j(error_messages)
+            else:
+                queries_executed = self._write_to_backend()
+            relinked = self._relink_cross_file_relationships(incoming_links)
+            # DartImports mới cũng có thể đổi import_refs của exports ở files khác
+            ref_names = set(in_degree_scope['ref_names'])
+            for node in self.created_nodes.values():
+                if node.type == NodeType.DART_IMPORT:
+                    ref_names.update(self.schema.dart_import_ref_names((node.properties or {}).get('imported_name')))
+            in_degree_scope['ref_names'] = sorted(ref_names)
+            self.refresh_in_degree_index(in_degree_scope)
+            
+            build_stats = self._calculate_build_stats(parse_result)
+            build_stats['files_deleted'] = len(deleted_files or [])
+            build_stats['cross_file_links_restored'] = relinked
+            
+            return CKGBuildResult(
+                project_path=parse_result.project_path,
+                total_nodes_created=len(self.created_nodes),
+                total_relationships_created=len(self.created_relationships),
+                cypher_queries_executed=queries_executed,
+                build_success=True,
+                error_messages=error_messages,
+                build_stats=build_stats
+            )
+            
+        except Exception as e:
+            logger.error(f"Lỗi cập nhật CKG incremental: {str(e)}")
+            error_messages.append(str(e))
+            
+            return CKGBuildResult(
+                project_path=parse_result.project_path,
+                total_nodes_created=len(self.created_nodes),
+                total_relationships_created=len(self.created_relationships),
+                cypher_queries_executed=0,
+                build_success=False,
+                error_messages=error_messages,
+                build_stats={}
+            )
+    
     def build_ckg_from_ast(self, ast_node: ast.AST, file_path: str) -> List[str]:
         """
         Xây dựng CKG từ một AST node (interface cũ).
@@ -187,14 +309,15 @@ class ASTtoCKGBuilderAgent:
             lines_count=0
         )
         
+        self._export_queries = True
         return self._process_file(parsed_file)
     
-    def save_to_neo4j(self, cypher_queries: List[str]) -> int:
+    def save_to_neo4j(self, cypher_queries: List[Union[str, Tuple[str, Dict[str, Any]]]]) -> int:
         """
         Thực thi Cypher queries lên Neo4j.
         
         Args:
-            cypher_queries: Danh sách queries cần thực thi
+            cypher_queries: Danh sách queries (string hoặc tuple (template, parameters))
             
         Returns:
             int: Số queries đã thực thi thành công
@@ -207,6 +330,60 @@ class ASTtoCKGBuilderAgent:
         
         return self._execute_cypher_queries(cypher_queries)
     
+    def refresh_in_degree_index(self, scope: Optional[Dict[str, List[str]]] = None) -> int:
+        """
+        Tính lại in-degree index (in_degree_<type>, import_refs) trên các nodes.
+        
+        Chạy sau mỗi lần ghi CKG để get_unused_public_functions,
+        find_dart_unused_exports và find_kotlin_unused_objects chỉ cần lọc
+        theo property. Có thể gọi trực tiếp cho CKG đã build trước đó.
+        
+        Args:
+            scope: {'paths', 'ids', 'ref_names'} từ incremental update để chỉ
+                tính lại nodes bị ảnh hưởng (None = toàn bộ CKG)
+        
+        Returns:
+            int: Số queries đã thực thi thành công
+        """
+        if not self.neo4j_connection:
+            if self.storage_backend:
+                self.storage_backend.refresh_in_degree_index(scope)
+                return 1
+            return 0
+        
+        if scope is None:
+            return self._execute_cypher_queries(self.schema.get_cypher_refresh_in_degree_index())
+        return self._execute_cypher_queries(
+            [(query, scope) for query in self.schema.get_cypher_refresh_in_degree_index(scoped=True)])
+    
+    def ensure_schema(self) -> int:
+        """
+        Tạo uniqueness constraints và indexes cho mọi NodeType label (chỉ chạy một lần).
+        
+        Returns:
+            int: Số statements đã thực thi thành công
+        """
+        if not self.neo4j_connection or self._schema_bootstrapped:
+            return 0
+        
+        executed_count = 0
+        
+        try:
+            with self.neo4j_connection.session() as session:
+                for statement in self.schema.get_cypher_schema_bootstrap():
+                    try:
+                        session.run(statement)
+                        executed_count += 1
+                    except Exception as e:
+                        logger.warning(f"Lỗi tạo constraint/index: {str(e)[:100]}")
+            
+            self._schema_bootstrapped = True
+            
+        except Exception as e:
+            logger.error(f"Lỗi kết nối Neo4j: {str(e)}")
+        
+        return executed_count
+    
     def _process_file(self, parsed_file: ParsedFile) -> List[str]:
         """
         Xử lý một file đã parse thành nodes và relationships.
@@ -222,7 +399,7 @@ class ASTtoCKGBuilderAgent:
         try:
             # Tạo File node
             file_node = self._create_file_node(parsed_file)
-            queries.append(self.schema.get_cypher_create_node(file_node))
+            self._add_node_query(queries, file_node)
             
             # Xử lý theo ngôn ngữ
             if parsed_file.language == 'Python':
@@ -243,7 +420,7 @@ class ASTtoCKGBuilderAgent:
     
     def _process_python_file(self, parsed_file: ParsedFile, file_node: NodeProperties) -> List[str]:
         """
-        Xử lý Python file AST.
+        Xử lý Python file (AST hoặc PythonParseInfo summary).
         
         Args:
             parsed_file: Parsed Python file
@@ -254,9 +431,11 @@ class ASTtoCKGBuilderAgent:
         """
         queries = []
         
+        parse_info = self._get_python_parse_info(parsed_file)
+        
         # Tạo Module node
-        module_node = self._create_module_node(parsed_file)
-        queries.append(self.schema.get_cypher_create_node(module_node))
+        module_node = self._create_module_node(parsed_file, parse_info)
+        self._add_node_query(queries, module_node)
         
         # Tạo relationship CONTAINS giữa File và Module
         contains_rel = RelationshipProperties(
@@ -264,15 +443,28 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=module_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(contains_rel))
+        self._add_relationship_query(queries, contains_rel)
         self.created_relationships.append(contains_rel)
         
-        # Xử lý AST tree
-        if parsed_file.ast_tree:
-            queries.extend(self._process_ast_tree(parsed_file.ast_tree, parsed_file, module_node))
+        # Xử lý các khai báo trong file
+        if parse_info:
+            queries.extend(self._process_python_declarations(parse_info, parsed_file, module_node))
         
         return queries
     
+    def _get_python_parse_info(self, parsed_file: ParsedFile) -> Optional[PythonParseInfo]:
+        """
+        Lấy PythonParseInfo từ ParsedFile.
+        
+        Parser song song trả về summary trực tiếp; parser tuần tự trả về AST
+        và được trích xuất tại đây.
+        """
+        if isinstance(parsed_file.ast_tree, PythonParseInfo):
+            return parsed_file.ast_tree
+        if isinstance(parsed_file.ast_tree, ast.AST):
+            return extract_python_parse_info(parsed_file.ast_tree)
+        return None
+    
     def _process_java_file(self, parsed_file: ParsedFile, file_node: NodeProperties) -> List[str]:
         """
         Xử lý Java file AST.
@@ -326,7 +518,7 @@ class ASTtoCKGBuilderAgent:
                     java_ast.metadata['package_name'], 
                     parsed_file
                 )
-                queries.append(self.schema.get_cypher_create_node(package_node))
+                self._add_node_query(queries, package_node)
                 
                 # Link file to package
                 belongs_to_rel = RelationshipProperties(
@@ -334,14 +526,14 @@ class ASTtoCKGBuilderAgent:
                     source_node_id=file_node.properties['id'],
                     target_node_id=package_node.properties['id']
                 )
-                queries.append(self.schema.get_cypher_create_relationship(belongs_to_rel))
+                self._add_relationship_query(queries, belongs_to_rel)
                 self.created_relationships.append(belongs_to_rel)
             
             # Process imports
             if java_ast.metadata and java_ast.metadata.get('imports'):
                 for import_name in java_ast.metadata['imports']:
                     import_node = self._create_java_import_node(import_name, parsed_file)
-                    queries.append(self.schema.get_cypher_create_node(import_node))
+                    self._add_node_query(queries, import_node)
                     
                     # Link file to import
                     imports_rel = RelationshipProperties(
@@ -349,7 +541,7 @@ class ASTtoCKGBuilderAgent:
                         source_node_id=file_node.properties['id'],
                         target_node_id=import_node.properties['id']
                     )
-                    queries.append(self.schema.get_cypher_create_relationship(imports_rel))
+                    self._add_relationship_query(queries, imports_rel)
                     self.created_relationships.append(imports_rel)
             
             # Process all child nodes recursively
@@ -419,7 +611,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java class node
         class_node = self._create_java_class_node(java_class_node, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(class_node))
+        self._add_node_query(queries, class_node)
         
         # Link file defines class
         defines_rel = RelationshipProperties(
@@ -427,7 +619,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=class_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         # Process class children (methods, fields, constructors)
@@ -459,7 +651,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java interface node
         interface_node = self._create_java_interface_node(java_interface_node, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(interface_node))
+        self._add_node_query(queries, interface_node)
         
         # Link file defines interface
         defines_rel = RelationshipProperties(
@@ -467,7 +659,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=interface_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         # Process interface methods
@@ -495,7 +687,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java enum node
         enum_node = self._create_java_enum_node(java_enum_node, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(enum_node))
+        self._add_node_query(queries, enum_node)
         
         # Link file defines enum
         defines_rel = RelationshipProperties(
@@ -503,7 +695,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=enum_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         # Process enum constants
@@ -530,7 +722,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java method node
         method_node = self._create_java_method_node(java_method_node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(method_node))
+        self._add_node_query(queries, method_node)
         
         # Link parent defines method
         defines_rel = RelationshipProperties(
@@ -538,7 +730,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=parent_node.properties['id'],
             target_node_id=method_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -560,7 +752,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java field node
         field_node = self._create_java_field_node(java_field_node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(field_node))
+        self._add_node_query(queries, field_node)
         
         # Link parent defines field
         defines_rel = RelationshipProperties(
@@ -568,7 +760,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=parent_node.properties['id'],
             target_node_id=field_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -590,7 +782,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java constructor node
         constructor_node = self._create_java_constructor_node(java_constructor_node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(constructor_node))
+        self._add_node_query(queries, constructor_node)
         
         # Link parent defines constructor
         defines_rel = RelationshipProperties(
@@ -598,7 +790,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=parent_node.properties['id'],
             target_node_id=constructor_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -620,7 +812,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Java enum constant node
         enum_const_node = self._create_java_enum_constant_node(java_enum_const_node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(enum_const_node))
+        self._add_node_query(queries, enum_const_node)
         
         # Link parent contains enum constant
         contains_rel = RelationshipProperties(
@@ -628,7 +820,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=parent_node.properties['id'],
             target_node_id=enum_const_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(contains_rel))
+        self._add_relationship_query(queries, contains_rel)
         self.created_relationships.append(contains_rel)
         
         return queries
@@ -924,29 +1116,20 @@ class ASTtoCKGBuilderAgent:
         self.created_nodes[node_id] = file_node
         return file_node
     
-    def _create_module_node(self, parsed_file: ParsedFile) -> NodeProperties:
+    def _create_module_node(self, parsed_file: ParsedFile,
+                            parse_info: Optional[PythonParseInfo] = None) -> NodeProperties:
         """Tạo Module node."""
         module_name = os.path.splitext(parsed_file.relative_path)[0].replace(os.sep, '.')
         node_id = self._generate_node_id(NodeType.MODULE, parsed_file.file_path, 1, module_name)
         
-        # Đếm các elements trong module
-        imports_count = 0
-        classes_count = 0
-        functions_count = 0
-        
-        for node in ast.walk(parsed_file.ast_tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                imports_count += 1
-            elif isinstance(node, ast.ClassDef):
-                classes_count += 1
-            elif isinstance(node, ast.FunctionDef):
-                functions_count += 1
+        if parse_info is None:
+            parse_info = self._get_python_parse_info(parsed_file) or PythonParseInfo()
         
         properties = {
             'id': node_id,
-            'imports_count': imports_count,
-            'classes_count': classes_count,
-            'functions_count': functions_count
+            'imports_count': parse_info.imports_count,
+            'classes_count': parse_info.classes_count,
+            'functions_count': parse_info.functions_count
         }
         
         module_node = NodeProperties(
@@ -960,12 +1143,13 @@ class ASTtoCKGBuilderAgent:
         self.created_nodes[node_id] = module_node
         return module_node
     
-    def _process_ast_tree(self, tree: ast.AST, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
+    def _process_python_declarations(self, parse_info: PythonParseInfo, parsed_file: ParsedFile,
+                                     module_node: NodeProperties) -> List[str]:
         """
-        Xử lý AST tree và tạo nodes/relationships.
+        Tạo nodes/relationships từ các khai báo trong PythonParseInfo.
         
         Args:
-            tree: AST tree
+            parse_info: Summary của Python file
             parsed_file: File đã parse
             module_node: Module node chứa các elements
             
@@ -974,83 +1158,57 @@ class ASTtoCKGBuilderAgent:
         """
         queries = []
         
-        # Duyệt qua tất cả nodes trong AST
-        for node in ast.walk(tree):
+        for import_info in parse_info.imports:
+            queries.extend(self._process_import(import_info, parsed_file, module_node))
+        
+        for class_info in parse_info.classes:
             try:
-                if isinstance(node, ast.Import):
-                    queries.extend(self._process_import(node, parsed_file, module_node))
-                elif isinstance(node, ast.ImportFrom):
-                    queries.extend(self._process_import_from(node, parsed_file, module_node))
-                elif isinstance(node, ast.ClassDef):
-                    queries.extend(self._process_class(node, parsed_file, module_node))
-                elif isinstance(node, ast.FunctionDef):
-                    queries.extend(self._process_function(node, parsed_file, module_node))
-                elif isinstance(node, ast.AsyncFunctionDef):
-                    queries.extend(self._process_async_function(node, parsed_file, module_node))
-            
+                queries.extend(self._process_class(class_info, parsed_file, module_node))
             except Exception as e:
-                logger.warning(f"Lỗi xử lý AST node {type(node).__name__}: {str(e)}")
+                logger.warning(f"Lỗi xử lý class {class_info.name}: {str(e)}")
         
-        return queries
-    
-    def _process_import(self, node: ast.Import, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
-        """Xử lý ast.Import."""
-        queries = []
-        
-        for alias in node.names:
-            import_node = self._create_import_node(
-                alias.name, 
-                alias.asname, 
-                node.lineno, 
-                parsed_file,
-                is_from_import=False
-            )
-            queries.append(self.schema.get_cypher_create_node(import_node))
-            
-            # Tạo relationship IMPORTS
-            imports_rel = RelationshipProperties(
-                type=RelationshipType.IMPORTS,
-                source_node_id=module_node.properties['id'],
-                target_node_id=import_node.properties['id']
-            )
-            queries.append(self.schema.get_cypher_create_relationship(imports_rel))
+        for function_info in parse_info.functions:
+            try:
+                queries.extend(self._process_function(function_info, parsed_file, module_node))
+            except Exception as e:
+                logger.warning(f"Lỗi xử lý function {function_info.name}: {str(e)}")
         
         return queries
     
-    def _process_import_from(self, node: ast.ImportFrom, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
-        """Xử lý ast.ImportFrom."""
+    def _process_import(self, import_info: PythonImportInfo, parsed_file: ParsedFile,
+                        module_node: NodeProperties) -> List[str]:
+        """Xử lý một import (import x hoặc from m import x)."""
         queries = []
         
-        module_name = node.module or ''
+        import_node = self._create_import_node(
+            import_info.imported_name,
+            import_info.alias,
+            import_info.line_number,
+            parsed_file,
+            is_from_import=import_info.is_from_import,
+            module_name=import_info.module_name
+        )
+        self._add_node_query(queries, import_node)
         
-        for alias in node.names:
-            import_node = self._create_import_node(
-                f"{module_name}.{alias.name}" if module_name else alias.name,
-                alias.asname,
-                node.lineno,
-                parsed_file,
-                is_from_import=True,
-                module_name=module_name
-            )
-            queries.append(self.schema.get_cypher_create_node(import_node))
-            
-            # Tạo relationship IMPORTS
-            imports_rel = RelationshipProperties(
-                type=RelationshipType.IMPORTS,
-                source_node_id=module_node.properties['id'],
-                target_node_id=import_node.properties['id']
-            )
-            queries.append(self.schema.get_cypher_create_relationship(imports_rel))
+        # Tạo relationship IMPORTS
+        imports_rel = RelationshipProperties(
+            type=RelationshipType.IMPORTS,
+            source_node_id=module_node.properties['id'],
+            target_node_id=import_node.properties['id']
+        )
+        self._add_relationship_query(queries, imports_rel)
+        self.created_relationships.append(imports_rel)
         
         return queries
     
-    def _process_class(self, node: ast.ClassDef, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
-        """Xử lý ast.ClassDef."""
+    def _process_class(self, class_info: PythonClassInfo, parsed_file: ParsedFile,
+                       module_node: NodeProperties) -> List[str]:
+        """Xử lý một class."""
         queries = []
         
         # Tạo Class node
-        class_node = self._create_class_node(node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(class_node))
+        class_node = self._create_class_node(class_info, parsed_file)
+        self._add_node_query(queries, class_node)
         
         # Tạo relationship DEFINES_CLASS
         defines_rel = RelationshipProperties(
@@ -1058,26 +1216,23 @@ class ASTtoCKGBuilderAgent:
             source_node_id=module_node.properties['id'],
             target_node_id=class_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
+        self.created_relationships.append(defines_rel)
         
         # Xử lý methods trong class
-        for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                method_queries = self._process_method(item, parsed_file, class_node)
-                queries.extend(method_queries)
-            elif isinstance(item, ast.AsyncFunctionDef):
-                method_queries = self._process_async_method(item, parsed_file, class_node)
-                queries.extend(method_queries)
+        for method_info in class_info.methods:
+            queries.extend(self._process_method(method_info, parsed_file, class_node))
         
         return queries
     
-    def _process_function(self, node: ast.FunctionDef, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
-        """Xử lý ast.FunctionDef (function ở module level)."""
+    def _process_function(self, function_info: PythonFunctionInfo, parsed_file: ParsedFile,
+                          module_node: NodeProperties) -> List[str]:
+        """Xử lý function (sync hoặc async)."""
         queries = []
         
         # Tạo Function node
-        function_node = self._create_function_node(node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(function_node))
+        function_node = self._create_function_node(function_info, parsed_file)
+        self._add_node_query(queries, function_node)
         
         # Tạo relationship DEFINES_FUNCTION
         defines_rel = RelationshipProperties(
@@ -1085,41 +1240,22 @@ class ASTtoCKGBuilderAgent:
             source_node_id=module_node.properties['id'],
             target_node_id=function_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
+        self.created_relationships.append(defines_rel)
         
         # Xử lý parameters
-        param_queries = self._process_function_parameters(node, parsed_file, function_node)
-        queries.extend(param_queries)
-        
-        return queries
-    
-    def _process_async_function(self, node: ast.AsyncFunctionDef, parsed_file: ParsedFile, module_node: NodeProperties) -> List[str]:
-        """Xử lý ast.AsyncFunctionDef."""
-        # Tương tự _process_function nhưng đánh dấu is_async=True
-        queries = []
-        
-        function_node = self._create_function_node(node, parsed_file, is_async=True)
-        queries.append(self.schema.get_cypher_create_node(function_node))
-        
-        defines_rel = RelationshipProperties(
-            type=RelationshipType.DEFINES_FUNCTION,
-            source_node_id=module_node.properties['id'],
-            target_node_id=function_node.properties['id']
-        )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
-        
-        param_queries = self._process_function_parameters(node, parsed_file, function_node)
-        queries.extend(param_queries)
+        queries.extend(self._process_function_parameters(function_info, parsed_file, function_node))
         
         return queries
     
-    def _process_method(self, node: ast.FunctionDef, parsed_file: ParsedFile, class_node: NodeProperties) -> List[str]:
-        """Xử lý method trong class."""
+    def _process_method(self, method_info: PythonFunctionInfo, parsed_file: ParsedFile,
+                        class_node: NodeProperties) -> List[str]:
+        """Xử lý method trong class (sync hoặc async)."""
         queries = []
         
         # Tạo Method node
-        method_node = self._create_method_node(node, parsed_file)
-        queries.append(self.schema.get_cypher_create_node(method_node))
+        method_node = self._create_method_node(method_info, parsed_file)
+        self._add_node_query(queries, method_node)
         
         # Tạo relationship DEFINES_METHOD
         defines_rel = RelationshipProperties(
@@ -1127,30 +1263,11 @@ class ASTtoCKGBuilderAgent:
             source_node_id=class_node.properties['id'],
             target_node_id=method_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
+        self.created_relationships.append(defines_rel)
         
         # Xử lý parameters
-        param_queries = self._process_function_parameters(node, parsed_file, method_node)
-        queries.extend(param_queries)
-        
-        return queries
-    
-    def _process_async_method(self, node: ast.AsyncFunctionDef, parsed_file: ParsedFile, class_node: NodeProperties) -> List[str]:
-        """Xử lý async method trong class."""
-        queries = []
-        
-        method_node = self._create_method_node(node, parsed_file, is_async=True)
-        queries.append(self.schema.get_cypher_create_node(method_node))
-        
-        defines_rel = RelationshipProperties(
-            type=RelationshipType.DEFINES_METHOD,
-            source_node_id=class_node.properties['id'],
-            target_node_id=method_node.properties['id']
-        )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
-        
-        param_queries = self._process_function_parameters(node, parsed_file, method_node)
-        queries.extend(param_queries)
+        queries.extend(self._process_function_parameters(method_info, parsed_file, method_node))
         
         return queries
     
@@ -1181,97 +1298,86 @@ class ASTtoCKGBuilderAgent:
         self.created_nodes[node_id] = import_node
         return import_node
     
-    def _create_class_node(self, node: ast.ClassDef, parsed_file: ParsedFile) -> NodeProperties:
+    def _create_class_node(self, class_info: PythonClassInfo, parsed_file: ParsedFile) -> NodeProperties:
         """Tạo Class node."""
-        node_id = self._generate_node_id(NodeType.CLASS, parsed_file.file_path, node.lineno, node.name)
-        
-        # Đếm methods và attributes
-        methods_count = len([n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))])
-        
-        # Lấy base classes
-        base_classes = [self._get_name_from_node(base) for base in node.bases]
+        node_id = self._generate_node_id(NodeType.CLASS, parsed_file.file_path, class_info.line_number, class_info.name)
         
         properties = {
             'id': node_id,
-            'methods_count': methods_count,
-            'base_classes': base_classes,
-            'docstring': ast.get_docstring(node)
+            'methods_count': len(class_info.methods),
+            'base_classes': class_info.base_classes,
+            'docstring': class_info.docstring
         }
         
         class_node = NodeProperties(
-            name=node.name,
+            name=class_info.name,
             type=NodeType.CLASS,
             file_path=parsed_file.file_path,
-            line_number=node.lineno,
-            end_line_number=getattr(node, 'end_lineno', None),
+            line_number=class_info.line_number,
+            end_line_number=class_info.end_line_number,
             properties=properties
         )
         
         self.created_nodes[node_id] = class_node
         return class_node
     
-    def _create_function_node(self, node: ast.FunctionDef, parsed_file: ParsedFile, is_async: bool = False) -> NodeProperties:
+    def _create_function_node(self, function_info: PythonFunctionInfo, parsed_file: ParsedFile) -> NodeProperties:
         """Tạo Function node."""
-        node_id = self._generate_node_id(NodeType.FUNCTION, parsed_file.file_path, node.lineno, node.name)
+        node_id = self._generate_node_id(NodeType.FUNCTION, parsed_file.file_path, function_info.line_number, function_info.name)
         
         properties = {
             'id': node_id,
-            'parameters_count': len(node.args.args),
-            'is_async': is_async,
-            'docstring': ast.get_docstring(node)
+            'parameters_count': len(function_info.parameters),
+            'is_async': function_info.is_async,
+            'docstring': function_info.docstring
         }
         
         function_node = NodeProperties(
-            name=node.name,
+            name=function_info.name,
             type=NodeType.FUNCTION,
             file_path=parsed_file.file_path,
-            line_number=node.lineno,
-            end_line_number=getattr(node, 'end_lineno', None),
+            line_number=function_info.line_number,
+            end_line_number=function_info.end_line_number,
             properties=properties
         )
         
         self.created_nodes[node_id] = function_node
         return function_node
     
-    def _create_method_node(self, node: ast.FunctionDef, parsed_file: ParsedFile, is_async: bool = False) -> NodeProperties:
+    def _create_method_node(self, method_info: PythonFunctionInfo, parsed_file: ParsedFile) -> NodeProperties:
         """Tạo Method node."""
-        node_id = self._generate_node_id(NodeType.METHOD, parsed_file.file_path, node.lineno, node.name)
-        
-        # Xác định method type
-        is_static = any(isinstance(d, ast.Name) and d.id == 'staticmethod' for d in node.decorator_list)
-        is_class_method = any(isinstance(d, ast.Name) and d.id == 'classmethod' for d in node.decorator_list)
-        is_property = any(isinstance(d, ast.Name) and d.id == 'property' for d in node.decorator_list)
+        node_id = self._generate_node_id(NodeType.METHOD, parsed_file.file_path, method_info.line_number, method_info.name)
         
         properties = {
             'id': node_id,
-            'parameters_count': len(node.args.args),
-            'is_async': is_async,
-            'is_static': is_static,
-            'is_class_method': is_class_method,
-            'is_property': is_property,
-            'docstring': ast.get_docstring(node)
+            'parameters_count': len(method_info.parameters),
+            'is_async': method_info.is_async,
+            'is_static': method_info.is_static,
+            'is_class_method': method_info.is_class_method,
+            'is_property': method_info.is_property,
+            'docstring': method_info.docstring
         }
         
         method_node = NodeProperties(
-            name=node.name,
+            name=method_info.name,
             type=NodeType.METHOD,
             file_path=parsed_file.file_path,
-            line_number=node.lineno,
-            end_line_number=getattr(node, 'end_lineno', None),
+            line_number=method_info.line_number,
+            end_line_number=method_info.end_line_number,
             properties=properties
         )
         
         self.created_nodes[node_id] = method_node
         return method_node
     
-    def _process_function_parameters(self, node: ast.FunctionDef, parsed_file: ParsedFile, 
+    def _process_function_parameters(self, function_info: PythonFunctionInfo, parsed_file: ParsedFile, 
                                    parent_node: NodeProperties) -> List[str]:
         """Xử lý parameters của function/method."""
         queries = []
         
-        for arg in node.args.args:
-            param_node = self._create_parameter_node(arg, parsed_file, node.lineno)
-            queries.append(self.schema.get_cypher_create_node(param_node))
+        for param_info in function_info.parameters:
+            param_node = self._create_parameter_node(param_info, parsed_file, function_info.line_number)
+            self._add_node_query(queries, param_node)
             
             # Tạo relationship HAS_PARAMETER
             has_param_rel = RelationshipProperties(
@@ -1279,21 +1385,23 @@ class ASTtoCKGBuilderAgent:
                 source_node_id=parent_node.properties['id'],
                 target_node_id=param_node.properties['id']
             )
-            queries.append(self.schema.get_cypher_create_relationship(has_param_rel))
+            self._add_relationship_query(queries, has_param_rel)
+            self.created_relationships.append(has_param_rel)
         
         return queries
     
-    def _create_parameter_node(self, arg: ast.arg, parsed_file: ParsedFile, line_number: int) -> NodeProperties:
+    def _create_parameter_node(self, param_info: PythonParameterInfo, parsed_file: ParsedFile,
+                               line_number: int) -> NodeProperties:
         """Tạo Parameter node."""
-        node_id = self._generate_node_id(NodeType.PARAMETER, parsed_file.file_path, line_number, arg.arg)
+        node_id = self._generate_node_id(NodeType.PARAMETER, parsed_file.file_path, line_number, param_info.name)
         
         properties = {
             'id': node_id,
-            'param_type': getattr(arg, 'annotation', None) and self._get_name_from_node(arg.annotation) or None
+            'param_type': param_info.annotation
         }
         
         param_node = NodeProperties(
-            name=arg.arg,
+            name=param_info.name,
             type=NodeType.PARAMETER,
             file_path=parsed_file.file_path,
             line_number=line_number,
@@ -1303,16 +1411,29 @@ class ASTtoCKGBuilderAgent:
         self.created_nodes[node_id] = param_node
         return param_node
     
-    def _get_name_from_node(self, node: ast.AST) -> str:
-        """Lấy tên từ AST node."""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_name_from_node(node.value)}.{node.attr}"
-        elif isinstance(node, ast.Constant):
-            return str(node.value)
-        else:
-            return str(type(node).__name__)
+    def _resolve_relationship_labels(self, relationship: RelationshipProperties) -> RelationshipProperties:
+        """Gán source/target labels cho relationship từ các nodes đã tạo."""
+        if relationship.source_type is None and relationship.source_node_id in self.created_nodes:
+            relationship.source_type = self.created_nodes[relationship.source_node_id].type
+        if relationship.target_type is None and relationship.target_node_id in self.created_nodes:
+            relationship.target_type = self.created_nodes[relationship.target_node_id].type
+        return relationship
+    
+    def _get_cypher_create_relationship(self, relationship: RelationshipProperties) -> str:
+        """Tạo Cypher query cho relationship với MATCH theo label."""
+        return self.schema.get_cypher_create_relationship(
+            self._resolve_relationship_labels(relationship)
+        )
+    
+    def _add_node_query(self, queries: List[str], node: NodeProperties):
+        """Thêm CREATE query của node vào queries nếu đang export queries."""
+        if self._export_queries:
+            queries.append(self.schema.get_cypher_create_node(node))
+    
+    def _add_relationship_query(self, queries: List[str], relationship: RelationshipProperties):
+        """Thêm CREATE query của relationship vào queries nếu đang export queries."""
+        if self._export_queries:
+            queries.append(self._get_cypher_create_relationship(relationship))
     
     def _generate_node_id(self, node_type: NodeType, file_path: str, line_number: int, name: str) -> str:
         """Tạo unique ID cho node."""
@@ -1320,12 +1441,32 @@ class ASTtoCKGBuilderAgent:
         clean_name = name.replace('.', '_').replace(' ', '_')
         return f"{node_type.value}_{clean_file_path}_{line_number}_{clean_name}_{self.node_id_counter}"
     
-    def _execute_cypher_queries(self, queries: List[str]) -> int:
+    def _get_parameterized_queries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Tạo parameterized queries cho toàn bộ nodes và relationships đã thu thập.
+        
+        Mỗi label / relationship type dùng một template cố định nên plan cache
+        của Neo4j được reuse suốt quá trình build.
+        
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Danh sách (template, parameters)
+        """
+        queries = [
+            self.schema.get_parameterized_create_node(node)
+            for node in self.created_nodes.values()
+        ]
+        queries.extend(
+            self.schema.get_parameterized_create_relationship(self._resolve_relationship_labels(rel))
+            for rel in self.created_relationships
+        )
+        return queries
+    
+    def _execute_cypher_queries(self, queries: List[Union[str, Tuple[str, Dict[str, Any]]]]) -> int:
         """
         Thực thi Cypher queries lên Neo4j.
         
         Args:
-            queries: Danh sách queries
+            queries: Danh sách queries (string hoặc tuple (template, parameters))
             
         Returns:
             int: Số queries thành công
@@ -1339,7 +1480,10 @@ class ASTtoCKGBuilderAgent:
             with self.neo4j_connection.session() as session:
                 for query in queries:
                     try:
-                        session.run(query)
+                        if isinstance(query, tuple):
+                            session.run(query[0], query[1])
+                        else:
+                            session.run(query)
                         executed_count += 1
                     except Exception as e:
                         logger.warning(f"Lỗi thực thi query: {str(e)[:100]}")
@@ -1347,8 +1491,170 @@ class ASTtoCKGBuilderAgent:
         except Exception as e:
             logger.error(f"Lỗi kết nối Neo4j: {str(e)}")
         
+        if executed_count:
+            invalidate_query_caches()
+        
         return executed_count
     
+    def _bulk_load_to_neo4j(self, error_messages: List[str]) -> int:
+        """
+        Ghi nodes và relationships đã thu thập bằng UNWIND batches.
+        
+        Args:
+            error_messages: Danh sách lỗi được bổ sung tại chỗ
+            
+        Returns:
+            int: Số batch queries đã thực thi thành công
+        """
+        loader = CKGBulkLoader(self.neo4j_connection, batch_size=self.batch_size)
+        loader.add_nodes(self.created_nodes.values())
+        loader.add_relationships(
+            self._resolve_relationship_labels(rel) for rel in self.created_relationships
+        )
+        
+        stats = loader.flush()
+        error_messages.extend(stats.error_messages)
+        return stats.batches_executed
+    
+    def _write_to_neo4j(self, error_messages: List[str]) -> int:
+        """
+        Ghi nodes và relationships đã thu thập theo chế độ đã cấu hình.
+        
+        Args:
+            error_messages: Danh sách lỗi được bổ sung tại chỗ
+            
+        Returns:
+            int: Số queries/batches đã thực thi thành công
+        """
+        self.ensure_schema()
+        
+        if self.bulk_load:
+            return self._bulk_load_to_neo4j(error_messages)
+        return self._execute_cypher_queries(self._get_parameterized_queries())
+    
+    def _write_to_backend(self) -> int:
+        """
+        Ghi nodes và relationships đã thu thập vào storage backend embedded.
+        
+        Returns:
+            int: Số nodes và relationships đã ghi
+        """
+        return self.storage_backend.write_graph(
+            self.created_nodes.values(),
+            [self._resolve_relationship_labels(rel) for rel in self.created_relationships]
+        )
+    
+    def _collect_incoming_links(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Lấy cross-file relationships từ files khác trỏ vào các files.
+        
+        Args:
+            file_paths: Danh sách files bị ảnh hưởng
+            
+        Returns:
+            List[Dict[str, Any]]: Rows mô tả các relationships cần nối lại
+        """
+        if not self.neo4j_connection:
+            return self.storage_backend.collect_incoming_links(file_paths)
+        
+        with self.neo4j_connection.session() as session:
+            result = session.run(self.schema.get_cypher_collect_incoming_links(), {'paths': file_paths})
+            return [dict(record) for record in result]
+    
+    def _collect_in_degree_scope(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """
+        Lấy phạm vi refresh in-degree index trước khi xóa các files.
+        
+        Args:
+            file_paths: Danh sách files bị ảnh hưởng
+            
+        Returns:
+            Dict[str, List[str]]: {'paths', 'ids', 'ref_names'} cho refresh_in_degree_index
+        """
+        if not self.neo4j_connection:
+            target_ids, imported_names = self.storage_backend.collect_in_degree_scope(file_paths)
+        else:
+            targets_query, imports_query = self.schema.get_cypher_collect_in_degree_scope()
+            with self.neo4j_connection.session() as session:
+                target_ids = [record['id'] for record in session.run(targets_query, {'paths': file_paths})]
+                imported_names = [record['imported_name']
+                                  for record in session.run(imports_query, {'paths': file_paths})]
+        
+        ref_names = set()
+        for imported_name in imported_names:
+            ref_names.update(self.schema.dart_import_ref_names(imported_name))
+        return {'paths': list(file_paths), 'ids': list(target_ids), 'ref_names': sorted(ref_names)}
+    
+    def _delete_file_subgraphs(self, file_paths: List[str]) -> None:
+        """
+        Xóa toàn bộ nodes (và relationships) thuộc các files.
+        
+        Args:
+            file_paths: Danh sách files cần xóa khỏi CKG
+        """
+        if not self.neo4j_connection:
+            self.storage_backend.delete_file_subgraphs(file_paths)
+            return
+        
+        try:
+            with self.neo4j_connection.session() as session:
+                for node_type in NodeType:
+                    session.run(self.schema.get_cypher_delete_file_nodes(node_type), {'paths': file_paths})
+        finally:
+            invalidate_query_caches()
+    
+    def _relink_cross_file_relationships(self, incoming_links: List[Dict[str, Any]]) -> int:
+        """
+        Nối lại cross-file relationships đã lưu sau khi build lại các files.
+        
+        Args:
+            incoming_links: Rows từ _collect_incoming_links
+            
+        Returns:
+            int: Số relationships đã lưu được gửi đi nối lại
+        """
+        if not self.neo4j_connection:
+            return self.storage_backend.restore_links(incoming_links)
+        
+        # Nhóm theo (relationship type, source label, target label) để MATCH dùng label
+        grouped: Dict[Tuple[RelationshipType, Optional[NodeType], Optional[NodeType]], List[Dict[str, Any]]] = {}
+        for link in incoming_links:
+            try:
+                rel_type = RelationshipType(link['rel_type'])
+            except ValueError:
+                continue
+            key = (rel_type, self._node_type_from_label(link.get('source_label')),
+                   self._node_type_from_label(link.get('target_label')))
+            grouped.setdefault(key, []).append({
+                'source_id': link['source_id'],
+                'target_file_path': link['target_file_path'],
+                'target_name': link['target_name'],
+                'properties': link.get('properties') or {}
+            })
+        
+        restored = 0
+        with self.neo4j_connection.session() as session:
+            for (rel_type, source_type, target_type), rows in grouped.items():
+                query = self.schema.get_cypher_restore_links(rel_type, source_type, target_type)
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    try:
+                        session.run(query, {'rows': batch})
+                        restored += len(batch)
+                    except Exception as e:
+                        logger.warning(f"Lỗi nối lại relationships: {str(e)[:100]}")
+        
+        invalidate_query_caches()
+        return restored
+    
+    @staticmethod
+    def _node_type_from_label(label: Optional[str]) -> Optional[NodeType]:
+        """Chuyển Neo4j label thành NodeType (None nếu không hợp lệ)."""
+        try:
+            return NodeType(label) if label else None
+        except ValueError:
+            return None
+    
     def _calculate_build_stats(self, parse_result: ParseResult) -> Dict[str, Any]:
         """Tính toán thống kê xây dựng CKG."""
         stats = {
@@ -1427,7 +1733,7 @@ class ASTtoCKGBuilderAgent:
             library_node = None
             if dart_ast.library_name:
                 library_node = self._create_dart_library_node(dart_ast.library_name, parsed_file)
-                queries.append(self.schema.get_cypher_create_node(library_node))
+                self._add_node_query(queries, library_node)
                 
                 # Tạo relationship từ file đến library
                 lib_rel = RelationshipProperties(
@@ -1436,12 +1742,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=library_node.properties['id']
                 )
                 self.created_relationships.append(lib_rel)
-                queries.append(self.schema.get_cypher_create_relationship(lib_rel))
+                self._add_relationship_query(queries, lib_rel)
             
             # Process imports
             for import_name in dart_ast.imports:
                 import_node = self._create_dart_import_node(import_name, parsed_file)
-                queries.append(self.schema.get_cypher_create_node(import_node))
+                self._add_node_query(queries, import_node)
                 
                 # Relationship từ file đến import
                 import_rel = RelationshipProperties(
@@ -1450,12 +1756,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=import_node.properties['id']
                 )
                 self.created_relationships.append(import_rel)
-                queries.append(self.schema.get_cypher_create_relationship(import_rel))
+                self._add_relationship_query(queries, import_rel)
             
             # Process exports  
             for export_name in dart_ast.exports:
                 export_node = self._create_dart_export_node(export_name, parsed_file)
-                queries.append(self.schema.get_cypher_create_node(export_node))
+                self._add_node_query(queries, export_node)
                 
                 # Relationship từ file đến export
                 export_rel = RelationshipProperties(
@@ -1464,12 +1770,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=export_node.properties['id']
                 )
                 self.created_relationships.append(export_rel)
-                queries.append(self.schema.get_cypher_create_relationship(export_rel))
+                self._add_relationship_query(queries, export_rel)
             
             # Process classes
             for class_name in dart_ast.classes:
                 class_node = self._create_dart_class_node(class_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(class_node))
+                self._add_node_query(queries, class_node)
                 
                 # Relationship từ library hoặc file đến class
                 parent_node = library_node if library_node else file_node
@@ -1479,12 +1785,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=class_node.properties['id']
                 )
                 self.created_relationships.append(class_rel)
-                queries.append(self.schema.get_cypher_create_relationship(class_rel))
+                self._add_relationship_query(queries, class_rel)
             
             # Process mixins
             for mixin_name in dart_ast.mixins:
                 mixin_node = self._create_dart_mixin_node(mixin_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(mixin_node))
+                self._add_node_query(queries, mixin_node)
                 
                 # Relationship từ library hoặc file đến mixin
                 parent_node = library_node if library_node else file_node
@@ -1494,12 +1800,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=mixin_node.properties['id']
                 )
                 self.created_relationships.append(mixin_rel)
-                queries.append(self.schema.get_cypher_create_relationship(mixin_rel))
+                self._add_relationship_query(queries, mixin_rel)
             
             # Process extensions
             for extension_name in dart_ast.extensions:
                 extension_node = self._create_dart_extension_node(extension_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(extension_node))
+                self._add_node_query(queries, extension_node)
                 
                 # Relationship từ library hoặc file đến extension
                 parent_node = library_node if library_node else file_node
@@ -1509,12 +1815,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=extension_node.properties['id']
                 )
                 self.created_relationships.append(extension_rel)
-                queries.append(self.schema.get_cypher_create_relationship(extension_rel))
+                self._add_relationship_query(queries, extension_rel)
             
             # Process functions
             for function_name in dart_ast.functions:
                 function_node = self._create_dart_function_node(function_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(function_node))
+                self._add_node_query(queries, function_node)
                 
                 # Relationship từ library hoặc file đến function
                 parent_node = library_node if library_node else file_node
@@ -1524,12 +1830,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=function_node.properties['id']
                 )
                 self.created_relationships.append(function_rel)
-                queries.append(self.schema.get_cypher_create_relationship(function_rel))
+                self._add_relationship_query(queries, function_rel)
             
             # Process enums
             for enum_name in dart_ast.enums:
                 enum_node = self._create_dart_enum_node(enum_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(enum_node))
+                self._add_node_query(queries, enum_node)
                 
                 # Relationship từ library hoặc file đến enum
                 parent_node = library_node if library_node else file_node
@@ -1539,12 +1845,12 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=enum_node.properties['id']
                 )
                 self.created_relationships.append(enum_rel)
-                queries.append(self.schema.get_cypher_create_relationship(enum_rel))
+                self._add_relationship_query(queries, enum_rel)
             
             # Process typedefs
             for typedef_name in dart_ast.typedefs:
                 typedef_node = self._create_dart_typedef_node(typedef_name, parsed_file, library_node)
-                queries.append(self.schema.get_cypher_create_node(typedef_node))
+                self._add_node_query(queries, typedef_node)
                 
                 # Relationship từ library hoặc file đến typedef
                 parent_node = library_node if library_node else file_node
@@ -1554,7 +1860,7 @@ class ASTtoCKGBuilderAgent:
                     target_node_id=typedef_node.properties['id']
                 )
                 self.created_relationships.append(typedef_rel)
-                queries.append(self.schema.get_cypher_create_relationship(typedef_rel))
+                self._add_relationship_query(queries, typedef_rel)
                 
         except Exception as e:
             logger.error(f"Error processing Dart AST: {str(e)}")
@@ -1823,7 +2129,7 @@ class ASTtoCKGBuilderAgent:
                     kotlin_ast.package_name, 
                     parsed_file
                 )
-                queries.append(self.schema.get_cypher_create_node(package_node))
+                self._add_node_query(queries, package_node)
                 
                 # Link file to package
                 belongs_to_rel = RelationshipProperties(
@@ -1831,7 +2137,7 @@ class ASTtoCKGBuilderAgent:
                     source_node_id=file_node.properties['id'],
                     target_node_id=package_node.properties['id']
                 )
-                queries.append(self.schema.get_cypher_create_relationship(belongs_to_rel))
+                self._add_relationship_query(queries, belongs_to_rel)
                 self.created_relationships.append(belongs_to_rel)
             
             # Process imports
@@ -1839,7 +2145,7 @@ class ASTtoCKGBuilderAgent:
                 for import_info in kotlin_ast.imports:
                     import_name = import_info.name if hasattr(import_info, 'name') else str(import_info)
                     import_node = self._create_kotlin_import_node(import_name, parsed_file)
-                    queries.append(self.schema.get_cypher_create_node(import_node))
+                    self._add_node_query(queries, import_node)
                     
                     # Link file to import
                     imports_rel = RelationshipProperties(
@@ -1847,7 +2153,7 @@ class ASTtoCKGBuilderAgent:
                         source_node_id=file_node.properties['id'],
                         target_node_id=import_node.properties['id']
                     )
-                    queries.append(self.schema.get_cypher_create_relationship(imports_rel))
+                    self._add_relationship_query(queries, imports_rel)
                     self.created_relationships.append(imports_rel)
             
             # Process classes
@@ -1898,7 +2204,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin class node
         class_node = self._create_kotlin_class_node(class_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(class_node))
+        self._add_node_query(queries, class_node)
         
         # Link file defines class
         defines_rel = RelationshipProperties(
@@ -1906,7 +2212,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=class_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -1918,7 +2224,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin data class node
         data_class_node = self._create_kotlin_data_class_node(data_class_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(data_class_node))
+        self._add_node_query(queries, data_class_node)
         
         # Link file defines data class
         defines_rel = RelationshipProperties(
@@ -1926,7 +2232,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=data_class_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -1938,7 +2244,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin interface node
         interface_node = self._create_kotlin_interface_node(interface_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(interface_node))
+        self._add_node_query(queries, interface_node)
         
         # Link file defines interface
         defines_rel = RelationshipProperties(
@@ -1946,7 +2252,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=interface_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -1958,7 +2264,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin object node
         object_node = self._create_kotlin_object_node(object_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(object_node))
+        self._add_node_query(queries, object_node)
         
         # Link file defines object
         defines_rel = RelationshipProperties(
@@ -1966,7 +2272,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=object_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -1978,7 +2284,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin function node
         function_node = self._create_kotlin_function_node(function_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(function_node))
+        self._add_node_query(queries, function_node)
         
         # Link file defines function
         defines_rel = RelationshipProperties(
@@ -1986,7 +2292,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=function_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -1998,7 +2304,7 @@ class ASTtoCKGBuilderAgent:
         
         # Create Kotlin enum node
         enum_node = self._create_kotlin_enum_node(enum_name, parsed_file, package_node)
-        queries.append(self.schema.get_cypher_create_node(enum_node))
+        self._add_node_query(queries, enum_node)
         
         # Link file defines enum
         defines_rel = RelationshipProperties(
@@ -2006,7 +2312,7 @@ class ASTtoCKGBuilderAgent:
             source_node_id=file_node.properties['id'],
             target_node_id=enum_node.properties['id']
         )
-        queries.append(self.schema.get_cypher_create_relationship(defines_rel))
+        self._add_relationship_query(queries, defines_rel)
         self.created_relationships.append(defines_rel)
         
         return queries
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - CKG Bulk Loader
+
+Ghi nodes và relationships vào Neo4j theo batch với UNWIND queries thay vì
+một query cho mỗi phần tử, giảm số Bolt round-trips khi build CKG lớn.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from loguru import logger
+
+from .ckg_schema import (
+    NodeType, RelationshipType, NodeProperties, RelationshipProperties, CKGSchema
+)
+from .query_cache import invalidate_query_caches
+
+
+@dataclass
+class BulkLoadStats:
+    """Thống kê một lần bulk load."""
+    nodes_written: int = 0
+    relationships_written: int = 0
+    batches_executed: int = 0
+    batches_failed: int = 0
+    error_messages: List[str] = field(default_factory=list)
+
+
+class CKGBulkLoader:
+    """
+    Bulk loader cho Code Knowledge Graph.
+
+    Thu thập NodeProperties và RelationshipProperties trong bộ nhớ, nhóm theo
+    label / (relationship type, source label, target label) rồi ghi bằng các query
+    ``UNWIND $rows AS row ...`` có tham số, mỗi batch trong một
+    explicit transaction.
+
+    Args:
+        neo4j_connection: Neo4j driver (hoặc object có method ``session()``).
+        batch_size (int): Số rows tối đa trong một UNWIND batch.
+
+    Example:
+        >>> loader = CKGBulkLoader(driver, batch_size=2000)
+        >>> loader.add_nodes(builder.created_nodes.values())
+        >>> loader.add_relationships(builder.created_relationships)
+        >>> stats = loader.flush()
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, neo4j_connection, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Khởi tạo CKGBulkLoader.
+
+        Args:
+            neo4j_connection: Connection đến Neo4j database
+            batch_size: Số rows tối đa trong một batch
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size phải lớn hơn 0")
+
+        self.neo4j_connection = neo4j_connection
+        self.batch_size = batch_size
+        self.schema = CKGSchema()
+        self.pending_nodes: Dict[NodeType, List[Dict[str, Any]]] = defaultdict(list)
+        # Key: (relationship type, source label, target label)
+        self.pending_relationships: Dict[
+            Tuple[RelationshipType, Optional[NodeType], Optional[NodeType]], List[Dict[str, Any]]
+        ] = defaultdict(list)
+
+    def add_node(self, node: NodeProperties):
+        """Thêm một node vào hàng đợi ghi."""
+        self.pending_nodes[node.type].append(self.schema.get_node_row(node))
+
+    def add_nodes(self, nodes: Iterable[NodeProperties]):
+        """Thêm nhiều nodes vào hàng đợi ghi."""
+        for node in nodes:
+            self.add_node(node)
+
+    def add_relationship(self, relationship: RelationshipProperties):
+        """Thêm một relationship vào hàng đợi ghi."""
+        key = (relationship.type, relationship.source_type, relationship.target_type)
+        self.pending_relationships[key].append(self.schema.get_relationship_row(relationship))
+
+    def add_relationships(self, relationships: Iterable[RelationshipProperties]):
+        """Thêm nhiều relationships vào hàng đợi ghi."""
+        for relationship in relationships:
+            self.add_relationship(relationship)
+
+    def pending_count(self) -> int:
+        """Tổng số nodes và relationships đang chờ ghi."""
+        return (sum(len(rows) for rows in self.pending_nodes.values()) +
+                sum(len(rows) for rows in self.pending_relationships.values()))
+
+    def clear(self):
+        """Xóa toàn bộ hàng đợi."""
+        self.pending_nodes.clear()
+        self.pending_relationships.clear()
+
+    def flush(self) -> BulkLoadStats:
+        """
+        Ghi toàn bộ hàng đợi vào Neo4j.
+
+        Nodes được ghi trước relationships để các MATCH theo id luôn thấy
+        nodes của cùng lần build.
+
+        Returns:
+            BulkLoadStats: Thống kê quá trình ghi
+        """
+        stats = BulkLoadStats()
+
+        if not self.neo4j_connection:
+            stats.error_messages.append("Không có Neo4j connection")
+            return stats
+
+        try:
+            with self.neo4j_connection.session() as session:
+                for node_type, rows in self.pending_nodes.items():
+                    query = self.schema.get_cypher_unwind_create_nodes(node_type)
+                    stats.nodes_written += self._write_batches(session, query, rows, stats)
+
+                for (rel_type, source_type, target_type), rows in self.pending_relationships.items():
+                    query = self.schema.get_cypher_unwind_create_relationships(
+                        rel_type, source_type, target_type
+                    )
+                    stats.relationships_written += self._write_batches(session, query, rows, stats)
+
+        except Exception as e:
+            logger.error(f"Lỗi kết nối Neo4j: {str(e)}")
+            stats.error_messages.append(str(e))
+
+        if stats.batches_executed:
+            invalidate_query_caches()
+
+        logger.info(
+            f"Bulk load: {stats.nodes_written} nodes, {stats.relationships_written} relationships "
+            f"trong {stats.batches_executed} batches ({stats.batches_failed} lỗi)"
+        )
+
+        self.clear()
+        return stats
+
+    def _write_batches(self, session, query: str, rows: List[Dict[str, Any]],
+                       stats: BulkLoadStats) -> int:
+        """
+        Ghi rows theo từng batch, mỗi batch trong một explicit transaction.
+
+        Args:
+            session: Neo4j session
+            query: UNWIND query nhận $rows
+            rows: Danh sách rows cần ghi
+            stats: Thống kê được cập nhật tại chỗ
+
+        Returns:
+            int: Số rows ghi thành công
+        """
+        written = 0
+
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                with session.begin_transaction() as tx:
+                    tx.run(query, rows=batch)
+                    tx.commit()
+                written += len(batch)
+                stats.batches_executed += 1
+            except Exception as e:
+                # Reason: một batch lỗi không nên làm hỏng toàn bộ lần build
+                logger.warning(f"Lỗi ghi batch: {str(e)[:100]}")
+                stats.batches_failed += 1
+                stats.error_messages.append(str(e))
+
+        return written
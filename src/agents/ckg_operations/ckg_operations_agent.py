@@ -6,12 +6,16 @@ Agent tổng hợp các chức năng CKG operations.
 """
 
 import logging
+import os
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 from .code_parser_coordinator import CodeParserCoordinatorAgent, ParseResult
+from .parse_cache import ParseCache
 from .ast_to_ckg_builder import ASTtoCKGBuilderAgent, CKGBuildResult
 from .ckg_query_interface import CKGQueryInterfaceAgent, CKGQueryResult, ConnectionConfig
+from .storage_backend import CKGStorageBackend
+from ..data_acquisition import GitOperationsAgent
 
 logger = logging.getLogger(__name__)
 
@@ -28,22 +32,40 @@ class CKGOperationsAgent:
     
     def __init__(self,
                  neo4j_config: Optional[ConnectionConfig] = None,
-                 project_path: Optional[str] = None):
+                 project_path: Optional[str] = None,
+                 parallel_workers: int = 1,
+                 parse_cache: Optional[ParseCache] = None,
+                 storage_backend: Optional[CKGStorageBackend] = None):
         """
         Initialize CKG Operations Agent.
         
         Args:
             neo4j_config: Neo4j connection configuration
             project_path: Path to project for analysis
+            parallel_workers: Number of processes for Python parsing (<= 0 uses all CPUs)
+            parse_cache: Optional on-disk parse cache reused across scans
+            storage_backend: Optional embedded CKG store (e.g. SQLiteCKGBackend) used
+                instead of Neo4j for both building and querying
         """
         self.project_path = project_path
         self.neo4j_config = neo4j_config or ConnectionConfig()
         
         # Initialize sub-agents
         try:
-            self.parser_coordinator = CodeParserCoordinatorAgent()
-            self.ckg_builder = ASTtoCKGBuilderAgent()
-            self.query_interface = CKGQueryInterfaceAgent(self.neo4j_config)
+            self.parser_coordinator = CodeParserCoordinatorAgent(
+                parallel_workers=parallel_workers, parse_cache=parse_cache
+            )
+            if storage_backend is not None:
+                self.ckg_builder = ASTtoCKGBuilderAgent(storage_backend=storage_backend)
+                self.query_interface = storage_backend
+            else:
+                self.ckg_builder = ASTtoCKGBuilderAgent()
+                self.query_interface = CKGQueryInterfaceAgent(
+                    uri=self.neo4j_config.uri,
+                    username=self.neo4j_config.username,
+                    password=self.neo4j_config.password,
+                    max_connection_pool_size=self.neo4j_config.max_connection_pool_size
+                )
             
             logger.info("CKGOperationsAgent initialized successfully")
         except Exception as e:
@@ -100,6 +122,54 @@ class CKGOperationsAgent:
             logger.error(f"Error building CKG: {e}")
             return None
     
+    def update_ckg_from_git_diff(self,
+                                 project_path: str,
+                                 base_commit: str,
+                                 head_commit: str = "HEAD",
+                                 git_agent: Optional[GitOperationsAgent] = None) -> Optional[CKGBuildResult]:
+        """
+        Incrementally update the CKG for files changed between two commits.
+
+        Only added/modified files are reparsed and rebuilt; deleted files have
+        their subgraphs removed. Saved cross-file edges are restored afterwards.
+
+        Files are parsed from the working tree, so head_commit must be the
+        checked-out HEAD and the changed files must have no local changes;
+        otherwise the update is refused.
+
+        Args:
+            project_path: Path to the local git repository
+            base_commit: Commit the current CKG was built from
+            head_commit: Commit to update the CKG to
+            git_agent: GitOperationsAgent to use (created if not provided)
+
+        Returns:
+            CKGBuildResult for the update or None if failed
+        """
+        try:
+            if not self.parser_coordinator or not self.ckg_builder:
+                logger.warning("Parser coordinator or CKG builder not available")
+                return None
+
+            git_agent = git_agent or GitOperationsAgent()
+            diff_info = git_agent.get_changed_files(project_path, base_commit, head_commit)
+            if not git_agent.is_worktree_at_commit(project_path, head_commit, diff_info.changed_files):
+                logger.error(f"Working tree of {project_path} does not match {head_commit} "
+                             f"(not checked out or has local changes); refusing incremental update")
+                return None
+
+            parse_result = self.parser_coordinator.parse_files(project_path, diff_info.changed_files)
+            deleted_files = [os.path.join(project_path, path) for path in diff_info.files_deleted]
+
+            if not self.ckg_builder.neo4j_connection and self.query_interface:
+                self.ckg_builder.neo4j_connection = self.query_interface.get_connection()
+
+            return self.ckg_builder.update_ckg_incremental(parse_result, deleted_files)
+
+        except Exception as e:
+            logger.error(f"Error updating CKG from {base_commit}..{head_commit}: {e}")
+            return None
+    
     def query_ckg(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[CKGQueryResult]:
         """
         Execute query against CKG database.
@@ -7,7 +7,9 @@ Cung cấp API chuẩn hóa để truy vấn thông tin từ CKG mà không cầ
 """
 
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import socket
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Set
 from dataclasses import dataclass
 from loguru import logger
 import json
@@ -19,6 +21,13 @@ except ImportError:
     GraphDatabase = None
 
 from .ckg_schema import NodeType, RelationshipType, CKGSchema
+from .query_cache import QueryResultCache, is_write_query, invalidate_query_caches
+from .neo4j_driver_registry import get_driver_registry, DEFAULT_MAX_CONNECTION_POOL_SIZE
+from .name_search import (
+    looks_like_regex, build_fulltext_query, rank_name_matches, is_missing_index_error,
+    classify_name_match, MATCH_FUZZY
+)
+from .graph_cycles import dependency_cycle_rows
 
 
 @dataclass
@@ -32,6 +41,18 @@ class CKGQueryResult:
     error_message: Optional[str] = None
 
 
+@dataclass
+class CKGQueryPage:
+    """Một trang kết quả keyset pagination (cursor trên id)."""
+    query: str
+    results: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+    has_more: bool
+    execution_time_ms: float
+    success: bool
+    error_message: Optional[str] = None
+
+
 @dataclass
 class ConnectionConfig:
     """Cấu hình kết nối Neo4j."""
@@ -39,6 +60,18 @@ class ConnectionConfig:
     username: str = "neo4j"
     password: str = "ai_codescan_password"
     database: str = "ai-codescan"
+    max_connection_pool_size: int = DEFAULT_MAX_CONNECTION_POOL_SIZE
+
+
+@lru_cache(maxsize=None)
+def _resolve_default_uri(uri: str) -> str:
+    """Fallback về localhost nếu Docker hostname không resolve được (chỉ lookup một lần)."""
+    if 'ai-codescan-neo4j' in uri:
+        try:
+            socket.gethostbyname('ai-codescan-neo4j')
+        except socket.gaierror:
+            return "bolt://localhost:7687"
+    return uri
 
 
 class CKGQueryInterfaceAgent:
@@ -47,15 +80,22 @@ class CKGQueryInterfaceAgent:
     
     Trách nhiệm:
     - Cung cấp API truy vấn CKG chuẩn hóa
-    - Quản lý kết nối Neo4j
+    - Quản lý kết nối Neo4j (driver dùng chung qua Neo4jDriverRegistry, kết nối lazy)
     - Tối ưu hóa performance với caching
     - Đảm bảo security và validation
     """
     
+    # Số hits lấy từ full-text index mỗi trang khi search theo tên
+    NAME_SEARCH_CANDIDATES = 1000
+    
     def __init__(self, 
                  uri: str = None,
                  username: str = "neo4j",
-                 password: str = "password"):
+                 password: str = "password",
+                 max_connection_pool_size: int = DEFAULT_MAX_CONNECTION_POOL_SIZE,
+                 cache_max_entries: int = 1024,
+                 cache_max_memory_mb: float = 64,
+                 cache_ttl_seconds: Optional[float] = 300):
         """
         Initialize CKG Query Interface với Neo4j connection.
         
@@ -63,26 +103,40 @@ class CKGQueryInterfaceAgent:
             uri: Neo4j URI (default from environment)
             username: Neo4j username
             password: Neo4j password
+            max_connection_pool_size: Pool size của shared driver (khi driver được tạo)
+            cache_max_entries: Số queries tối đa trong result cache (0 = tắt cache)
+            cache_max_memory_mb: Giới hạn bộ nhớ ước lượng của result cache
+            cache_ttl_seconds: Thời gian sống của mỗi cached result (None = không hết hạn)
         """
         # Default URI prioritizes environment variable, then Docker hostname, then localhost
         if uri is None:
-            uri = os.getenv('NEO4J_URI', 'bolt://ai-codescan-neo4j:7687')
-            # Fallback to localhost if running outside Docker
-            if 'ai-codescan-neo4j' in uri:
-                import socket
-                try:
-                    socket.gethostbyname('ai-codescan-neo4j')
-                except socket.gaierror:
-                    uri = "bolt://localhost:7687"
+            uri = _resolve_default_uri(os.getenv('NEO4J_URI', 'bolt://ai-codescan-neo4j:7687'))
         
         self.uri = uri
-        self.config = ConnectionConfig(uri=self.uri, username=username, password=password)
-        self.driver = None
+        self.config = ConnectionConfig(uri=self.uri, username=username, password=password,
+                                       max_connection_pool_size=max_connection_pool_size)
+        self._driver = None
+        self._connection_attempted = False
+        self._fulltext_search_available = True
         self.schema = CKGSchema()
-        self.query_cache = {}  # Simple cache cho frequent queries
-        
-        # Kết nối Neo4j
-        self._connect()
+        # LRU/TTL cache cho read queries, tự invalidate khi builder ghi vào graph
+        self.query_cache = QueryResultCache(
+            max_entries=cache_max_entries,
+            max_memory_mb=cache_max_memory_mb,
+            ttl_seconds=cache_ttl_seconds
+        )
+    
+    @property
+    def driver(self):
+        """Shared Neo4j driver, kết nối lazy ở lần dùng đầu tiên."""
+        if self._driver is None and not self._connection_attempted:
+            self._connect()
+        return self._driver
+    
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+        self._connection_attempted = True
     
     def get_connection(self):
         """
@@ -91,45 +145,50 @@ class CKGQueryInterfaceAgent:
         Returns:
             Neo4j driver hoặc None nếu không kết nối được
         """
-        if self.driver is None:
+        if self._driver is None:
             self._connect()
-        return self.driver
+        return self._driver
     
     def _connect(self):
-        """Thiết lập kết nối Neo4j."""
+        """Lấy shared driver từ registry (registry kiểm tra liveness)."""
+        self._connection_attempted = True
         if GraphDatabase is None:
             logger.warning("Neo4j driver not available")
             return
         
         try:
-            self.driver = GraphDatabase.driver(
+            self._driver = get_driver_registry().get_driver(
                 self.config.uri,
-                auth=(self.config.username, self.config.password)
+                self.config.username,
+                self.config.password,
+                max_connection_pool_size=self.config.max_connection_pool_size
             )
             
-            # Test connection - sử dụng default database cho Community Edition
-            with self.driver.session() as session:
-                session.run("RETURN 1")
-            
-            logger.info(f"Kết nối Neo4j thành công: {self.config.uri}")
-            
         except Exception as e:
             logger.error(f"Lỗi kết nối Neo4j: {str(e)}")
-            self.driver = None
+            self._driver = None
     
     def close(self):
-        """Đóng kết nối Neo4j."""
-        if self.driver:
-            self.driver.close()
-            self.driver = None
+        """
+        Bỏ tham chiếu tới driver.
+        
+        Driver dùng chung giữa các agents nên không bị đóng ở đây; dùng
+        get_driver_registry().close_all() khi tắt process.
+        """
+        self._driver = None
     
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> CKGQueryResult:
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True) -> CKGQueryResult:
         """
         Thực thi Cypher query.
         
+        Read queries được cache theo query text và parameters; write queries
+        không được cache và invalidate mọi query caches.
+        
         Args:
             query: Cypher query
             parameters: Parameters cho query
+            use_cache: Cho phép đọc/ghi result cache
             
         Returns:
             CKGQueryResult: Kết quả truy vấn
@@ -147,24 +206,35 @@ class CKGQueryInterfaceAgent:
         import time
         start_time = time.time()
         
+        writes_graph = is_write_query(query)
+        cache_key = None
+        if use_cache and not writes_graph:
+            cache_key = self.query_cache.make_key(query, parameters)
+            cached_records = self.query_cache.get(cache_key)
+            if cached_records is not None:
+                return CKGQueryResult(
+                    query=query,
+                    results=cached_records,
+                    total_count=len(cached_records),
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    success=True
+                )
+        
         try:
             with self.driver.session() as session:
                 result = session.run(query, parameters or {})
                 records = []
                 
                 for record in result:
-                    record_dict = {}
-                    for key in record.keys():
-                        value = record[key]
-                        # Convert Neo4j objects to dict
-                        if hasattr(value, '__dict__'):
-                            record_dict[key] = dict(value)
-                        else:
-                            record_dict[key] = value
-                    records.append(record_dict)
+                    records.append(self._record_to_dict(record))
                 
                 execution_time = (time.time() - start_time) * 1000
                 
+                if writes_graph:
+                    invalidate_query_caches()
+                elif cache_key is not None:
+                    self.query_cache.put(cache_key, records)
+                
                 return CKGQueryResult(
                     query=query,
                     results=records,
@@ -186,6 +256,108 @@ class CKGQueryInterfaceAgent:
                 error_message=str(e)
             )
     
+    @staticmethod
+    def _record_to_dict(record) -> Dict[str, Any]:
+        """Chuyển Neo4j record thành dict."""
+        record_dict = {}
+        for key in record.keys():
+            value = record[key]
+            # Convert Neo4j objects to dict
+            if hasattr(value, '__dict__'):
+                record_dict[key] = dict(value)
+            else:
+                record_dict[key] = value
+        return record_dict
+    
+    def stream_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                     fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Thực thi Cypher query và yield từng record thay vì giữ toàn bộ kết quả.
+        
+        Neo4j gửi records theo từng đợt fetch_size nên bộ nhớ bị chặn bởi
+        fetch_size. Kết quả không đi qua result cache. Session được giữ mở
+        cho đến khi iterator chạy hết hoặc bị đóng.
+        
+        Args:
+            query: Cypher query
+            parameters: Parameters cho query
+            fetch_size: Số records mỗi lần lấy từ server
+            
+        Yields:
+            Dict[str, Any]: Từng record
+            
+        Raises:
+            RuntimeError: Nếu không có kết nối Neo4j
+        """
+        if not self.driver:
+            raise RuntimeError("Không có kết nối Neo4j")
+        
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(query, parameters or {})
+            for record in result:
+                yield self._record_to_dict(record)
+    
+    def execute_query_page(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                           cursor: Optional[str] = None, page_size: int = 1000,
+                           cursor_key: str = "id") -> CKGQueryPage:
+        """
+        Lấy một trang kết quả bằng keyset pagination.
+        
+        Query phải lọc theo ``$cursor`` (vd. ``n.id > $cursor``), sắp xếp theo
+        cùng khóa và kết thúc bằng ``LIMIT $limit``; cột ``cursor_key`` phải
+        có trong RETURN. Trang đầu dùng cursor rỗng.
+        
+        Args:
+            query: Cypher query có $cursor và $limit
+            parameters: Parameters khác cho query
+            cursor: next_cursor của trang trước (None cho trang đầu)
+            page_size: Số rows mỗi trang
+            cursor_key: Cột dùng làm cursor
+            
+        Returns:
+            CKGQueryPage: Rows của trang và cursor cho trang tiếp theo
+        """
+        page_parameters = dict(parameters or {})
+        page_parameters["cursor"] = cursor or ""
+        # Lấy thêm một row để biết còn trang sau hay không
+        page_parameters["limit"] = page_size + 1
+        
+        result = self.execute_query(query, page_parameters)
+        rows = result.results[:page_size]
+        has_more = len(result.results) > page_size
+        
+        return CKGQueryPage(
+            query=query,
+            results=rows,
+            next_cursor=rows[-1].get(cursor_key) if has_more and rows else None,
+            has_more=has_more,
+            execution_time_ms=result.execution_time_ms,
+            success=result.success,
+            error_message=result.error_message
+        )
+    
+    def iter_query_pages(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                         page_size: int = 1000, cursor_key: str = "id") -> Iterator[CKGQueryPage]:
+        """
+        Duyệt lần lượt các trang của một keyset-paginated query.
+        
+        Args:
+            query: Cypher query có $cursor và $limit (xem execute_query_page)
+            parameters: Parameters khác cho query
+            page_size: Số rows mỗi trang
+            cursor_key: Cột dùng làm cursor
+            
+        Yields:
+            CKGQueryPage: Từng trang, dừng sau trang cuối hoặc trang lỗi
+        """
+        cursor = None
+        while True:
+            page = self.execute_query_page(query, parameters, cursor, page_size, cursor_key)
+            yield page
+            if not page.success or not page.has_more or page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+    
     # === API Methods cho các truy vấn phổ biến ===
     
     def get_functions_in_file(self, file_path: str) -> CKGQueryResult:
@@ -285,6 +457,95 @@ class CKGQueryInterfaceAgent:
         
         return self.execute_query(query, {"file_path": file_path})
     
+    # === Batched API Methods (UNWIND $paths) ===
+    
+    def get_functions_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """
+        Lấy functions của nhiều files trong một query.
+        
+        Args:
+            file_paths: Danh sách đường dẫn files
+            
+        Returns:
+            CKGQueryResult: Functions, mỗi dòng kèm file_path
+        """
+        query = """
+        UNWIND $paths AS path
+        MATCH (f:File {file_path: path})-[:CONTAINS]->(m:Module)
+        MATCH (m)-[:DEFINES_FUNCTION]->(func:Function)
+        RETURN path as file_path, func.name as name, func.line_number as line_number,
+               func.parameters_count as params_count, func.docstring as docstring
+        ORDER BY path, func.line_number
+        """
+        
+        return self.execute_query(query, {"paths": list(file_paths)})
+    
+    def get_classes_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """
+        Lấy classes của nhiều files trong một query.
+        
+        Args:
+            file_paths: Danh sách đường dẫn files
+            
+        Returns:
+            CKGQueryResult: Classes, mỗi dòng kèm file_path
+        """
+        query = """
+        UNWIND $paths AS path
+        MATCH (f:File {file_path: path})-[:CONTAINS]->(m:Module)
+        MATCH (m)-[:DEFINES_CLASS]->(cls:Class)
+        RETURN path as file_path, cls.name as name, cls.line_number as line_number,
+               cls.methods_count as methods_count, cls.base_classes as base_classes,
+               cls.docstring as docstring
+        ORDER BY path, cls.line_number
+        """
+        
+        return self.execute_query(query, {"paths": list(file_paths)})
+    
+    def get_imports_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """
+        Lấy imports của nhiều files trong một query.
+        
+        Args:
+            file_paths: Danh sách đường dẫn files
+            
+        Returns:
+            CKGQueryResult: Imports, mỗi dòng kèm file_path
+        """
+        query = """
+        UNWIND $paths AS path
+        MATCH (f:File {file_path: path})-[:CONTAINS]->(m:Module)
+        MATCH (m)-[:IMPORTS]->(imp:Import)
+        RETURN path as file_path, imp.name as name, imp.imported_name as imported_name,
+               imp.alias as alias, imp.is_from_import as is_from_import,
+               imp.module_name as module_name, imp.line_number as line_number
+        ORDER BY path, imp.line_number
+        """
+        
+        return self.execute_query(query, {"paths": list(file_paths)})
+    
+    def get_files_dependencies(self, file_paths: List[str]) -> CKGQueryResult:
+        """
+        Lấy dependencies của nhiều files trong một query.
+        
+        Args:
+            file_paths: Danh sách đường dẫn files
+            
+        Returns:
+            CKGQueryResult: File dependencies, mỗi dòng kèm file_path
+        """
+        query = """
+        UNWIND $paths AS path
+        MATCH (f:File {file_path: path})-[:CONTAINS]->(m:Module)
+        MATCH (m)-[:IMPORTS]->(imp:Import)
+        RETURN path as file_path, imp.module_name as dependency,
+               COUNT(imp) as import_count,
+               COLLECT(imp.imported_name) as imported_items
+        ORDER BY file_path, dependency
+        """
+        
+        return self.execute_query(query, {"paths": list(file_paths)})
+    
     def find_function_callers(self, function_name: str) -> CKGQueryResult:
         """
         Tìm những functions gọi đến function đã cho.
@@ -356,27 +617,59 @@ class CKGQueryInterfaceAgent:
         
         return self.execute_query(query, {"class_name": class_name})
     
-    def find_circular_dependencies(self) -> CKGQueryResult:
+    def find_circular_dependencies(self, minimal_cycles: bool = False,
+                                   max_cycles_per_component: Optional[int] = 10) -> CKGQueryResult:
         """
         Tìm circular dependencies giữa các modules.
         
+        Chỉ lấy các IMPORTS edges bằng một query rồi tìm strongly connected
+        components in-memory (O(V+E)) thay vì match variable-length paths.
+        Mỗi component được báo cáo một lần.
+        
+        Args:
+            minimal_cycles: Liệt kê cycle ngắn nhất qua từng module của component
+            max_cycles_per_component: Số minimal cycles tối đa cho mỗi component
+            
         Returns:
-            CKGQueryResult: Circular dependencies
+            CKGQueryResult: Mỗi dòng gồm cycle_path (module đầu lặp lại ở cuối),
+                cycle_length, component và component_size
         """
         query = """
-        MATCH path = (m1:Module)-[:IMPORTS*2..10]->(m1)
-        WHERE ALL(rel in relationships(path) WHERE type(rel) = 'IMPORTS')
-        RETURN [node in nodes(path) | node.name] as cycle_path,
-               length(path) as cycle_length
-        ORDER BY cycle_length
+        MATCH (m1:Module)-[:IMPORTS]->(m2:Module)
+        RETURN m1.name as source, m2.name as target
         """
         
-        return self.execute_query(query)
+        edges_result = self.execute_query(query)
+        if not edges_result.success:
+            return edges_result
+        
+        import time
+        start_time = time.time()
+        
+        graph: Dict[str, Set[str]] = {}
+        for record in edges_result.results:
+            source, target = record.get("source"), record.get("target")
+            if source and target:
+                graph.setdefault(source, set()).add(target)
+        
+        results = dependency_cycle_rows(graph, minimal_cycles, max_cycles_per_component)
+        
+        return CKGQueryResult(
+            query=query,
+            results=results,
+            total_count=len(results),
+            execution_time_ms=edges_result.execution_time_ms + (time.time() - start_time) * 1000,
+            success=True
+        )
     
     def get_unused_public_functions(self, file_path: Optional[str] = None) -> CKGQueryResult:
         """
         Tìm public functions không được sử dụng.
         
+        Dùng in-degree index (func.in_degree_calls) do ASTtoCKGBuilderAgent
+        duy trì khi build, nên chỉ là một lượt scan có lọc. Nodes chưa có
+        property (CKG build trước khi có index) dùng lại NOT EXISTS.
+        
         Args:
             file_path: Đường dẫn file (optional)
             
@@ -388,7 +681,8 @@ class CKGQueryInterfaceAgent:
             MATCH (f:File {file_path: $file_path})-[:CONTAINS]->(m:Module)
             MATCH (m)-[:DEFINES_FUNCTION]->(func:Function)
             WHERE NOT func.name STARTS WITH '_'
-            AND NOT EXISTS((other)-[:CALLS]->(func))
+            AND (func.in_degree_calls = 0
+                 OR (func.in_degree_calls IS NULL AND NOT EXISTS { MATCH (func)<-[:CALLS]-() }))
             RETURN func.name as name, func.file_path as file_path,
                    func.line_number as line_number, func.docstring as docstring
             ORDER BY func.name
@@ -398,7 +692,8 @@ class CKGQueryInterfaceAgent:
             query = """
             MATCH (func:Function)
             WHERE NOT func.name STARTS WITH '_'
-            AND NOT EXISTS((other)-[:CALLS]->(func))
+            AND (func.in_degree_calls = 0
+                 OR (func.in_degree_calls IS NULL AND NOT EXISTS { MATCH (func)<-[:CALLS]-() }))
             RETURN func.name as name, func.file_path as file_path,
                    func.line_number as line_number, func.docstring as docstring
             ORDER BY func.file_path, func.name
@@ -407,6 +702,50 @@ class CKGQueryInterfaceAgent:
         
         return self.execute_query(query, params)
     
+    def get_unused_public_functions_page(self, file_path: Optional[str] = None,
+                                         cursor: Optional[str] = None,
+                                         page_size: int = 1000) -> CKGQueryPage:
+        """
+        Tìm public functions không được sử dụng, theo từng trang (cursor trên id).
+        
+        Args:
+            file_path: Đường dẫn file (optional)
+            cursor: next_cursor của trang trước
+            page_size: Số rows mỗi trang
+            
+        Returns:
+            CKGQueryPage: Unused functions, sắp xếp theo id
+        """
+        if file_path:
+            query = """
+            MATCH (f:File {file_path: $file_path})-[:CONTAINS]->(m:Module)
+            MATCH (m)-[:DEFINES_FUNCTION]->(func:Function)
+            WHERE func.id > $cursor
+            AND NOT func.name STARTS WITH '_'
+            AND (func.in_degree_calls = 0
+                 OR (func.in_degree_calls IS NULL AND NOT EXISTS { MATCH (func)<-[:CALLS]-() }))
+            RETURN func.id as id, func.name as name, func.file_path as file_path,
+                   func.line_number as line_number, func.docstring as docstring
+            ORDER BY func.id
+            LIMIT $limit
+            """
+            params = {"file_path": file_path}
+        else:
+            query = """
+            MATCH (func:Function)
+            WHERE func.id > $cursor
+            AND NOT func.name STARTS WITH '_'
+            AND (func.in_degree_calls = 0
+                 OR (func.in_degree_calls IS NULL AND NOT EXISTS { MATCH (func)<-[:CALLS]-() }))
+            RETURN func.id as id, func.name as name, func.file_path as file_path,
+                   func.line_number as line_number, func.docstring as docstring
+            ORDER BY func.id
+            LIMIT $limit
+            """
+            params = {}
+        
+        return self.execute_query_page(query, params, cursor, page_size)
+    
     def get_project_statistics(self) -> CKGQueryResult:
         """
         Lấy thống kê tổng quan về project.
@@ -428,22 +767,39 @@ class CKGQueryInterfaceAgent:
         
         return self.execute_query(query)
     
-    def search_by_name(self, name_pattern: str, node_types: Optional[List[str]] = None) -> CKGQueryResult:
+    def search_by_name(self, name_pattern: str, node_types: Optional[List[str]] = None,
+                       limit: Optional[int] = None, fuzzy: bool = False) -> CKGQueryResult:
         """
         Tìm kiếm nodes theo tên.
         
+        Tên thường được tìm qua full-text index và xếp hạng theo match_type
+        (exact, prefix, substring); kết quả giống regex search trước đây
+        (mọi tên chứa pattern, không phân biệt hoa thường). Patterns có cú
+        pháp regex hoặc khi index không khả dụng sẽ dùng regex matching.
+        
         Args:
-            name_pattern: Pattern tìm kiếm (hỗ trợ regex)
+            name_pattern: Pattern tìm kiếm (tên hoặc regex)
             node_types: Danh sách loại nodes cần tìm
+            limit: Số kết quả tối đa (None = mọi kết quả)
+            fuzzy: Thêm các tên gần đúng (edit distance) với match_type "fuzzy"
             
         Returns:
             CKGQueryResult: Kết quả tìm kiếm
         """
+        fulltext_result = self._search_names_fulltext(name_pattern, node_types, limit, fuzzy)
+        if fulltext_result is not None:
+            return fulltext_result
+        
         if node_types:
-            type_filter = " OR ".join([f"'{t}' IN labels(n)" for t in node_types])
+            # Reason: MATCH theo từng label chỉ scan label store của các loại
+            # được yêu cầu thay vì toàn bộ nodes rồi lọc bằng labels(n)
+            label_matches = "\n                UNION\n                ".join(
+                f"MATCH (n:`{t}`) WHERE n.name =~ $pattern RETURN n" for t in node_types
+            )
             query = f"""
-            MATCH (n)
-            WHERE n.name =~ $pattern AND ({type_filter})
+            CALL {{
+                {label_matches}
+            }}
             RETURN n.name as name, labels(n) as types, n.file_path as file_path,
                    n.line_number as line_number, n.docstring as docstring
             ORDER BY n.name
@@ -462,6 +818,106 @@ class CKGQueryInterfaceAgent:
         
         return self.execute_query(query, {"pattern": regex_pattern})
     
+    def _search_names_fulltext(self, name_pattern: str, labels: Optional[List[str]],
+                               limit: Optional[int] = None,
+                               fuzzy: bool = False) -> Optional[CKGQueryResult]:
+        """
+        Tìm nodes theo tên qua full-text index và xếp hạng kết quả.
+        
+        Hits được lấy theo trang NAME_SEARCH_CANDIDATES: không có limit thì đọc
+        đến hết index, có limit thì dừng khi đủ limit * 4 candidates để xếp hạng.
+        
+        Args:
+            name_pattern: Tên cần tìm (không phải regex)
+            labels: Labels được phép (None = tất cả)
+            limit: Số kết quả tối đa (None = mọi kết quả)
+            fuzzy: Giữ các hits chỉ khớp gần đúng (MATCH_FUZZY)
+            
+        Returns:
+            CKGQueryResult đã xếp hạng, hoặc None nếu cần dùng regex search
+        """
+        if (not self._fulltext_search_available or not name_pattern.strip()
+                or looks_like_regex(name_pattern)):
+            return None
+        
+        page_size = self.NAME_SEARCH_CANDIDATES
+        wanted = limit * 4 if limit is not None else None
+        allowed = set(labels or [])
+        rows: List[Dict[str, Any]] = []
+        skip = 0
+        execution_time_ms = 0.0
+        # Lọc label và match_type sau khi lấy hits, nên đọc tiếp các trang sau
+        while True:
+            result = self.execute_query(self.schema.get_cypher_name_search(), {
+                "search": build_fulltext_query(name_pattern, fuzzy=fuzzy),
+                "skip": skip,
+                "limit": page_size
+            })
+            if not result.success:
+                if self.driver and is_missing_index_error(result.error_message):
+                    logger.info("Full-text name index không khả dụng, dùng regex search")
+                    self._fulltext_search_available = False
+                return None
+            execution_time_ms += result.execution_time_ms
+            rows.extend(row for row in result.results
+                        if (not allowed or allowed.intersection(row.get("types") or []))
+                        and (fuzzy or classify_name_match(row.get("name"), name_pattern) != MATCH_FUZZY))
+            if len(result.results) < page_size or (wanted is not None and len(rows) >= wanted):
+                break
+            skip += page_size
+        
+        ranked = rank_name_matches(rows, name_pattern, limit)
+        return CKGQueryResult(
+            query=result.query,
+            results=ranked,
+            total_count=len(ranked),
+            execution_time_ms=execution_time_ms,
+            success=True
+        )
+    
+    def search_by_name_page(self, name_pattern: str, node_types: Optional[List[str]] = None,
+                            cursor: Optional[str] = None, page_size: int = 1000) -> CKGQueryPage:
+        """
+        Tìm kiếm nodes theo tên, theo từng trang (cursor trên id).
+        
+        Args:
+            name_pattern: Pattern tìm kiếm (hỗ trợ regex)
+            node_types: Danh sách loại nodes cần tìm
+            cursor: next_cursor của trang trước
+            page_size: Số rows mỗi trang
+            
+        Returns:
+            CKGQueryPage: Kết quả tìm kiếm, sắp xếp theo id
+        """
+        if node_types:
+            # Mỗi nhánh tự giới hạn $limit rows theo id nên không phải sort toàn bộ kết quả
+            label_matches = "\n                UNION\n                ".join(
+                f"MATCH (n:`{t}`) WHERE n.id > $cursor AND n.name =~ $pattern "
+                f"RETURN n ORDER BY n.id LIMIT $limit" for t in node_types
+            )
+            query = f"""
+            CALL {{
+                {label_matches}
+            }}
+            RETURN n.id as id, n.name as name, labels(n) as types, n.file_path as file_path,
+                   n.line_number as line_number, n.docstring as docstring
+            ORDER BY id
+            LIMIT $limit
+            """
+        else:
+            query = """
+            MATCH (n)
+            WHERE n.id > $cursor AND n.name =~ $pattern
+            RETURN n.id as id, n.name as name, labels(n) as types, n.file_path as file_path,
+                   n.line_number as line_number, n.docstring as docstring
+            ORDER BY id
+            LIMIT $limit
+            """
+        
+        regex_pattern = f"(?i).*{name_pattern}.*"
+        
+        return self.execute_query_page(query, {"pattern": regex_pattern}, cursor, page_size)
+    
     def get_file_dependencies(self, file_path: str) -> CKGQueryResult:
         """
         Lấy dependencies của một file.
@@ -516,12 +972,11 @@ class CKGQueryInterfaceAgent:
         Lấy thống kê cache.
         
         Returns:
-            Dict[str, Any]: Thống kê cache
+            Dict[str, Any]: Thống kê cache (kích thước, bộ nhớ, hits/misses, evictions)
         """
-        return {
-            'cache_size': len(self.query_cache),
-            'cached_queries': list(self.query_cache.keys())
-        }
+        stats = self.query_cache.get_stats()
+        stats['cached_queries'] = [query for query, _ in self.query_cache.keys()]
+        return stats
 
     # === Dart-specific Query Methods ===
     
@@ -725,10 +1180,10 @@ class CKGQueryInterfaceAgent:
     
     def search_dart_elements_by_name(self, name_pattern: str, element_types: Optional[List[str]] = None) -> CKGQueryResult:
         """
-        Tìm kiếm Dart elements theo tên.
+        Tìm kiếm Dart elements theo tên (full-text index, fallback regex).
         
         Args:
-            name_pattern: Pattern tìm kiếm (regex)
+            name_pattern: Pattern tìm kiếm (tên hoặc regex)
             element_types: Loại elements cần tìm (DartClass, DartMixin, DartFunction, etc.)
             
         Returns:
@@ -738,6 +1193,10 @@ class CKGQueryInterfaceAgent:
         if element_types is None:
             element_types = ['DartClass', 'DartMixin', 'DartExtension', 'DartFunction', 'DartEnum']
         
+        fulltext_result = self._search_names_fulltext(name_pattern, element_types, limit=50)
+        if fulltext_result is not None:
+            return fulltext_result
+        
         # Build dynamic query based on element types
         type_conditions = []
         for element_type in element_types:
@@ -760,6 +1219,9 @@ class CKGQueryInterfaceAgent:
         """
         Tìm Dart exports không được sử dụng.
         
+        Dùng property exp.import_refs do ASTtoCKGBuilderAgent tính khi build
+        (NOT EXISTS trên DartImports nếu property chưa có).
+        
         Args:
             file_path: File path để tìm kiếm (optional)
             
@@ -769,10 +1231,12 @@ class CKGQueryInterfaceAgent:
         if file_path:
             query = """
             MATCH (f:File {file_path: $file_path})-[:DART_EXPORTS]->(exp:DartExport)
-            WHERE NOT EXISTS {
-                MATCH (other_file:File)-[:IMPORTS]->(imp:DartImport)
-                WHERE imp.imported_name CONTAINS exp.name
-            }
+            WHERE exp.import_refs = 0
+               OR (exp.import_refs IS NULL AND NOT EXISTS {
+                   MATCH (:File)-[:IMPORTS]->(imp:DartImport)
+                   WHERE imp.imported_name = exp.name OR imp.imported_name = 'package:' + exp.name
+                      OR imp.imported_name ENDS WITH '/' + exp.name
+               })
             RETURN exp.name as export_name, exp.file_path as file_path,
                    exp.line_number as line_number
             ORDER BY exp.name
@@ -781,10 +1245,12 @@ class CKGQueryInterfaceAgent:
         else:
             query = """
             MATCH (exp:DartExport)
-            WHERE NOT EXISTS {
-                MATCH (other_file:File)-[:IMPORTS]->(imp:DartImport)
-                WHERE imp.imported_name CONTAINS exp.name
-            }
+            WHERE exp.import_refs = 0
+               OR (exp.import_refs IS NULL AND NOT EXISTS {
+                   MATCH (:File)-[:IMPORTS]->(imp:DartImport)
+                   WHERE imp.imported_name = exp.name OR imp.imported_name = 'package:' + exp.name
+                      OR imp.imported_name ENDS WITH '/' + exp.name
+               })
             RETURN exp.name as export_name, exp.file_path as file_path,
                    exp.line_number as line_number
             ORDER BY exp.file_path, exp.name
@@ -1057,7 +1523,7 @@ class CKGQueryInterfaceAgent:
         Tìm kiếm Kotlin elements theo tên.
         
         Args:
-            name_pattern: Pattern để tìm kiếm (regex)
+            name_pattern: Pattern để tìm kiếm (regex, khớp toàn bộ tên, phân biệt hoa thường)
             element_types: Danh sách loại elements cần tìm (classes, interfaces, functions, etc.)
             
         Returns:
@@ -1089,6 +1555,9 @@ class CKGQueryInterfaceAgent:
         """
         Tìm Kotlin objects không được sử dụng.
         
+        Dùng in-degree index (o.in_degree_kotlin_uses_type) do
+        ASTtoCKGBuilderAgent duy trì khi build (NOT EXISTS nếu property chưa có).
+        
         Args:
             file_path: File path để scope search (optional)
             
@@ -1098,7 +1567,8 @@ class CKGQueryInterfaceAgent:
         if file_path:
             query = """
             MATCH (f:File {file_path: $file_path})-[:DEFINES_KOTLIN_OBJECT]->(o:KotlinObject)
-            WHERE NOT exists((o)<-[:KOTLIN_USES_TYPE]-())
+            WHERE o.in_degree_kotlin_uses_type = 0
+               OR (o.in_degree_kotlin_uses_type IS NULL AND NOT EXISTS { MATCH (o)<-[:KOTLIN_USES_TYPE]-() })
             RETURN o.name as object_name, o.file_path as file_path,
                    o.line_number as line_number, o.modifiers as modifiers
             ORDER BY o.name
@@ -1107,7 +1577,8 @@ class CKGQueryInterfaceAgent:
         else:
             query = """
             MATCH (o:KotlinObject)
-            WHERE NOT exists((o)<-[:KOTLIN_USES_TYPE]-())
+            WHERE o.in_degree_kotlin_uses_type = 0
+               OR (o.in_degree_kotlin_uses_type IS NULL AND NOT EXISTS { MATCH (o)<-[:KOTLIN_USES_TYPE]-() })
             RETURN o.name as object_name, o.file_path as file_path,
                    o.line_number as line_number, o.modifiers as modifiers
             ORDER BY o.name
@@ -7,9 +7,11 @@ các loại nodes, relationships và properties cho Python.
 """
 
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from .name_search import NAME_FULLTEXT_INDEX
+
 
 @dataclass
 class CKGNode:
@@ -202,6 +204,9 @@ class RelationshipProperties:
     source_node_id: str
     target_node_id: str
     properties: Dict[str, Any] = None
+    # Labels của source/target để MATCH dùng được index (optional)
+    source_type: Optional[NodeType] = None
+    target_type: Optional[NodeType] = None
     
     def __post_init__(self):
         if self.properties is None:
@@ -641,8 +646,8 @@ class CKGSchema:
         # Tạo properties string cho Cypher
         props_str = ', '.join([f'{k}: {repr(v)}' for k, v in properties.items()])
         
-        # Generate unique ID
-        node_id = f"{node.type.value}_{node.file_path}_{node.line_number}_{node.name}".replace('/', '_').replace('.', '_')
+        # Dùng cùng ID với relationships (ưu tiên ID do builder gán)
+        node_id = cls.get_node_id(node)
         
         return f"CREATE (n:{node.type.value} {{{props_str}}}) SET n.id = '{node_id}' RETURN n"
     
@@ -651,6 +656,9 @@ class CKGSchema:
         """
         Tạo Cypher query để tạo relationship.
         
+        Nếu relationship có source_type/target_type, MATCH sẽ kèm label để
+        dùng uniqueness constraint trên id thay vì scan toàn bộ nodes.
+        
         Args:
             relationship: Relationship cần tạo
             
@@ -662,13 +670,515 @@ class CKGSchema:
             props = ', '.join([f'{k}: {repr(v)}' for k, v in relationship.properties.items()])
             properties_str = f" {{{props}}}"
         
+        source_label = cls._label_fragment(relationship.source_type)
+        target_label = cls._label_fragment(relationship.target_type)
+        
         return f"""
-        MATCH (source {{id: '{relationship.source_node_id}'}})
-        MATCH (target {{id: '{relationship.target_node_id}'}})
+        MATCH (source{source_label} {{id: '{relationship.source_node_id}'}})
+        MATCH (target{target_label} {{id: '{relationship.target_node_id}'}})
         CREATE (source)-[r:{relationship.type.value}{properties_str}]->(target)
         RETURN r
         """
     
+    # === Parameterized query generation ===
+    
+    @classmethod
+    def get_cypher_create_node_template(cls, node_type: NodeType) -> str:
+        """
+        Tạo Cypher template cố định cho việc tạo node của một label.
+        
+        Template chỉ phụ thuộc vào label nên Neo4j có thể reuse execution
+        plan cho mọi node cùng loại. MERGE trên id (có uniqueness constraint)
+        nên build lại cùng project ghi đè node thay vì vi phạm constraint.
+        
+        Args:
+            node_type: Loại node
+            
+        Returns:
+            str: Cypher template nhận parameter $props
+        """
+        return f"MERGE (n:{node_type.value} {{id: $props.id}}) SET n = $props RETURN n"
+    
+    @classmethod
+    def get_parameterized_create_node(cls, node: NodeProperties) -> Tuple[str, Dict[str, Any]]:
+        """
+        Tạo Cypher template và parameter map để tạo node.
+        
+        Args:
+            node: Node cần tạo
+            
+        Returns:
+            Tuple[str, Dict[str, Any]]: (query template, parameters)
+        """
+        return cls.get_cypher_create_node_template(node.type), {'props': cls.get_node_row(node)}
+    
+    @classmethod
+    def get_cypher_create_relationship_template(cls, relationship_type: RelationshipType,
+                                                source_type: Optional[NodeType] = None,
+                                                target_type: Optional[NodeType] = None) -> str:
+        """
+        Tạo Cypher template cố định cho việc tạo relationship.
+        
+        MERGE nên build lại không tạo thêm relationship trùng giữa cùng hai nodes.
+        
+        Args:
+            relationship_type: Loại relationship
+            source_type: Label của source node (optional)
+            target_type: Label của target node (optional)
+            
+        Returns:
+            str: Cypher template nhận $source_id, $target_id và $props
+        """
+        source_label = cls._label_fragment(source_type)
+        target_label = cls._label_fragment(target_type)
+        
+        return f"""
+        MATCH (source{source_label} {{id: $source_id}})
+        MATCH (target{target_label} {{id: $target_id}})
+        MERGE (source)-[r:{relationship_type.value}]->(target)
+        SET r = $props
+        RETURN r
+        """
+    
+    @classmethod
+    def get_parameterized_create_relationship(cls, relationship: RelationshipProperties) -> Tuple[str, Dict[str, Any]]:
+        """
+        Tạo Cypher template và parameter map để tạo relationship.
+        
+        Args:
+            relationship: Relationship cần tạo
+            
+        Returns:
+            Tuple[str, Dict[str, Any]]: (query template, parameters)
+        """
+        query = cls.get_cypher_create_relationship_template(
+            relationship.type, relationship.source_type, relationship.target_type
+        )
+        row = cls.get_relationship_row(relationship)
+        
+        return query, {
+            'source_id': row['source_id'],
+            'target_id': row['target_id'],
+            'props': row['properties']
+        }
+    
+    @staticmethod
+    def _label_fragment(node_type: Optional[NodeType]) -> str:
+        """Tạo fragment ':Label' cho pattern, rỗng nếu không biết label."""
+        return f":{node_type.value}" if node_type else ""
+    
+    # === Schema bootstrap (constraints & indexes) ===
+    
+    INDEXED_PROPERTIES = ['file_path', 'name']
+    
+    @staticmethod
+    def _schema_object_prefix(node_type: NodeType) -> str:
+        """Tạo prefix snake_case cho tên constraint/index, ví dụ JavaClass -> java_class."""
+        return ''.join(
+            f"_{ch.lower()}" if ch.isupper() and i > 0 else ch.lower()
+            for i, ch in enumerate(node_type.value)
+        )
+    
+    @classmethod
+    def get_cypher_schema_bootstrap(cls) -> List[str]:
+        """
+        Tạo các Cypher statements cho uniqueness constraints và indexes.
+        
+        Mỗi NodeType label có uniqueness constraint trên ``id`` và index trên
+        ``file_path`` và ``name``. Các statements dùng IF NOT EXISTS nên có thể
+        chạy lại an toàn.
+        
+        Returns:
+            List[str]: Danh sách Cypher statements
+        """
+        statements = []
+        
+        for node_type in NodeType:
+            prefix = cls._schema_object_prefix(node_type)
+            label = node_type.value
+            statements.append(
+                f"CREATE CONSTRAINT {prefix}_id_unique IF NOT EXISTS "
+                f"FOR (n:{label}) REQUIRE n.id IS UNIQUE"
+            )
+            for prop in cls.INDEXED_PROPERTIES:
+                statements.append(
+                    f"CREATE INDEX {prefix}_{prop}_index IF NOT EXISTS "
+                    f"FOR (n:{label}) ON (n.{prop})"
+                )
+        
+        statements.append(cls.get_cypher_name_fulltext_index())
+        
+        return statements
+    
+    @classmethod
+    def get_cypher_name_fulltext_index(cls) -> str:
+        """
+        Tạo full-text index trên ``name`` cho mọi NodeType label.
+        
+        Analyzer standard-no-stop-words giữ nguyên identifiers có dấu gạch
+        dưới thành một token (lowercase), phù hợp cho prefix/substring/fuzzy
+        matching của symbol search.
+        
+        Returns:
+            str: Cypher statement
+        """
+        labels = "|".join(node_type.value for node_type in NodeType)
+        return (
+            f"CREATE FULLTEXT INDEX {NAME_FULLTEXT_INDEX} IF NOT EXISTS "
+            f"FOR (n:{labels}) ON EACH [n.name] "
+            "OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-no-stop-words'}}"
+        )
+    
+    @staticmethod
+    def get_cypher_name_search() -> str:
+        """
+        Tạo Cypher query tìm nodes theo tên qua full-text index, theo trang.
+        
+        Lucene không lọc được theo label, nên query trả về mọi label
+        (cột ``types``) và caller lọc rồi lấy trang tiếp theo khi chưa đủ.
+        
+        Parameters: ``$search`` (Lucene query), ``$skip`` (số hits bỏ qua),
+        ``$limit`` (số hits mỗi trang).
+        
+        Returns:
+            str: Cypher query
+        """
+        return f"""
+        CALL db.index.fulltext.queryNodes('{NAME_FULLTEXT_INDEX}', $search, {{skip: $skip, limit: $limit}})
+        YIELD node AS n, score
+        RETURN n.name as name, labels(n) as types, labels(n)[0] as type,
+               n.file_path as file_path, n.line_number as line_number,
+               n.docstring as docstring, score
+        ORDER BY score DESC
+        """
+    
+    # === Bulk (UNWIND) query generation ===
+
+    @classmethod
+    def get_node_id(cls, node: NodeProperties) -> str:
+        """
+        Lấy ID của node, ưu tiên ID do builder gán trong properties.
+
+        Args:
+            node: Node cần lấy ID
+
+        Returns:
+            str: Node ID dùng để match relationships
+        """
+        if node.properties and node.properties.get('id'):
+            return node.properties['id']
+        return f"{node.type.value}_{node.file_path}_{node.line_number}_{node.name}".replace('/', '_').replace('.', '_')
+
+    @staticmethod
+    def to_cypher_value(value: Any) -> Any:
+        """
+        Chuyển giá trị Python sang kiểu property Neo4j hỗ trợ.
+
+        Neo4j chỉ lưu primitives và list của primitives, các kiểu khác
+        (dict, object, list lồng nhau) được chuyển thành string.
+
+        Args:
+            value: Giá trị cần chuyển
+
+        Returns:
+            Any: Giá trị hợp lệ cho Neo4j property
+        """
+        if value is None or isinstance(value, (str, bool, int, float)):
+            return value
+        if isinstance(value, (list, tuple, set)):
+            return [
+                item if isinstance(item, (str, bool, int, float)) else str(item)
+                for item in value if item is not None
+            ]
+        return str(value)
+
+    @classmethod
+    def get_node_row(cls, node: NodeProperties) -> Dict[str, Any]:
+        """
+        Tạo property map (row) cho node dùng trong UNWIND batch.
+
+        Args:
+            node: Node cần chuyển
+
+        Returns:
+            Dict[str, Any]: Properties của node, bao gồm id
+        """
+        row = {
+            'name': node.name,
+            'type': node.type.value,
+            'file_path': node.file_path,
+            'line_number': node.line_number
+        }
+
+        if node.end_line_number:
+            row['end_line_number'] = node.end_line_number
+
+        if node.column_offset:
+            row['column_offset'] = node.column_offset
+
+        if node.properties:
+            for key, value in node.properties.items():
+                row[key] = cls.to_cypher_value(value)
+
+        row['id'] = cls.get_node_id(node)
+        return row
+
+    @classmethod
+    def get_relationship_row(cls, relationship: RelationshipProperties) -> Dict[str, Any]:
+        """
+        Tạo row cho relationship dùng trong UNWIND batch.
+
+        Args:
+            relationship: Relationship cần chuyển
+
+        Returns:
+            Dict[str, Any]: Row gồm source_id, target_id và properties
+        """
+        return {
+            'source_id': relationship.source_node_id,
+            'target_id': relationship.target_node_id,
+            'properties': {
+                k: cls.to_cypher_value(v) for k, v in (relationship.properties or {}).items()
+            }
+        }
+
+    @classmethod
+    def get_cypher_unwind_create_nodes(cls, node_type: NodeType) -> str:
+        """
+        Tạo Cypher query UNWIND để tạo nhiều nodes cùng label trong một lần.
+
+        Args:
+            node_type: Loại node (label) của batch
+
+        Returns:
+            str: Cypher query nhận parameter $rows
+        """
+        # Reason: MERGE trên id dùng uniqueness constraint và giữ cho việc
+        # ghi lại cùng một node (rebuild) không vi phạm constraint
+        return f"UNWIND $rows AS row MERGE (n:{node_type.value} {{id: row.id}}) SET n += row"
+
+    @classmethod
+    def get_cypher_unwind_create_relationships(cls, relationship_type: RelationshipType,
+                                               source_type: Optional[NodeType] = None,
+                                               target_type: Optional[NodeType] = None) -> str:
+        """
+        Tạo Cypher query UNWIND để tạo nhiều relationships cùng type trong một lần.
+
+        MERGE giống nodes, nên rebuild qua CKGBulkLoader không nhân đôi edges.
+
+        Args:
+            relationship_type: Loại relationship của batch
+            source_type: Label của source nodes (optional)
+            target_type: Label của target nodes (optional)
+
+        Returns:
+            str: Cypher query nhận parameter $rows
+        """
+        source_label = cls._label_fragment(source_type)
+        target_label = cls._label_fragment(target_type)
+        return f"""
+        UNWIND $rows AS row
+        MATCH (source{source_label} {{id: row.source_id}})
+        MATCH (target{target_label} {{id: row.target_id}})
+        MERGE (source)-[r:{relationship_type.value}]->(target)
+        SET r = row.properties
+        """
+
+    # === Incremental update queries ===
+
+    # Relationships có thể nối nodes của các files khác nhau
+    CROSS_FILE_RELATIONSHIPS = [
+        RelationshipType.IMPORTS,
+        RelationshipType.CALLS,
+        RelationshipType.INHERITS_FROM
+    ]
+
+    @classmethod
+    def get_cypher_delete_file_nodes(cls, node_type: NodeType) -> str:
+        """
+        Tạo Cypher query xóa toàn bộ nodes của một label thuộc các files.
+
+        Args:
+            node_type: Label cần xóa (dùng index trên file_path)
+
+        Returns:
+            str: Cypher query nhận parameter $paths
+        """
+        return f"MATCH (n:{node_type.value}) WHERE n.file_path IN $paths DETACH DELETE n"
+
+    @classmethod
+    def get_cypher_collect_incoming_links(cls) -> str:
+        """
+        Tạo Cypher query lấy cross-file relationships từ files khác trỏ vào các files.
+
+        Target được định danh bằng (label, file_path, name) vì id của node
+        thay đổi khi file được build lại.
+
+        Returns:
+            str: Cypher query nhận parameter $paths
+        """
+        rel_types = '|'.join(rel.value for rel in cls.CROSS_FILE_RELATIONSHIPS)
+        return f"""
+        MATCH (source)-[r:{rel_types}]->(target)
+        WHERE target.file_path IN $paths AND NOT source.file_path IN $paths
+        RETURN source.id AS source_id, labels(source)[0] AS source_label,
+               type(r) AS rel_type, labels(target)[0] AS target_label,
+               target.file_path AS target_file_path, target.name AS target_name,
+               properties(r) AS properties
+        """
+
+    @classmethod
+    def get_cypher_restore_links(cls, relationship_type: RelationshipType,
+                                 source_type: Optional[NodeType] = None,
+                                 target_type: Optional[NodeType] = None) -> str:
+        """
+        Tạo Cypher query UNWIND nối lại relationships vào nodes đã build lại.
+
+        Args:
+            relationship_type: Loại relationship
+            source_type: Label của source nodes (optional)
+            target_type: Label của target nodes (optional)
+
+        Returns:
+            str: Cypher query nhận parameter $rows
+        """
+        source_label = cls._label_fragment(source_type)
+        target_label = cls._label_fragment(target_type)
+        return f"""
+        UNWIND $rows AS row
+        MATCH (source{source_label} {{id: row.source_id}})
+        MATCH (target{target_label} {{file_path: row.target_file_path, name: row.target_name}})
+        MERGE (source)-[r:{relationship_type.value}]->(target)
+        SET r += row.properties
+        """
+
+    # === In-degree index ===
+
+    # Relationship types có in-degree được lưu trên target nodes (theo label)
+    IN_DEGREE_INDEX = {
+        RelationshipType.CALLS: [NodeType.FUNCTION],
+        RelationshipType.KOTLIN_USES_TYPE: [NodeType.KOTLIN_OBJECT]
+    }
+
+    # Số DartImport (File-[:IMPORTS]->) tham chiếu DartExport theo path (xem dart_import_ref_names)
+    DART_EXPORT_IMPORT_REFS = 'import_refs'
+
+    # Điều kiện DartImport imp tham chiếu DartExport exp, tương đương
+    # exp.name IN dart_import_ref_names(imp.imported_name)
+    DART_IMPORT_REFERENCES_EXPORT = (
+        "(imp.imported_name = exp.name OR imp.imported_name = 'package:' + exp.name "
+        "OR imp.imported_name ENDS WITH '/' + exp.name)"
+    )
+
+    @staticmethod
+    def in_degree_property(relationship_type: RelationshipType) -> str:
+        """Tên property lưu in-degree, ví dụ CALLS -> in_degree_calls."""
+        return f"in_degree_{relationship_type.value.lower()}"
+
+    @staticmethod
+    def dart_import_ref_names(imported_name: Optional[str]) -> List[str]:
+        """
+        Các tên DartExport mà một import tham chiếu: mọi path suffix của
+        imported_name theo '/' (và bản bỏ prefix ``package:``).
+
+        Ví dụ ``package:app/src/w.dart`` -> ``package:app/src/w.dart``,
+        ``app/src/w.dart``, ``src/w.dart``, ``w.dart``.
+        """
+        if not imported_name:
+            return []
+        parts = imported_name.split('/')
+        names = ['/'.join(parts[i:]) for i in range(len(parts))]
+        if imported_name.startswith('package:'):
+            names.append(imported_name[len('package:'):])
+        return names
+
+    @classmethod
+    def get_cypher_refresh_in_degree_index(cls, scoped: bool = False) -> List[str]:
+        """
+        Tạo Cypher queries tính lại in-degree index sau khi ghi CKG.
+
+        Mỗi query duyệt một label một lần và ghi số relationships đi vào
+        thành property, để các báo cáo unused elements chỉ cần lọc
+        ``n.in_degree_<type> = 0`` thay vì NOT EXISTS subquery cho từng node.
+
+        DartExport import_refs được tính bằng cách tách mỗi imported_name
+        thành path suffixes rồi MATCH theo ``exp.name`` (có index), thay vì
+        so CONTAINS giữa mọi export và mọi import.
+
+        Args:
+            scoped: Chỉ tính lại nodes bị ảnh hưởng bởi incremental update;
+                queries nhận parameters $paths (files đã build lại), $ids
+                (targets của relationships đã xóa) và $ref_names (tên exports
+                mà các DartImports cũ/mới của các files tham chiếu)
+
+        Returns:
+            List[str]: Cypher queries
+        """
+        queries = []
+        scope_filter = "WHERE n.file_path IN $paths OR n.id IN $ids" if scoped else ""
+        for relationship_type, node_types in cls.IN_DEGREE_INDEX.items():
+            prop = cls.in_degree_property(relationship_type)
+            for node_type in node_types:
+                queries.append(f"""
+                MATCH (n:{node_type.value})
+                {scope_filter}
+                OPTIONAL MATCH (n)<-[r:{relationship_type.value}]-()
+                WITH n, count(r) AS in_degree
+                SET n.{prop} = in_degree
+                """)
+
+        if scoped:
+            queries.append(f"""
+            MATCH (exp:DartExport)
+            WHERE exp.file_path IN $paths OR exp.name IN $ref_names
+            OPTIONAL MATCH (:File)-[:IMPORTS]->(imp:DartImport)
+            WHERE {cls.DART_IMPORT_REFERENCES_EXPORT}
+            WITH exp, count(DISTINCT imp) AS refs
+            SET exp.{cls.DART_EXPORT_IMPORT_REFS} = refs
+            """)
+        else:
+            queries.append(f"""
+            MATCH (exp:DartExport)
+            SET exp.{cls.DART_EXPORT_IMPORT_REFS} = 0
+            WITH count(exp) AS reset
+            MATCH (:File)-[:IMPORTS]->(imp:DartImport)
+            WHERE imp.imported_name IS NOT NULL
+            WITH DISTINCT imp, split(imp.imported_name, '/') AS parts
+            UNWIND range(0, size(parts) - 1) AS i
+            WITH imp, i, reduce(path = parts[i], part IN parts[i + 1..] | path + '/' + part) AS ref_name
+            UNWIND CASE WHEN i = 0 AND ref_name STARTS WITH 'package:'
+                        THEN [ref_name, substring(ref_name, 8)] ELSE [ref_name] END AS name
+            MATCH (exp:DartExport {{name: name}})
+            WITH exp, count(DISTINCT imp) AS refs
+            SET exp.{cls.DART_EXPORT_IMPORT_REFS} = refs
+            """)
+        return queries
+
+    @classmethod
+    def get_cypher_collect_in_degree_scope(cls) -> List[str]:
+        """
+        Tạo Cypher queries lấy phạm vi refresh in-degree trước khi xóa các files.
+
+        Query đầu trả về ``id`` của targets (ở files khác) có in-degree sẽ
+        giảm khi relationships từ các files bị xóa; query sau trả về
+        ``imported_name`` của các DartImports trong các files.
+
+        Returns:
+            List[str]: Cypher queries nhận parameter $paths
+        """
+        rel_types = '|'.join(rel.value for rel in cls.IN_DEGREE_INDEX)
+        return [
+            f"""
+            MATCH (source)-[:{rel_types}]->(target)
+            WHERE source.file_path IN $paths AND NOT target.file_path IN $paths
+            RETURN DISTINCT target.id AS id
+            """,
+            """
+            MATCH (imp:DartImport) WHERE imp.file_path IN $paths
+            RETURN imp.imported_name AS imported_name
+            """
+        ]
+
     @classmethod
     def get_cypher_find_node(cls, node_type: NodeType, **filters) -> str:
         """
@@ -8,12 +8,21 @@ Hiện tại hỗ trợ Python sử dụng module ast built-in.
 
 import ast
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
 from ..data_acquisition import ProjectDataContext, ProjectLanguageProfile
+from .python_parser import extract_python_parse_info, PYTHON_PARSER_VERSION
+from .parse_cache import ParseCache, ParseCacheEntry
+
+
+# Reason: cấu trúc ast thay đổi giữa các Python versions nên version interpreter
+# cũng là một phần của cache key
+_PYTHON_CACHE_VERSION = f"{PYTHON_PARSER_VERSION}-py{sys.version_info.major}.{sys.version_info.minor}"
 
 
 @dataclass
@@ -42,6 +51,100 @@ class ParseResult:
     parsing_stats: Dict[str, Any]
 
 
+def _count_file_lines(file_path: str) -> int:
+    """Đếm số dòng trong file khi không thể parse."""
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return len(f.readlines())
+    except Exception:
+        return 0
+
+
+def parse_python_file(file_path: str, relative_path: str, summarize: bool = False) -> ParsedFile:
+    """
+    Parse một Python file sử dụng ast module.
+    
+    Hàm ở mức module để có thể chạy trong ProcessPoolExecutor worker.
+    
+    Args:
+        file_path: Đường dẫn đầy đủ đến file
+        relative_path: Đường dẫn relative
+        summarize: Nếu True, ast_tree là PythonParseInfo (picklable, nhỏ gọn)
+            thay vì AST đầy đủ
+        
+    Returns:
+        ParsedFile: Thông tin file đã parse
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Parse AST
+        tree = ast.parse(content, filename=file_path)
+        lines_count = len(content.splitlines())
+        
+        if summarize:
+            # Reason: AST không gửi qua process boundary; summary đếm nodes
+            # trong cùng một lần duyệt cây
+            parse_info = extract_python_parse_info(tree)
+            ast_tree = parse_info
+            nodes_count = parse_info.nodes_count
+        else:
+            ast_tree = tree
+            nodes_count = sum(1 for _ in ast.walk(tree))
+        
+        return ParsedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            language='Python',
+            ast_tree=ast_tree,
+            parse_success=True,
+            nodes_count=nodes_count,
+            lines_count=lines_count
+        )
+        
+    except SyntaxError as e:
+        logger.warning(f"Syntax error trong file {relative_path}: {str(e)}")
+        return ParsedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            language='Python',
+            ast_tree=None,
+            parse_success=False,
+            error_message=f"Syntax error: {str(e)}",
+            lines_count=_count_file_lines(file_path)
+        )
+        
+    except UnicodeDecodeError as e:
+        logger.warning(f"Encoding error trong file {relative_path}: {str(e)}")
+        return ParsedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            language='Python',
+            ast_tree=None,
+            parse_success=False,
+            error_message=f"Encoding error: {str(e)}",
+            lines_count=0
+        )
+        
+    except Exception as e:
+        logger.error(f"Unexpected error parsing file {relative_path}: {str(e)}")
+        return ParsedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            language='Python',
+            ast_tree=None,
+            parse_success=False,
+            error_message=f"Parse error: {str(e)}",
+            lines_count=_count_file_lines(file_path)
+        )
+
+
+def _parse_python_file_summary(file_path: str, relative_path: str) -> ParsedFile:
+    """Worker function cho process pool: parse và trả về summary."""
+    return parse_python_file(file_path, relative_path, summarize=True)
+
+
 class CodeParserCoordinatorAgent:
     """
     Agent điều phối phân tích cú pháp cho các ngôn ngữ lập trình khác nhau.
@@ -53,14 +156,28 @@ class CodeParserCoordinatorAgent:
     - Xử lý lỗi parse và báo cáo trạng thái
     """
     
-    def __init__(self, max_file_size_mb: float = 5.0):
+    # Extension -> ngôn ngữ, dùng khi parse một tập files cụ thể
+    LANGUAGE_EXTENSIONS = {
+        '.py': 'Python',
+        '.java': 'Java',
+        '.dart': 'Dart',
+    }
+    
+    def __init__(self, max_file_size_mb: float = 5.0, parallel_workers: int = 1,
+                 parse_cache: Optional[ParseCache] = None):
         """
         Khởi tạo CodeParserCoordinatorAgent.
         
         Args:
             max_file_size_mb: Kích thước file tối đa để parse (MB)
+            parallel_workers: Số process parse Python song song.
+                1 = tuần tự (giữ AST đầy đủ), <= 0 = dùng os.cpu_count()
+            parse_cache: Cache trên đĩa theo content hash. Khi bật, Python files
+                được trả về dưới dạng PythonParseInfo và file không đổi bỏ qua parse
         """
         self.max_file_size_bytes = int(max_file_size_mb * 1024 * 1024)
+        self.parallel_workers = parallel_workers if parallel_workers > 0 else (os.cpu_count() or 1)
+        self.parse_cache = parse_cache
         self.supported_languages = {
             'Python': self._parse_python_files,
             'Java': self._parse_java_files,
@@ -70,7 +187,7 @@ class CodeParserCoordinatorAgent:
         # Initialize Java parser
         try:
             from .java_parser import JavaParserAgent
-            self.java_parser = JavaParserAgent()
+            self.java_parser = JavaParserAgent(worker_count=self.parallel_workers)
             logger.info("Java parser initialized successfully")
         except Exception as e:
             logger.warning(f"Java parser initialization failed: {e}")
@@ -219,6 +336,73 @@ class CodeParserCoordinatorAgent:
             parsing_stats=parsing_stats
         )
     
+    def parse_files(self, project_path: str, relative_paths: List[str]) -> ParseResult:
+        """
+        Parse một tập files cụ thể của project (dùng cho cập nhật CKG incremental).
+        
+        Files được chọn parser theo extension; files không được hỗ trợ, không
+        tồn tại hoặc quá lớn bị bỏ qua.
+        
+        Args:
+            project_path: Đường dẫn đến project
+            relative_paths: Danh sách đường dẫn relative cần parse
+            
+        Returns:
+            ParseResult: Kết quả parse các files
+        """
+        files_by_language: Dict[str, List[Tuple[str, str]]] = {}
+        for relative_path in relative_paths:
+            language = self.LANGUAGE_EXTENSIONS.get(os.path.splitext(relative_path)[1].lower())
+            file_path = os.path.join(project_path, relative_path)
+            if (language in self.supported_languages and os.path.isfile(file_path) and
+                    os.path.getsize(file_path) <= self.max_file_size_bytes):
+                files_by_language.setdefault(language, []).append((file_path, relative_path))
+        
+        parsed_files = []
+        for language, files in files_by_language.items():
+            parsed_files.extend(self.supported_languages[language](files))
+        
+        from ..data_acquisition import LanguageInfo
+        languages = [
+            LanguageInfo(
+                name=language,
+                percentage=100.0 * len(files) / len(parsed_files) if parsed_files else 0.0,
+                file_count=len(files),
+                total_lines=sum(f.lines_count for f in parsed_files if f.language == language)
+            )
+            for language, files in files_by_language.items()
+        ]
+        primary_language = max(files_by_language, key=lambda lang: len(files_by_language[lang]),
+                               default='Python')
+        
+        language_profile = ProjectLanguageProfile(
+            primary_language=primary_language,
+            languages=languages,
+            frameworks=[],
+            build_tools=[],
+            package_managers=[],
+            project_type="library",
+            confidence_score=0.9
+        )
+        
+        successful_files = sum(1 for f in parsed_files if f.parse_success)
+        
+        return ParseResult(
+            project_path=project_path,
+            language_profile=language_profile,
+            parsed_files=parsed_files,
+            total_files=len(parsed_files),
+            successful_files=successful_files,
+            failed_files=len(parsed_files) - successful_files,
+            parse_errors=[f.error_message for f in parsed_files if f.error_message],
+            parsing_stats={
+                'primary_language': primary_language,
+                'total_nodes': sum(f.nodes_count for f in parsed_files if f.parse_success),
+                'total_lines': sum(f.lines_count for f in parsed_files),
+                'requested_files': len(relative_paths)
+            }
+        )
+    
     def _get_files_to_parse(self, project_context: ProjectDataContext) -> List[Tuple[str, str]]:
         """
         Lấy danh sách file cần parse từ ProjectDataContext.
@@ -246,20 +430,127 @@ class CodeParserCoordinatorAgent:
         """
         Parse danh sách Python files.
         
+        Khi có parse_cache, files có content hash đã cache được lấy trực tiếp
+        từ cache và chỉ các files còn lại được parse. Khi parallel_workers > 1,
+        files được chia shard cho ProcessPoolExecutor; mỗi worker trả về
+        PythonParseInfo thay cho AST.
+        
+        Args:
+            files: Danh sách (file_path, relative_path)
+            
+        Returns:
+            List[ParsedFile]: Danh sách file đã parse (cùng thứ tự với files)
+        """
+        if not self.parse_cache:
+            return self._parse_python_files_uncached(files)
+        
+        results: List[Optional[ParsedFile]] = [None] * len(files)
+        pending_indices = []
+        pending_keys = []
+        
+        for index, (file_path, relative_path) in enumerate(files):
+            key = self._get_cache_key(file_path)
+            entry = self.parse_cache.get(key) if key else None
+            if entry:
+                results[index] = ParsedFile(
+                    file_path=file_path,
+                    relative_path=relative_path,
+                    language='Python',
+                    ast_tree=entry.parse_info,
+                    parse_success=True,
+                    nodes_count=entry.nodes_count,
+                    lines_count=entry.lines_count
+                )
+            else:
+                pending_indices.append(index)
+                pending_keys.append(key)
+        
+        logger.info(f"Parse cache: {len(files) - len(pending_indices)}/{len(files)} Python files không đổi")
+        
+        parsed_pending = self._parse_python_files_uncached(
+            [files[index] for index in pending_indices], summarize=True
+        )
+        
+        for index, key, parsed_file in zip(pending_indices, pending_keys, parsed_pending):
+            results[index] = parsed_file
+            if key and parsed_file.parse_success:
+                self.parse_cache.put(key, ParseCacheEntry(
+                    parse_info=parsed_file.ast_tree,
+                    nodes_count=parsed_file.nodes_count,
+                    lines_count=parsed_file.lines_count
+                ))
+        
+        return results
+    
+    def _parse_python_files_uncached(self, files: List[Tuple[str, str]],
+                                     summarize: bool = False) -> List[ParsedFile]:
+        """
+        Parse Python files, song song nếu được cấu hình.
+        
         Args:
             files: Danh sách (file_path, relative_path)
+            summarize: Trả về PythonParseInfo thay cho AST ở chế độ tuần tự
             
         Returns:
             List[ParsedFile]: Danh sách file đã parse
         """
+        if self.parallel_workers > 1 and len(files) > 1:
+            try:
+                return self._parse_python_files_parallel(files)
+            except Exception as e:
+                logger.warning(f"Parse song song thất bại, chuyển sang tuần tự: {str(e)}")
+        
         parsed_files = []
         
         for file_path, relative_path in files:
-            parsed_file = self._parse_python_file(file_path, relative_path)
+            if summarize:
+                parsed_file = parse_python_file(file_path, relative_path, summarize=True)
+            else:
+                parsed_file = self._parse_python_file(file_path, relative_path)
             parsed_files.append(parsed_file)
         
         return parsed_files
     
+    def _get_cache_key(self, file_path: str) -> Optional[str]:
+        """
+        Tạo parse cache key cho một Python file.
+        
+        Args:
+            file_path: Đường dẫn file
+            
+        Returns:
+            Optional[str]: Cache key, None nếu không đọc được file
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        return ParseCache.make_key(content, 'Python', _PYTHON_CACHE_VERSION)
+    
+    def _parse_python_files_parallel(self, files: List[Tuple[str, str]]) -> List[ParsedFile]:
+        """
+        Parse Python files trong process pool.
+        
+        Args:
+            files: Danh sách (file_path, relative_path)
+            
+        Returns:
+            List[ParsedFile]: Danh sách file đã parse với ast_tree là PythonParseInfo
+        """
+        workers = min(self.parallel_workers, len(files))
+        # Reason: nhiều shard hơn số workers để cân bằng tải giữa files lớn/nhỏ
+        chunksize = max(1, len(files) // (workers * 4))
+        file_paths = [file_path for file_path, _ in files]
+        relative_paths = [relative_path for _, relative_path in files]
+        
+        logger.info(f"Parse {len(files)} Python files với {workers} processes (chunksize={chunksize})")
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                _parse_python_file_summary, file_paths, relative_paths, chunksize=chunksize
+            ))
+    
     def _parse_python_file(self, file_path: str, relative_path: str) -> ParsedFile:
         """
         Parse một Python file sử dụng ast module.
@@ -271,62 +562,7 @@ class CodeParserCoordinatorAgent:
         Returns:
             ParsedFile: Thông tin file đã parse
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse AST
-            tree = ast.parse(content, filename=file_path)
-            
-            # Đếm nodes
-            nodes_count = self._count_ast_nodes(tree)
-            lines_count = len(content.splitlines())
-            
-            return ParsedFile(
-                file_path=file_path,
-                relative_path=relative_path,
-                language='Python',
-                ast_tree=tree,
-                parse_success=True,
-                nodes_count=nodes_count,
-                lines_count=lines_count
-            )
-            
-        except SyntaxError as e:
-            logger.warning(f"Syntax error trong file {relative_path}: {str(e)}")
-            return ParsedFile(
-                file_path=file_path,
-                relative_path=relative_path,
-                language='Python',
-                ast_tree=None,
-                parse_success=False,
-                error_message=f"Syntax error: {str(e)}",
-                lines_count=self._count_file_lines(file_path)
-            )
-            
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error trong file {relative_path}: {str(e)}")
-            return ParsedFile(
-                file_path=file_path,
-                relative_path=relative_path,
-                language='Python',
-                ast_tree=None,
-                parse_success=False,
-                error_message=f"Encoding error: {str(e)}",
-                lines_count=0
-            )
-            
-        except Exception as e:
-            logger.error(f"Unexpected error parsing file {relative_path}: {str(e)}")
-            return ParsedFile(
-                file_path=file_path,
-                relative_path=relative_path,
-                language='Python',
-                ast_tree=None,
-                parse_success=False,
-                error_message=f"Parse error: {str(e)}",
-                lines_count=self._count_file_lines(file_path)
-            )
+        return parse_python_file(file_path, relative_path)
     
     def _count_ast_nodes(self, tree: ast.AST) -> int:
         """
@@ -353,11 +589,7 @@ class CodeParserCoordinatorAgent:
         Returns:
             int: Số dòng
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return len(f.readlines())
-        except Exception:
-            return 0
+        return _count_file_lines(file_path)
     
     def get_parsing_statistics(self, parse_result: ParseResult) -> Dict[str, Any]:
         """
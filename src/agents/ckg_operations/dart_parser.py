@@ -85,13 +85,23 @@ class DartParseInfo:
 
 
 class DartParserAgent:
-    """Agent để parse Dart code sử dụng Dart analyzer command line tool."""
+    """
+    Agent để parse Dart code sử dụng Dart analyzer command line tool.
+
+    Khi parse nhiều files, `dart analyze --format=json` chỉ chạy một lần cho
+    mỗi package root (thư mục chứa pubspec.yaml) và diagnostics được chia lại
+    theo từng file.
+    """
+
+    # Timeout cho một lần analyze cả package
+    PACKAGE_ANALYZE_TIMEOUT = 600
 
     def __init__(self):
         """Initialize DartParserAgent."""
         self.dart_command = self._find_dart_command()
         if not self.dart_command:
             logger.warning("Dart command not found in system PATH")
+        self._dartdoc_json_available: Optional[bool] = None
 
     def _find_dart_command(self) -> Optional[str]:
         """Find dart command in system PATH."""
@@ -122,8 +132,16 @@ class DartParserAgent:
         
         return file_path.lower().endswith('.dart')
 
-    def parse_file(self, file_path: str) -> Optional[DartParseInfo]:
-        """Parse single Dart file."""
+    def parse_file(self, file_path: str,
+                   analysis_issues: Optional[List[Dict[str, Any]]] = None) -> Optional[DartParseInfo]:
+        """
+        Parse single Dart file.
+
+        Args:
+            file_path: Path to Dart file
+            analysis_issues: Diagnostics đã có từ lần analyze cả package.
+                Nếu None, dart analyze được chạy riêng cho file này.
+        """
         if not self.can_parse(file_path):
             logger.warning(f"Cannot parse file: {file_path}")
             return None
@@ -132,10 +150,13 @@ class DartParserAgent:
             # Create parse info object
             parse_info = DartParseInfo(file_path=file_path)
             
-            # Run dart analyze to get analysis information
-            analysis_result = self._run_dart_analyze(file_path)
-            if analysis_result:
-                parse_info.analysis_issues = analysis_result.get('diagnostics', [])
+            if analysis_issues is not None:
+                parse_info.analysis_issues = analysis_issues
+            else:
+                # Run dart analyze to get analysis information
+                analysis_result = self._run_dart_analyze(file_path)
+                if analysis_result:
+                    parse_info.analysis_issues = analysis_result.get('diagnostics', [])
             
             # Extract basic structure information from file content
             self._extract_file_structure(file_path, parse_info)
@@ -150,15 +171,100 @@ class DartParserAgent:
             logger.error(f"Error parsing Dart file {file_path}: {e}")
             return None
 
-    def parse_files(self, file_paths: List[str]) -> List[DartParseInfo]:
-        """Parse multiple Dart files."""
+    def parse_files(self, file_paths: List[str], project_root: Optional[str] = None) -> List[DartParseInfo]:
+        """Parse multiple Dart files (project_root giới hạn việc tìm pubspec.yaml)."""
+        issues_by_file = self.analyze_files(file_paths, project_root)
+        
         results = []
         for file_path in file_paths:
-            parse_info = self.parse_file(file_path)
+            parse_info = self.parse_file(file_path, issues_by_file.get(file_path, []))
             if parse_info:
                 results.append(parse_info)
         return results
 
+    def analyze_files(self, file_paths: List[str],
+                      project_root: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Chạy dart analyze một lần cho mỗi package root và chia diagnostics theo file.
+
+        Files không thuộc package nào (không có pubspec.yaml) được nhóm theo thư mục.
+        Roots nằm trong root khác được gộp vào root ngoài, nên mỗi file chỉ được
+        analyze (và nhận diagnostics) một lần.
+
+        Args:
+            file_paths: Danh sách Dart files
+            project_root: Thư mục dừng tìm pubspec.yaml (mặc định thư mục chung của các files)
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: file_path -> diagnostics của file đó
+        """
+        issues_by_file: Dict[str, List[Dict[str, Any]]] = {path: [] for path in file_paths}
+        if not self.dart_command:
+            return issues_by_file
+        
+        lookup = {os.path.realpath(path): path for path in file_paths}
+        roots = self._group_files_by_package_root(file_paths, project_root)
+        logger.info(f"Running dart analyze on {len(roots)} package roots for {len(file_paths)} files")
+        
+        for root in roots:
+            analysis_result = self._run_dart_analyze(root, timeout=self.PACKAGE_ANALYZE_TIMEOUT)
+            for diagnostic in (analysis_result or {}).get('diagnostics', []):
+                diagnostic_file = diagnostic.get('location', {}).get('file')
+                target = lookup.get(os.path.realpath(diagnostic_file)) if diagnostic_file else None
+                if target:
+                    issues_by_file[target].append(diagnostic)
+        
+        return issues_by_file
+
+    def _group_files_by_package_root(self, file_paths: List[str],
+                                     project_root: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Nhóm files theo package root gần nhất (thư mục chứa pubspec.yaml).
+
+        Việc tìm pubspec.yaml dừng ở project_root. Root nằm trong một root
+        khác (package lồng nhau, hoặc thư mục của file ngoài package) được gộp
+        vào root ngoài cùng, vì dart analyze trên root ngoài đã bao gồm nó.
+
+        Args:
+            file_paths: Danh sách Dart files
+            project_root: Thư mục dừng tìm (mặc định thư mục chung của các files)
+
+        Returns:
+            Dict[str, List[str]]: package root -> files
+        """
+        if not file_paths:
+            return {}
+        
+        directories = {file_path: Path(file_path).resolve().parent for file_path in file_paths}
+        boundary = (Path(project_root).resolve() if project_root
+                    else Path(os.path.commonpath([str(d) for d in directories.values()])))
+        
+        groups: Dict[str, List[str]] = {}
+        root_cache: Dict[Path, str] = {}
+        
+        for file_path in file_paths:
+            directory = directories[file_path]
+            if directory not in root_cache:
+                root = str(directory)
+                current = directory
+                while True:
+                    if (current / "pubspec.yaml").exists():
+                        root = str(current)
+                        break
+                    if current == boundary or current == current.parent:
+                        break
+                    current = current.parent
+                root_cache[directory] = root
+            groups.setdefault(root_cache[directory], []).append(file_path)
+        
+        # Gộp roots lồng nhau vào root ngoài (roots ngắn hơn được xét trước)
+        merged: Dict[str, List[str]] = {}
+        for root in sorted(groups, key=lambda r: len(Path(r).parts)):
+            outer = next((kept for kept in merged if Path(root).is_relative_to(kept)), None)
+            merged.setdefault(outer or root, []).extend(groups[root])
+        
+        return merged
+
     def parse_directory(self, directory_path: str) -> List[DartParseInfo]:
         """Parse all Dart files in directory recursively."""
         dart_files = []
@@ -168,7 +274,7 @@ class DartParserAgent:
             dart_files = list(directory.rglob("*.dart"))
         
         file_paths = [str(f) for f in dart_files]
-        return self.parse_files(file_paths)
+        return self.parse_files(file_paths, project_root=directory_path)
 
     def parse_dart_files(self, files: List[Tuple[str, str]]) -> List:
         """
@@ -183,11 +289,12 @@ class DartParserAgent:
         from . import ParsedFile  # Import here to avoid circular imports
         
         parsed_files = []
+        issues_by_file = self.analyze_files([file_path for file_path, _ in files])
         
         for file_path, relative_path in files:
             try:
                 # Parse the Dart file
-                parse_info = self.parse_file(file_path)
+                parse_info = self.parse_file(file_path, issues_by_file.get(file_path, []))
                 
                 if parse_info:
                     # Count lines
@@ -235,8 +342,8 @@ class DartParserAgent:
         
         return parsed_files
 
-    def _run_dart_analyze(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Run dart analyze command on file and return JSON results."""
+    def _run_dart_analyze(self, file_path: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        """Run dart analyze command on file or package directory and return JSON results."""
         if not self.dart_command:
             return None
             
@@ -246,7 +353,7 @@ class DartParserAgent:
                 [self.dart_command, "analyze", "--format=json", file_path],
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=timeout
             )
             
             # Parse JSON output
@@ -346,15 +453,7 @@ class DartParserAgent:
     def _extract_detailed_ast(self, file_path: str, parse_info: DartParseInfo):
         """Try to extract detailed AST using dartdoc_json if available."""
         try:
-            # Check if dartdoc_json is available
-            result = subprocess.run(
-                ["dart", "pub", "global", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if "dartdoc_json" in result.stdout:
+            if self._is_dartdoc_json_available():
                 # Run dartdoc_json to extract detailed AST
                 with tempfile.TemporaryDirectory() as temp_dir:
                     output_file = os.path.join(temp_dir, "ast_output.json")
@@ -379,6 +478,21 @@ class DartParserAgent:
         except Exception as e:
             logger.debug(f"Could not extract detailed AST for {file_path}: {e}")
 
+    def _is_dartdoc_json_available(self) -> bool:
+        """Check (once per agent) if dartdoc_json is installed."""
+        if self._dartdoc_json_available is None:
+            try:
+                result = subprocess.run(
+                    ["dart", "pub", "global", "list"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                self._dartdoc_json_available = "dartdoc_json" in result.stdout
+            except Exception:
+                self._dartdoc_json_available = False
+        return self._dartdoc_json_available
+
     def _process_ast_data(self, ast_data: List[Dict[str, Any]]) -> Optional[DartNode]:
         """Process AST data from dartdoc_json and create DartNode structure."""
         if not ast_data:
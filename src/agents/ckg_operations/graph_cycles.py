@@ -0,0 +1,254 @@
+"""
+Graph Cycles for CKG Operations Team.
+
+Cycle detection over an in-memory dependency graph (``node -> successors``).
+Strongly connected components are found with an iterative Tarjan walk in
+O(V + E), so deep import chains never hit Python's recursion limit and each
+cyclic component is reported exactly once. Representative and minimal
+cycles are recovered per component with breadth-first searches restricted
+to the component.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set
+
+
+Graph = Mapping[Hashable, Iterable[Hashable]]
+
+
+@dataclass
+class DependencyCycle:
+    """A cyclic strongly connected component and cycles found inside it."""
+    component: List[Hashable]
+    cycles: List[List[Hashable]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        """Number of nodes in the component."""
+        return len(self.component)
+
+
+def _sorted_nodes(nodes: Iterable[Hashable]) -> List[Hashable]:
+    """Sort nodes for deterministic output, falling back to string order."""
+    nodes = list(nodes)
+    try:
+        return sorted(nodes)
+    except TypeError:
+        return sorted(nodes, key=str)
+
+
+def strongly_connected_components(graph: Graph) -> List[List[Hashable]]:
+    """
+    Compute all strongly connected components with an iterative Tarjan walk.
+
+    Nodes that only appear as successors are included. Components are
+    returned in reverse topological order (a component is emitted before
+    every component that depends on it).
+
+    Args:
+        graph: Adjacency mapping node -> iterable of successors
+
+    Returns:
+        List[List[Hashable]]: Components, including single-node ones
+    """
+    adjacency: Dict[Hashable, List[Hashable]] = {}
+    for node, successors in graph.items():
+        adjacency.setdefault(node, []).extend(successors)
+    for successors in list(adjacency.values()):
+        for successor in successors:
+            adjacency.setdefault(successor, [])
+
+    index: Dict[Hashable, int] = {}
+    lowlink: Dict[Hashable, int] = {}
+    on_stack: Set[Hashable] = set()
+    stack: List[Hashable] = []
+    components: List[List[Hashable]] = []
+
+    for root in adjacency:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency[root]))]
+
+        while work:
+            node, successors = work[-1]
+            descended = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency[successor])))
+                    descended = True
+                    break
+                if successor in on_stack and index[successor] < lowlink[node]:
+                    lowlink[node] = index[successor]
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def find_cyclic_components(graph: Graph) -> List[List[Hashable]]:
+    """
+    Return the components that contain at least one cycle.
+
+    A component is cyclic if it has more than one node or a self-loop.
+    Members are sorted and components are ordered by their first member.
+
+    Args:
+        graph: Adjacency mapping node -> iterable of successors
+
+    Returns:
+        List[List[Hashable]]: Sorted members of each cyclic component
+    """
+    cyclic = []
+    for component in strongly_connected_components(graph):
+        if len(component) > 1 or component[0] in set(graph.get(component[0], ())):
+            cyclic.append(_sorted_nodes(component))
+    try:
+        cyclic.sort()
+    except TypeError:
+        cyclic.sort(key=lambda component: [str(node) for node in component])
+    return cyclic
+
+
+def shortest_cycle_through(graph: Graph, start: Hashable,
+                           members: Optional[Set[Hashable]] = None) -> List[Hashable]:
+    """
+    Find a shortest cycle through ``start`` with a breadth-first search.
+
+    Args:
+        graph: Adjacency mapping node -> iterable of successors
+        start: Node the cycle must pass through
+        members: Restrict the search to these nodes (e.g. its component)
+
+    Returns:
+        List[Hashable]: Cycle nodes starting at ``start`` without repeating
+            it at the end, or an empty list if there is no cycle
+    """
+    parents: Dict[Hashable, Optional[Hashable]] = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for successor in graph.get(node, ()):
+            if successor == start:
+                cycle = [node]
+                while parents[cycle[-1]] is not None:
+                    cycle.append(parents[cycle[-1]])
+                cycle.reverse()
+                return cycle
+            if successor not in parents and (members is None or successor in members):
+                parents[successor] = node
+                queue.append(successor)
+    return []
+
+
+def _canonical_rotation(cycle: List[Hashable]) -> tuple:
+    """Rotate a cycle so it starts at its smallest node."""
+    start = cycle.index(_sorted_nodes(cycle)[0])
+    return tuple(cycle[start:] + cycle[:start])
+
+
+def find_minimal_cycles(graph: Graph, component: Iterable[Hashable],
+                        max_cycles: Optional[int] = None) -> List[List[Hashable]]:
+    """
+    List the shortest cycle through every node of a component.
+
+    Each cycle is reported once regardless of the node it was found from,
+    rotated to start at its smallest node, and the result is ordered by
+    length. Costs one BFS over the component per member.
+
+    Args:
+        graph: Adjacency mapping node -> iterable of successors
+        component: Members of one strongly connected component
+        max_cycles: Stop after this many distinct cycles
+
+    Returns:
+        List[List[Hashable]]: Distinct minimal cycles
+    """
+    members = set(component)
+    seen = set()
+    cycles = []
+    for node in _sorted_nodes(members):
+        if max_cycles is not None and len(cycles) >= max_cycles:
+            break
+        cycle = shortest_cycle_through(graph, node, members)
+        if not cycle:
+            continue
+        key = _canonical_rotation(cycle)
+        if key not in seen:
+            seen.add(key)
+            cycles.append(list(key))
+    cycles.sort(key=len)
+    return cycles
+
+
+def find_dependency_cycles(graph: Graph, minimal_cycles: bool = False,
+                           max_cycles_per_component: Optional[int] = None) -> List[DependencyCycle]:
+    """
+    Report every cyclic component of a dependency graph once.
+
+    Without ``minimal_cycles`` each component carries one representative
+    cycle (the shortest cycle through its smallest member), which keeps the
+    whole analysis O(V + E).
+
+    Args:
+        graph: Adjacency mapping node -> iterable of successors
+        minimal_cycles: Also list the shortest cycle through each member
+        max_cycles_per_component: Cap on minimal cycles per component
+
+    Returns:
+        List[DependencyCycle]: One entry per cyclic component
+    """
+    results = []
+    for component in find_cyclic_components(graph):
+        if minimal_cycles:
+            cycles = find_minimal_cycles(graph, component, max_cycles_per_component)
+        else:
+            cycle = _canonical_rotation(shortest_cycle_through(graph, component[0], set(component)))
+            cycles = [list(cycle)]
+        results.append(DependencyCycle(component=component, cycles=cycles))
+    return results
+
+
+def dependency_cycle_rows(graph: Graph, minimal_cycles: bool = False,
+                          max_cycles_per_component: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Flatten find_dependency_cycles into query-result rows.
+
+    Each row has ``cycle_path`` (first node repeated at the end, like a
+    Cypher path), ``cycle_length``, ``component`` and ``component_size``;
+    rows are ordered by cycle length.
+    """
+    rows = []
+    for dependency_cycle in find_dependency_cycles(graph, minimal_cycles, max_cycles_per_component):
+        for cycle in dependency_cycle.cycles:
+            rows.append({
+                "cycle_path": cycle + [cycle[0]],
+                "cycle_length": len(cycle),
+                "component": dependency_cycle.component,
+                "component_size": dependency_cycle.size
+            })
+    rows.sort(key=lambda row: row["cycle_length"])
+    return rows
@@ -0,0 +1,545 @@
+"""
+Graph Snapshot for CKG Operations Team.
+
+Compact in-process copy of one project's CKG for offline analytics. Nodes
+get dense integer ids, every string (node ids, labels, names, file paths)
+is interned once, and each relationship type is stored as a CSR adjacency
+(``indptr``/``indices`` arrays). Degree, unused-element and reachability
+analyses run as numpy array operations; cycles reuse the SCC engine in
+``graph_cycles``. A snapshot can be saved to a single file and loaded back
+memory-mapped, so repeated analyses do not go back to Neo4j.
+"""
+
+import json
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .graph_cycles import DependencyCycle, find_dependency_cycles
+
+
+SNAPSHOT_MAGIC = b"CKGSNAP1"
+SNAPSHOT_ALIGNMENT = 64
+
+# Node arrays stored per snapshot; -1 marks a missing string or line number
+_NODE_ARRAYS = ("node_keys", "node_labels", "node_names", "node_files", "node_lines")
+
+
+class StringTable:
+    """Interned strings addressed by integer id."""
+
+    def __init__(self, strings: Optional[Iterable[str]] = None):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for string in strings or ():
+            self.intern(string)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, string_id: int) -> Optional[str]:
+        return self.strings[string_id] if string_id >= 0 else None
+
+    def intern(self, string: Optional[str]) -> int:
+        """Return the id of a string, adding it if needed (-1 for None)."""
+        if string is None:
+            return -1
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[string] = string_id
+            self.strings.append(string)
+        return string_id
+
+    def lookup(self, string: str) -> int:
+        """Return the id of a string without adding it (-1 if unknown)."""
+        return self._ids.get(string, -1)
+
+
+@dataclass
+class CSRAdjacency:
+    """Compressed sparse row adjacency: successors of i are indices[indptr[i]:indptr[i+1]]."""
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.indices.shape[0])
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self, num_nodes: int) -> np.ndarray:
+        return np.bincount(self.indices, minlength=num_nodes)
+
+    def sources(self) -> np.ndarray:
+        """Source node of every edge, aligned with indices."""
+        return np.repeat(np.arange(self.indptr.shape[0] - 1, dtype=np.int32), self.out_degree())
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, sources: np.ndarray, targets: np.ndarray) -> 'CSRAdjacency':
+        """Build a CSR adjacency from parallel source/target arrays."""
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=num_nodes)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(indptr, np.ascontiguousarray(targets[order], dtype=np.int32))
+
+
+class _CSRMapping(Mapping):
+    """Read-only ``node -> successors`` view of a CSR adjacency for graph_cycles."""
+
+    def __init__(self, adjacency: CSRAdjacency, nodes: np.ndarray):
+        self._adjacency = adjacency
+        self._nodes = nodes
+
+    def __getitem__(self, node: int) -> List[int]:
+        if not 0 <= node < self._adjacency.indptr.shape[0] - 1:
+            raise KeyError(node)
+        start, end = self._adjacency.indptr[node], self._adjacency.indptr[node + 1]
+        return self._adjacency.indices[start:end].tolist()
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._nodes.tolist())
+
+    def __len__(self) -> int:
+        return int(self._nodes.shape[0])
+
+
+class GraphSnapshot:
+    """
+    Immutable compact CKG snapshot.
+
+    Example:
+        >>> snapshot = GraphSnapshot.from_ckg(query_agent, project_path="/repo")
+        >>> snapshot.save("/tmp/repo.ckgsnap")
+        >>> snapshot = GraphSnapshot.load("/tmp/repo.ckgsnap")
+        >>> snapshot.find_cycles(["IMPORTS"], labels=["Module"])
+    """
+
+    def __init__(self, strings: StringTable, node_arrays: Dict[str, np.ndarray],
+                 relationships: Dict[str, CSRAdjacency]):
+        """
+        Initialize a snapshot (use GraphSnapshotBuilder, from_ckg or load).
+
+        Args:
+            strings: Interned string table
+            node_arrays: Arrays named in _NODE_ARRAYS, one entry per node
+            relationships: CSR adjacency per relationship type
+        """
+        self.strings = strings
+        self.node_keys = node_arrays["node_keys"]
+        self.node_labels = node_arrays["node_labels"]
+        self.node_names = node_arrays["node_names"]
+        self.node_files = node_arrays["node_files"]
+        self.node_lines = node_arrays["node_lines"]
+        self.relationships = relationships
+        self._key_index: Optional[Dict[str, int]] = None
+
+    @property
+    def num_nodes(self) -> int:
+        return int(self.node_keys.shape[0])
+
+    @property
+    def num_edges(self) -> int:
+        return sum(adjacency.num_edges for adjacency in self.relationships.values())
+
+    @property
+    def relationship_types(self) -> List[str]:
+        return sorted(self.relationships)
+
+    # === Node lookup ===
+
+    def node_index(self, key: str) -> Optional[int]:
+        """Return the integer id of a CKG node id, or None if absent."""
+        if self._key_index is None:
+            self._key_index = {self.strings[int(string_id)]: position
+                               for position, string_id in enumerate(self.node_keys)}
+        return self._key_index.get(key)
+
+    def node_info(self, node: int) -> Dict[str, Any]:
+        """Return the stored properties of a node."""
+        line_number = int(self.node_lines[node])
+        return {
+            "id": self.strings[int(self.node_keys[node])],
+            "label": self.strings[int(self.node_labels[node])],
+            "name": self.strings[int(self.node_names[node])],
+            "file_path": self.strings[int(self.node_files[node])],
+            "line_number": line_number if line_number >= 0 else None
+        }
+
+    def display_name(self, node: int) -> str:
+        """Name of a node, falling back to its file path and then its id."""
+        for string_id in (self.node_names[node], self.node_files[node], self.node_keys[node]):
+            if string_id >= 0:
+                return self.strings[int(string_id)]
+        return str(node)
+
+    def label_mask(self, labels: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Boolean mask of nodes carrying one of the labels (all nodes if None)."""
+        if labels is None:
+            return np.ones(self.num_nodes, dtype=bool)
+        label_ids = [self.strings.lookup(label) for label in labels]
+        return np.isin(self.node_labels, [label_id for label_id in label_ids if label_id >= 0])
+
+    # === Adjacency ===
+
+    def _relationship_names(self, rel_types: Optional[Iterable[str]]) -> List[str]:
+        if rel_types is None:
+            return self.relationship_types
+        return [rel_type for rel_type in rel_types if rel_type in self.relationships]
+
+    def adjacency(self, rel_types: Optional[Iterable[str]] = None,
+                  labels: Optional[Iterable[str]] = None) -> CSRAdjacency:
+        """
+        Merge relationship types into one CSR adjacency.
+
+        Args:
+            rel_types: Relationship types to include (default: all)
+            labels: Keep only edges whose endpoints both carry one of these labels
+
+        Returns:
+            CSRAdjacency over all nodes of the snapshot
+        """
+        names = self._relationship_names(rel_types)
+        if len(names) == 1 and labels is None:
+            return self.relationships[names[0]]
+
+        sources = [self.relationships[name].sources() for name in names]
+        targets = [np.asarray(self.relationships[name].indices) for name in names]
+        sources = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int32)
+        targets = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int32)
+        if labels is not None:
+            mask = self.label_mask(labels)
+            keep = mask[sources] & mask[targets]
+            sources, targets = sources[keep], targets[keep]
+        return CSRAdjacency.from_edges(self.num_nodes, sources, targets)
+
+    def neighbors(self, node: int, rel_types: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Successors of a node over the given relationship types."""
+        parts = []
+        for name in self._relationship_names(rel_types):
+            adjacency = self.relationships[name]
+            parts.append(adjacency.indices[adjacency.indptr[node]:adjacency.indptr[node + 1]])
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int32)
+
+    # === Analyses ===
+
+    def out_degree(self, rel_types: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Fan-out of every node over the given relationship types."""
+        degree = np.zeros(self.num_nodes, dtype=np.int64)
+        for name in self._relationship_names(rel_types):
+            degree += self.relationships[name].out_degree()
+        return degree
+
+    def in_degree(self, rel_types: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Fan-in of every node over the given relationship types."""
+        degree = np.zeros(self.num_nodes, dtype=np.int64)
+        for name in self._relationship_names(rel_types):
+            degree += self.relationships[name].in_degree(self.num_nodes)
+        return degree
+
+    def fan_in_fan_out(self, rel_types: Optional[Iterable[str]] = None,
+                       labels: Optional[Iterable[str]] = None,
+                       top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fan-in and fan-out per node, highest total coupling first.
+
+        Args:
+            rel_types: Relationship types to count (default: all)
+            labels: Only report nodes with these labels
+            top: Maximum number of rows
+
+        Returns:
+            List[Dict[str, Any]]: Node properties plus fan_in and fan_out
+        """
+        fan_in = self.in_degree(rel_types)
+        fan_out = self.out_degree(rel_types)
+        nodes = np.flatnonzero(self.label_mask(labels))
+        order = np.lexsort((nodes, -fan_out[nodes], -(fan_in[nodes] + fan_out[nodes])))
+        nodes = nodes[order][:top] if top is not None else nodes[order]
+        return [dict(self.node_info(int(node)), fan_in=int(fan_in[node]), fan_out=int(fan_out[node]))
+                for node in nodes]
+
+    def find_unused_elements(self, labels: Sequence[str] = ("Function",),
+                             rel_types: Sequence[str] = ("CALLS",),
+                             public_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Elements that no relationship of the given types points at.
+
+        Args:
+            labels: Element labels to check
+            rel_types: Relationship types that count as a use
+            public_only: Skip names starting with '_'
+
+        Returns:
+            List[Dict[str, Any]]: Node properties, ordered by file path and name
+        """
+        candidates = self.label_mask(labels) & (self.in_degree(rel_types) == 0)
+        rows = []
+        for node in np.flatnonzero(candidates):
+            info = self.node_info(int(node))
+            if public_only and (info["name"] or "").startswith("_"):
+                continue
+            rows.append(info)
+        rows.sort(key=lambda row: (row["file_path"] or "", row["name"] or ""))
+        return rows
+
+    def transitive_dependencies(self, node: int, rel_types: Optional[Iterable[str]] = None,
+                                max_depth: Optional[int] = None) -> np.ndarray:
+        """
+        All nodes reachable from a node, expanding one BFS level per array step.
+
+        Args:
+            node: Start node (integer id)
+            rel_types: Relationship types to follow (default: all)
+            max_depth: Stop after this many levels
+
+        Returns:
+            np.ndarray: Sorted integer ids of reachable nodes, excluding the start
+                unless it lies on a cycle
+        """
+        adjacency = self.adjacency(rel_types)
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        frontier = np.array([node], dtype=np.int64)
+        depth = 0
+        while frontier.size and (max_depth is None or depth < max_depth):
+            starts = adjacency.indptr[frontier]
+            lengths = adjacency.indptr[frontier + 1] - starts
+            if not lengths.sum():
+                break
+            # Positions of every successor of every frontier node, without a Python loop
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            successors = adjacency.indices[offsets + np.arange(lengths.sum())]
+            successors = np.unique(successors)
+            frontier = successors[~visited[successors]]
+            visited[frontier] = True
+            depth += 1
+        return np.flatnonzero(visited)
+
+    def find_cycles(self, rel_types: Optional[Iterable[str]] = ("IMPORTS",),
+                    labels: Optional[Iterable[str]] = None, minimal_cycles: bool = False,
+                    max_cycles_per_component: Optional[int] = 10) -> List[DependencyCycle]:
+        """
+        Cyclic strongly connected components over the given relationships.
+
+        Args:
+            rel_types: Relationship types forming the dependency graph
+            labels: Restrict the graph to nodes with these labels
+            minimal_cycles: List the shortest cycle through every member
+            max_cycles_per_component: Cap on minimal cycles per component
+
+        Returns:
+            List[DependencyCycle]: Components and cycles as display names
+        """
+        adjacency = self.adjacency(rel_types, labels)
+        nodes = np.flatnonzero(adjacency.out_degree() > 0)
+        cycles = find_dependency_cycles(_CSRMapping(adjacency, nodes), minimal_cycles,
+                                        max_cycles_per_component)
+        return [DependencyCycle(component=[self.display_name(node) for node in cycle.component],
+                                cycles=[[self.display_name(node) for node in path] for path in cycle.cycles])
+                for cycle in cycles]
+
+    # === Persistence ===
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {name: getattr(self, name) for name in _NODE_ARRAYS}
+        for rel_type, adjacency in self.relationships.items():
+            arrays[f"rel:{rel_type}:indptr"] = adjacency.indptr
+            arrays[f"rel:{rel_type}:indices"] = adjacency.indices
+        return arrays
+
+    def save(self, path: str):
+        """
+        Write the snapshot to a single file that load() can memory-map.
+
+        Layout: magic, 8-byte header length, JSON header (string table and
+        array offsets), then each array's raw bytes aligned to 64 bytes.
+        """
+        arrays = self._arrays()
+        specs = {}
+        offset = 0
+        for name, values in arrays.items():
+            specs[name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+            offset += -(-values.nbytes // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+        header = json.dumps({"strings": self.strings.strings, "arrays": specs}).encode("utf-8")
+        data_start = len(SNAPSHOT_MAGIC) + 8 + len(header)
+        data_start = -(-data_start // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+        with open(path, "wb") as handle:
+            handle.write(SNAPSHOT_MAGIC)
+            handle.write(len(header).to_bytes(8, "little"))
+            handle.write(header)
+            for name, values in arrays.items():
+                handle.seek(data_start + specs[name]["offset"])
+                handle.write(np.ascontiguousarray(values).tobytes())
+            handle.truncate(data_start + offset)
+        logger.info(f"Saved graph snapshot: {self.num_nodes} nodes, {self.num_edges} edges -> {path}")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'GraphSnapshot':
+        """
+        Load a snapshot written by save().
+
+        Args:
+            path: Snapshot file
+            mmap: Memory-map the arrays read-only instead of reading them
+
+        Returns:
+            GraphSnapshot
+
+        Raises:
+            ValueError: If the file is not a graph snapshot
+        """
+        with open(path, "rb") as handle:
+            if handle.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a CKG graph snapshot: {path}")
+            header_length = int.from_bytes(handle.read(8), "little")
+            header = json.loads(handle.read(header_length).decode("utf-8"))
+        data_start = len(SNAPSHOT_MAGIC) + 8 + header_length
+        data_start = -(-data_start // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r",
+                                         offset=data_start + spec["offset"], shape=shape)
+            else:
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(path, dtype=dtype, count=count,
+                                           offset=data_start + spec["offset"]).reshape(shape)
+
+        relationships = {}
+        for name in arrays:
+            if name.startswith("rel:") and name.endswith(":indptr"):
+                rel_type = name[len("rel:"):-len(":indptr")]
+                relationships[rel_type] = CSRAdjacency(arrays[name], arrays[f"rel:{rel_type}:indices"])
+        return cls(StringTable(header["strings"]),
+                   {name: arrays[name] for name in _NODE_ARRAYS}, relationships)
+
+    # === Export from Neo4j ===
+
+    @classmethod
+    def from_ckg(cls, query_agent, project_path: Optional[str] = None,
+                 rel_types: Optional[Iterable[str]] = None,
+                 fetch_size: int = 5000) -> 'GraphSnapshot':
+        """
+        Stream the CKG of one project into a snapshot.
+
+        Uses two streamed queries (nodes, then relationships) so memory on the
+        Python side is bounded by the compact arrays, not by query results.
+
+        Args:
+            query_agent: CKGQueryInterfaceAgent with a Neo4j connection
+            project_path: Only nodes whose file_path starts with this path
+                (and relationships leaving them); None exports everything
+            rel_types: Relationship types to export (default: all)
+            fetch_size: Records per fetch from the server
+
+        Returns:
+            GraphSnapshot
+        """
+        params = {"project_path": project_path,
+                  "rel_types": list(rel_types) if rel_types is not None else None}
+        node_query = """
+        MATCH (n)
+        WHERE n.id IS NOT NULL
+          AND ($project_path IS NULL OR n.file_path STARTS WITH $project_path)
+        RETURN n.id as id, labels(n)[0] as label, n.name as name,
+               n.file_path as file_path, n.line_number as line_number
+        """
+        edge_query = """
+        MATCH (source)-[r]->(target)
+        WHERE source.id IS NOT NULL AND target.id IS NOT NULL
+          AND ($project_path IS NULL OR source.file_path STARTS WITH $project_path)
+          AND ($rel_types IS NULL OR type(r) IN $rel_types)
+        RETURN source.id as source_id, type(r) as rel_type, target.id as target_id
+        """
+
+        builder = GraphSnapshotBuilder()
+        for record in query_agent.stream_query(node_query, params, fetch_size=fetch_size):
+            builder.add_node(record.get("id"), record.get("label"), record.get("name"),
+                             record.get("file_path"), record.get("line_number"))
+        for record in query_agent.stream_query(edge_query, params, fetch_size=fetch_size):
+            builder.add_edge(record.get("source_id"), record.get("rel_type"), record.get("target_id"))
+
+        snapshot = builder.build()
+        logger.info(f"Exported graph snapshot: {snapshot.num_nodes} nodes, {snapshot.num_edges} edges"
+                    f" ({builder.dropped_edges} edges to nodes outside the snapshot dropped)")
+        return snapshot
+
+
+class GraphSnapshotBuilder:
+    """
+    Accumulates nodes and edges into compact buffers, then builds a GraphSnapshot.
+
+    Example:
+        >>> builder = GraphSnapshotBuilder()
+        >>> builder.add_node("m1", "Module", "app")
+        >>> builder.add_node("m2", "Module", "utils")
+        >>> builder.add_edge("m1", "IMPORTS", "m2")
+        >>> snapshot = builder.build()
+    """
+
+    def __init__(self):
+        self.strings = StringTable()
+        self._nodes: Dict[str, int] = {}
+        self._node_arrays = {name: array("i") for name in _NODE_ARRAYS}
+        self._edges: Dict[str, Tuple[array, array]] = {}
+        self.dropped_edges = 0
+
+    def add_node(self, key: str, label: Optional[str], name: Optional[str] = None,
+                 file_path: Optional[str] = None, line_number: Optional[int] = None) -> int:
+        """
+        Add a node (ignored if the key was already added).
+
+        Returns:
+            int: Integer id of the node
+        """
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+
+        node = len(self._nodes)
+        self._nodes[key] = node
+        self._node_arrays["node_keys"].append(self.strings.intern(key))
+        self._node_arrays["node_labels"].append(self.strings.intern(label))
+        self._node_arrays["node_names"].append(self.strings.intern(name))
+        self._node_arrays["node_files"].append(self.strings.intern(file_path))
+        self._node_arrays["node_lines"].append(int(line_number) if line_number is not None else -1)
+        return node
+
+    def add_edge(self, source_key: str, rel_type: str, target_key: str) -> bool:
+        """
+        Add a relationship between two added nodes.
+
+        Returns:
+            bool: False if an endpoint is not in the snapshot (edge dropped)
+        """
+        source, target = self._nodes.get(source_key), self._nodes.get(target_key)
+        if source is None or target is None:
+            self.dropped_edges += 1
+            return False
+
+        sources, targets = self._edges.setdefault(rel_type, (array("i"), array("i")))
+        sources.append(source)
+        targets.append(target)
+        return True
+
+    def build(self) -> GraphSnapshot:
+        """Freeze the buffers into numpy arrays and CSR adjacencies."""
+        num_nodes = len(self._nodes)
+        node_arrays = {name: np.array(values, dtype=np.int32) for name, values in self._node_arrays.items()}
+        relationships = {}
+        for rel_type, (sources, targets) in self._edges.items():
+            relationships[rel_type] = CSRAdjacency.from_edges(
+                num_nodes,
+                np.frombuffer(sources, dtype=np.int32),
+                np.frombuffer(targets, dtype=np.int32)
+            )
+        return GraphSnapshot(self.strings, node_arrays, relationships)
@@ -6,15 +6,15 @@ Converts Java code into AST representation for CKG building.
 """
 
 import os
-import json
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
 from .code_parser_coordinator import ParsedFile, ParseResult
+from .javaparser_worker import JavaParserWorkerPool, JAVAPARSER_WORKER_SOURCE
 
 
 @dataclass
@@ -67,19 +67,26 @@ class JavaParserAgent:
     """
     Agent responsible for parsing Java source code into AST representation.
     
-    Uses JavaParser library via subprocess to handle Java parsing without
-    requiring Java runtime in the main application.
+    Uses JavaParser library via long-lived JVM worker processes (see
+    javaparser_worker) to handle Java parsing without requiring a Java
+    runtime in the main application.
     """
     
-    def __init__(self, javaparser_jar_path: Optional[str] = None):
+    def __init__(self, javaparser_jar_path: Optional[str] = None,
+                 worker_count: int = 1, timeout: float = 30.0):
         """
         Initialize Java Parser Agent.
         
         Args:
             javaparser_jar_path: Path to JavaParser JAR file.
                                 If None, will try to download automatically.
+            worker_count: Number of JavaParser JVM workers used per scan.
+            timeout: Per-file parse timeout in seconds.
         """
         self.javaparser_jar_path = javaparser_jar_path
+        self.worker_count = worker_count
+        self.timeout = timeout
+        self._worker_pool: Optional[JavaParserWorkerPool] = None
         self.java_cmd = self._find_java_command()
         self._ensure_javaparser_available()
         
@@ -144,32 +151,50 @@ class JavaParserAgent:
         """
         Parse multiple Java files.
         
+        A pool of JavaParser workers is started lazily for the scan and shut
+        down afterwards; with more than one worker, files are parsed
+        concurrently.
+        
         Args:
             java_files: List of (file_path, relative_path) tuples
             
         Returns:
             List of ParsedFile objects
         """
-        parsed_files = []
+        worker_count = max(1, self.worker_count)
+        self._worker_pool = JavaParserWorkerPool(
+            self._get_worker_command,
+            size=worker_count,
+            timeout=self.timeout
+        )
         
-        for file_path, relative_path in java_files:
-            try:
-                parsed_file = self._parse_java_file(file_path, relative_path)
-                parsed_files.append(parsed_file)
-                
-            except Exception as e:
-                logger.error(f"Failed to parse Java file {relative_path}: {e}")
-                parsed_files.append(ParsedFile(
-                    file_path=file_path,
-                    relative_path=relative_path,
-                    language='Java',
-                    ast_tree=None,
-                    parse_success=False,
-                    error_message=str(e),
-                    lines_count=self._count_file_lines(file_path)
-                ))
-                
-        return parsed_files
+        try:
+            if worker_count > 1 and len(java_files) > 1:
+                with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    return list(executor.map(lambda f: self._parse_java_file_safe(*f), java_files))
+            
+            return [self._parse_java_file_safe(file_path, relative_path)
+                    for file_path, relative_path in java_files]
+        finally:
+            self._worker_pool.close()
+            self._worker_pool = None
+    
+    def _parse_java_file_safe(self, file_path: str, relative_path: str) -> ParsedFile:
+        """Parse a Java file, converting unexpected errors into a failed ParsedFile."""
+        try:
+            return self._parse_java_file(file_path, relative_path)
+            
+        except Exception as e:
+            logger.error(f"Failed to parse Java file {relative_path}: {e}")
+            return ParsedFile(
+                file_path=file_path,
+                relative_path=relative_path,
+                language='Java',
+                ast_tree=None,
+                parse_success=False,
+                error_message=str(e),
+                lines_count=self._count_file_lines(file_path)
+            )
     
     def _parse_java_file(self, file_path: str, relative_path: str) -> ParsedFile:
         """
@@ -245,9 +270,33 @@ class JavaParserAgent:
                 lines_count=self._count_file_lines(file_path)
             )
     
+    def _get_worker_command(self) -> List[str]:
+        """
+        Build the command line that starts a JavaParser worker.
+        
+        The worker source is written next to the cached JavaParser JAR and run
+        with the single-file source launcher, so it is compiled once per
+        worker start rather than once per parsed file.
+        
+        Returns:
+            Worker command line
+        """
+        worker_dir = Path(self.javaparser_jar_path).parent if self.javaparser_jar_path else \
+            Path.home() / '.ai_codescan' / 'jars'
+        worker_dir.mkdir(parents=True, exist_ok=True)
+        worker_source = worker_dir / 'JavaParserWorker.java'
+        
+        if not worker_source.exists() or worker_source.read_text(encoding='utf-8') != JAVAPARSER_WORKER_SOURCE:
+            worker_source.write_text(JAVAPARSER_WORKER_SOURCE, encoding='utf-8')
+        
+        return [self.java_cmd, '-cp', self.javaparser_jar_path, str(worker_source)]
+    
     def _run_javaparser(self, java_file_path: str) -> Dict[str, Any]:
         """
-        Run JavaParser on a Java file via subprocess.
+        Run JavaParser on a Java file using a worker process.
+        
+        Uses the scan's worker pool when called from parse_java_files,
+        otherwise starts a single short-lived worker.
         
         Args:
             java_file_path: Path to Java file to parse
@@ -255,154 +304,11 @@ class JavaParserAgent:
         Returns:
             AST as JSON dictionary
         """
-        # Create temporary Java program to run JavaParser
-        java_parser_code = f'''
-import com.github.javaparser.JavaParser;
-import com.github.javaparser.ast.CompilationUnit;
-import com.github.javaparser.ast.Node;
-import com.github.javaparser.ast.body.*;
-import com.github.javaparser.ast.expr.*;
-import com.github.javaparser.ast.stmt.*;
-import com.github.javaparser.ast.type.*;
-import com.github.javaparser.ast.ImportDeclaration;
-import com.github.javaparser.ast.PackageDeclaration;
-import java.io.File;
-import java.io.FileNotFoundException;
-import java.util.List;
-import java.util.Optional;
-
-public class JavaParserRunner {{
-    public static void main(String[] args) {{
-        try {{
-            JavaParser parser = new JavaParser();
-            CompilationUnit cu = parser.parse(new File("{java_file_path}")).getResult().get();
-            
-            System.out.println("{{");
-            System.out.println("\\"node_type\\": \\"CompilationUnit\\",");
-            
-            // Package declaration
-            Optional<PackageDeclaration> pkg = cu.getPackageDeclaration();
-            if (pkg.isPresent()) {{
-                System.out.println("\\"package\\": \\"" + pkg.get().getNameAsString() + "\\",");
-            }}
-            
-            // Imports
-            List<ImportDeclaration> imports = cu.getImports();
-            System.out.print("\\"imports\\": [");
-            for (int i = 0; i < imports.size(); i++) {{
-                System.out.print("\\"" + imports.get(i).getNameAsString() + "\\"");
-                if (i < imports.size() - 1) System.out.print(", ");
-            }}
-            System.out.println("],");
-            
-            // Types (classes, interfaces, enums)
-            System.out.print("\\"types\\": [");
-            List<TypeDeclaration<?>> types = cu.getTypes();
-            for (int i = 0; i < types.size(); i++) {{
-                TypeDeclaration<?> type = types.get(i);
-                System.out.print("{{");
-                System.out.print("\\"type\\": \\"" + type.getClass().getSimpleName() + "\\", ");
-                System.out.print("\\"name\\": \\"" + type.getNameAsString() + "\\"");
-                
-                if (type instanceof ClassOrInterfaceDeclaration) {{
-                    ClassOrInterfaceDeclaration clazz = (ClassOrInterfaceDeclaration) type;
-                    System.out.print(", \\"isInterface\\": " + clazz.isInterface());
-                    
-                    // Methods
-                    List<MethodDeclaration> methods = clazz.getMethods();
-                    System.out.print(", \\"methods\\": [");
-                    for (int j = 0; j < methods.size(); j++) {{
-                        MethodDeclaration method = methods.get(j);
-                        System.out.print("\\"" + method.getNameAsString() + "\\"");
-                        if (j < methods.size() - 1) System.out.print(", ");
-                    }}
-                    System.out.print("]");
-                    
-                    // Fields
-                    List<FieldDeclaration> fields = clazz.getFields();
-                    System.out.print(", \\"fields\\": [");
-                    for (int j = 0; j < fields.size(); j++) {{
-                        FieldDeclaration field = fields.get(j);
-                        field.getVariables().forEach(var -> {{
-                            System.out.print("\\"" + var.getNameAsString() + "\\"");
-                        }});
-                        if (j < fields.size() - 1) System.out.print(", ");
-                    }}
-                    System.out.print("]");
-                }}
-                
-                System.out.print("}}");
-                if (i < types.size() - 1) System.out.print(", ");
-            }}
-            System.out.println("]");
-            
-            System.out.println("}}");
-            
-        }} catch (FileNotFoundException e) {{
-            System.err.println("File not found: " + e.getMessage());
-            System.exit(1);
-        }} catch (Exception e) {{
-            System.err.println("Parsing error: " + e.getMessage());
-            System.exit(1);
-        }}
-    }}
-}}
-'''
+        if self._worker_pool is not None:
+            return self._worker_pool.parse(java_file_path)
         
-        # Create temporary files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Write Java parser runner
-            runner_file = os.path.join(temp_dir, 'JavaParserRunner.java')
-            with open(runner_file, 'w', encoding='utf-8') as f:
-                f.write(java_parser_code)
-            
-            # Compile Java parser runner
-            compile_cmd = [
-                self.java_cmd, '-cp', self.javaparser_jar_path,
-                '-d', temp_dir,
-                runner_file
-            ]
-            
-            result = subprocess.run(
-                compile_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(
-                    result.returncode, compile_cmd, 
-                    stdout=result.stdout, stderr=result.stderr
-                )
-            
-            # Run Java parser
-            run_cmd = [
-                self.java_cmd, '-cp',
-                f"{temp_dir}{os.pathsep}{self.javaparser_jar_path}",
-                'JavaParserRunner'
-            ]
-            
-            result = subprocess.run(
-                run_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(
-                    result.returncode, run_cmd,
-                    stdout=result.stdout, stderr=result.stderr
-                )
-            
-            # Parse JSON output
-            try:
-                return json.loads(result.stdout)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JavaParser JSON output: {e}")
-                logger.debug(f"JavaParser output: {result.stdout}")
-                raise
+        with JavaParserWorkerPool(self._get_worker_command, size=1, timeout=self.timeout) as pool:
+            return pool.parse(java_file_path)
     
     def _parse_ast_json(self, ast_json: Dict[str, Any]) -> JavaNode:
         """
@@ -0,0 +1,334 @@
+"""
+JavaParser Worker for CKG Operations Team.
+
+Long-lived JVM processes that parse Java files with JavaParser. Each worker
+reads one file path per line on stdin and writes one compact AST JSON object
+per line on stdout, so JVM startup and source compilation are paid once per
+worker instead of once per file.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+from typing import Callable, Dict, List, Any, Optional
+from loguru import logger
+
+
+# Java source of the worker, run with the JDK single-file source launcher
+# (java -cp javaparser.jar JavaParserWorker.java).
+JAVAPARSER_WORKER_SOURCE = r'''
+import com.github.javaparser.JavaParser;
+import com.github.javaparser.ParseResult;
+import com.github.javaparser.ast.CompilationUnit;
+import com.github.javaparser.ast.ImportDeclaration;
+import com.github.javaparser.ast.PackageDeclaration;
+import com.github.javaparser.ast.body.*;
+import java.io.BufferedReader;
+import java.io.File;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.util.List;
+import java.util.Optional;
+
+public class JavaParserWorker {
+    private static String quote(String value) {
+        StringBuilder sb = new StringBuilder("\"");
+        for (char c : value.toCharArray()) {
+            switch (c) {
+                case '"': sb.append("\\\""); break;
+                case '\\': sb.append("\\\\"); break;
+                case '\n': sb.append("\\n"); break;
+                case '\r': sb.append("\\r"); break;
+                case '\t': sb.append("\\t"); break;
+                default:
+                    if (c < 0x20) sb.append(String.format("\\u%04x", (int) c));
+                    else sb.append(c);
+            }
+        }
+        return sb.append("\"").toString();
+    }
+
+    private static String toJson(CompilationUnit cu) {
+        StringBuilder sb = new StringBuilder("{\"node_type\": \"CompilationUnit\"");
+
+        Optional<PackageDeclaration> pkg = cu.getPackageDeclaration();
+        if (pkg.isPresent()) {
+            sb.append(", \"package\": ").append(quote(pkg.get().getNameAsString()));
+        }
+
+        sb.append(", \"imports\": [");
+        List<ImportDeclaration> imports = cu.getImports();
+        for (int i = 0; i < imports.size(); i++) {
+            if (i > 0) sb.append(", ");
+            sb.append(quote(imports.get(i).getNameAsString()));
+        }
+        sb.append("]");
+
+        sb.append(", \"types\": [");
+        List<TypeDeclaration<?>> types = cu.getTypes();
+        for (int i = 0; i < types.size(); i++) {
+            TypeDeclaration<?> type = types.get(i);
+            if (i > 0) sb.append(", ");
+            sb.append("{\"type\": ").append(quote(type.getClass().getSimpleName()));
+            sb.append(", \"name\": ").append(quote(type.getNameAsString()));
+
+            if (type instanceof ClassOrInterfaceDeclaration) {
+                ClassOrInterfaceDeclaration clazz = (ClassOrInterfaceDeclaration) type;
+                sb.append(", \"isInterface\": ").append(clazz.isInterface());
+
+                sb.append(", \"methods\": [");
+                List<MethodDeclaration> methods = clazz.getMethods();
+                for (int j = 0; j < methods.size(); j++) {
+                    if (j > 0) sb.append(", ");
+                    sb.append(quote(methods.get(j).getNameAsString()));
+                }
+                sb.append("]");
+
+                sb.append(", \"fields\": [");
+                boolean first = true;
+                for (FieldDeclaration field : clazz.getFields()) {
+                    for (VariableDeclarator var : field.getVariables()) {
+                        if (!first) sb.append(", ");
+                        sb.append(quote(var.getNameAsString()));
+                        first = false;
+                    }
+                }
+                sb.append("]");
+            }
+            sb.append("}");
+        }
+        sb.append("]}");
+        return sb.toString();
+    }
+
+    public static void main(String[] args) throws Exception {
+        PrintStream out = new PrintStream(System.out, false, "UTF-8");
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        JavaParser parser = new JavaParser();
+
+        out.println("{\"ready\": true}");
+        out.flush();
+
+        String path;
+        while ((path = in.readLine()) != null) {
+            if (path.isEmpty()) continue;
+            try {
+                ParseResult<CompilationUnit> result = parser.parse(new File(path));
+                if (result.getResult().isPresent()) {
+                    out.println(toJson(result.getResult().get()));
+                } else {
+                    out.println("{\"error\": " + quote("Parsing error: " + result.getProblems()) + "}");
+                }
+            } catch (Exception e) {
+                out.println("{\"error\": " + quote("Parsing error: " + e.getMessage()) + "}");
+            }
+            out.flush();
+        }
+    }
+}
+'''
+
+
+class JavaParserWorkerError(RuntimeError):
+    """Raised when a worker reports a parse error or exits unexpectedly."""
+
+
+class JavaParserWorker:
+    """
+    One long-lived JavaParser JVM process speaking the line protocol.
+
+    Protocol: after startup the worker prints ``{"ready": true}``; then for
+    every file path written to stdin it prints exactly one JSON line, either
+    the AST summary or ``{"error": "..."}``.
+    """
+
+    def __init__(self, command: List[str], startup_timeout: float = 60.0):
+        """
+        Start the worker process.
+
+        Args:
+            command: Command line that launches the worker
+            startup_timeout: Seconds to wait for the ready handshake
+        """
+        self.command = command
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+        try:
+            ready = self._read_response(startup_timeout)
+        except Exception:
+            self.process.kill()
+            raise
+        if not ready.get('ready'):
+            self.process.kill()
+            raise JavaParserWorkerError(f"JavaParser worker failed to start: {ready}")
+
+    def _read_stdout(self):
+        """Forward stdout lines to the queue (None marks end of stream)."""
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_response(self, timeout: float) -> Dict[str, Any]:
+        """Read the next JSON line from the worker."""
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(self.command, timeout)
+
+        if line is None:
+            raise JavaParserWorkerError("JavaParser worker exited unexpectedly")
+        return json.loads(line)
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is still running."""
+        return self.process.poll() is None
+
+    def parse(self, java_file_path: str, timeout: float = 30.0) -> Dict[str, Any]:
+        """
+        Parse one Java file.
+
+        Args:
+            java_file_path: Path to Java file
+            timeout: Seconds to wait for the response
+
+        Returns:
+            AST as JSON dictionary
+
+        Raises:
+            subprocess.CalledProcessError: If the worker reports a parse error
+            subprocess.TimeoutExpired: If no response arrives in time
+            JavaParserWorkerError: If the worker died
+        """
+        self.process.stdin.write(java_file_path + '\n')
+        self.process.stdin.flush()
+
+        response = self._read_response(timeout)
+        if 'error' in response:
+            raise subprocess.CalledProcessError(1, self.command, stderr=response['error'])
+        return response
+
+    def close(self):
+        """Stop the worker process."""
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+
+class JavaParserWorkerPool:
+    """
+    Pool of up to ``size`` JavaParser workers, started lazily on demand.
+
+    ``parse`` is thread-safe: each call borrows an idle worker (starting a
+    new one while below ``size``). Workers that time out or die are killed
+    and replaced on the next call.
+
+    Example:
+        >>> with JavaParserWorkerPool(agent._get_worker_command, size=4) as pool:
+        ...     ast_json = pool.parse('/repo/src/Main.java')
+    """
+
+    def __init__(self, command_factory: Callable[[], List[str]], size: int = 1,
+                 timeout: float = 30.0, startup_timeout: float = 60.0):
+        """
+        Initialize the pool.
+
+        Args:
+            command_factory: Returns the worker command line (called once)
+            size: Maximum number of concurrent workers
+            timeout: Per-file parse timeout in seconds
+            startup_timeout: Worker startup timeout in seconds
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+
+        self.command_factory = command_factory
+        self.size = size
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self._command: Optional[List[str]] = None
+        self._idle: "queue.Queue[JavaParserWorker]" = queue.Queue()
+        self._workers: List[JavaParserWorker] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'JavaParserWorkerPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _acquire(self) -> JavaParserWorker:
+        """Borrow an idle worker, starting a new one while below size."""
+        while True:
+            with self._lock:
+                try:
+                    return self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+                if len(self._workers) < self.size:
+                    if self._command is None:
+                        self._command = self.command_factory()
+                    worker = JavaParserWorker(self._command, self.startup_timeout)
+                    self._workers.append(worker)
+                    logger.info(f"Started JavaParser worker {len(self._workers)}/{self.size}")
+                    return worker
+            # Poll so a slot freed by a discarded worker is noticed
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _discard(self, worker: JavaParserWorker):
+        """Kill a broken worker so a fresh one can replace it."""
+        worker.process.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def parse(self, java_file_path: str) -> Dict[str, Any]:
+        """
+        Parse one Java file on a pooled worker.
+
+        Args:
+            java_file_path: Path to Java file
+
+        Returns:
+            AST as JSON dictionary
+        """
+        worker = self._acquire()
+        try:
+            result = worker.parse(java_file_path, self.timeout)
+        except subprocess.CalledProcessError:
+            self._idle.put(worker)
+            raise
+        except Exception:
+            # A timed-out worker may still answer the previous file later,
+            # which would shift every following response by one
+            self._discard(worker)
+            raise
+
+        self._idle.put(worker)
+        return result
+
+    def close(self):
+        """Stop all workers."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+        self._idle = queue.Queue()
@@ -8,10 +8,12 @@ Agent này responsible cho việc parse Kotlin source code thành AST representa
 """
 
 import os
+import re
 import json
 import subprocess
 import tempfile
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from pathlib import Path
@@ -56,6 +58,9 @@ class KotlinParseInfo:
     annotations: List[KotlinNode] = field(default_factory=list)
     extensions: List[KotlinNode] = field(default_factory=list)
     typealiases: List[KotlinNode] = field(default_factory=list)
+    # None = chưa kiểm tra syntax (syntax_check tắt)
+    syntax_valid: Optional[bool] = None
+    syntax_errors: List[str] = field(default_factory=list)
 
 class KotlinParserAgent:
     """
@@ -63,12 +68,34 @@ class KotlinParserAgent:
     
     Sử dụng kotlinc compiler với subprocess approach để extract AST information
     từ Kotlin files, tương tự approach thành công của JavaParserAgent.
+    
+    Syntax check bằng kotlinc là opt-in: khi bật, files được nhóm theo module
+    (thư mục chứa build.gradle/build.gradle.kts/pom.xml) và mỗi module được
+    kiểm tra bằng một lần gọi kotlinc, diagnostics được map lại về từng file.
     """
     
-    def __init__(self):
-        """Initialize KotlinParserAgent."""
+    # Marker files xác định root của một module
+    MODULE_MARKERS = ('build.gradle', 'build.gradle.kts', 'pom.xml')
+    # Giới hạn số files mỗi lần gọi kotlinc (độ dài command line)
+    MAX_FILES_PER_INVOCATION = 500
+    
+    # Diagnostic của kotlinc: path/File.kt:3:5: error: message
+    DIAGNOSTIC_PATTERN = re.compile(
+        r'^(?P<path>.+?\.kts?):(?P<line>\d+):(?P<column>\d+): (?P<severity>error|warning): (?P<message>.*)$'
+    )
+    
+    def __init__(self, syntax_check: bool = False, syntax_check_workers: int = 1):
+        """
+        Initialize KotlinParserAgent.
+        
+        Args:
+            syntax_check: Bật kiểm tra syntax bằng kotlinc (batch theo module)
+            syntax_check_workers: Số lần gọi kotlinc chạy song song
+        """
         self.kotlinc_path = self._ensure_kotlinc_available()
         self.timeout = 30  # 30 seconds timeout
+        self.syntax_check = syntax_check
+        self.syntax_check_workers = max(1, syntax_check_workers)
         
     def _ensure_kotlinc_available(self) -> Optional[str]:
         """
@@ -117,16 +144,24 @@ class KotlinParserAgent:
         if not self.kotlinc_path:
             logger.error("kotlinc not available for parsing")
             return []
+        
+        kotlin_files = [path for path in file_paths if path.endswith(('.kt', '.kts'))]
+        
+        syntax_errors = {}
+        if self.syntax_check and kotlin_files:
+            syntax_errors = self.check_kotlin_syntax_batch(kotlin_files)
             
         results = []
-        for file_path in file_paths:
-            if file_path.endswith(('.kt', '.kts')):
-                try:
-                    parse_info = self._parse_single_file(file_path)
-                    results.append((file_path, parse_info))
-                except Exception as e:
-                    logger.error(f"Failed to parse {file_path}: {e}")
-                    results.append((file_path, KotlinParseInfo()))
+        for file_path in kotlin_files:
+            try:
+                parse_info = self._parse_single_file(file_path)
+                if file_path in syntax_errors:
+                    parse_info.syntax_errors = syntax_errors[file_path]
+                    parse_info.syntax_valid = not syntax_errors[file_path]
+                results.append((file_path, parse_info))
+            except Exception as e:
+                logger.error(f"Failed to parse {file_path}: {e}")
+                results.append((file_path, KotlinParseInfo()))
                     
         return results
     
@@ -144,9 +179,6 @@ class KotlinParserAgent:
             # Read file content
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                
-            # Try to compile và check for syntax errors
-            compile_result = self._check_kotlin_syntax(file_path)
             
             # Parse content manually (fallback approach)
             parse_info = self._manual_parse_kotlin(content)
@@ -157,44 +189,147 @@ class KotlinParserAgent:
             logger.error(f"Error parsing {file_path}: {e}")
             return KotlinParseInfo()
     
-    def _check_kotlin_syntax(self, file_path: str) -> bool:
+    def check_kotlin_syntax_batch(self, file_paths: List[str]) -> Dict[str, List[str]]:
         """
-        Check Kotlin file syntax using kotlinc.
+        Kiểm tra syntax nhiều Kotlin files với một lần gọi kotlinc cho mỗi module.
+        
+        Scripts (.kts) không compile chung được với sources nên được kiểm tra riêng.
+        Các module được kiểm tra song song khi syntax_check_workers > 1.
         
         Args:
-            file_path: Path to Kotlin file
+            file_paths: Danh sách Kotlin files
             
         Returns:
-            bool: True if syntax is valid
+            Dict[str, List[str]]: file_path -> danh sách errors (rỗng nếu hợp lệ)
+        """
+        batches = []
+        for module_files in self._group_files_by_module(file_paths).values():
+            sources = [path for path in module_files if path.endswith('.kt')]
+            for start in range(0, len(sources), self.MAX_FILES_PER_INVOCATION):
+                batches.append(sources[start:start + self.MAX_FILES_PER_INVOCATION])
+            batches.extend([path] for path in module_files if path.endswith('.kts'))
+        
+        logger.info(f"Kotlin syntax check: {len(file_paths)} files trong {len(batches)} kotlinc invocations")
+        
+        results: Dict[str, List[str]] = {}
+        workers = self.syntax_check_workers
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for batch_result in executor.map(self._run_kotlinc_batch, batches):
+                    results.update(batch_result)
+        else:
+            for batch in batches:
+                results.update(self._run_kotlinc_batch(batch))
+        
+        return results
+    
+    def _group_files_by_module(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """
+        Nhóm files theo module root gần nhất (thư mục chứa MODULE_MARKERS).
+        
+        Files không thuộc module nào được gom chung vào một nhóm.
+        
+        Args:
+            file_paths: Danh sách Kotlin files
+            
+        Returns:
+            Dict[str, List[str]]: module root -> files
         """
+        groups: Dict[str, List[str]] = {}
+        root_cache: Dict[str, str] = {}
+        
+        for file_path in file_paths:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            if directory not in root_cache:
+                root = ''
+                current = directory
+                while True:
+                    if any(os.path.isfile(os.path.join(current, marker)) for marker in self.MODULE_MARKERS):
+                        root = current
+                        break
+                    parent = os.path.dirname(current)
+                    if parent == current:
+                        break
+                    current = parent
+                root_cache[directory] = root
+            groups.setdefault(root_cache[directory], []).append(file_path)
+        
+        return groups
+    
+    def _run_kotlinc_batch(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """
+        Gọi kotlinc một lần cho nhiều files và map diagnostics về từng file.
+        
+        Args:
+            file_paths: Files compile chung
+            
+        Returns:
+            Dict[str, List[str]]: file_path -> danh sách errors
+        """
+        results: Dict[str, List[str]] = {path: [] for path in file_paths}
+        lookup = {os.path.realpath(path): path for path in file_paths}
+        
         try:
             with tempfile.TemporaryDirectory() as temp_dir:
                 output_dir = os.path.join(temp_dir, 'output')
                 os.makedirs(output_dir, exist_ok=True)
                 
-                # Run kotlinc to check syntax
-                cmd = [self.kotlinc_path, '-d', output_dir, file_path]
+                cmd = [self.kotlinc_path, '-d', output_dir] + list(file_paths)
                 
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
                     text=True,
-                    timeout=self.timeout
+                    timeout=self.timeout * max(1, len(file_paths) // 50 + 1)
                 )
                 
                 if result.returncode == 0:
-                    logger.debug(f"Kotlin syntax check passed for {file_path}")
-                    return True
-                else:
-                    logger.warning(f"Kotlin syntax issues in {file_path}: {result.stderr}")
-                    return False
+                    return results
+                
+                stderr = result.stderr if isinstance(result.stderr, str) else ''
+                mapped = False
+                for line in stderr.splitlines():
+                    match = self.DIAGNOSTIC_PATTERN.match(line.strip())
+                    if not match or match.group('severity') != 'error':
+                        continue
+                    target = lookup.get(os.path.realpath(match.group('path')))
+                    if target:
+                        results[target].append(
+                            f"{match.group('line')}:{match.group('column')}: {match.group('message')}"
+                        )
+                        mapped = True
+                
+                if not mapped:
+                    # Không map được diagnostic về file cụ thể: đánh dấu cả batch lỗi
+                    message = stderr.strip() or f"kotlinc exited with code {result.returncode}"
+                    for path in file_paths:
+                        results[path].append(message)
+                
+                logger.warning(f"Kotlin syntax issues in {sum(1 for e in results.values() if e)} "
+                               f"of {len(file_paths)} files")
                     
         except subprocess.TimeoutExpired:
-            logger.error(f"Kotlin syntax check timeout for {file_path}")
-            return False
+            logger.error(f"Kotlin syntax check timeout for {len(file_paths)} files")
+            for path in file_paths:
+                results[path].append("kotlinc timeout")
         except Exception as e:
-            logger.error(f"Error checking Kotlin syntax for {file_path}: {e}")
-            return False
+            logger.error(f"Error checking Kotlin syntax: {e}")
+            for path in file_paths:
+                results[path].append(str(e))
+        
+        return results
+    
+    def _check_kotlin_syntax(self, file_path: str) -> bool:
+        """
+        Check Kotlin file syntax using kotlinc.
+        
+        Args:
+            file_path: Path to Kotlin file
+            
+        Returns:
+            bool: True if syntax is valid
+        """
+        return not self._run_kotlinc_batch([file_path])[file_path]
     
     def _manual_parse_kotlin(self, content: str) -> KotlinParseInfo:
         """
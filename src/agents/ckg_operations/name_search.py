@@ -0,0 +1,125 @@
+"""
+Name Search for CKG Operations Team.
+
+Helpers for symbol search backed by the Neo4j full-text index on ``name``
+(see ``CKGSchema.get_cypher_name_fulltext_index``): building Lucene queries
+that combine exact, prefix, substring and (opt-in) fuzzy clauses, and
+ranking the returned candidates so exact matches come first, then prefixes,
+substrings and fuzzy matches.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Optional
+
+
+NAME_FULLTEXT_INDEX = "ckg_name_fulltext"
+
+# Match tiers, best first
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_SUBSTRING = "substring"
+MATCH_FUZZY = "fuzzy"
+MATCH_TIERS = [MATCH_EXACT, MATCH_PREFIX, MATCH_SUBSTRING, MATCH_FUZZY]
+
+# Characters that make a pattern a regex rather than a plain name
+_REGEX_METACHARACTERS = re.compile(r'[.*+?^$()\[\]{}|\\]')
+
+# Characters with special meaning in Lucene query syntax
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+# Errors meaning the full-text index cannot be used at all (vs. one bad query)
+_MISSING_INDEX_ERRORS = ("no such fulltext schema index", "no procedure with the name")
+
+
+def is_missing_index_error(message: Optional[str]) -> bool:
+    """
+    Check whether a failed full-text query means the index (or the
+    procedure) does not exist, so later searches should skip it.
+    """
+    lowered = (message or "").lower()
+    return any(error in lowered for error in _MISSING_INDEX_ERRORS)
+
+
+def looks_like_regex(pattern: str) -> bool:
+    """
+    Check whether a search pattern uses regex syntax.
+
+    Regex patterns keep going through the ``=~`` path so existing callers
+    that pass expressions like ``test_.*`` behave as before.
+    """
+    return bool(_REGEX_METACHARACTERS.search(pattern))
+
+
+def escape_lucene(term: str) -> str:
+    """Escape Lucene special characters in a term."""
+    return _LUCENE_SPECIAL.sub(r'\\\1', term)
+
+
+def build_fulltext_query(pattern: str, fuzzy: bool = False) -> str:
+    """
+    Build a Lucene query matching names exactly, by prefix, by substring
+    and (optionally) fuzzily.
+
+    Args:
+        pattern: Plain search text; whitespace separates alternative terms
+        fuzzy: Include an edit-distance clause for typos
+
+    Returns:
+        str: Lucene query for db.index.fulltext.queryNodes
+    """
+    clauses = []
+    for term in pattern.lower().split():
+        escaped = escape_lucene(term)
+        clauses.extend([f"{escaped}^8", f"{escaped}*^4", f"*{escaped}*^2"])
+        if fuzzy and len(term) > 2:
+            clauses.append(f"{escaped}~")
+    return " OR ".join(clauses)
+
+
+def classify_name_match(name: Optional[str], pattern: str) -> str:
+    """
+    Classify how a name matches the search text.
+
+    Returns:
+        str: One of MATCH_EXACT, MATCH_PREFIX, MATCH_SUBSTRING, MATCH_FUZZY
+    """
+    name = (name or "").lower()
+    terms = pattern.lower().split() or [""]
+    if any(name == term for term in terms):
+        return MATCH_EXACT
+    if any(name.startswith(term) for term in terms):
+        return MATCH_PREFIX
+    if any(term in name for term in terms):
+        return MATCH_SUBSTRING
+    return MATCH_FUZZY
+
+
+def rank_name_matches(rows: List[Dict[str, Any]], pattern: str,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Sort search rows by match tier, then index score and name similarity.
+
+    Each row gets a ``match_type`` column.
+
+    Args:
+        rows: Rows with ``name`` and optional ``score`` columns
+        pattern: Search text the rows were found with
+        limit: Maximum number of rows to return
+
+    Returns:
+        List[Dict[str, Any]]: Ranked rows
+    """
+    lowered = pattern.lower()
+    ranked = []
+    for row in rows:
+        match_type = classify_name_match(row.get("name"), pattern)
+        row = dict(row, match_type=match_type)
+        similarity = SequenceMatcher(None, (row.get("name") or "").lower(), lowered).ratio()
+        ranked.append((MATCH_TIERS.index(match_type), -(row.get("score") or 0.0),
+                       -similarity, len(row.get("name") or ""), row.get("name") or "", row))
+
+    ranked.sort(key=lambda item: item[:5])
+    rows = [item[-1] for item in ranked]
+    return rows[:limit] if limit is not None else rows
@@ -0,0 +1,178 @@
+"""
+Neo4j Driver Registry for CKG Operations Team.
+
+Process-wide registry that hands out one shared Neo4j driver per
+(uri, username, password). Drivers are created lazily on first use, keep
+their own connection pool, and are re-verified at most once per liveness
+interval so a restarted database is picked up without every agent opening
+its own driver.
+"""
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+try:
+    from neo4j import GraphDatabase
+except ImportError:
+    GraphDatabase = None
+
+
+DEFAULT_MAX_CONNECTION_POOL_SIZE = 100
+DEFAULT_LIVENESS_CHECK_INTERVAL = 30.0
+
+
+@dataclass
+class _DriverEntry:
+    """A shared driver and when it was last known to be alive."""
+    driver: Any
+    max_connection_pool_size: int
+    last_verified: float
+
+
+class Neo4jDriverRegistry:
+    """
+    Thread-safe cache of Neo4j drivers shared by all CKG agents.
+
+    Example:
+        >>> driver = get_driver_registry().get_driver(uri, username, password)
+        >>> with driver.session() as session:
+        ...     session.run("RETURN 1")
+    """
+
+    def __init__(self, liveness_check_interval: float = DEFAULT_LIVENESS_CHECK_INTERVAL):
+        """
+        Initialize the registry.
+
+        Args:
+            liveness_check_interval: Seconds between connectivity checks of a
+                cached driver (0 checks on every get_driver call)
+        """
+        self.liveness_check_interval = liveness_check_interval
+        self._entries: Dict[Tuple[str, str, str], _DriverEntry] = {}
+        # _lock chỉ bảo vệ các dicts; network I/O (tạo/verify driver) chạy dưới
+        # lock của từng database nên một database chậm không chặn các database khác
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self.drivers_created = 0
+
+    def get_driver(self, uri: str, username: str, password: str,
+                   max_connection_pool_size: int = DEFAULT_MAX_CONNECTION_POOL_SIZE):
+        """
+        Get the shared driver for a database, creating it if needed.
+
+        Args:
+            uri: Neo4j URI
+            username: Neo4j username
+            password: Neo4j password
+            max_connection_pool_size: Pool size used when the driver is created
+
+        Returns:
+            A verified Neo4j driver
+
+        Raises:
+            RuntimeError: If the neo4j package is not installed
+            Exception: Connectivity errors from the driver
+        """
+        if GraphDatabase is None:
+            raise RuntimeError("Neo4j driver not installed")
+
+        key = (uri, username, password)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.last_verified < self.liveness_check_interval:
+                return entry.driver
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                # Thread khác có thể vừa verify/tạo driver trong lúc chờ key_lock
+                if time.monotonic() - entry.last_verified < self.liveness_check_interval:
+                    return entry.driver
+                try:
+                    entry.driver.verify_connectivity()
+                    entry.last_verified = time.monotonic()
+                    return entry.driver
+                except Exception as e:
+                    logger.warning(f"Neo4j driver cho {uri} không còn kết nối, tạo lại: {str(e)}")
+                    self._close_driver(self._pop_entry(key, entry))
+
+            driver = GraphDatabase.driver(
+                uri,
+                auth=(username, password),
+                max_connection_pool_size=max_connection_pool_size
+            )
+            try:
+                driver.verify_connectivity()
+            except Exception:
+                driver.close()
+                raise
+
+            with self._lock:
+                self._entries[key] = _DriverEntry(driver, max_connection_pool_size, time.monotonic())
+                self.drivers_created += 1
+            logger.info(f"Kết nối Neo4j thành công: {uri} (pool size {max_connection_pool_size})")
+            return driver
+
+    def _pop_entry(self, key: Tuple[str, str, str],
+                   expected: Optional[_DriverEntry] = None) -> Optional[_DriverEntry]:
+        """Remove an entry (only if it is still `expected`, when given)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (expected is not None and entry is not expected):
+                return None
+            return self._entries.pop(key)
+
+    @staticmethod
+    def _close_driver(entry: Optional[_DriverEntry]):
+        if entry is not None:
+            try:
+                entry.driver.close()
+            except Exception as e:
+                logger.debug(f"Lỗi đóng Neo4j driver: {str(e)}")
+
+    def close_driver(self, uri: str, username: str, password: str):
+        """Close and forget the shared driver for one database."""
+        self._close_driver(self._pop_entry((uri, username, password)))
+
+    def close_all(self):
+        """Close every shared driver (called at interpreter exit)."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close_driver(entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Dict[str, Any]: Open drivers and how many were created in total
+        """
+        with self._lock:
+            return {
+                'open_drivers': len(self._entries),
+                'drivers_created': self.drivers_created,
+                'uris': [uri for uri, _, _ in self._entries]
+            }
+
+
+_registry: Optional[Neo4jDriverRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_driver_registry() -> Neo4jDriverRegistry:
+    """Return the process-wide driver registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = Neo4jDriverRegistry()
+                atexit.register(_registry.close_all)
+    return _registry
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Parse Cache
+
+Cache trên đĩa cho kết quả parse, key theo content hash của file, ngôn ngữ và
+parser version. File không thay đổi giữa các lần scan sẽ bỏ qua bước parse.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from loguru import logger
+
+
+@dataclass
+class ParseCacheEntry:
+    """Dữ liệu được cache cho một file."""
+    parse_info: Any
+    nodes_count: int = 0
+    lines_count: int = 0
+
+
+class ParseCache:
+    """
+    Cache kết quả parse trên đĩa với LRU eviction giới hạn theo dung lượng.
+
+    Mỗi entry là một file pickle ``<key>.pkl`` trong cache_dir. Thứ tự LRU dựa
+    trên mtime của file (được cập nhật khi hit), nên được giữ giữa các lần scan.
+
+    Args:
+        cache_dir (str): Thư mục lưu cache. Mặc định ``~/.ai_codescan/parse_cache``.
+        max_size_mb (float): Dung lượng tối đa của cache (MB).
+
+    Example:
+        >>> cache = ParseCache(max_size_mb=200)
+        >>> key = cache.make_key(content_bytes, 'Python', PYTHON_PARSER_VERSION)
+        >>> entry = cache.get(key)
+    """
+
+    DEFAULT_MAX_SIZE_MB = 500.0
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        """
+        Khởi tạo ParseCache.
+
+        Args:
+            cache_dir: Thư mục lưu cache
+            max_size_mb: Dung lượng tối đa (MB)
+        """
+        if max_size_mb <= 0:
+            raise ValueError("max_size_mb phải lớn hơn 0")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".ai_codescan" / "parse_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> size bytes, thứ tự từ least đến most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_size = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(content: bytes, language: str, parser_version: str) -> str:
+        """
+        Tạo cache key từ nội dung file, ngôn ngữ và parser version.
+
+        Args:
+            content: Nội dung file (bytes)
+            language: Ngôn ngữ của parser
+            parser_version: Version của parser/summary format
+
+        Returns:
+            str: Hex digest dùng làm key
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{language}\0{parser_version}\0".encode('utf-8'))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ParseCacheEntry]:
+        """
+        Lấy entry từ cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[ParseCacheEntry]: Entry nếu có, None nếu miss hoặc entry hỏng
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except Exception as e:
+            logger.debug(f"Parse cache entry lỗi {key[:12]}: {str(e)}")
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: ParseCacheEntry):
+        """
+        Lưu entry vào cache và evict các entries cũ nhất nếu vượt dung lượng.
+
+        Args:
+            key: Cache key
+            entry: Dữ liệu cần cache
+        """
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Không thể cache entry {key[:12]}: {str(e)}")
+            return
+
+        if len(data) > self.max_size_bytes:
+            return
+
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            # Reason: ghi file tạm rồi rename để scan song song không đọc entry dở dang
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Lỗi ghi parse cache: {str(e)}")
+            return
+
+        if key in self._entries:
+            self._total_size -= self._entries.pop(key)
+        self._entries[key] = len(data)
+        self._total_size += len(data)
+
+        self._evict()
+
+    def clear(self):
+        """Xóa toàn bộ cache."""
+        for key in list(self._entries):
+            self._remove(key)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lấy thống kê cache."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self._total_size,
+            'max_size_bytes': self.max_size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        """Đường dẫn file của một entry."""
+        return self.cache_dir / f"{key}.pkl"
+
+    def _load_index(self):
+        """Nạp danh sách entries có sẵn trên đĩa theo thứ tự mtime."""
+        entries = []
+        for path in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_size += size
+
+        self._evict()
+
+    def _remove(self, key: str):
+        """Xóa một entry khỏi index và đĩa."""
+        self._total_size -= self._entries.pop(key, 0)
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Evict các entries least recently used cho đến khi nằm trong giới hạn."""
+        while self._total_size > self.max_size_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
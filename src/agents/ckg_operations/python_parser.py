@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Python Parse Summary
+
+Trích xuất thông tin khai báo (imports, classes, functions, parameters) từ
+Python AST thành các dataclass gọn, picklable. Summary này được dùng thay cho
+AST đầy đủ khi parse song song (process pool) và khi cache kết quả parse.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Tăng khi thay đổi cấu trúc summary để invalidate các kết quả đã cache
+PYTHON_PARSER_VERSION = "1"
+
+
+@dataclass
+class PythonImportInfo:
+    """Một import đã được chuẩn hóa (import x / from m import x)."""
+    imported_name: str
+    alias: Optional[str]
+    line_number: int
+    is_from_import: bool = False
+    module_name: str = ''
+
+
+@dataclass
+class PythonParameterInfo:
+    """Thông tin parameter của function/method."""
+    name: str
+    annotation: Optional[str] = None
+
+
+@dataclass
+class PythonFunctionInfo:
+    """Thông tin function hoặc method."""
+    name: str
+    line_number: int
+    end_line_number: Optional[int] = None
+    parameters: List[PythonParameterInfo] = field(default_factory=list)
+    is_async: bool = False
+    is_static: bool = False
+    is_class_method: bool = False
+    is_property: bool = False
+    docstring: Optional[str] = None
+
+
+@dataclass
+class PythonClassInfo:
+    """Thông tin class và các methods trực tiếp của nó."""
+    name: str
+    line_number: int
+    end_line_number: Optional[int] = None
+    base_classes: List[str] = field(default_factory=list)
+    docstring: Optional[str] = None
+    methods: List[PythonFunctionInfo] = field(default_factory=list)
+
+
+@dataclass
+class PythonParseInfo:
+    """
+    Summary của một Python file đủ để ASTtoCKGBuilderAgent xây dựng CKG.
+
+    Các danh sách giữ đúng thứ tự duyệt của ast.walk. ``functions`` chứa mọi
+    FunctionDef/AsyncFunctionDef trong file (kể cả methods và nested functions),
+    khớp với cách builder duyệt AST.
+    """
+    imports: List[PythonImportInfo] = field(default_factory=list)
+    classes: List[PythonClassInfo] = field(default_factory=list)
+    functions: List[PythonFunctionInfo] = field(default_factory=list)
+    nodes_count: int = 0
+    imports_count: int = 0
+    classes_count: int = 0
+    functions_count: int = 0
+
+
+def get_name_from_node(node: ast.AST) -> str:
+    """
+    Lấy tên từ AST node (Name, Attribute, Constant).
+
+    Args:
+        node: AST node
+
+    Returns:
+        str: Tên dạng dotted hoặc tên loại node
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return f"{get_name_from_node(node.value)}.{node.attr}"
+    elif isinstance(node, ast.Constant):
+        return str(node.value)
+    else:
+        return str(type(node).__name__)
+
+
+def _has_decorator(node: ast.AST, name: str) -> bool:
+    """Kiểm tra function có decorator dạng @name."""
+    return any(isinstance(d, ast.Name) and d.id == name for d in node.decorator_list)
+
+
+def _extract_function_info(node: ast.AST) -> PythonFunctionInfo:
+    """Trích xuất PythonFunctionInfo từ FunctionDef/AsyncFunctionDef."""
+    parameters = [
+        PythonParameterInfo(
+            name=arg.arg,
+            annotation=get_name_from_node(arg.annotation) if arg.annotation is not None else None
+        )
+        for arg in node.args.args
+    ]
+
+    return PythonFunctionInfo(
+        name=node.name,
+        line_number=node.lineno,
+        end_line_number=getattr(node, 'end_lineno', None),
+        parameters=parameters,
+        is_async=isinstance(node, ast.AsyncFunctionDef),
+        is_static=_has_decorator(node, 'staticmethod'),
+        is_class_method=_has_decorator(node, 'classmethod'),
+        is_property=_has_decorator(node, 'property'),
+        docstring=ast.get_docstring(node)
+    )
+
+
+def extract_python_parse_info(tree: ast.AST) -> PythonParseInfo:
+    """
+    Trích xuất summary từ Python AST trong một lần duyệt cây.
+
+    Args:
+        tree: AST tree của file
+
+    Returns:
+        PythonParseInfo: Summary của file
+    """
+    info = PythonParseInfo()
+    # Reason: methods được gặp hai lần (trong class body và trong ast.walk),
+    # dùng chung một object để summary nhỏ hơn khi pickle/cache
+    function_infos: Dict[int, PythonFunctionInfo] = {}
+
+    def function_info_for(node: ast.AST) -> PythonFunctionInfo:
+        if id(node) not in function_infos:
+            function_infos[id(node)] = _extract_function_info(node)
+        return function_infos[id(node)]
+
+    for node in ast.walk(tree):
+        info.nodes_count += 1
+
+        if isinstance(node, ast.Import):
+            info.imports_count += 1
+            for alias in node.names:
+                info.imports.append(PythonImportInfo(
+                    imported_name=alias.name,
+                    alias=alias.asname,
+                    line_number=node.lineno
+                ))
+
+        elif isinstance(node, ast.ImportFrom):
+            info.imports_count += 1
+            module_name = node.module or ''
+            for alias in node.names:
+                info.imports.append(PythonImportInfo(
+                    imported_name=f"{module_name}.{alias.name}" if module_name else alias.name,
+                    alias=alias.asname,
+                    line_number=node.lineno,
+                    is_from_import=True,
+                    module_name=module_name
+                ))
+
+        elif isinstance(node, ast.ClassDef):
+            info.classes_count += 1
+            info.classes.append(PythonClassInfo(
+                name=node.name,
+                line_number=node.lineno,
+                end_line_number=getattr(node, 'end_lineno', None),
+                base_classes=[get_name_from_node(base) for base in node.bases],
+                docstring=ast.get_docstring(node),
+                methods=[
+                    function_info_for(item) for item in node.body
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                ]
+            ))
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if isinstance(node, ast.FunctionDef):
+                info.functions_count += 1
+            info.functions.append(function_info_for(node))
+
+    return info
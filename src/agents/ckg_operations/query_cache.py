@@ -0,0 +1,232 @@
+"""
+Query Result Cache for CKG Operations Team.
+
+Bounded LRU cache with TTL for CKGQueryInterfaceAgent read queries. Entries
+are keyed by normalized query text and parameters and are dropped whenever
+a builder in this process writes to the graph (see
+``invalidate_query_caches``).
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from loguru import logger
+
+
+# Bumped on every graph write in this process; caches compare against it
+_graph_version = 0
+_graph_version_lock = threading.Lock()
+
+# Cypher clauses that modify the graph; queries containing them are never cached
+WRITE_CLAUSE_PATTERN = re.compile(
+    r'\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|LOAD\s+CSV)\b', re.IGNORECASE
+)
+
+
+def invalidate_query_caches() -> int:
+    """
+    Mark every query cache in this process as stale.
+
+    Called by the CKG builder and bulk loader after writing to Neo4j.
+
+    Returns:
+        int: The new graph version
+    """
+    global _graph_version
+    with _graph_version_lock:
+        _graph_version += 1
+        return _graph_version
+
+
+def get_graph_version() -> int:
+    """Return the current graph version of this process."""
+    return _graph_version
+
+
+def is_write_query(query: str) -> bool:
+    """Check whether a Cypher query modifies the graph."""
+    return WRITE_CLAUSE_PATTERN.search(query) is not None
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Roughly estimate the memory footprint of a query result in bytes.
+
+    Args:
+        value: Records (lists/dicts of primitives)
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+@dataclass
+class _CacheEntry:
+    """One cached query result."""
+    records: List[Dict[str, Any]]
+    size_bytes: int
+    expires_at: float
+
+
+class QueryResultCache:
+    """
+    Thread-safe LRU cache of query records with TTL, entry and memory bounds.
+
+    Example:
+        >>> cache = QueryResultCache(max_entries=1024, max_memory_mb=64, ttl_seconds=300)
+        >>> key = cache.make_key(query, parameters)
+        >>> records = cache.get(key)
+        >>> if records is None:
+        ...     cache.put(key, run_query())
+    """
+
+    def __init__(self, max_entries: int = 1024, max_memory_mb: float = 64,
+                 ttl_seconds: Optional[float] = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached queries (0 disables caching)
+            max_memory_mb: Maximum estimated size of all cached records
+            ttl_seconds: Seconds an entry stays valid (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._graph_version = get_graph_version()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """Return cached keys from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    @staticmethod
+    def make_key(query: str, parameters: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """
+        Build a cache key from query text and parameters.
+
+        Whitespace in the query is collapsed and parameters are serialized
+        with sorted keys, so formatting differences map to the same entry.
+        """
+        normalized_query = " ".join(query.split())
+        normalized_params = json.dumps(parameters or {}, sort_keys=True, default=str)
+        return normalized_query, normalized_params
+
+    def _check_graph_version(self):
+        """Drop all entries if the graph was written since they were cached."""
+        version = get_graph_version()
+        if version != self._graph_version:
+            if self._entries:
+                self.invalidations += 1
+                logger.debug(f"Query cache invalidated ({len(self._entries)} entries)")
+            self._entries.clear()
+            self.size_bytes = 0
+            self._graph_version = version
+
+    def get(self, key: Tuple[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached records.
+
+        Returns:
+            A copy of the cached records, or None on miss/expiry
+        """
+        with self._lock:
+            self._check_graph_version()
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(record) for record in entry.records]
+
+    def put(self, key: Tuple[str, str], records: List[Dict[str, Any]]) -> bool:
+        """
+        Store records for a key.
+
+        Returns:
+            bool: False if the result was too large to cache
+        """
+        if self.max_entries <= 0:
+            return False
+
+        size_bytes = estimate_size(records)
+        if size_bytes > self.max_memory_bytes:
+            return False
+
+        expires_at = (time.monotonic() + self.ttl_seconds
+                      if self.ttl_seconds is not None else float('inf'))
+        with self._lock:
+            self._check_graph_version()
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry([dict(record) for record in records], size_bytes, expires_at)
+            self.size_bytes += size_bytes
+
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_memory_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key)
+        self.size_bytes -= entry.size_bytes
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Entry count, memory use, hit/miss counters
+        """
+        with self._lock:
+            self._check_graph_version()
+            lookups = self.hits + self.misses
+            return {
+                'cache_size': len(self._entries),
+                'size_bytes': self.size_bytes,
+                'max_entries': self.max_entries,
+                'max_memory_bytes': self.max_memory_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
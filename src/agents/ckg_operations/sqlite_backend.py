@@ -0,0 +1,1039 @@
+"""
+SQLite Backend for CKG Operations Team.
+
+Embedded CKG store for CI scans and single-user deployments without a
+Neo4j server. The graph lives in two adjacency tables:
+
+- ``nodes(id, label, name, file_path, line_number, properties)`` with the
+  full property map as JSON and indexes on (label, name) and
+  (file_path, label),
+- ``edges(source_id, rel_type, target_id, properties)`` keyed by
+  (source_id, rel_type, target_id) with a reverse index on
+  (target_id, rel_type).
+
+SQLiteCKGBackend implements CKGStorageBackend for ASTtoCKGBuilderAgent and
+the CKGQueryInterfaceAgent query methods with the same result columns.
+Raw Cypher (execute_query) is not supported; use execute_sql instead.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from .ckg_schema import CKGSchema, NodeProperties, RelationshipProperties
+from .ckg_query_interface import CKGQueryResult, CKGQueryPage
+from .graph_cycles import dependency_cycle_rows
+from .name_search import looks_like_regex, rank_name_matches
+from .storage_backend import CKGStorageBackend
+
+
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS nodes (
+        id TEXT PRIMARY KEY,
+        label TEXT NOT NULL,
+        name TEXT,
+        file_path TEXT,
+        line_number INTEGER,
+        properties TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_nodes_label_name ON nodes(label, name)",
+    "CREATE INDEX IF NOT EXISTS idx_nodes_file_label ON nodes(file_path, label)",
+    """
+    CREATE TABLE IF NOT EXISTS edges (
+        source_id TEXT NOT NULL,
+        rel_type TEXT NOT NULL,
+        target_id TEXT NOT NULL,
+        properties TEXT NOT NULL DEFAULT '{}',
+        PRIMARY KEY (source_id, rel_type, target_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id, rel_type)"
+]
+
+# One step of a traversal: (relationship type, target label or None, target name or None)
+Step = Tuple[str, Optional[str], Optional[str]]
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    """SQLite REGEXP function with Neo4j =~ semantics (whole-string match)."""
+    if value is None:
+        return False
+    try:
+        return re.fullmatch(pattern, value) is not None
+    except re.error:
+        return False
+
+
+class SQLiteCKGBackend(CKGStorageBackend):
+    """
+    CKG stored in an SQLite database (file or in-memory).
+
+    Example:
+        >>> backend = SQLiteCKGBackend("/tmp/ckg.db")
+        >>> builder = ASTtoCKGBuilderAgent(storage_backend=backend)
+        >>> builder.build_ckg_from_parse_result(parse_result)
+        >>> backend.get_functions_in_file("src/app.py").results
+    """
+
+    def __init__(self, database_path: str = ":memory:"):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            database_path: SQLite file path, or ":memory:" for a private in-memory graph
+        """
+        self.database_path = database_path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+        if database_path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in SQLITE_SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> 'SQLiteCKGBackend':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_connection(self):
+        """No Neo4j driver behind this backend (kept for API compatibility)."""
+        return None
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    # === Low-level helpers ===
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(sql, tuple(params)).fetchall()
+
+    @staticmethod
+    def _placeholders(values: Sequence[Any]) -> str:
+        return ", ".join("?" for _ in values)
+
+    @staticmethod
+    def _properties(row: sqlite3.Row, column: str = "properties") -> Dict[str, Any]:
+        return json.loads(row[column]) if row[column] else {}
+
+    @staticmethod
+    def _project(properties: Dict[str, Any], columns: Dict[str, str]) -> Dict[str, Any]:
+        """Map node properties to result columns ({column: property})."""
+        return {column: properties.get(prop) for column, prop in columns.items()}
+
+    @staticmethod
+    def _result(query: str, results: List[Dict[str, Any]], start_time: float) -> CKGQueryResult:
+        return CKGQueryResult(
+            query=query,
+            results=results,
+            total_count=len(results),
+            execution_time_ms=(time.time() - start_time) * 1000,
+            success=True
+        )
+
+    def _traverse(self, start_label: Optional[str], start_where: str, start_params: Sequence[Any],
+                  steps: Sequence[Step]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Follow a chain of relationships from matching start nodes.
+
+        Args:
+            start_label: Label of the start nodes (None for any)
+            start_where: SQL condition on the start node alias ``n0``
+            start_params: Parameters of start_where
+            steps: (relationship type, target label, target name) per hop
+
+        Returns:
+            List of (start node properties, end node properties)
+        """
+        joins, params = [], []
+        for position, (rel_type, label, name) in enumerate(steps, 1):
+            join = (f"JOIN edges e{position} ON e{position}.source_id = n{position - 1}.id "
+                    f"AND e{position}.rel_type = ? "
+                    f"JOIN nodes n{position} ON n{position}.id = e{position}.target_id")
+            params.append(rel_type)
+            if label is not None:
+                join += f" AND n{position}.label = ?"
+                params.append(label)
+            if name is not None:
+                join += f" AND n{position}.name = ?"
+                params.append(name)
+            joins.append(join)
+
+        where = [start_where] if start_where else []
+        where_params = list(start_params)
+        if start_label is not None:
+            where.insert(0, "n0.label = ?")
+            where_params.insert(0, start_label)
+
+        sql = (f"SELECT n0.properties AS start, n{len(steps)}.properties AS end FROM nodes n0 "
+               + " ".join(joins)
+               + (" WHERE " + " AND ".join(where) if where else ""))
+        return [(self._properties(row, "start"), self._properties(row, "end"))
+                for row in self._fetch(sql, params + where_params)]
+
+    def _elements_in_files(self, query: str, file_paths: List[str], steps: Sequence[Step],
+                           columns: Dict[str, str], with_file_path: bool = False) -> CKGQueryResult:
+        """Elements reached from File nodes of the given paths, ordered by path and line."""
+        start_time = time.time()
+        if not file_paths:
+            return self._result(query, [], start_time)
+
+        pairs = self._traverse("File", f"n0.file_path IN ({self._placeholders(file_paths)})",
+                               file_paths, steps)
+        pairs.sort(key=lambda pair: (pair[0].get("file_path") or "", pair[1].get("line_number") or 0))
+        results = []
+        for file_node, element in pairs:
+            row = {"file_path": file_node.get("file_path")} if with_file_path else {}
+            row.update(self._project(element, columns))
+            results.append(row)
+        return self._result(query, results, start_time)
+
+    def _nodes(self, label: str, where: str = "", params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Properties of nodes with a label matching an optional SQL condition on ``n``."""
+        sql = "SELECT n.properties FROM nodes n WHERE n.label = ?" + (f" AND {where}" if where else "")
+        return [self._properties(row) for row in self._fetch(sql, [label, *params])]
+
+    def _neighbor_names(self, node_id: str, rel_type: str, label: Optional[str],
+                        incoming: bool = False) -> List[str]:
+        """Distinct names of nodes linked to a node by one relationship type."""
+        near, far = ("target_id", "source_id") if incoming else ("source_id", "target_id")
+        sql = (f"SELECT DISTINCT n.name FROM edges e JOIN nodes n ON n.id = e.{far} "
+               f"WHERE e.{near} = ? AND e.rel_type = ?")
+        params = [node_id, rel_type]
+        if label is not None:
+            sql += " AND n.label = ?"
+            params.append(label)
+        return [row["name"] for row in self._fetch(sql + " ORDER BY n.name", params) if row["name"] is not None]
+
+    def _count_labels(self, labels: Iterable[str]) -> Dict[str, int]:
+        labels = list(labels)
+        counts = {label: 0 for label in labels}
+        sql = f"SELECT label, COUNT(*) AS count FROM nodes WHERE label IN ({self._placeholders(labels)}) GROUP BY label"
+        for row in self._fetch(sql, labels):
+            counts[row["label"]] = row["count"]
+        return counts
+
+    def _mutual_file_dependencies(self, query: str, steps: Sequence[Step]) -> CKGQueryResult:
+        """File pairs that depend on each other through the given chain."""
+        start_time = time.time()
+        pairs = {(start.get("file_path"), end.get("file_path"))
+                 for start, end in self._traverse("File", "", (), steps)}
+        results = [{"file1": file1, "file2": file2, "path_length": len(steps)}
+                   for file1, file2 in sorted(pairs, key=lambda pair: (pair[0] or "", pair[1] or ""))
+                   if file1 != file2 and (file2, file1) in pairs]
+        return self._result(query, results, start_time)
+
+    # === CKGStorageBackend ===
+
+    def write_graph(self, nodes: Iterable[NodeProperties],
+                    relationships: Iterable[RelationshipProperties]) -> int:
+        """
+        Insert or replace nodes by id and add relationships in one transaction.
+
+        Returns:
+            int: Number of nodes and relationships written
+        """
+        node_rows = []
+        for node in nodes:
+            row = CKGSchema.get_node_row(node)
+            node_rows.append((row["id"], node.type.value, row.get("name"), row.get("file_path"),
+                              row.get("line_number"), json.dumps(row, default=str)))
+
+        edge_rows = []
+        for relationship in relationships:
+            row = CKGSchema.get_relationship_row(relationship)
+            edge_rows.append((row["source_id"], relationship.type.value, row["target_id"],
+                              json.dumps(row["properties"], default=str), row["source_id"], row["target_id"]))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO nodes (id, label, name, file_path, line_number, properties) "
+                "VALUES (?, ?, ?, ?, ?, ?)", node_rows)
+            # Like MATCH in Neo4j: skip relationships whose endpoints do not exist
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO edges (source_id, rel_type, target_id, properties) "
+                "SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM nodes WHERE id = ?) "
+                "AND EXISTS (SELECT 1 FROM nodes WHERE id = ?)", edge_rows)
+
+        logger.info(f"SQLite CKG: ghi {len(node_rows)} nodes, {len(edge_rows)} relationships")
+        return len(node_rows) + len(edge_rows)
+
+    def delete_file_subgraphs(self, file_paths: List[str]) -> int:
+        """Delete nodes of the files and every relationship touching them."""
+        if not file_paths:
+            return 0
+        placeholders = self._placeholders(file_paths)
+        file_nodes = f"SELECT id FROM nodes WHERE file_path IN ({placeholders})"
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM edges WHERE source_id IN ({file_nodes})", file_paths)
+            self._connection.execute(f"DELETE FROM edges WHERE target_id IN ({file_nodes})", file_paths)
+            cursor = self._connection.execute(f"DELETE FROM nodes WHERE file_path IN ({placeholders})", file_paths)
+        return cursor.rowcount
+
+    def collect_incoming_links(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """Cross-file relationships from other files into the files."""
+        if not file_paths:
+            return []
+        placeholders = self._placeholders(file_paths)
+        rel_types = [rel.value for rel in CKGSchema.CROSS_FILE_RELATIONSHIPS]
+        sql = f"""
+        SELECT s.id AS source_id, s.label AS source_label, e.rel_type AS rel_type,
+               t.label AS target_label, t.file_path AS target_file_path, t.name AS target_name,
+               e.properties AS properties
+        FROM nodes t
+        JOIN edges e ON e.target_id = t.id
+        JOIN nodes s ON s.id = e.source_id
+        WHERE t.file_path IN ({placeholders})
+          AND (s.file_path IS NULL OR s.file_path NOT IN ({placeholders}))
+          AND e.rel_type IN ({self._placeholders(rel_types)})
+        """
+        rows = self._fetch(sql, [*file_paths, *file_paths, *rel_types])
+        return [dict(row, properties=self._properties(row)) for row in rows]
+
+    def restore_links(self, incoming_links: List[Dict[str, Any]]) -> int:
+        """Re-attach collected links to rebuilt targets matched by (label, file_path, name)."""
+        restored = 0
+        with self._lock, self._connection:
+            for link in incoming_links:
+                cursor = self._connection.execute(
+                    """
+                    INSERT OR REPLACE INTO edges (source_id, rel_type, target_id, properties)
+                    SELECT ?, ?, t.id, ? FROM nodes t
+                    WHERE t.label = ? AND t.file_path = ? AND t.name = ?
+                      AND EXISTS (SELECT 1 FROM nodes s WHERE s.id = ?)
+                    """,
+                    (link["source_id"], link["rel_type"], json.dumps(link.get("properties") or {}),
+                     link.get("target_label"), link["target_file_path"], link["target_name"],
+                     link["source_id"]))
+                restored += max(cursor.rowcount, 0)
+        return restored
+
+    def collect_in_degree_scope(self, file_paths: List[str]) -> Tuple[List[str], List[str]]:
+        """Ids of in-degree targets reached from the files and the files' DartImport names."""
+        if not file_paths:
+            return [], []
+        placeholders = self._placeholders(file_paths)
+        rel_types = [rel.value for rel in CKGSchema.IN_DEGREE_INDEX]
+        targets = self._fetch(f"""
+        SELECT DISTINCT t.id AS id FROM nodes s
+        JOIN edges e ON e.source_id = s.id
+        JOIN nodes t ON t.id = e.target_id
+        WHERE s.file_path IN ({placeholders})
+          AND (t.file_path IS NULL OR t.file_path NOT IN ({placeholders}))
+          AND e.rel_type IN ({self._placeholders(rel_types)})
+        """, [*file_paths, *file_paths, *rel_types])
+        imports = self._fetch(f"""
+        SELECT json_extract(properties, '$.imported_name') AS imported_name FROM nodes
+        WHERE label = 'DartImport' AND file_path IN ({placeholders})
+        """, file_paths)
+        return [row["id"] for row in targets], [row["imported_name"] for row in imports]
+
+    def refresh_in_degree_index(self, scope: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Store in-degrees (CKGSchema.IN_DEGREE_INDEX) and DartExport import_refs
+        as node properties, mirroring the Neo4j in-degree index. With a scope
+        only the nodes touched by an incremental update are recomputed.
+        """
+        scope_sql, scope_params = "", []
+        if scope is not None:
+            paths, ids = list(scope.get("paths") or []), list(scope.get("ids") or [])
+            scope_sql = f" AND (file_path IN ({self._placeholders(paths)}) OR id IN ({self._placeholders(ids)}))"
+            scope_params = [*paths, *ids]
+
+        refs_path = f"$.{CKGSchema.DART_EXPORT_IMPORT_REFS}"
+        import_rows_sql = """
+        SELECT DISTINCT imp.id AS id, json_extract(imp.properties, '$.imported_name') AS imported_name
+        FROM nodes f
+        JOIN edges e ON e.source_id = f.id AND e.rel_type = 'IMPORTS'
+        JOIN nodes imp ON imp.id = e.target_id AND imp.label = 'DartImport'
+        WHERE f.label = 'File'
+        """
+        with self._lock, self._connection:
+            for relationship_type, node_types in CKGSchema.IN_DEGREE_INDEX.items():
+                path = f"$.{CKGSchema.in_degree_property(relationship_type)}"
+                for node_type in node_types:
+                    self._connection.execute(
+                        """
+                        UPDATE nodes SET properties = json_set(properties, ?, (
+                            SELECT COUNT(*) FROM edges e WHERE e.target_id = nodes.id AND e.rel_type = ?))
+                        WHERE label = ?
+                        """ + scope_sql, (path, relationship_type.value, node_type.value, *scope_params))
+
+            if scope is None:
+                # Một lượt qua imports: đếm theo path suffix rồi tra theo tên export
+                refs: Dict[str, int] = {}
+                for row in self._connection.execute(import_rows_sql):
+                    for name in set(CKGSchema.dart_import_ref_names(row["imported_name"])):
+                        refs[name] = refs.get(name, 0) + 1
+                exports = self._connection.execute(
+                    "SELECT id, name FROM nodes WHERE label = 'DartExport'").fetchall()
+                self._connection.executemany(
+                    "UPDATE nodes SET properties = json_set(properties, ?, ?) WHERE id = ?",
+                    [(refs_path, refs.get(row["name"], 0), row["id"]) for row in exports])
+            else:
+                paths, ref_names = list(scope.get("paths") or []), list(scope.get("ref_names") or [])
+                self._connection.execute(
+                    f"""
+                    UPDATE nodes SET properties = json_set(properties, ?, (
+                        SELECT COUNT(*) FROM ({import_rows_sql}) imp
+                        WHERE imp.imported_name = nodes.name
+                           OR imp.imported_name = 'package:' || nodes.name
+                           OR substr(imp.imported_name, -length(nodes.name) - 1) = '/' || nodes.name))
+                    WHERE label = 'DartExport'
+                      AND (file_path IN ({self._placeholders(paths)}) OR name IN ({self._placeholders(ref_names)}))
+                    """, (refs_path, *paths, *ref_names))
+
+    # === Generic query API ===
+
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True) -> CKGQueryResult:
+        """
+        Cypher is not available without Neo4j; returns a failed result so
+        callers fall back the same way as when Neo4j is unreachable.
+        """
+        return CKGQueryResult(
+            query=query,
+            results=[],
+            total_count=0,
+            execution_time_ms=0,
+            success=False,
+            error_message="SQLite backend không hỗ trợ Cypher queries (dùng execute_sql)"
+        )
+
+    def execute_sql(self, sql: str, parameters: Sequence[Any] = ()) -> CKGQueryResult:
+        """
+        Run a read-only SQL query against the nodes/edges tables.
+
+        Args:
+            sql: SELECT statement
+            parameters: Positional parameters
+
+        Returns:
+            CKGQueryResult: Rows as dicts
+        """
+        start_time = time.time()
+        try:
+            rows = [dict(row) for row in self._fetch(sql, parameters)]
+            return self._result(sql, rows, start_time)
+        except sqlite3.Error as e:
+            logger.error(f"Lỗi thực thi SQL: {str(e)}")
+            return CKGQueryResult(
+                query=sql,
+                results=[],
+                total_count=0,
+                execution_time_ms=(time.time() - start_time) * 1000,
+                success=False,
+                error_message=str(e)
+            )
+
+    def clear_cache(self):
+        """SQLite queries are not cached (kept for API compatibility)."""
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return an empty cache summary (kept for API compatibility)."""
+        return {'cache_size': 0, 'cached_queries': [], 'backend': 'sqlite'}
+
+    # === Python Query Methods ===
+
+    _FUNCTION_COLUMNS = {"name": "name", "line_number": "line_number",
+                         "params_count": "parameters_count", "docstring": "docstring"}
+    _CLASS_COLUMNS = {"name": "name", "line_number": "line_number", "methods_count": "methods_count",
+                      "base_classes": "base_classes", "docstring": "docstring"}
+    _IMPORT_COLUMNS = {"name": "name", "imported_name": "imported_name", "alias": "alias",
+                       "is_from_import": "is_from_import", "module_name": "module_name",
+                       "line_number": "line_number"}
+    _METHOD_COLUMNS = {"name": "name", "line_number": "line_number", "params_count": "parameters_count",
+                       "is_static": "is_static", "is_class_method": "is_class_method",
+                       "docstring": "docstring"}
+
+    _MODULE_FUNCTIONS: Tuple[Step, ...] = (("CONTAINS", "Module", None), ("DEFINES_FUNCTION", "Function", None))
+    _MODULE_CLASSES: Tuple[Step, ...] = (("CONTAINS", "Module", None), ("DEFINES_CLASS", "Class", None))
+    _MODULE_IMPORTS: Tuple[Step, ...] = (("CONTAINS", "Module", None), ("IMPORTS", "Import", None))
+
+    def get_functions_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả functions trong một file."""
+        return self._elements_in_files("get_functions_in_file", [file_path],
+                                       self._MODULE_FUNCTIONS, self._FUNCTION_COLUMNS)
+
+    def get_classes_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả classes trong một file."""
+        return self._elements_in_files("get_classes_in_file", [file_path],
+                                       self._MODULE_CLASSES, self._CLASS_COLUMNS)
+
+    def get_methods_in_class(self, class_name: str, file_path: Optional[str] = None) -> CKGQueryResult:
+        """Lấy tất cả methods trong một class."""
+        start_time = time.time()
+        method_step = ("DEFINES_METHOD", "Method", None)
+        if file_path:
+            pairs = self._traverse("File", "n0.file_path = ?", [file_path],
+                                   [("CONTAINS", "Module", None), ("DEFINES_CLASS", "Class", class_name),
+                                    method_step])
+            columns = self._METHOD_COLUMNS
+        else:
+            pairs = self._traverse("Class", "n0.name = ?", [class_name], [method_step])
+            columns = dict(self._METHOD_COLUMNS, file_path="file_path")
+        methods = sorted((method for _, method in pairs), key=lambda method: method.get("line_number") or 0)
+        return self._result("get_methods_in_class", [self._project(method, columns) for method in methods],
+                            start_time)
+
+    def get_imports_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả imports trong một file."""
+        return self._elements_in_files("get_imports_in_file", [file_path],
+                                       self._MODULE_IMPORTS, self._IMPORT_COLUMNS)
+
+    def get_functions_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """Lấy functions của nhiều files trong một query."""
+        return self._elements_in_files("get_functions_in_files", list(file_paths),
+                                       self._MODULE_FUNCTIONS, self._FUNCTION_COLUMNS, with_file_path=True)
+
+    def get_classes_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """Lấy classes của nhiều files trong một query."""
+        return self._elements_in_files("get_classes_in_files", list(file_paths),
+                                       self._MODULE_CLASSES, self._CLASS_COLUMNS, with_file_path=True)
+
+    def get_imports_in_files(self, file_paths: List[str]) -> CKGQueryResult:
+        """Lấy imports của nhiều files trong một query."""
+        return self._elements_in_files("get_imports_in_files", list(file_paths),
+                                       self._MODULE_IMPORTS, self._IMPORT_COLUMNS, with_file_path=True)
+
+    def _group_dependencies(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """Imports grouped by (file, module_name) like COUNT/COLLECT in Cypher."""
+        groups: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        if not file_paths:
+            return []
+        pairs = self._traverse("File", f"n0.file_path IN ({self._placeholders(file_paths)})",
+                               file_paths, self._MODULE_IMPORTS)
+        for file_node, imp in pairs:
+            key = (file_node.get("file_path"), imp.get("module_name"))
+            group = groups.setdefault(key, {"file_path": key[0], "dependency": key[1],
+                                            "import_count": 0, "imported_items": []})
+            group["import_count"] += 1
+            if imp.get("imported_name") is not None:
+                group["imported_items"].append(imp["imported_name"])
+        return sorted(groups.values(), key=lambda row: (row["file_path"] or "", row["dependency"] or ""))
+
+    def get_files_dependencies(self, file_paths: List[str]) -> CKGQueryResult:
+        """Lấy dependencies của nhiều files trong một query."""
+        start_time = time.time()
+        return self._result("get_files_dependencies", self._group_dependencies(list(file_paths)), start_time)
+
+    def get_file_dependencies(self, file_path: str) -> CKGQueryResult:
+        """Lấy dependencies của một file."""
+        start_time = time.time()
+        rows = self._group_dependencies([file_path])
+        for row in rows:
+            del row["file_path"]
+        return self._result("get_file_dependencies", rows, start_time)
+
+    def find_function_callers(self, function_name: str) -> CKGQueryResult:
+        """Tìm những functions gọi đến function đã cho."""
+        start_time = time.time()
+        sql = """
+        SELECT c.properties AS caller, t.properties AS target
+        FROM nodes t
+        JOIN edges e ON e.target_id = t.id AND e.rel_type = 'CALLS'
+        JOIN nodes c ON c.id = e.source_id
+        WHERE t.label = 'Function' AND t.name = ?
+        """
+        results = []
+        for row in self._fetch(sql, [function_name]):
+            caller, target = self._properties(row, "caller"), self._properties(row, "target")
+            results.append({
+                "caller_name": caller.get("name"), "caller_type": caller.get("type"),
+                "caller_file": caller.get("file_path"), "caller_line": caller.get("line_number"),
+                "target_name": target.get("name"), "target_file": target.get("file_path")
+            })
+        return self._result("find_function_callers", results, start_time)
+
+    def find_function_callees(self, function_name: str, file_path: Optional[str] = None) -> CKGQueryResult:
+        """Tìm những functions được gọi bởi function đã cho."""
+        start_time = time.time()
+        where, params = "n0.name = ?", [function_name]
+        if file_path:
+            where, params = where + " AND n0.file_path = ?", params + [file_path]
+        results = []
+        for caller, target in self._traverse("Function", where, params, [("CALLS", None, None)]):
+            results.append({
+                "target_name": target.get("name"), "target_type": target.get("type"),
+                "target_file": target.get("file_path"), "target_line": target.get("line_number"),
+                "caller_name": caller.get("name"), "caller_file": caller.get("file_path")
+            })
+        return self._result("find_function_callees", results, start_time)
+
+    def get_class_hierarchy(self, class_name: str) -> CKGQueryResult:
+        """Lấy hierarchy của một class (base classes và derived classes)."""
+        start_time = time.time()
+        results = []
+        for cls in self._nodes("Class", "n.name = ?", [class_name]):
+            results.append({
+                "class_name": cls.get("name"),
+                "class_file": cls.get("file_path"),
+                "base_classes": self._neighbor_names(cls["id"], "INHERITS_FROM", "Class"),
+                "derived_classes": self._neighbor_names(cls["id"], "INHERITS_FROM", "Class", incoming=True)
+            })
+        return self._result("get_class_hierarchy", results, start_time)
+
+    def find_circular_dependencies(self, minimal_cycles: bool = False,
+                                   max_cycles_per_component: Optional[int] = 10) -> CKGQueryResult:
+        """Tìm circular dependencies giữa các modules (SCC in-memory trên IMPORTS edges)."""
+        start_time = time.time()
+        sql = """
+        SELECT s.name AS source, t.name AS target
+        FROM nodes s
+        JOIN edges e ON e.source_id = s.id AND e.rel_type = 'IMPORTS'
+        JOIN nodes t ON t.id = e.target_id AND t.label = 'Module'
+        WHERE s.label = 'Module'
+        """
+        graph: Dict[str, set] = {}
+        for row in self._fetch(sql):
+            if row["source"] and row["target"]:
+                graph.setdefault(row["source"], set()).add(row["target"])
+        return self._result("find_circular_dependencies",
+                            dependency_cycle_rows(graph, minimal_cycles, max_cycles_per_component),
+                            start_time)
+
+    def _unused_functions_sql(self, file_path: Optional[str]) -> Tuple[str, List[Any]]:
+        sql = """
+        SELECT n.properties FROM nodes n
+        WHERE n.label = 'Function' AND n.name NOT LIKE '\\_%' ESCAPE '\\'
+          AND (json_extract(n.properties, '$.in_degree_calls') = 0
+               OR (json_extract(n.properties, '$.in_degree_calls') IS NULL
+                   AND NOT EXISTS (SELECT 1 FROM edges e WHERE e.target_id = n.id AND e.rel_type = 'CALLS')))
+        """
+        params: List[Any] = []
+        if file_path:
+            sql += """
+          AND EXISTS (SELECT 1 FROM nodes f
+                      JOIN edges c ON c.source_id = f.id AND c.rel_type = 'CONTAINS'
+                      JOIN edges d ON d.source_id = c.target_id AND d.rel_type = 'DEFINES_FUNCTION'
+                      WHERE f.label = 'File' AND f.file_path = ? AND d.target_id = n.id)
+            """
+            params.append(file_path)
+        return sql, params
+
+    def get_unused_public_functions(self, file_path: Optional[str] = None) -> CKGQueryResult:
+        """Tìm public functions không được sử dụng."""
+        start_time = time.time()
+        sql, params = self._unused_functions_sql(file_path)
+        functions = [self._properties(row) for row in self._fetch(sql, params)]
+        if file_path:
+            functions.sort(key=lambda func: func.get("name") or "")
+        else:
+            functions.sort(key=lambda func: (func.get("file_path") or "", func.get("name") or ""))
+        columns = {"name": "name", "file_path": "file_path", "line_number": "line_number",
+                   "docstring": "docstring"}
+        return self._result("get_unused_public_functions",
+                            [self._project(func, columns) for func in functions], start_time)
+
+    def _page(self, query: str, sql: str, params: List[Any], columns: Dict[str, str],
+              cursor: Optional[str], page_size: int) -> CKGQueryPage:
+        """Keyset page over node id (limit + 1 probe, like execute_query_page)."""
+        start_time = time.time()
+        rows = self._fetch(f"{sql} AND n.id > ? ORDER BY n.id LIMIT ?", [*params, cursor or "", page_size + 1])
+        has_more = len(rows) > page_size
+        results = [self._project(self._properties(row), columns) for row in rows[:page_size]]
+        return CKGQueryPage(
+            query=query,
+            results=results,
+            next_cursor=results[-1]["id"] if has_more else None,
+            has_more=has_more,
+            execution_time_ms=(time.time() - start_time) * 1000,
+            success=True
+        )
+
+    def get_unused_public_functions_page(self, file_path: Optional[str] = None,
+                                         cursor: Optional[str] = None,
+                                         page_size: int = 1000) -> CKGQueryPage:
+        """Tìm public functions không được sử dụng, theo từng trang (cursor trên id)."""
+        sql, params = self._unused_functions_sql(file_path)
+        columns = {"id": "id", "name": "name", "file_path": "file_path", "line_number": "line_number",
+                   "docstring": "docstring"}
+        return self._page("get_unused_public_functions_page", sql, params, columns, cursor, page_size)
+
+    def get_project_statistics(self) -> CKGQueryResult:
+        """Lấy thống kê tổng quan về project."""
+        start_time = time.time()
+        counts = self._count_labels(["File", "Module", "Class", "Function", "Method", "Import"])
+        relationships = self._fetch("SELECT COUNT(*) AS count FROM edges")[0]["count"]
+        return self._result("get_project_statistics", [{
+            "files_count": counts["File"],
+            "modules_count": counts["Module"],
+            "classes_count": counts["Class"],
+            "functions_count": counts["Function"],
+            "methods_count": counts["Method"],
+            "imports_count": counts["Import"],
+            "relationships_count": relationships
+        }], start_time)
+
+    def _search_rows(self, where: str, params: List[Any], labels: Optional[List[str]]) -> List[Dict[str, Any]]:
+        sql = "SELECT label, properties FROM nodes n WHERE " + where
+        if labels:
+            sql += f" AND n.label IN ({self._placeholders(labels)})"
+            params = [*params, *labels]
+        rows = []
+        for row in self._fetch(sql, params):
+            node = self._properties(row)
+            rows.append({"id": node.get("id"), "name": node.get("name"), "types": [row["label"]],
+                         "type": row["label"], "file_path": node.get("file_path"),
+                         "line_number": node.get("line_number"), "docstring": node.get("docstring")})
+        return rows
+
+    def search_by_name(self, name_pattern: str, node_types: Optional[List[str]] = None,
+                       limit: Optional[int] = None) -> CKGQueryResult:
+        """
+        Tìm kiếm nodes theo tên.
+
+        Tên thường được tìm theo substring (không phân biệt hoa thường) và xếp
+        hạng exact/prefix/substring như full-text search của Neo4j (không có
+        fuzzy matching); patterns có cú pháp regex dùng REGEXP.
+        """
+        start_time = time.time()
+        if looks_like_regex(name_pattern) or not name_pattern.strip():
+            rows = self._search_rows("n.name REGEXP ?", [f"(?i).*{name_pattern}.*"], node_types)
+            rows.sort(key=lambda row: row["name"] or "")
+            for row in rows:
+                del row["id"]
+            return self._result("search_by_name", rows[:limit] if limit is not None else rows, start_time)
+
+        terms = name_pattern.lower().split()
+        where = "(" + " OR ".join("lower(n.name) LIKE ? ESCAPE '\\'" for _ in terms) + ")"
+        params = ["%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                  for term in terms]
+        rows = self._search_rows(where, params, node_types)
+        for row in rows:
+            del row["id"]
+        return self._result("search_by_name", rank_name_matches(rows, name_pattern, limit), start_time)
+
+    def search_by_name_page(self, name_pattern: str, node_types: Optional[List[str]] = None,
+                            cursor: Optional[str] = None, page_size: int = 1000) -> CKGQueryPage:
+        """Tìm kiếm nodes theo tên (regex), theo từng trang (cursor trên id)."""
+        start_time = time.time()
+        where, params = "n.name REGEXP ? AND n.id > ?", [f"(?i).*{name_pattern}.*", cursor or ""]
+        if node_types:
+            where += f" AND n.label IN ({self._placeholders(node_types)})"
+            params += list(node_types)
+        sql = f"SELECT label, properties FROM nodes n WHERE {where} ORDER BY n.id LIMIT ?"
+        rows = self._fetch(sql, [*params, page_size + 1])
+        has_more = len(rows) > page_size
+        results = []
+        for row in rows[:page_size]:
+            node = self._properties(row)
+            results.append({"id": node.get("id"), "name": node.get("name"), "types": [row["label"]],
+                            "file_path": node.get("file_path"), "line_number": node.get("line_number"),
+                            "docstring": node.get("docstring")})
+        return CKGQueryPage(
+            query="search_by_name_page",
+            results=results,
+            next_cursor=results[-1]["id"] if has_more else None,
+            has_more=has_more,
+            execution_time_ms=(time.time() - start_time) * 1000,
+            success=True
+        )
+
+    def get_complex_functions(self, min_parameters: int = 5) -> CKGQueryResult:
+        """Tìm functions phức tạp (nhiều parameters)."""
+        start_time = time.time()
+        functions = self._nodes("Function", "json_extract(n.properties, '$.parameters_count') >= ?",
+                                [min_parameters])
+        functions.sort(key=lambda func: (-(func.get("parameters_count") or 0), func.get("name") or ""))
+        columns = {"name": "name", "file_path": "file_path", "line_number": "line_number",
+                   "params_count": "parameters_count", "docstring": "docstring"}
+        return self._result("get_complex_functions", [self._project(func, columns) for func in functions],
+                            start_time)
+
+    # === Dart-specific Query Methods ===
+
+    def get_dart_classes_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart classes trong một file."""
+        return self._elements_in_files("get_dart_classes_in_file", [file_path],
+                                       [("DEFINES_DART_CLASS", "DartClass", None)],
+                                       {"name": "name", "line_number": "line_number", "package": "package_name",
+                                        "is_abstract": "is_abstract", "extends_class": "extends_class",
+                                        "implements_interfaces": "implements_interfaces"})
+
+    def get_dart_mixins_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart mixins trong một file."""
+        return self._elements_in_files("get_dart_mixins_in_file", [file_path],
+                                       [("DEFINES_DART_MIXIN", "DartMixin", None)],
+                                       {"name": "name", "line_number": "line_number", "package": "package_name",
+                                        "extends_interfaces": "extends_interfaces"})
+
+    def get_dart_extensions_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart extensions trong một file."""
+        return self._elements_in_files("get_dart_extensions_in_file", [file_path],
+                                       [("DEFINES_DART_EXTENSION", "DartExtension", None)],
+                                       {"name": "name", "line_number": "line_number",
+                                        "extends_class": "extends_class",
+                                        "implements_interfaces": "implements_interfaces"})
+
+    def get_dart_functions_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart functions trong một file."""
+        return self._elements_in_files("get_dart_functions_in_file", [file_path],
+                                       [("DEFINES_DART_FUNCTION", "DartFunction", None)],
+                                       {"name": "name", "line_number": "line_number", "return_type": "return_type",
+                                        "params_count": "parameters_count", "is_async": "is_async",
+                                        "is_generator": "is_generator"})
+
+    def get_dart_enums_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart enums trong một file."""
+        return self._elements_in_files("get_dart_enums_in_file", [file_path],
+                                       [("DEFINES_DART_ENUM", "DartEnum", None)],
+                                       {"name": "name", "line_number": "line_number", "package": "package_name",
+                                        "constants_count": "constants_count"})
+
+    def get_dart_imports_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart imports trong một file."""
+        return self._elements_in_files("get_dart_imports_in_file", [file_path],
+                                       [("IMPORTS", "DartImport", None)],
+                                       {"name": "name", "line_number": "line_number",
+                                        "imported_name": "imported_name",
+                                        "is_package_import": "is_package_import",
+                                        "is_relative_import": "is_relative_import"})
+
+    def get_dart_exports_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Dart exports trong một file."""
+        return self._elements_in_files("get_dart_exports_in_file", [file_path],
+                                       [("DART_EXPORTS", "DartExport", None)],
+                                       {"name": "name", "line_number": "line_number", "full_name": "full_name"})
+
+    def get_dart_library_info(self, file_path: str) -> CKGQueryResult:
+        """Lấy thông tin Dart library trong một file."""
+        return self._elements_in_files("get_dart_library_info", [file_path],
+                                       [("CONTAINS", "DartLibrary", None)],
+                                       {"name": "name", "line_number": "line_number", "full_name": "full_name"})
+
+    def find_dart_class_hierarchy(self, class_name: str) -> CKGQueryResult:
+        """Tìm hierarchy của Dart class (extends, implements, mixins)."""
+        start_time = time.time()
+        classes = self._nodes("DartClass", "n.name = ?", [class_name])
+        if not classes:
+            return self._result("find_dart_class_hierarchy", [], start_time)
+
+        def collect(rel_type: str, label: str) -> List[str]:
+            return sorted({name for cls in classes for name in self._neighbor_names(cls["id"], rel_type, label)})
+
+        return self._result("find_dart_class_hierarchy", [{
+            "class_name": class_name,
+            "extends_classes": collect("DART_EXTENDS", "DartClass"),
+            "implements_interfaces": collect("DART_IMPLEMENTS", "DartInterface"),
+            "mixes_in_mixins": collect("DART_MIXES_IN", "DartMixin")
+        }], start_time)
+
+    def get_dart_project_statistics(self) -> CKGQueryResult:
+        """Lấy thống kê tổng quan về Dart project."""
+        start_time = time.time()
+        columns = {"DartClass": "dart_classes_count", "DartMixin": "dart_mixins_count",
+                   "DartExtension": "dart_extensions_count", "DartFunction": "dart_functions_count",
+                   "DartEnum": "dart_enums_count", "DartImport": "dart_imports_count",
+                   "DartExport": "dart_exports_count", "DartLibrary": "dart_libraries_count"}
+        counts = self._count_labels(columns)
+        return self._result("get_dart_project_statistics",
+                            [{column: counts[label] for label, column in columns.items()}], start_time)
+
+    def search_dart_elements_by_name(self, name_pattern: str,
+                                     element_types: Optional[List[str]] = None) -> CKGQueryResult:
+        """Tìm kiếm Dart elements theo tên."""
+        if element_types is None:
+            element_types = ['DartClass', 'DartMixin', 'DartExtension', 'DartFunction', 'DartEnum']
+        return self.search_by_name(name_pattern, element_types, limit=50)
+
+    def find_dart_unused_exports(self, file_path: Optional[str] = None) -> CKGQueryResult:
+        """Tìm Dart exports không được sử dụng."""
+        start_time = time.time()
+        where = """(json_extract(n.properties, '$.import_refs') = 0
+            OR (json_extract(n.properties, '$.import_refs') IS NULL AND NOT EXISTS (
+                SELECT 1 FROM nodes f
+                JOIN edges e ON e.source_id = f.id AND e.rel_type = 'IMPORTS'
+                JOIN nodes imp ON imp.id = e.target_id AND imp.label = 'DartImport'
+                WHERE f.label = 'File' AND (
+                    json_extract(imp.properties, '$.imported_name') = n.name
+                    OR json_extract(imp.properties, '$.imported_name') = 'package:' || n.name
+                    OR substr(json_extract(imp.properties, '$.imported_name'), -length(n.name) - 1) = '/' || n.name))))"""
+        params: List[Any] = []
+        if file_path:
+            where += """ AND EXISTS (
+                SELECT 1 FROM nodes f JOIN edges e ON e.source_id = f.id AND e.rel_type = 'DART_EXPORTS'
+                WHERE f.label = 'File' AND f.file_path = ? AND e.target_id = n.id
+            )"""
+            params.append(file_path)
+        exports = self._nodes("DartExport", where, params)
+        if file_path:
+            exports.sort(key=lambda exp: exp.get("name") or "")
+        else:
+            exports.sort(key=lambda exp: (exp.get("file_path") or "", exp.get("name") or ""))
+        columns = {"export_name": "name", "file_path": "file_path", "line_number": "line_number"}
+        return self._result("find_dart_unused_exports", [self._project(exp, columns) for exp in exports],
+                            start_time)
+
+    def find_dart_circular_imports(self) -> CKGQueryResult:
+        """Tìm circular imports trong Dart code."""
+        return self._mutual_file_dependencies("find_dart_circular_imports", [
+            ("CONTAINS", "DartLibrary", None),
+            ("DEFINES_DART_IMPORT", "DartImport", None),
+            ("DART_IMPORTS", "File", None)
+        ])
+
+    # === Kotlin Query Methods ===
+
+    def get_kotlin_classes_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin classes trong một file."""
+        return self._elements_in_files("get_kotlin_classes_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_CLASS", "KotlinClass", None)],
+                                       {"name": "name", "line_number": "line_number", "modifiers": "modifiers",
+                                        "is_abstract": "is_abstract", "is_final": "is_final",
+                                        "extends_class": "extends_class",
+                                        "implements_interfaces": "implements_interfaces",
+                                        "methods_count": "methods_count", "fields_count": "fields_count"})
+
+    def get_kotlin_interfaces_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin interfaces trong một file."""
+        return self._elements_in_files("get_kotlin_interfaces_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_INTERFACE", "KotlinInterface", None)],
+                                       {"name": "name", "line_number": "line_number", "modifiers": "modifiers",
+                                        "extends_interfaces": "extends_interfaces",
+                                        "methods_count": "methods_count", "fields_count": "fields_count"})
+
+    def get_kotlin_data_classes_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin data classes trong một file."""
+        return self._elements_in_files("get_kotlin_data_classes_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_DATA_CLASS", "KotlinDataClass", None)],
+                                       {"name": "name", "line_number": "line_number", "modifiers": "modifiers",
+                                        "extends_class": "extends_class",
+                                        "implements_interfaces": "implements_interfaces",
+                                        "fields_count": "fields_count"})
+
+    def get_kotlin_objects_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin objects trong một file."""
+        return self._elements_in_files("get_kotlin_objects_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_OBJECT", "KotlinObject", None)],
+                                       {"name": "name", "line_number": "line_number", "modifiers": "modifiers",
+                                        "extends_class": "extends_class",
+                                        "implements_interfaces": "implements_interfaces",
+                                        "methods_count": "methods_count", "fields_count": "fields_count"})
+
+    def get_kotlin_functions_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin functions trong một file."""
+        return self._elements_in_files("get_kotlin_functions_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_FUNCTION", "KotlinFunction", None)],
+                                       {"name": "name", "line_number": "line_number", "return_type": "return_type",
+                                        "parameters_count": "parameters_count", "complexity": "complexity",
+                                        "is_async": "is_async"})
+
+    def get_kotlin_extension_functions_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin extension functions trong một file."""
+        return self._elements_in_files("get_kotlin_extension_functions_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_EXTENSION_FUNCTION", "KotlinExtensionFunction", None)],
+                                       {"name": "name", "line_number": "line_number", "return_type": "return_type",
+                                        "parameters_count": "parameters_count", "complexity": "complexity"})
+
+    def get_kotlin_enums_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin enums trong một file."""
+        return self._elements_in_files("get_kotlin_enums_in_file", [file_path],
+                                       [("DEFINES_KOTLIN_ENUM", "KotlinEnum", None)],
+                                       {"name": "name", "line_number": "line_number", "modifiers": "modifiers",
+                                        "implements_interfaces": "implements_interfaces",
+                                        "constants_count": "constants_count", "methods_count": "methods_count"})
+
+    def get_kotlin_imports_in_file(self, file_path: str) -> CKGQueryResult:
+        """Lấy tất cả Kotlin imports trong một file."""
+        return self._elements_in_files("get_kotlin_imports_in_file", [file_path],
+                                       [("CONTAINS", "KotlinPackage", None),
+                                        ("DEFINES_KOTLIN_IMPORT", "KotlinImport", None)],
+                                       {"import_name": "name", "line_number": "line_number",
+                                        "module_name": "module_name", "imported_name": "imported_name",
+                                        "alias": "alias", "is_from_import": "is_from_import"})
+
+    def get_kotlin_package_info(self, file_path: str) -> CKGQueryResult:
+        """Lấy thông tin Kotlin package trong một file."""
+        return self._elements_in_files("get_kotlin_package_info", [file_path],
+                                       [("CONTAINS", "KotlinPackage", None)],
+                                       {"package_name": "name", "line_number": "line_number",
+                                        "full_name": "full_name", "classes_count": "classes_count",
+                                        "interfaces_count": "interfaces_count"})
+
+    def find_kotlin_class_hierarchy(self, class_name: str) -> CKGQueryResult:
+        """Tìm hierarchy của một Kotlin class (một dòng cho mỗi cặp parent/interface)."""
+        start_time = time.time()
+        results = []
+        for cls in self._nodes("KotlinClass", "n.name = ?", [class_name]):
+            children = self._neighbor_names(cls["id"], "KOTLIN_EXTENDS", "KotlinClass", incoming=True)
+            parents = self._neighbor_names(cls["id"], "KOTLIN_EXTENDS", "KotlinClass") or [None]
+            interfaces = self._neighbor_names(cls["id"], "KOTLIN_IMPLEMENTS", "KotlinInterface") or [None]
+            for parent in parents:
+                for interface in interfaces:
+                    results.append({"class_name": cls.get("name"), "file_path": cls.get("file_path"),
+                                    "parent_class": parent, "implemented_interface": interface,
+                                    "child_classes": children})
+        return self._result("find_kotlin_class_hierarchy", results, start_time)
+
+    def get_kotlin_project_statistics(self) -> CKGQueryResult:
+        """Lấy thống kê tổng quan về Kotlin code trong project."""
+        start_time = time.time()
+        definitions = {
+            "total_classes": ("DEFINES_KOTLIN_CLASS", "KotlinClass"),
+            "total_interfaces": ("DEFINES_KOTLIN_INTERFACE", "KotlinInterface"),
+            "total_data_classes": ("DEFINES_KOTLIN_DATA_CLASS", "KotlinDataClass"),
+            "total_objects": ("DEFINES_KOTLIN_OBJECT", "KotlinObject"),
+            "total_functions": ("DEFINES_KOTLIN_FUNCTION", "KotlinFunction"),
+            "total_extension_functions": ("DEFINES_KOTLIN_EXTENSION_FUNCTION", "KotlinExtensionFunction"),
+            "total_enums": ("DEFINES_KOTLIN_ENUM", "KotlinEnum")
+        }
+        row = {"total_kotlin_files": self._count_labels(["File"])["File"]}
+        sql = """
+        SELECT COUNT(DISTINCT t.id) AS count FROM nodes f
+        JOIN edges e ON e.source_id = f.id AND e.rel_type = ?
+        JOIN nodes t ON t.id = e.target_id AND t.label = ?
+        WHERE f.label = 'File'
+        """
+        for column, (rel_type, label) in definitions.items():
+            row[column] = self._fetch(sql, [rel_type, label])[0]["count"]
+        return self._result("get_kotlin_project_statistics", [row], start_time)
+
+    def search_kotlin_elements_by_name(self, name_pattern: str,
+                                       element_types: Optional[List[str]] = None) -> CKGQueryResult:
+        """Tìm kiếm Kotlin elements theo tên."""
+        if element_types is None:
+            element_types = ['KotlinClass', 'KotlinInterface', 'KotlinDataClass', 'KotlinObject',
+                             'KotlinFunction', 'KotlinExtensionFunction', 'KotlinEnum']
+        return self.search_by_name(name_pattern, element_types)
+
+    def find_kotlin_unused_objects(self, file_path: Optional[str] = None) -> CKGQueryResult:
+        """Tìm Kotlin objects không được sử dụng."""
+        start_time = time.time()
+        where = """(json_extract(n.properties, '$.in_degree_kotlin_uses_type') = 0
+            OR (json_extract(n.properties, '$.in_degree_kotlin_uses_type') IS NULL
+                AND NOT EXISTS (SELECT 1 FROM edges e WHERE e.target_id = n.id
+                                AND e.rel_type = 'KOTLIN_USES_TYPE')))"""
+        params: List[Any] = []
+        if file_path:
+            where += """ AND EXISTS (
+                SELECT 1 FROM nodes f JOIN edges e ON e.source_id = f.id AND e.rel_type = 'DEFINES_KOTLIN_OBJECT'
+                WHERE f.label = 'File' AND f.file_path = ? AND e.target_id = n.id
+            )"""
+            params.append(file_path)
+        objects = sorted(self._nodes("KotlinObject", where, params), key=lambda obj: obj.get("name") or "")
+        columns = {"object_name": "name", "file_path": "file_path", "line_number": "line_number",
+                   "modifiers": "modifiers"}
+        return self._result("find_kotlin_unused_objects", [self._project(obj, columns) for obj in objects],
+                            start_time)
+
+    def find_kotlin_circular_dependencies(self) -> CKGQueryResult:
+        """Tìm circular dependencies trong Kotlin code."""
+        return self._mutual_file_dependencies("find_kotlin_circular_dependencies", [
+            ("CONTAINS", "KotlinPackage", None),
+            ("DEFINES_KOTLIN_IMPORT", "KotlinImport", None),
+            ("KOTLIN_DEPENDS_ON", "File", None)
+        ])
@@ -0,0 +1,84 @@
+"""
+Storage Backend Interface for CKG Operations Team.
+
+Pluggable storage for the Code Knowledge Graph. ASTtoCKGBuilderAgent writes
+through a backend when it has no Neo4j connection, and a backend answers
+the same query methods as CKGQueryInterfaceAgent (get_functions_in_file,
+find_circular_dependencies, search_by_name, ...) returning CKGQueryResult,
+so agents that take a ``ckg_query_agent`` can use it unchanged.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .ckg_schema import NodeProperties, RelationshipProperties
+
+
+class CKGStorageBackend(ABC):
+    """
+    Write side of a CKG store plus the hooks used by incremental updates.
+
+    Implementations also provide the CKGQueryInterfaceAgent query methods.
+    """
+
+    @abstractmethod
+    def write_graph(self, nodes: Iterable[NodeProperties],
+                    relationships: Iterable[RelationshipProperties]) -> int:
+        """
+        Insert or replace nodes (by id) and add relationships.
+
+        Returns:
+            int: Number of nodes and relationships written
+        """
+
+    @abstractmethod
+    def delete_file_subgraphs(self, file_paths: List[str]) -> int:
+        """
+        Delete every node of the files together with its relationships.
+
+        Returns:
+            int: Number of nodes deleted
+        """
+
+    @abstractmethod
+    def collect_incoming_links(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Cross-file relationships from other files into the files.
+
+        Rows use the columns of CKGSchema.get_cypher_collect_incoming_links
+        (source_id, source_label, rel_type, target_label, target_file_path,
+        target_name, properties).
+        """
+
+    @abstractmethod
+    def restore_links(self, incoming_links: List[Dict[str, Any]]) -> int:
+        """
+        Re-attach rows from collect_incoming_links to rebuilt nodes, matching
+        targets by (label, file_path, name).
+
+        Returns:
+            int: Number of relationships restored
+        """
+
+    @abstractmethod
+    def collect_in_degree_scope(self, file_paths: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Before the files are deleted: ids of IN_DEGREE_INDEX targets in other
+        files reached from the files, and imported_name of the files'
+        DartImports (the equivalent of CKGSchema.get_cypher_collect_in_degree_scope).
+        """
+
+    @abstractmethod
+    def refresh_in_degree_index(self, scope: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Recompute the in-degree index (CKGSchema.IN_DEGREE_INDEX) and the
+        DartExport import_refs used by the unused-element reports.
+
+        Args:
+            scope: {'paths', 'ids', 'ref_names'} limiting the refresh to nodes
+                touched by an incremental update (None = every node)
+        """
+
+    @abstractmethod
+    def close(self):
+        """Release the underlying storage."""
@@ -13,12 +13,28 @@ from .static_analysis_integrator import (
     FindingType
 )
 
+from .finding_table import FindingTable
+
+from .analysis_cache import AnalysisResultCache
+
+from .linter_sharding import (
+    Shard,
+    ShardOutcome,
+    WorkStealingPool,
+    build_size_balanced_shards
+)
+
 from .contextual_query import (
     ContextualQueryAgent,
     ContextualFinding,
     ContextualAnalysisResult
 )
 
+from .code_element_index import (
+    CodeElementIndex,
+    CodeElementInterval
+)
+
 from .architectural_analyzer import (
     ArchitecturalAnalyzerAgent,
     ArchitecturalIssue,
@@ -49,11 +65,19 @@ __all__ = [
     'AnalysisResult',
     'SeverityLevel',
     'FindingType',
+    'FindingTable',
+    'AnalysisResultCache',
+    'Shard',
+    'ShardOutcome',
+    'WorkStealingPool',
+    'build_size_balanced_shards',
     
     # Contextual Query
     'ContextualQueryAgent',
     'ContextualFinding',
     'ContextualAnalysisResult',
+    'CodeElementIndex',
+    'CodeElementInterval',
     
     # Architectural Analysis
     'ArchitecturalAnalyzerAgent',
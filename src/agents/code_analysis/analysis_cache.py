@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Analysis Result Cache
+
+Cache trên đĩa cho findings của từng file, content-addressed theo hash nội
+dung file, tên tool, tool version và cấu hình tool. Khi rescan, chỉ các file
+có hash thay đổi được gửi cho tool; findings của các file còn lại được phát
+lại từ cache.
+"""
+
+import dataclasses
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..ckg_operations.parse_cache import ParseCache
+
+
+# Config keys chỉ ảnh hưởng cách chạy tool, không ảnh hưởng findings
+EXECUTION_ONLY_CONFIG_KEYS = frozenset({
+    "enabled", "timeout", "cpu_cost", "cache",
+    "shard_workers", "shards_per_worker", "max_files_per_shard"
+})
+
+# Config files của project mà flake8/pylint/mypy đọc (ở thư mục gốc project)
+PROJECT_CONFIG_FILES = (
+    ".flake8", "setup.cfg", "tox.ini", ".pylintrc", "pylintrc",
+    "pyproject.toml", "mypy.ini", ".mypy.ini"
+)
+
+
+class AnalysisResultCache(ParseCache):
+    """
+    Cache findings theo file với LRU eviction giới hạn theo dung lượng.
+
+    Mỗi entry là tuple Finding của một file (path tương đối trong project,
+    được thay bằng path hiện tại khi phát lại, nên file đổi tên hoặc trùng nội
+    dung vẫn hit).
+
+    Args:
+        cache_dir (str): Thư mục lưu cache. Mặc định ``~/.ai_codescan/analysis_cache``.
+        max_size_mb (float): Dung lượng tối đa của cache (MB).
+
+    Example:
+        >>> cache = AnalysisResultCache()
+        >>> agent = StaticAnalysisIntegratorAgent(result_cache=cache)
+        >>> agent.run_analysis("/path/to/project", ["flake8"])  # lần sau chỉ chạy files đã đổi
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_size_mb: float = ParseCache.DEFAULT_MAX_SIZE_MB):
+        """
+        Khởi tạo AnalysisResultCache.
+
+        Args:
+            cache_dir: Thư mục lưu cache
+            max_size_mb: Dung lượng tối đa (MB)
+        """
+        if cache_dir is None:
+            cache_dir = str(Path.home() / ".ai_codescan" / "analysis_cache")
+        super().__init__(cache_dir=cache_dir, max_size_mb=max_size_mb)
+        # Tools chạy song song (cpu_budget > 1) dùng chung cache
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def config_fingerprint(tool_config: Optional[Dict[str, Any]],
+                           project_path: Optional[str] = None) -> str:
+        """
+        Chuỗi ổn định đại diện cho cấu hình tool (bỏ các keys chỉ liên quan đến cách chạy).
+
+        Khi có project_path, hash nội dung các PROJECT_CONFIG_FILES cũng được
+        đưa vào, nên sửa ``.flake8``/``setup.cfg``/... làm mọi entry hết hiệu lực.
+
+        Args:
+            tool_config: tools_config[tool]
+            project_path: Thư mục gốc project chứa config files
+
+        Returns:
+            str: JSON với keys đã sắp xếp
+        """
+        relevant = {key: value for key, value in (tool_config or {}).items()
+                    if key not in EXECUTION_ONLY_CONFIG_KEYS}
+        fingerprint = {"tool_config": relevant}
+        if project_path is not None:
+            config_files = {}
+            for name in PROJECT_CONFIG_FILES:
+                try:
+                    config_files[name] = hashlib.sha256((Path(project_path) / name).read_bytes()).hexdigest()
+                except OSError:
+                    continue
+            fingerprint["config_files"] = config_files
+        return json.dumps(fingerprint, sort_keys=True, default=str)
+
+    @staticmethod
+    def make_analysis_key(content: bytes, tool: str, tool_version: str, config_fingerprint: str) -> str:
+        """
+        Tạo cache key từ nội dung file, tool, tool version và cấu hình.
+
+        Args:
+            content: Nội dung file (bytes)
+            tool: Tên tool
+            tool_version: Output của ``<tool> --version``
+            config_fingerprint: Kết quả config_fingerprint()
+
+        Returns:
+            str: Hex digest dùng làm key
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{tool}\0{tool_version}\0{config_fingerprint}\0".encode('utf-8'))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get_findings(self, key: str, file_path: str) -> Optional[List[Any]]:
+        """
+        Lấy findings đã cache của một file.
+
+        Args:
+            key: Cache key
+            file_path: Path hiện tại của file (gán cho findings phát lại)
+
+        Returns:
+            Optional[List[Finding]]: Findings (có thể rỗng) nếu hit, None nếu miss
+        """
+        with self._lock:
+            findings = self.get(key)
+        if findings is None:
+            return None
+        return [dataclasses.replace(finding, file_path=file_path) for finding in findings]
+
+    def put_findings(self, key: str, findings: List[Any]):
+        """
+        Lưu findings của một file (kể cả khi rỗng, để file sạch cũng được bỏ qua lần sau).
+
+        Args:
+            key: Cache key
+            findings: Findings của file
+        """
+        with self._lock:
+            self.put(key, tuple(findings))
@@ -15,6 +15,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from ..ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent, CKGQueryResult
+from ..ckg_operations.graph_cycles import DependencyCycle, find_dependency_cycles
 
 
 class IssueType(Enum):
@@ -56,6 +57,7 @@ class CircularDependency:
     cycle: List[str]  # Danh sách các elements trong cycle
     cycle_type: str   # 'file', 'module', 'class', etc.
     description: str
+    component: Optional[List[str]] = None  # Toàn bộ strongly connected component chứa cycle
     
     def __str__(self) -> str:
         """String representation."""
@@ -91,16 +93,23 @@ class ArchitecturalAnalysisResult:
 class ArchitecturalAnalyzerAgent:
     """Agent phân tích kiến trúc cơ bản."""
 
-    def __init__(self, ckg_query_agent: Optional[CKGQueryInterfaceAgent] = None):
+    def __init__(self, ckg_query_agent: Optional[CKGQueryInterfaceAgent] = None,
+                 report_minimal_cycles: bool = False,
+                 max_cycles_per_component: Optional[int] = 10):
         """
         Khởi tạo ArchitecturalAnalyzerAgent.
         
         Args:
             ckg_query_agent: CKGQueryInterfaceAgent để truy vấn code knowledge graph.
                            Nếu None, sẽ tạo instance mới.
+            report_minimal_cycles: Liệt kê cycle ngắn nhất qua từng file của mỗi
+                           component thay vì một cycle đại diện.
+            max_cycles_per_component: Số minimal cycles tối đa cho mỗi component.
         """
         self.logger = logger
         self.ckg_query_agent = ckg_query_agent or CKGQueryInterfaceAgent()
+        self.report_minimal_cycles = report_minimal_cycles
+        self.max_cycles_per_component = max_cycles_per_component
         
         # Các hạn chế của phân tích tĩnh
         self.static_analysis_limitations = [
@@ -202,17 +211,17 @@ class ArchitecturalAnalyzerAgent:
             # Xây dựng dependency graph
             dep_graph = self._build_dependency_graph(deps_result.results)
             
-            # Tìm cycles trong graph
-            cycles = self._find_cycles_in_graph(dep_graph)
-            
-            # Chuyển đổi cycles thành CircularDependency objects
-            for cycle in cycles:
-                circular_dep = CircularDependency(
-                    cycle=cycle,
-                    cycle_type="file",
-                    description=f"Circular dependency giữa {len(cycle)} files"
-                )
-                circular_deps.append(circular_dep)
+            # Tìm strongly connected components và cycles trong graph
+            for dependency_cycle in self._find_dependency_cycles(dep_graph):
+                for cycle in dependency_cycle.cycles:
+                    circular_dep = CircularDependency(
+                        cycle=cycle,
+                        cycle_type="file",
+                        description=(f"Circular dependency giữa {len(cycle)} files "
+                                     f"(component gồm {dependency_cycle.size} files)"),
+                        component=dependency_cycle.component
+                    )
+                    circular_deps.append(circular_dep)
                 
         except Exception as e:
             self.logger.error(f"Lỗi trong phân tích circular dependencies: {str(e)}")
@@ -263,52 +272,36 @@ class ArchitecturalAnalyzerAgent:
         
         return graph
 
-    def _find_cycles_in_graph(self, graph: Dict[str, Set[str]]) -> List[List[str]]:
+    def _find_dependency_cycles(self, graph: Dict[str, Set[str]]) -> List[DependencyCycle]:
         """
-        Tìm tất cả cycles trong directed graph sử dụng DFS.
+        Tìm các strongly connected components có cycle (iterative Tarjan, O(V+E)).
         
         Args:
             graph: Dependency graph dạng adjacency list.
             
         Returns:
-            List[List[str]]: Danh sách các cycles được phát hiện.
+            List[DependencyCycle]: Mỗi component một lần, kèm cycle đại diện
+                hoặc minimal cycles nếu report_minimal_cycles.
         """
-        cycles = []
-        visited = set()
-        rec_stack = set()
-        path = []
-        
-        def dfs(node: str) -> bool:
-            """DFS để tìm cycles."""
-            if node in rec_stack:
-                # Tìm thấy cycle
-                cycle_start = path.index(node)
-                cycle = path[cycle_start:] + [node]
-                cycles.append(cycle)
-                return True
-            
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            # Duyệt tất cả neighbors
-            for neighbor in graph.get(node, []):
-                if dfs(neighbor):
-                    pass  # Continue tìm kiếm cycles khác
-            
-            rec_stack.remove(node)
-            path.pop()
-            return False
-        
-        # Duyệt tất cả nodes trong graph
-        for node in graph:
-            if node not in visited:
-                dfs(node)
+        return find_dependency_cycles(
+            graph,
+            minimal_cycles=self.report_minimal_cycles,
+            max_cycles_per_component=self.max_cycles_per_component
+        )
+
+    def _find_cycles_in_graph(self, graph: Dict[str, Set[str]]) -> List[List[str]]:
+        """
+        Tìm cycles trong directed graph, mỗi strongly connected component một lần.
         
-        return cycles
+        Args:
+            graph: Dependency graph dạng adjacency list.
+            
+        Returns:
+            List[List[str]]: Danh sách các cycles (node đầu không lặp lại ở cuối).
+        """
+        return [cycle
+                for dependency_cycle in self._find_dependency_cycles(graph)
+                for cycle in dependency_cycle.cycles]
 
     def _analyze_unused_public_elements(self) -> List[UnusedElement]:
         """
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Code Element Index
+
+Interval index in-memory (file_path → các khoảng dòng đã sắp xếp của
+functions, methods và classes) để tìm element bao quanh một dòng code
+trong O(log n) thay vì quét toàn bộ CKG cho mỗi finding.
+"""
+
+import ast
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterable
+from loguru import logger
+
+
+# Labels CKG được xem là function-like và class-like
+FUNCTION_ELEMENT_TYPES = frozenset({
+    "Function", "Method",
+    "JavaMethod", "JavaConstructor",
+    "DartFunction", "DartMethod", "DartConstructor", "DartGetter", "DartSetter",
+    "KotlinFunction", "KotlinMethod", "KotlinExtensionFunction", "KotlinConstructor"
+})
+
+CLASS_ELEMENT_TYPES = frozenset({
+    "Class",
+    "JavaClass", "JavaInterface", "JavaEnum",
+    "DartClass", "DartMixin", "DartExtension", "DartEnum",
+    "KotlinClass", "KotlinInterface", "KotlinDataClass", "KotlinSealedClass",
+    "KotlinObject", "KotlinCompanionObject", "KotlinEnum"
+})
+
+
+@dataclass
+class CodeElementInterval:
+    """Khoảng dòng [start_line, end_line] của một code element."""
+    name: str
+    element_type: str
+    file_path: str
+    start_line: int
+    end_line: int
+    docstring: Optional[str] = None
+    parent: Optional[int] = None  # Vị trí element bao ngoài trong cùng file
+
+    def contains(self, line: int) -> bool:
+        """Kiểm tra dòng có nằm trong element không."""
+        return self.start_line <= line <= self.end_line
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Chuyển sang dict cùng dạng với kết quả search_by_name."""
+        return {
+            "name": self.name,
+            "types": [self.element_type],
+            "file_path": self.file_path,
+            "line_number": self.start_line,
+            "end_line_number": self.end_line,
+            "docstring": self.docstring
+        }
+
+
+class CodeElementIndex:
+    """
+    Index các code elements theo file để trả lời "element nào bao quanh
+    dòng L của file F".
+
+    Mỗi file giữ danh sách intervals sắp xếp theo (start_line, -end_line) và
+    con trỏ parent tới element bao ngoài gần nhất. Lookup bisect theo
+    start_line rồi đi ngược chuỗi parent, nên tốn O(log n + độ sâu lồng nhau).
+    Elements không có end_line chỉ bao quanh đúng dòng khai báo.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, List[CodeElementInterval]] = {}
+        self._intervals: Dict[str, List[CodeElementInterval]] = {}
+        self._starts: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        self._build()
+        return sum(len(intervals) for intervals in self._intervals.values())
+
+    @staticmethod
+    def _normalize_path(file_path: str) -> str:
+        return os.path.normpath(file_path)
+
+    def add(self, name: str, element_type: str, file_path: str, start_line: int,
+            end_line: Optional[int] = None, docstring: Optional[str] = None):
+        """
+        Thêm một element vào index.
+
+        Args:
+            name: Tên element
+            element_type: Label CKG (Function, Method, Class, ...)
+            file_path: Đường dẫn file chứa element
+            start_line: Dòng bắt đầu
+            end_line: Dòng kết thúc (None nếu không biết)
+            docstring: Docstring nếu có
+        """
+        if not file_path or not start_line:
+            return
+        end_line = max(end_line or start_line, start_line)
+        path = self._normalize_path(file_path)
+        self._pending.setdefault(path, []).append(
+            CodeElementInterval(name, element_type, file_path, start_line, end_line, docstring)
+        )
+
+    def _build(self):
+        """Sắp xếp intervals và tính parent cho các file vừa thêm elements."""
+        for path, added in self._pending.items():
+            intervals = self._intervals.get(path, []) + added
+            intervals.sort(key=lambda interval: (interval.start_line, -interval.end_line))
+
+            stack: List[int] = []
+            for position, interval in enumerate(intervals):
+                while stack and intervals[stack[-1]].end_line < interval.start_line:
+                    stack.pop()
+                interval.parent = stack[-1] if stack else None
+                stack.append(position)
+
+            self._intervals[path] = intervals
+            self._starts[path] = [interval.start_line for interval in intervals]
+        self._pending.clear()
+
+    def find_enclosing(self, file_path: str, line: int,
+                       element_types: Optional[Iterable[str]] = None) -> Optional[CodeElementInterval]:
+        """
+        Tìm element trong cùng bao quanh một dòng.
+
+        Args:
+            file_path: Đường dẫn file
+            line: Số dòng
+            element_types: Chỉ xét các labels này (default: tất cả)
+
+        Returns:
+            CodeElementInterval hoặc None nếu không có element nào bao quanh
+        """
+        if self._pending:
+            self._build()
+
+        path = self._normalize_path(file_path)
+        starts = self._starts.get(path)
+        if not starts:
+            return None
+
+        intervals = self._intervals[path]
+        allowed = set(element_types) if element_types is not None else None
+        position = bisect_right(starts, line) - 1
+        while position is not None and position >= 0:
+            interval = intervals[position]
+            if interval.contains(line) and (allowed is None or interval.element_type in allowed):
+                return interval
+            position = interval.parent
+        return None
+
+    def find_enclosing_function(self, file_path: str, line: int) -> Optional[CodeElementInterval]:
+        """Tìm function/method trong cùng bao quanh một dòng."""
+        return self.find_enclosing(file_path, line, FUNCTION_ELEMENT_TYPES)
+
+    def find_enclosing_class(self, file_path: str, line: int) -> Optional[CodeElementInterval]:
+        """Tìm class trong cùng bao quanh một dòng."""
+        return self.find_enclosing(file_path, line, CLASS_ELEMENT_TYPES)
+
+    @classmethod
+    def from_ckg(cls, ckg_agent) -> 'CodeElementIndex':
+        """
+        Build index bằng một query duy nhất lấy mọi function/method/class từ CKG.
+
+        Args:
+            ckg_agent: CKGQueryInterfaceAgent
+
+        Returns:
+            CodeElementIndex (rỗng nếu query thất bại)
+        """
+        index = cls()
+        labels = sorted(FUNCTION_ELEMENT_TYPES | CLASS_ELEMENT_TYPES)
+        label_matches = "\n            UNION ALL\n            ".join(
+            f"MATCH (n:`{label}`) RETURN n" for label in labels
+        )
+        query = f"""
+        CALL {{
+            {label_matches}
+        }}
+        WITH n WHERE n.file_path IS NOT NULL AND n.line_number IS NOT NULL
+        RETURN n.name as name, n.type as type, n.file_path as file_path,
+               n.line_number as line_number, n.end_line_number as end_line_number,
+               n.docstring as docstring
+        """
+
+        result = ckg_agent.execute_query(query)
+        if not result.success:
+            logger.debug(f"Không thể build code element index từ CKG: {result.error_message}")
+            return index
+
+        for record in result.results:
+            index.add(
+                record.get("name"),
+                record.get("type"),
+                record.get("file_path"),
+                record.get("line_number"),
+                record.get("end_line_number"),
+                record.get("docstring")
+            )
+        logger.info(f"Built code element index: {len(index)} elements")
+        return index
+
+    @classmethod
+    def from_parse_result(cls, parse_result) -> 'CodeElementIndex':
+        """
+        Build index từ kết quả CodeParserCoordinatorAgent (Python files).
+
+        Args:
+            parse_result: ParseResult với ast_tree là ast.Module hoặc PythonParseInfo
+
+        Returns:
+            CodeElementIndex
+        """
+        from ..ckg_operations.python_parser import PythonParseInfo, extract_python_parse_info
+
+        index = cls()
+        for parsed_file in parse_result.parsed_files:
+            if not parsed_file.parse_success or parsed_file.language != "Python":
+                continue
+
+            parse_info = parsed_file.ast_tree
+            if isinstance(parse_info, ast.Module):
+                parse_info = extract_python_parse_info(parse_info)
+            if not isinstance(parse_info, PythonParseInfo):
+                continue
+
+            method_positions = set()
+            for class_info in parse_info.classes:
+                index.add(class_info.name, "Class", parsed_file.file_path, class_info.line_number,
+                          class_info.end_line_number, class_info.docstring)
+                method_positions.update((method.name, method.line_number) for method in class_info.methods)
+
+            for function_info in parse_info.functions:
+                element_type = ("Method" if (function_info.name, function_info.line_number) in method_positions
+                                else "Function")
+                index.add(function_info.name, element_type, parsed_file.file_path,
+                          function_info.line_number, function_info.end_line_number,
+                          function_info.docstring)
+        return index
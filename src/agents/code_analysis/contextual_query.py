@@ -6,11 +6,13 @@ Agent thực hiện truy vấn contextual dựa trên Code Knowledge Graph và s
 Kết hợp thông tin từ CKG với findings để cung cấp context deeper analysis.
 """
 
+import os
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
 from .static_analysis_integrator import Finding, AnalysisResult, SeverityLevel, FindingType
+from .code_element_index import CodeElementIndex
 from ..ckg_operations import CKGQueryInterfaceAgent, CKGQueryResult, ConnectionConfig
 
 
@@ -57,14 +59,24 @@ class ContextualQueryAgent:
     - Phân tích patterns và anti-patterns
     """
     
-    def __init__(self, ckg_agent: Optional[CKGQueryInterfaceAgent] = None):
+    # Số files tối đa trong mỗi UNWIND $paths query khi prefetch file context
+    FILE_CONTEXT_BATCH_SIZE = 500
+    
+    def __init__(self, ckg_agent: Optional[CKGQueryInterfaceAgent] = None,
+                 element_index: Optional[CodeElementIndex] = None):
         """
         Khởi tạo ContextualQueryAgent.
         
         Args:
             ckg_agent: CKG query interface agent
+            element_index: Interval index dựng sẵn (vd. từ parse results);
+                nếu None sẽ build từ CKG một lần mỗi lần analyze
         """
         self.ckg_agent = ckg_agent or CKGQueryInterfaceAgent()
+        self.element_index = element_index
+        self._owns_element_index = element_index is None
+        self._element_context_cache: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._file_context_cache: Dict[str, Dict[str, Any]] = {}
     
     def analyze_findings_with_context(
         self, 
@@ -100,6 +112,16 @@ class ContextualQueryAgent:
                     success=True
                 )
             
+            # Build interval index một lần cho cả scan
+            if self._owns_element_index:
+                self.element_index = CodeElementIndex.from_ckg(self.ckg_agent)
+            self._element_context_cache.clear()
+            
+            # Prefetch file context cho tất cả files distinct bằng vài batched queries
+            self._file_context_cache.clear()
+            self._prefetch_file_contexts(list(dict.fromkeys(
+                self._resolve_ckg_path(f.file_path, project_path) for f in all_findings)))
+            
             # Process findings với context
             contextual_findings = []
             for finding in all_findings:
@@ -147,13 +169,15 @@ class ContextualQueryAgent:
             related_findings = []
             recommendations = []
             
+            ckg_path = self._resolve_ckg_path(finding.file_path, project_path)
+            
             # Get basic file context
-            file_context = self._get_file_context(finding.file_path)
+            file_context = self._get_file_context(ckg_path)
             if file_context:
                 context.update(file_context)
             
             # Get function/class context nếu có thể determine được
-            code_element_context = self._get_code_element_context(finding)
+            code_element_context = self._get_code_element_context(finding, ckg_path)
             if code_element_context:
                 context.update(code_element_context)
             
@@ -178,6 +202,23 @@ class ContextualQueryAgent:
             logger.debug(f"Không thể enrich finding {finding}: {str(e)}")
             return None
     
+    @staticmethod
+    def _resolve_ckg_path(file_path: str, project_path: str) -> str:
+        """
+        Chuyển path của finding (thường tương đối với project) sang dạng
+        CKG lưu ``file_path`` (project_path + path tương đối).
+        
+        Args:
+            file_path: Path trong finding
+            project_path: Đường dẫn project
+            
+        Returns:
+            str: Path đã normalize
+        """
+        if not os.path.isabs(file_path) and project_path:
+            file_path = os.path.join(project_path, file_path)
+        return os.path.normpath(file_path)
+    
     def _get_file_context(self, file_path: str) -> Dict[str, Any]:
         """
         Lấy context của file từ CKG.
@@ -188,6 +229,9 @@ class ContextualQueryAgent:
         Returns:
             Dict với file context
         """
+        if file_path in self._file_context_cache:
+            return self._file_context_cache[file_path]
+        
         context = {}
         
         try:
@@ -220,12 +264,58 @@ class ContextualQueryAgent:
         
         return context
     
-    def _get_code_element_context(self, finding: Finding) -> Dict[str, Any]:
+    def _prefetch_file_contexts(self, file_paths: List[str]):
+        """
+        Lấy file context cho nhiều files bằng UNWIND $paths queries và lưu
+        vào cache dùng chung cho mọi findings của cùng file.
+        
+        Batch có query lỗi không được cache, nên các files đó dùng lại
+        per-file queries trong _get_file_context.
+        
+        Args:
+            file_paths: Danh sách files distinct (cùng dạng File.file_path trong CKG)
+        """
+        batched_queries = [
+            ("functions", self.ckg_agent.get_functions_in_files),
+            ("classes", self.ckg_agent.get_classes_in_files),
+            ("imports", self.ckg_agent.get_imports_in_files),
+            ("dependencies", self.ckg_agent.get_files_dependencies)
+        ]
+        
+        for start in range(0, len(file_paths), self.FILE_CONTEXT_BATCH_SIZE):
+            batch = file_paths[start:start + self.FILE_CONTEXT_BATCH_SIZE]
+            contexts: Dict[str, Dict[str, Any]] = {path: {} for path in batch}
+            
+            try:
+                for key, fetch in batched_queries:
+                    result = fetch(batch)
+                    if not result.success:
+                        raise RuntimeError(f"{key}: {result.error_message}")
+                    
+                    rows_by_file: Dict[str, List[Dict[str, Any]]] = {path: [] for path in batch}
+                    for row in result.results:
+                        row = dict(row)
+                        path = row.pop("file_path", None)
+                        if path in rows_by_file:
+                            rows_by_file[path].append(row)
+                    
+                    for path, rows in rows_by_file.items():
+                        contexts[path][key] = rows
+                        contexts[path][f"{key}_count"] = len(rows)
+            except Exception as e:
+                logger.debug(f"Lỗi prefetch file context: {str(e)}")
+                continue
+            
+            self._file_context_cache.update(contexts)
+    
+    def _get_code_element_context(self, finding: Finding,
+                                  file_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Lấy context của code element cụ thể (function, class).
         
         Args:
             finding: Finding để analyze
+            file_path: Path của file trong CKG (default: finding.file_path)
             
         Returns:
             Dict với code element context
@@ -233,46 +323,54 @@ class ContextualQueryAgent:
         context = {}
         
         try:
-            # Attempt to identify function/class từ finding location
-            # This is a simplified approach - could be more sophisticated
-            
-            # Search for functions around the finding line
-            search_result = self.ckg_agent.search_by_name("*", ["Function"])
-            if search_result.success:
-                for func in search_result.results:
-                    if (func.get("file_path") == finding.file_path and 
-                        abs(func.get("line_number", 0) - finding.line_number) <= 10):
-                        context["nearby_function"] = func
-                        
-                        # Get function callers/callees
-                        callers = self.ckg_agent.find_function_callers(func["name"])
-                        if callers.success:
-                            context["function_callers"] = callers.results
-                            
-                        callees = self.ckg_agent.find_function_callees(func["name"], finding.file_path)
-                        if callees.success:
-                            context["function_callees"] = callees.results
-                        break
-            
-            # Search for classes around the finding line
-            search_result = self.ckg_agent.search_by_name("*", ["Class"])
-            if search_result.success:
-                for cls in search_result.results:
-                    if (cls.get("file_path") == finding.file_path and 
-                        abs(cls.get("line_number", 0) - finding.line_number) <= 20):
-                        context["nearby_class"] = cls
-                        
-                        # Get class hierarchy
-                        hierarchy = self.ckg_agent.get_class_hierarchy(cls["name"])
-                        if hierarchy.success:
-                            context["class_hierarchy"] = hierarchy.results
-                        break
+            if self.element_index is None:
+                self.element_index = CodeElementIndex.from_ckg(self.ckg_agent)
+            
+            file_path = file_path or finding.file_path
+            
+            # Function/method trong cùng bao quanh dòng của finding
+            func = self.element_index.find_enclosing_function(file_path, finding.line_number)
+            if func:
+                context["nearby_function"] = func.to_dict()
+                context.update(self._get_function_relations(func.name, file_path))
+            
+            # Class trong cùng bao quanh dòng của finding
+            cls = self.element_index.find_enclosing_class(file_path, finding.line_number)
+            if cls:
+                context["nearby_class"] = cls.to_dict()
+                context.update(self._get_class_relations(cls.name))
             
         except Exception as e:
             logger.debug(f"Lỗi lấy code element context: {str(e)}")
         
         return context
     
+    def _get_function_relations(self, function_name: str, file_path: str) -> Dict[str, Any]:
+        """Lấy callers/callees của function, dùng chung cho các findings trong cùng function."""
+        key = ("function", function_name, file_path)
+        if key not in self._element_context_cache:
+            relations = {}
+            callers = self.ckg_agent.find_function_callers(function_name)
+            if callers.success:
+                relations["function_callers"] = callers.results
+            
+            callees = self.ckg_agent.find_function_callees(function_name, file_path)
+            if callees.success:
+                relations["function_callees"] = callees.results
+            self._element_context_cache[key] = relations
+        return self._element_context_cache[key]
+    
+    def _get_class_relations(self, class_name: str) -> Dict[str, Any]:
+        """Lấy class hierarchy, dùng chung cho các findings trong cùng class."""
+        key = ("class", class_name, "")
+        if key not in self._element_context_cache:
+            relations = {}
+            hierarchy = self.ckg_agent.get_class_hierarchy(class_name)
+            if hierarchy.success:
+                relations["class_hierarchy"] = hierarchy.results
+            self._element_context_cache[key] = relations
+        return self._element_context_cache[key]
+    
     def _find_related_findings(self, finding: Finding, project_path: str) -> List[Finding]:
         """
         Tìm findings liên quan đến finding hiện tại.
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Finding Table
+
+Columnar store cho findings dựa trên pandas. Mỗi finding là một row với
+categorical columns cho tool, rule_id, severity, type và file (mã int nhỏ
+thay vì string lặp lại), line/column kiểu Int32 nullable, nên grouping,
+counting, severity histograms và per-file rollups chạy vectorized thay vì
+lặp qua list Finding dataclasses.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from .static_analysis_integrator import Finding, AnalysisResult, SeverityLevel, FindingType
+
+
+SEVERITY_CATEGORIES = [level.value for level in SeverityLevel]
+TYPE_CATEGORIES = [finding_type.value for finding_type in FindingType]
+
+
+class FindingTable:
+    """
+    Bảng findings dạng cột (pandas DataFrame với categorical columns).
+
+    Example:
+        >>> table = FindingTable.from_findings(result.findings)
+        >>> table.severity_histogram()
+        {'low': 120, 'medium': 14, 'high': 3, 'critical': 0}
+        >>> table.file_rollup().head()
+    """
+
+    COLUMNS = ['tool', 'rule_id', 'severity', 'type', 'file', 'line', 'column',
+               'message', 'suggestion', 'metadata']
+    CATEGORICAL_COLUMNS = ['tool', 'rule_id', 'severity', 'type', 'file']
+    EXPORT_COLUMNS = ['file', 'line', 'column', 'severity', 'type', 'rule_id', 'message', 'tool', 'suggestion']
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None, findings: Optional[List[Finding]] = None):
+        """
+        Khởi tạo FindingTable từ DataFrame có các cột trong COLUMNS.
+
+        Args:
+            frame: DataFrame (None tạo bảng rỗng)
+            findings: Finding objects nguồn theo đúng thứ tự rows (nếu có,
+                to_findings() trả lại chính các objects này thay vì tạo mới)
+        """
+        if frame is None:
+            frame = pd.DataFrame({column: [] for column in self.COLUMNS})
+        self.frame = self._normalize(frame)
+        if findings is not None and len(findings) != len(self.frame):
+            raise ValueError("findings phải có cùng số phần tử với frame")
+        self._findings = findings
+
+    @classmethod
+    def _normalize(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        """Đảm bảo đủ cột và đúng dtypes (categoricals, Int32)."""
+        frame = frame.reindex(columns=cls.COLUMNS).reset_index(drop=True)
+        frame['severity'] = pd.Categorical(frame['severity'], categories=SEVERITY_CATEGORIES, ordered=True)
+        frame['type'] = pd.Categorical(frame['type'], categories=TYPE_CATEGORIES)
+        for column in ('tool', 'rule_id', 'file'):
+            frame[column] = frame[column].astype(object).astype('category')
+        for column in ('line', 'column'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype('Int32')
+        frame['message'] = frame['message'].astype(object)
+        frame['suggestion'] = frame['suggestion'].astype(object)
+        frame['metadata'] = frame['metadata'].astype(object)
+        return frame
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[Finding]) -> 'FindingTable':
+        """
+        Tạo bảng từ Finding objects (một lượt, không tạo dict cho từng row).
+
+        Bảng giữ tham chiếu đến các Finding nguồn (strings trong các cột cũng
+        là cùng objects), nên chuyển ngược về Finding không tạo bản sao.
+
+        Args:
+            findings: Findings cần chuyển
+
+        Returns:
+            FindingTable: Bảng findings
+        """
+        findings = list(findings)
+        columns: Dict[str, List[Any]] = {column: [] for column in cls.COLUMNS}
+        for finding in findings:
+            columns['tool'].append(finding.tool)
+            columns['rule_id'].append(finding.rule_id)
+            columns['severity'].append(finding.severity.value)
+            columns['type'].append(finding.finding_type.value)
+            columns['file'].append(finding.file_path)
+            columns['line'].append(finding.line_number)
+            columns['column'].append(finding.column_number)
+            columns['message'].append(finding.message)
+            columns['suggestion'].append(finding.suggestion)
+            columns['metadata'].append(finding.metadata)
+        return cls(pd.DataFrame(columns), findings=findings)
+
+    @classmethod
+    def from_analysis_results(cls, results: Dict[str, AnalysisResult],
+                              successful_only: bool = True) -> 'FindingTable':
+        """
+        Tạo bảng từ kết quả của StaticAnalysisIntegratorAgent.run_analysis.
+
+        Args:
+            results: Dict tool -> AnalysisResult
+            successful_only: Bỏ qua kết quả của tools bị lỗi
+
+        Returns:
+            FindingTable: Findings của mọi tools
+        """
+        return cls.from_findings(
+            finding
+            for result in results.values() if result.success or not successful_only
+            for finding in result.findings
+        )
+
+    @classmethod
+    def concat(cls, tables: Iterable['FindingTable']) -> 'FindingTable':
+        """Nối nhiều bảng (categories được hợp nhất)."""
+        tables = list(tables)
+        if not tables:
+            return cls()
+        findings = None
+        if all(table._findings is not None for table in tables):
+            findings = [finding for table in tables for finding in table._findings]
+        # Categories khác nhau giữa các bảng: nối dạng object rồi categorize lại
+        return cls(pd.concat([table.frame.astype({column: object for column in cls.CATEGORICAL_COLUMNS})
+                              for table in tables], ignore_index=True), findings=findings)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _take(self, positions) -> 'FindingTable':
+        """Bảng con theo vị trí rows (giữ tham chiếu Finding nguồn)."""
+        findings = [self._findings[i] for i in positions] if self._findings is not None else None
+        return FindingTable(self.frame.iloc[positions], findings=findings)
+
+    def to_findings(self) -> List[Finding]:
+        """Chuyển ngược thành list Finding (các objects nguồn nếu bảng được tạo từ Finding)."""
+        if self._findings is not None:
+            return list(self._findings)
+        findings = []
+        for row in self.frame.itertuples(index=False):
+            findings.append(Finding(
+                file_path=row.file,
+                line_number=None if pd.isna(row.line) else int(row.line),
+                column_number=None if pd.isna(row.column) else int(row.column),
+                severity=SeverityLevel(row.severity),
+                finding_type=FindingType(row.type),
+                rule_id=row.rule_id,
+                message=row.message,
+                tool=row.tool,
+                suggestion=row.suggestion,
+                metadata=row.metadata
+            ))
+        return findings
+
+    def findings_by_tool(self) -> Dict[str, List[Finding]]:
+        """Finding objects nhóm theo tool (input cho FindingAggregatorAgent)."""
+        groups = self.frame.groupby('tool', observed=True, sort=False).indices
+        return {str(tool): self._take(positions).to_findings() for tool, positions in groups.items()}
+
+    def filter(self, **criteria: Union[Any, Iterable[Any]]) -> 'FindingTable':
+        """
+        Lọc theo giá trị cột, ví dụ ``filter(severity=['high', 'critical'], tool='pylint')``.
+
+        Giá trị có thể là scalar, list, hoặc SeverityLevel/FindingType.
+
+        Returns:
+            FindingTable: Bảng con
+        """
+        mask = pd.Series(True, index=self.frame.index)
+        for column, value in criteria.items():
+            if column not in self.COLUMNS:
+                raise ValueError(f"Unknown FindingTable column: {column}")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            values = [item.value if isinstance(item, (SeverityLevel, FindingType)) else item for item in values]
+            mask &= self.frame[column].isin(values)
+        return self._take(mask.to_numpy().nonzero()[0])
+
+    def count_by(self, *columns: str) -> pd.Series:
+        """Số findings theo nhóm cột, giảm dần (chỉ các nhóm có findings)."""
+        return self.frame.groupby(list(columns), observed=True).size().sort_values(ascending=False)
+
+    def severity_histogram(self) -> Dict[str, int]:
+        """Số findings theo severity (đủ mọi SeverityLevel, kể cả 0)."""
+        counts = self.frame['severity'].value_counts(sort=False)
+        return {severity: int(counts.get(severity, 0)) for severity in SEVERITY_CATEGORIES}
+
+    def type_histogram(self) -> Dict[str, int]:
+        """Số findings theo FindingType (đủ mọi loại, kể cả 0)."""
+        counts = self.frame['type'].value_counts(sort=False)
+        return {finding_type: int(counts.get(finding_type, 0)) for finding_type in TYPE_CATEGORIES}
+
+    def top_rules(self, limit: int = 10) -> pd.Series:
+        """Các (tool, rule_id) xuất hiện nhiều nhất."""
+        return self.count_by('tool', 'rule_id').head(limit)
+
+    def file_rollup(self) -> pd.DataFrame:
+        """
+        Tổng hợp theo file: số findings mỗi severity, tổng và số tools.
+
+        Returns:
+            pd.DataFrame: Index là file, sắp xếp theo severity cao nhất rồi tổng
+        """
+        by_severity = (self.frame.groupby(['file', 'severity'], observed=True).size()
+                       .unstack(fill_value=0)
+                       .reindex(columns=SEVERITY_CATEGORIES, fill_value=0))
+        by_severity.columns = list(SEVERITY_CATEGORIES)
+        rollup = by_severity.assign(
+            total=by_severity.sum(axis=1),
+            tools=self.frame.groupby('file', observed=True)['tool'].nunique()
+        )
+        rollup.index = rollup.index.astype(str)
+        rollup.index.name = 'file'
+        return rollup.sort_values(list(reversed(SEVERITY_CATEGORIES)) + ['total'], ascending=False)
+
+    def memory_usage(self) -> int:
+        """Bộ nhớ của bảng (bytes, gồm cả strings)."""
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def _export_frame(self, include_metadata: bool) -> pd.DataFrame:
+        columns = self.EXPORT_COLUMNS + (['metadata'] if include_metadata else [])
+        return self.frame[columns]
+
+    def to_csv(self, path: Optional[str] = None, include_metadata: bool = False) -> Optional[str]:
+        """
+        Xuất CSV.
+
+        Args:
+            path: File đích (None trả về string)
+            include_metadata: Xuất cả cột metadata
+
+        Returns:
+            Optional[str]: CSV string nếu không có path
+        """
+        return self._export_frame(include_metadata).to_csv(path, index=False)
+
+    def to_json(self, path: Optional[str] = None, include_metadata: bool = False) -> Optional[str]:
+        """
+        Xuất JSON (list records).
+
+        Args:
+            path: File đích (None trả về string)
+            include_metadata: Xuất cả cột metadata
+
+        Returns:
+            Optional[str]: JSON string nếu không có path
+        """
+        return self._export_frame(include_metadata).to_json(path, orient='records', force_ascii=False)
+
+    def to_display_frame(self) -> pd.DataFrame:
+        """DataFrame với các cột mà EnhancedDataTablesAgent hiển thị (severity, category, message, file, line)."""
+        return pd.DataFrame({
+            'severity': self.frame['severity'].astype(str).str.upper(),
+            'category': self.frame['type'],
+            'message': self.frame['message'],
+            'file': self.frame['file'],
+            'line': self.frame['line'],
+            'rule_id': self.frame['rule_id'],
+            'tool': self.frame['tool']
+        })
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Linter Sharding
+
+Chia danh sách files thành shards cân bằng theo tổng kích thước và chạy các
+shards trên worker pool với work stealing: mỗi worker có deque riêng, lấy
+shard từ đầu deque của mình, hết việc thì lấy (steal) từ cuối deque dài
+nhất của worker khác. Một shard chậm chỉ giữ một worker, các workers còn
+lại tiếp tục xử lý phần còn lại.
+"""
+
+import heapq
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, List, Optional
+
+
+@dataclass
+class Shard:
+    """Một nhóm files được chạy trong cùng một tool invocation."""
+    index: int
+    files: List[str] = field(default_factory=list)
+    total_bytes: int = 0
+
+
+@dataclass
+class ShardOutcome:
+    """Kết quả chạy một shard (result hoặc error)."""
+    shard: Shard
+    worker: int
+    elapsed_seconds: float
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def build_size_balanced_shards(files: List[str], shard_count: int) -> List[Shard]:
+    """
+    Chia files thành tối đa shard_count shards có tổng bytes gần bằng nhau.
+
+    Greedy LPT: files lớn trước, mỗi file vào shard đang nhỏ nhất.
+
+    Args:
+        files: Đường dẫn files
+        shard_count: Số shards mong muốn
+
+    Returns:
+        List[Shard]: Shards khác rỗng, sắp xếp theo total_bytes giảm dần
+    """
+    shard_count = max(1, min(shard_count, len(files)))
+    shards = [Shard(index=i) for i in range(shard_count)]
+    heap = [(0, i) for i in range(shard_count)]
+
+    for size, path in sorted(((_file_size(path), path) for path in files), key=lambda item: (-item[0], item[1])):
+        total, index = heapq.heappop(heap)
+        shards[index].files.append(path)
+        shards[index].total_bytes = total + size
+        heapq.heappush(heap, (total + size, index))
+
+    shards = [shard for shard in shards if shard.files]
+    return sorted(shards, key=lambda shard: (-shard.total_bytes, shard.index))
+
+
+class WorkStealingPool:
+    """
+    Chạy shards trên các worker threads với per-worker deques và work stealing.
+
+    Args:
+        workers: Số workers
+        cancel_event: Dừng nhận shard mới khi event được set
+    """
+
+    def __init__(self, workers: int, cancel_event: Optional[threading.Event] = None):
+        self.workers = max(1, workers)
+        self.cancel_event = cancel_event or threading.Event()
+        self._deques: List[Deque[Shard]] = [deque() for _ in range(self.workers)]
+        self._lock = threading.Lock()
+        self.steals = 0
+
+    def _next_shard(self, worker: int) -> Optional[Shard]:
+        with self._lock:
+            own = self._deques[worker]
+            if own:
+                return own.popleft()
+            victim = max(self._deques, key=len)
+            if victim:
+                self.steals += 1
+                return victim.pop()
+            return None
+
+    def run(self, shards: List[Shard], run_shard: Callable[[Shard], Any]) -> List[ShardOutcome]:
+        """
+        Chạy run_shard cho mọi shard.
+
+        Shards được chia round-robin (lớn trước) vào deques của workers.
+        Exceptions của run_shard được giữ trong ShardOutcome.error, không
+        làm dừng các shards khác.
+
+        Args:
+            shards: Shards cần chạy
+            run_shard: Hàm chạy một shard
+
+        Returns:
+            List[ShardOutcome]: Outcomes theo Shard.index (shards bị cancel không có outcome)
+        """
+        for position, shard in enumerate(sorted(shards, key=lambda s: -s.total_bytes)):
+            self._deques[position % self.workers].append(shard)
+
+        outcomes: List[ShardOutcome] = []
+
+        def work(worker: int):
+            while not self.cancel_event.is_set():
+                shard = self._next_shard(worker)
+                if shard is None:
+                    return
+                start = time.time()
+                try:
+                    outcome = ShardOutcome(shard, worker, 0.0, result=run_shard(shard))
+                except Exception as e:
+                    outcome = ShardOutcome(shard, worker, 0.0, error=e)
+                outcome.elapsed_seconds = time.time() - start
+                with self._lock:
+                    outcomes.append(outcome)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for future in [executor.submit(work, worker) for worker in range(self.workers)]:
+                future.result()
+
+        return sorted(outcomes, key=lambda outcome: outcome.shard.index)
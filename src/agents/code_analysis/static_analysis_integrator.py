@@ -10,15 +10,33 @@ Enhanced với multi-language bridge integration cho Java, Dart, Kotlin.
 import subprocess
 import os
 import re
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable
 from dataclasses import dataclass
 from loguru import logger
 from enum import Enum
 
+from .analysis_cache import AnalysisResultCache
+from .linter_sharding import Shard, ShardOutcome, WorkStealingPool, build_size_balanced_shards
+
 # Import bridge classes
 # Bridge classes will be imported lazily to avoid circular imports
 
+# Output patterns (compile một lần, dùng cho mọi dòng)
+# flake8: path:line:col: code message
+FLAKE8_LINE_PATTERN = re.compile(r'^(.+?):(\d+):(\d+):\s*([A-Z]\d+)\s*(.+)$')
+# pylint parseable: path:line:column: message-type: message (rule-id)
+PYLINT_LINE_PATTERN = re.compile(r'^(.+?):(\d+):(\d+):\s*([A-Z]\d+):\s*(.+?)\s*\(([^)]+)\)$')
+# mypy: path:line: error/note: message
+MYPY_LINE_PATTERN = re.compile(r'^(.+?):(\d+):\s*(error|warning|note):\s*(.+)$')
+
+# Kích thước chunk khi đọc XML reports
+XML_CHUNK_SIZE = 64 * 1024
+
 
 class SeverityLevel(Enum):
     """Mức độ nghiêm trọng của finding."""
@@ -73,6 +91,221 @@ class AnalysisResult:
     raw_output: Optional[str] = None
 
 
+class _CPUBudget:
+    """Counting budget chia sẻ giữa các tools chạy song song."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.available = total
+        self._condition = threading.Condition()
+
+    def acquire(self, cost: int, cancel_event: threading.Event) -> bool:
+        """Chờ đến khi đủ budget; trả về False nếu bị cancel trong lúc chờ."""
+        cost = min(cost, self.total)
+        with self._condition:
+            while self.available < cost:
+                if cancel_event.is_set():
+                    return False
+                self._condition.wait(timeout=0.1)
+            if cancel_event.is_set():
+                return False
+            self.available -= cost
+            return True
+
+    def release(self, cost: int):
+        """Trả lại budget đã chiếm."""
+        with self._condition:
+            self.available += min(cost, self.total)
+            self._condition.notify_all()
+
+
+class AnalysisCancelled(Exception):
+    """Tool process bị kill bởi cancel_analysis()."""
+
+
+class _ProcessRegistry:
+    """
+    Các tool processes đang chạy, để cancel_analysis() kill ngay thay vì
+    chờ tool kết thúc hoặc hết timeout.
+    """
+
+    def __init__(self, cancel_event: threading.Event):
+        self.cancel_event = cancel_event
+        self._processes: set = set()
+        self._lock = threading.Lock()
+
+    def register(self, process: subprocess.Popen):
+        """Theo dõi process; kill luôn nếu analysis đã bị hủy."""
+        with self._lock:
+            self._processes.add(process)
+            if self.cancel_event.is_set():
+                process.kill()
+
+    def unregister(self, process: subprocess.Popen):
+        with self._lock:
+            self._processes.discard(process)
+
+    def kill_all(self) -> int:
+        """Kill mọi process còn chạy; trả về số process đã kill."""
+        with self._lock:
+            running = [process for process in self._processes if process.poll() is None]
+            for process in running:
+                process.kill()
+        return len(running)
+
+
+def _stream_process_lines(cmd: List[str], cwd: str, timeout: float,
+                          merge_stderr: bool = False,
+                          processes: Optional[_ProcessRegistry] = None) -> Iterator[str]:
+    """
+    Chạy command và yield stdout từng dòng trong lúc process còn chạy.
+
+    Không buffer toàn bộ output: timeout được áp bằng watchdog kill process,
+    sau đó raise subprocess.TimeoutExpired như subprocess.run.
+
+    Args:
+        cmd: Command cần chạy
+        cwd: Working directory
+        timeout: Timeout (giây) cho toàn bộ process
+        merge_stderr: Gộp stderr vào stdout (mypy), nếu không stderr bị bỏ
+        processes: Registry để cancel kill được process; process bị kill
+            theo cách này raise AnalysisCancelled
+
+    Yields:
+        str: Từng dòng output (không có newline)
+    """
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if merge_stderr else subprocess.DEVNULL,
+        text=True,
+        bufsize=1
+    )
+    if processes is not None:
+        processes.register(process)
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        process.kill()
+
+    watchdog = threading.Timer(timeout, kill_on_timeout)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        for line in process.stdout:
+            yield line.rstrip('\r\n')
+        process.wait()
+        if processes is not None and processes.cancel_event.is_set() and process.returncode < 0:
+            raise AnalysisCancelled(" ".join(cmd[:1]))
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+    finally:
+        watchdog.cancel()
+        if processes is not None:
+            processes.unregister(process)
+        # Consumer dừng sớm hoặc lỗi: không để lại process mồ côi
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+def _run_process(cmd: List[str], cwd: str, timeout: float,
+                 processes: Optional[_ProcessRegistry] = None) -> subprocess.CompletedProcess:
+    """
+    Chạy command như subprocess.run(capture_output=True, text=True), nhưng
+    process được đăng ký với registry để cancel_analysis() kill được.
+
+    Args:
+        cmd: Command cần chạy
+        cwd: Working directory
+        timeout: Timeout (giây) cho toàn bộ process
+        processes: Registry để cancel kill được process; process bị kill
+            theo cách này raise AnalysisCancelled
+
+    Returns:
+        subprocess.CompletedProcess: returncode, stdout và stderr
+
+    Raises:
+        subprocess.TimeoutExpired: Process chạy quá timeout (đã bị kill)
+        AnalysisCancelled: Process bị kill bởi cancel
+    """
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    if processes is not None:
+        processes.register(process)
+    try:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        if processes is not None and processes.cancel_event.is_set() and process.returncode < 0:
+            raise AnalysisCancelled(" ".join(cmd[:1]))
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+    finally:
+        if processes is not None:
+            processes.unregister(process)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def _iter_xml_chunks(source: Any) -> Iterator[str]:
+    """Đọc file object theo chunks XML_CHUNK_SIZE."""
+    return iter(lambda: source.read(XML_CHUNK_SIZE), '')
+
+
+def _iter_checkstyle_errors(chunks: Iterable[str]) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Parse checkstyle-format XML (Checkstyle, Detekt) tăng dần bằng pull parser.
+
+    Mỗi <error> được yield ngay khi parse xong và các <file> đã xử lý bị
+    clear, nên bộ nhớ không tăng theo kích thước report.
+
+    Args:
+        chunks: XML theo từng phần (dòng, chunk, hoặc cả string)
+
+    Yields:
+        Tuple[str, Dict[str, str]]: (tên file, attributes của <error>)
+
+    Raises:
+        ET.ParseError: XML không hợp lệ
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    file_name = ''
+
+    def drain() -> Iterator[Tuple[str, Dict[str, str]]]:
+        nonlocal root, file_name
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+                if elem.tag == 'file':
+                    file_name = elem.get('name', '')
+            elif elem.tag == 'error':
+                yield file_name, dict(elem.attrib)
+            elif elem.tag == 'file':
+                elem.clear()
+                if root is not None:
+                    root.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
 class StaticAnalysisIntegratorAgent:
     """
     Agent tích hợp static analysis tools.
@@ -84,15 +317,58 @@ class StaticAnalysisIntegratorAgent:
     - Aggregate results từ multiple tools
     """
     
-    def __init__(self, tools_config: Optional[Dict[str, Any]] = None):
+    # Số CPU mặc định mỗi tool chiếm trong budget (JVM tools dùng nhiều threads);
+    # override bằng tools_config[tool]["cpu_cost"]
+    DEFAULT_TOOL_CPU_COSTS = {
+        "flake8": 1,
+        "pylint": 1,
+        "mypy": 1,
+        "checkstyle": 2,
+        "pmd": 2,
+        "dart_analyze": 1,
+        "detekt": 2
+    }
+    
+    # Tools dùng result_cache mặc định; override bằng tools_config[tool]["cache"].
+    # pylint/mypy tắt mặc định: findings của một file phụ thuộc các files khác
+    # (no-member, import-error, cyclic-import, duplicate-code, kiểu dữ liệu)
+    DEFAULT_TOOL_CACHEABLE = {
+        "flake8": True,
+        "pylint": False,
+        "mypy": False
+    }
+    
+    # Tools có output dạng dòng: (parser method, default timeout, gộp stderr)
+    LINE_STREAMING_TOOLS = {
+        "flake8": ("iter_flake8_findings", 300, False),
+        "pylint": ("iter_pylint_findings", 600, False),
+        "mypy": ("iter_mypy_findings", 300, True)
+    }
+    
+    def __init__(self, tools_config: Optional[Dict[str, Any]] = None, cpu_budget: int = 1,
+                 shard_workers: int = 1, result_cache: Optional[AnalysisResultCache] = None):
         """
         Khởi tạo StaticAnalysisIntegratorAgent với bridge classes support.
         
         Args:
             tools_config: Cấu hình cho các tools
+            cpu_budget: Tổng số CPU cho các tools chạy đồng thời
+                (1 = chạy tuần tự, <= 0 = dùng tất cả CPUs)
+            shard_workers: Số tool processes song song khi chạy flake8/pylint/mypy
+                theo shards (1 = một invocation cho cả project, <= 0 = dùng tất cả CPUs);
+                override bằng tools_config[tool]["shard_workers"]
+            result_cache: Cache findings theo nội dung file; khi bật, rescan chỉ
+                chạy flake8/pylint/mypy trên các files đã thay đổi
         """
         self.tools_config = tools_config or self._get_default_config()
         self.supported_tools = ["flake8", "pylint", "mypy", "checkstyle", "pmd", "dart_analyze", "detekt"]
+        self.cpu_budget = cpu_budget if cpu_budget > 0 else (os.cpu_count() or 1)
+        self.shard_workers = shard_workers
+        self.result_cache = result_cache
+        self._tool_versions: Dict[str, Optional[str]] = {}
+        self._tool_versions_lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._processes = _ProcessRegistry(self._cancel_event)
         
         # Initialize bridge classes for multi-language support
         self._bridge_instances = {}
@@ -218,23 +494,165 @@ class StaticAnalysisIntegratorAgent:
             logger.error(f"Project path không tồn tại: {project_path}")
             return {}
         
-        # Determine tools to run
+        tools = self._resolve_tools(tools)
+        completed = dict(self.iter_analysis(project_path, tools))
+        
+        # Giữ thứ tự tools như khi chạy tuần tự
+        return {tool: completed[tool] for tool in tools if tool in completed}
+    
+    def iter_analysis(self, project_path: str,
+                      tools: Optional[List[str]] = None) -> Iterator[Tuple[str, AnalysisResult]]:
+        """
+        Chạy các tools đồng thời trong giới hạn cpu_budget và yield kết quả
+        theo thứ tự hoàn thành.
+        
+        Mỗi tool chiếm cpu_cost đơn vị budget trong lúc chạy. Gọi
+        cancel_analysis() để dừng: tools chưa bắt đầu được bỏ qua, tool
+        processes đang chạy (kể cả các shards) bị kill; các tools này được trả
+        về với error "Analysis cancelled".
+        
+        Args:
+            project_path: Đường dẫn đến project
+            tools: Danh sách tools cần chạy (default: all enabled)
+            
+        Yields:
+            Tuple[str, AnalysisResult]: (tên tool, kết quả)
+        """
+        if not os.path.exists(project_path):
+            logger.error(f"Project path không tồn tại: {project_path}")
+            return
+        
+        tools = self._resolve_tools(tools)
+        self._cancel_event.clear()
+        logger.info(f"Chạy static analysis trên {project_path} với tools: {tools} "
+                    f"(cpu_budget={self.cpu_budget})")
+        
+        if self.cpu_budget <= 1 or len(tools) <= 1:
+            for tool in tools:
+                if self._cancel_event.is_set():
+                    yield tool, self._cancelled_result(tool, project_path)
+                    continue
+                logger.info(f"Chạy {tool}...")
+                yield tool, self._finish_tool(tool, project_path, self._run_tool(tool, project_path))
+            return
+        
+        budget = _CPUBudget(self.cpu_budget)
+        
+        def run_with_budget(tool: str) -> AnalysisResult:
+            cost = self._get_tool_cpu_cost(tool)
+            if not budget.acquire(cost, self._cancel_event):
+                return self._cancelled_result(tool, project_path)
+            try:
+                logger.info(f"Chạy {tool}...")
+                return self._run_tool(tool, project_path)
+            finally:
+                budget.release(cost)
+        
+        with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+            futures = {executor.submit(run_with_budget, tool): tool for tool in tools}
+            for future in as_completed(futures):
+                tool = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Lỗi chạy {tool}: {str(e)}")
+                    result = AnalysisResult(
+                        tool=tool,
+                        project_path=project_path,
+                        total_files_analyzed=0,
+                        total_findings=0,
+                        findings=[],
+                        execution_time_seconds=0,
+                        success=False,
+                        error_message=str(e)
+                    )
+                result = self._finish_tool(tool, project_path, result)
+                logger.info(f"{tool} hoàn thành: {result.total_findings} findings "
+                            f"trong {result.execution_time_seconds:.1f}s")
+                yield tool, result
+    
+    def cancel_analysis(self):
+        """
+        Hủy analysis đang chạy (an toàn khi gọi từ thread khác).
+        
+        Tools chưa bắt đầu và shards chưa chạy bị bỏ qua; tool processes
+        đang chạy (mọi tools và các shards) bị kill ngay.
+        """
+        self._cancel_event.set()
+        killed = self._processes.kill_all()
+        if killed:
+            logger.info(f"Đã kill {killed} tool processes đang chạy")
+    
+    def _finish_tool(self, tool: str, project_path: str, result: AnalysisResult) -> AnalysisResult:
+        """Tool không hoàn thành vì bị cancel được báo là cancelled thay vì lỗi."""
+        if self._cancel_event.is_set() and not result.success:
+            return self._cancelled_result(tool, project_path)
+        return result
+    
+    def _resolve_tools(self, tools: Optional[List[str]]) -> List[str]:
+        """Lấy danh sách tools cần chạy, bỏ qua tools không được hỗ trợ."""
         if tools is None:
             tools = [tool for tool in self.supported_tools 
                     if self.tools_config.get(tool, {}).get("enabled", False)]
         
-        logger.info(f"Chạy static analysis trên {project_path} với tools: {tools}")
-        
-        results = {}
+        resolved = []
         for tool in tools:
             if tool in self.supported_tools:
-                logger.info(f"Chạy {tool}...")
-                result = self._run_tool(tool, project_path)
-                results[tool] = result
+                resolved.append(tool)
             else:
                 logger.warning(f"Tool không được hỗ trợ: {tool}")
-        
-        return results
+        return resolved
+    
+    def _get_tool_cpu_cost(self, tool: str) -> int:
+        """Số CPU tool chiếm trong budget (số shard workers nếu chạy theo shards)."""
+        cost = self.tools_config.get(tool, {}).get("cpu_cost", self.DEFAULT_TOOL_CPU_COSTS.get(tool, 1))
+        if self._is_sharded(tool):
+            cost = max(int(cost), self._get_shard_workers(tool))
+        return max(1, int(cost))
+    
+    def _get_shard_workers(self, tool: str) -> int:
+        """Số workers chạy shards của tool."""
+        workers = int(self.tools_config.get(tool, {}).get("shard_workers", self.shard_workers))
+        return workers if workers > 0 else (os.cpu_count() or 1)
+    
+    def _is_cached(self, tool: str) -> bool:
+        """Tool có dùng result_cache không."""
+        return (self.result_cache is not None and tool in self.DEFAULT_TOOL_CACHEABLE and
+                bool(self.tools_config.get(tool, {}).get("cache", self.DEFAULT_TOOL_CACHEABLE[tool])))
+    
+    def _get_tool_version(self, tool: str) -> Optional[str]:
+        """Output của ``<tool> --version`` (None nếu tool không chạy được), nhớ theo agent."""
+        with self._tool_versions_lock:
+            if tool not in self._tool_versions:
+                try:
+                    result = subprocess.run([tool, "--version"], capture_output=True, text=True, timeout=60)
+                    version = (result.stdout or result.stderr).strip()
+                    self._tool_versions[tool] = version if result.returncode == 0 and version else None
+                except (OSError, subprocess.SubprocessError) as e:
+                    logger.debug(f"Không lấy được version của {tool}: {str(e)}")
+                    self._tool_versions[tool] = None
+            return self._tool_versions[tool]
+    
+    def _is_sharded(self, tool: str) -> bool:
+        """Tool có chạy theo shards không (chỉ flake8, pylint, mypy)."""
+        return tool in self.LINE_STREAMING_TOOLS and self._get_shard_workers(tool) > 1
+    
+    def _get_tool_timeout(self, tool: str, default: float) -> float:
+        """Timeout (giây) cho tool, override bằng tools_config[tool]["timeout"]."""
+        return self.tools_config.get(tool, {}).get("timeout") or default
+    
+    def _cancelled_result(self, tool: str, project_path: str) -> AnalysisResult:
+        """Kết quả cho tool bị hủy."""
+        return AnalysisResult(
+            tool=tool,
+            project_path=project_path,
+            total_files_analyzed=0,
+            total_findings=0,
+            findings=[],
+            execution_time_seconds=0,
+            success=False,
+            error_message="Analysis cancelled"
+        )
     
     def _run_tool(self, tool: str, project_path: str) -> AnalysisResult:
         """
@@ -247,7 +665,11 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             AnalysisResult: Kết quả analysis
         """
-        if tool == "flake8":
+        if self._is_cached(tool):
+            return self.run_cached(tool, project_path)
+        elif self._is_sharded(tool):
+            return self.run_sharded(tool, project_path)
+        elif tool == "flake8":
             return self.run_flake8(project_path)
         elif tool == "pylint":
             return self.run_pylint(project_path)
@@ -273,22 +695,222 @@ class StaticAnalysisIntegratorAgent:
                 error_message=f"Tool không được hỗ trợ: {tool}"
             )
     
-    def run_flake8(self, project_path: str) -> AnalysisResult:
+    def stream_findings(self, tool: str, project_path: str,
+                        targets: Optional[List[str]] = None) -> Iterator[Finding]:
         """
-        Chạy flake8 trên project.
+        Chạy tool và yield findings ngay khi tool in ra, trước khi tool kết thúc.
+        
+        stdout được đọc từng dòng từ pipe và parse ngay, nên aggregation có thể
+        bắt đầu sớm và bộ nhớ không tăng theo kích thước output.
+        
+        Args:
+            tool: Tên tool (flake8, pylint, mypy)
+            project_path: Đường dẫn đến project
+            targets: Chỉ phân tích các files này (default: cả project)
+            
+        Yields:
+            Finding: Từng finding theo thứ tự tool in ra
+            
+        Raises:
+            ValueError: Tool không hỗ trợ streaming
+            FileNotFoundError: Tool chưa được cài đặt
+            subprocess.TimeoutExpired: Tool chạy quá timeout
+        """
+        if tool not in self.LINE_STREAMING_TOOLS:
+            raise ValueError(f"Tool không hỗ trợ streaming: {tool}")
+        
+        parser_name, default_timeout, merge_stderr = self.LINE_STREAMING_TOOLS[tool]
+        build_command = getattr(self, f"_build_{tool}_command")
+        lines = _stream_process_lines(
+            build_command(project_path, targets),
+            cwd=project_path,
+            timeout=self._get_tool_timeout(tool, default_timeout),
+            merge_stderr=merge_stderr,
+            processes=self._processes
+        )
+        yield from getattr(self, parser_name)(lines, project_path)
+    
+    def run_sharded(self, tool: str, project_path: str) -> AnalysisResult:
+        """
+        Chạy flake8/pylint/mypy theo shards trên worker pool với work stealing.
+        
+        Python files được chia thành shards cân bằng theo kích thước
+        (shards_per_worker shards mỗi worker, mặc định 4, tối đa
+        max_files_per_shard files mỗi shard). Mỗi shard là một tool invocation
+        với timeout riêng; shard timeout hoặc lỗi chỉ làm mất findings của shard
+        đó và được ghi trong error_message. Findings được merge và deduplicate
+        (mypy có thể báo cùng lỗi từ nhiều shards khi follow imports).
+        
+        Checks cần toàn bộ project (ví dụ pylint duplicate-code) chỉ thấy files
+        trong cùng shard.
         
         Args:
+            tool: Tên tool (flake8, pylint, mypy)
             project_path: Đường dẫn đến project
             
         Returns:
-            AnalysisResult: Kết quả flake8 analysis
+            AnalysisResult: Kết quả đã merge từ mọi shards
         """
         import time
         start_time = time.time()
         
-        # Build flake8 command
+        if tool not in self.LINE_STREAMING_TOOLS:
+            raise ValueError(f"Tool không hỗ trợ sharding: {tool}")
+        
+        files = self._list_python_files(project_path)
+        shards, outcomes = self._run_shards(tool, project_path, files, self._get_shard_workers(tool))
+        return self._build_sharded_result(tool, project_path, shards, outcomes, start_time)
+    
+    def _run_shards(self, tool: str, project_path: str, files: List[str],
+                    workers: int) -> Tuple[List[Shard], List[ShardOutcome]]:
+        """
+        Chia files thành shards và chạy tool trên từng shard.
+        
+        Args:
+            tool: Tên tool (flake8, pylint, mypy)
+            project_path: Đường dẫn đến project
+            files: Files cần phân tích (đường dẫn tuyệt đối)
+            workers: Số workers (1 = các shards chạy tuần tự)
+            
+        Returns:
+            Tuple[List[Shard], List[ShardOutcome]]: Shards và outcomes của shards đã chạy
+        """
+        config = self.tools_config.get(tool, {})
+        shard_count = max(workers * int(config.get("shards_per_worker", 4)) if workers > 1 else 1,
+                          -(-len(files) // int(config.get("max_files_per_shard", 500))))
+        shards = build_size_balanced_shards(files, shard_count)
+        
+        logger.info(f"Chạy {tool} trên {len(files)} files: {len(shards)} shards, {workers} workers")
+        pool = WorkStealingPool(workers, self._cancel_event)
+        outcomes = pool.run(shards, lambda shard: list(self.stream_findings(tool, project_path, shard.files)))
+        return shards, outcomes
+    
+    def _build_sharded_result(self, tool: str, project_path: str, shards: List[Shard],
+                              outcomes: List[ShardOutcome], start_time: float,
+                              replayed_findings: Optional[List[Finding]] = None,
+                              replayed_files: int = 0) -> AnalysisResult:
+        """Gộp outcomes của shards (và findings phát lại từ cache) thành AnalysisResult."""
+        import time
+        
+        # Shards bị kill khi cancel được tính như shards chưa chạy
+        cancelled = [outcome for outcome in outcomes if isinstance(outcome.error, AnalysisCancelled)]
+        failed = [outcome for outcome in outcomes
+                  if not outcome.success and not isinstance(outcome.error, AnalysisCancelled)]
+        missing = len(shards) - len(outcomes) + len(cancelled)
+        for outcome in failed:
+            reason = "timeout" if isinstance(outcome.error, subprocess.TimeoutExpired) else str(outcome.error)
+            logger.warning(f"{tool} shard {outcome.shard.index} ({len(outcome.shard.files)} files) lỗi: {reason}")
+        
+        findings = self._merge_shard_findings(
+            [outcome.result for outcome in outcomes if outcome.success] + [replayed_findings or []]
+        )
+        succeeded = sum(1 for outcome in outcomes if outcome.success)
+        
+        error_message = None
+        if failed or missing:
+            parts = []
+            errors = [outcome.error for outcome in failed
+                      if not isinstance(outcome.error, subprocess.TimeoutExpired)]
+            if len(failed) > len(errors):
+                parts.append(f"{len(failed) - len(errors)} shards timeout")
+            if errors:
+                parts.append(f"{len(errors)} shards lỗi ({errors[0]})")
+            if missing:
+                parts.append(f"{missing} shards bị hủy")
+            skipped = sum(len(outcome.shard.files) for outcome in failed)
+            error_message = f"{', '.join(parts)} trên tổng {len(shards)} shards ({skipped} files không được phân tích)"
+        
+        return AnalysisResult(
+            tool=tool,
+            project_path=project_path,
+            total_files_analyzed=replayed_files + sum(len(outcome.shard.files)
+                                                      for outcome in outcomes if outcome.success),
+            total_findings=len(findings),
+            findings=findings,
+            execution_time_seconds=time.time() - start_time,
+            success=succeeded > 0 or not shards,
+            error_message=error_message,
+            command_executed=" ".join(getattr(self, f"_build_{tool}_command")(project_path, ["<shard files>"]))
+        )
+    
+    def run_cached(self, tool: str, project_path: str) -> AnalysisResult:
+        """
+        Chạy flake8/pylint/mypy chỉ trên các files có nội dung thay đổi so với result_cache.
+        
+        Cache key của mỗi file gồm hash nội dung, tên tool, tool version và
+        cấu hình tool. Files hit được phát lại từ cache; files miss được gửi cho
+        tool (theo shards nếu bật sharding) và findings của chúng được lưu lại,
+        kể cả khi rỗng. Findings của shard lỗi không được cache.
+        
+        Args:
+            tool: Tên tool (flake8, pylint, mypy)
+            project_path: Đường dẫn đến project
+            
+        Returns:
+            AnalysisResult: Findings phát lại và findings mới, đã merge
+        """
+        import time
+        start_time = time.time()
+        
+        version = self._get_tool_version(tool)
+        if version is None:
+            # Tool không chạy được: để run thường báo lỗi như cũ
+            return self.run_sharded(tool, project_path) if self._is_sharded(tool) else \
+                getattr(self, f"run_{tool}")(project_path)
+        
+        fingerprint = AnalysisResultCache.config_fingerprint(self.tools_config.get(tool), project_path)
+        replayed: List[Finding] = []
+        replayed_files = 0
+        changed: Dict[str, str] = {}  # absolute path -> cache key
+        
+        for path in self._list_python_files(project_path):
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError as e:
+                logger.debug(f"Không đọc được {path}: {str(e)}")
+                continue
+            key = AnalysisResultCache.make_analysis_key(content, tool, version, fingerprint)
+            cached = self.result_cache.get_findings(key, self._relative_to_project(path, project_path))
+            if cached is None:
+                changed[path] = key
+            else:
+                replayed.extend(cached)
+                replayed_files += 1
+        
+        logger.info(f"{tool}: {replayed_files} files từ cache, {len(changed)} files cần phân tích")
+        workers = self._get_shard_workers(tool) if self._is_sharded(tool) else 1
+        shards, outcomes = self._run_shards(tool, project_path, list(changed), workers)
+        
+        for outcome in outcomes:
+            if not outcome.success:
+                continue
+            relative = {path: self._relative_to_project(path, project_path) for path in outcome.shard.files}
+            by_file: Dict[str, List[Finding]] = {rel_path: [] for rel_path in relative.values()}
+            for finding in outcome.result:
+                if finding.file_path in by_file:
+                    by_file[finding.file_path].append(finding)
+            for path, rel_path in relative.items():
+                self.result_cache.put_findings(changed[path], by_file[rel_path])
+        
+        return self._build_sharded_result(tool, project_path, shards, outcomes, start_time,
+                                          replayed_findings=replayed, replayed_files=replayed_files)
+    
+    def _merge_shard_findings(self, shard_findings: Iterable[List[Finding]]) -> List[Finding]:
+        """Gộp findings từ các shards, bỏ trùng và sắp xếp theo file/line/column."""
+        merged: Dict[Tuple[Any, ...], Finding] = {}
+        for findings in shard_findings:
+            for finding in findings:
+                key = (finding.file_path, finding.line_number, finding.column_number,
+                       finding.rule_id, finding.message)
+                merged.setdefault(key, finding)
+        return sorted(merged.values(),
+                      key=lambda f: (f.file_path, f.line_number or 0, f.column_number or 0, f.rule_id))
+    
+    def _build_flake8_command(self, project_path: str, targets: Optional[List[str]] = None) -> List[str]:
+        """Command flake8 theo tools_config (targets: files cụ thể thay cho cả project)."""
         config = self.tools_config.get("flake8", {})
-        cmd = ["flake8", project_path]
+        cmd = ["flake8", *(targets or [project_path])]
         
         # Add configuration options
         if "max_line_length" in config:
@@ -302,22 +924,29 @@ class StaticAnalysisIntegratorAgent:
         
         # Add format for easier parsing
         cmd.extend(["--format", "%(path)s:%(row)d:%(col)d: %(code)s %(text)s"])
+        return cmd
+    
+    def run_flake8(self, project_path: str) -> AnalysisResult:
+        """
+        Chạy flake8 trên project.
+        
+        Args:
+            project_path: Đường dẫn đến project
+            
+        Returns:
+            AnalysisResult: Kết quả flake8 analysis
+        """
+        import time
+        start_time = time.time()
+        
+        cmd = self._build_flake8_command(project_path)
         
         try:
             logger.debug(f"Chạy command: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
+            # Parse từng dòng trong lúc flake8 chạy, không giữ raw output
+            findings = list(self.stream_findings("flake8", project_path))
             
             execution_time = time.time() - start_time
-            raw_output = result.stdout
-            
-            # Parse flake8 output
-            findings = self.parse_flake8_output(raw_output, project_path)
             
             # Count analyzed files
             analyzed_files = self._count_python_files(project_path)
@@ -330,8 +959,7 @@ class StaticAnalysisIntegratorAgent:
                 findings=findings,
                 execution_time_seconds=execution_time,
                 success=True,
-                command_executed=" ".join(cmd),
-                raw_output=raw_output
+                command_executed=" ".join(cmd)
             )
             
         except subprocess.TimeoutExpired:
@@ -387,35 +1015,33 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             List[Finding]: Danh sách findings
         """
-        findings = []
-        
-        if not output_str.strip():
-            return findings
-        
-        # Pattern cho flake8 output: path:line:col: code message
-        pattern = r'^(.+?):(\d+):(\d+):\s*([A-Z]\d+)\s*(.+)$'
+        return list(self.iter_flake8_findings(output_str.splitlines(), project_path))
+    
+    def iter_flake8_findings(self, lines: Iterable[str], project_path: str) -> Iterator[Finding]:
+        """
+        Parse flake8 output từng dòng, yield Finding ngay khi parse được.
         
-        for line in output_str.strip().split('\n'):
-            if not line.strip():
+        Args:
+            lines: Các dòng output (list, file, hoặc pipe đang chạy)
+            project_path: Base project path
+            
+        Yields:
+            Finding: Từng finding
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
                 continue
                 
-            match = re.match(pattern, line.strip())
+            match = FLAKE8_LINE_PATTERN.match(line)
             if match:
                 file_path, line_num, col_num, rule_id, message = match.groups()
                 
-                # Convert to relative path if possible
-                try:
-                    rel_path = os.path.relpath(file_path, project_path)
-                    if not rel_path.startswith('..'):
-                        file_path = rel_path
-                except ValueError:
-                    pass  # Keep absolute path if relpath fails
-                
                 # Determine severity và type từ rule_id
                 severity, finding_type = self._classify_flake8_rule(rule_id)
                 
-                finding = Finding(
-                    file_path=file_path,
+                yield Finding(
+                    file_path=self._relative_to_project(file_path, project_path),
                     line_number=int(line_num),
                     column_number=int(col_num),
                     severity=severity,
@@ -424,12 +1050,18 @@ class StaticAnalysisIntegratorAgent:
                     message=message.strip(),
                     tool="flake8"
                 )
-                
-                findings.append(finding)
             else:
                 logger.debug(f"Không parse được line: {line}")
-        
-        return findings
+    
+    def _relative_to_project(self, file_path: str, project_path: str) -> str:
+        """Đổi sang path tương đối với project nếu file nằm trong project."""
+        try:
+            rel_path = os.path.relpath(file_path, project_path)
+            if not rel_path.startswith('..'):
+                return rel_path
+        except ValueError:
+            pass  # Keep absolute path if relpath fails
+        return file_path
     
     def _classify_flake8_rule(self, rule_id: str) -> Tuple[SeverityLevel, FindingType]:
         """
@@ -471,22 +1103,10 @@ class StaticAnalysisIntegratorAgent:
             # Default
             return SeverityLevel.MEDIUM, FindingType.WARNING
     
-    def run_pylint(self, project_path: str) -> AnalysisResult:
-        """
-        Chạy pylint trên project.
-        
-        Args:
-            project_path: Đường dẫn đến project
-            
-        Returns:
-            AnalysisResult: Kết quả pylint analysis
-        """
-        import time
-        start_time = time.time()
-        
-        # Build pylint command
+    def _build_pylint_command(self, project_path: str, targets: Optional[List[str]] = None) -> List[str]:
+        """Command pylint theo tools_config (targets: files cụ thể thay cho cả project)."""
         config = self.tools_config.get("pylint", {})
-        cmd = ["pylint", project_path]
+        cmd = ["pylint", *(targets or [project_path])]
         
         # Add configuration options
         if "disable" in config and config["disable"]:
@@ -500,22 +1120,29 @@ class StaticAnalysisIntegratorAgent:
         
         # Don't fail on warnings/errors
         cmd.append("--exit-zero")
+        return cmd
+    
+    def run_pylint(self, project_path: str) -> AnalysisResult:
+        """
+        Chạy pylint trên project.
+        
+        Args:
+            project_path: Đường dẫn đến project
+            
+        Returns:
+            AnalysisResult: Kết quả pylint analysis
+        """
+        import time
+        start_time = time.time()
+        
+        cmd = self._build_pylint_command(project_path)
         
         try:
             logger.debug(f"Chạy command: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minutes timeout (pylint slower than flake8)
-            )
+            # Parse từng dòng trong lúc pylint chạy, không giữ raw output
+            findings = list(self.stream_findings("pylint", project_path))
             
             execution_time = time.time() - start_time
-            raw_output = result.stdout
-            
-            # Parse pylint output
-            findings = self.parse_pylint_output(raw_output, project_path)
             
             # Count analyzed files
             analyzed_files = self._count_python_files(project_path)
@@ -528,8 +1155,7 @@ class StaticAnalysisIntegratorAgent:
                 findings=findings,
                 execution_time_seconds=execution_time,
                 success=True,
-                command_executed=" ".join(cmd),
-                raw_output=raw_output
+                command_executed=" ".join(cmd)
             )
             
         except subprocess.TimeoutExpired:
@@ -585,39 +1211,37 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             List[Finding]: Danh sách findings
         """
-        findings = []
-        
-        if not output_str.strip():
-            return findings
-        
-        # Pattern cho pylint parseable output: path:line:column: message-type: message (rule-id)
-        pattern = r'^(.+?):(\d+):(\d+):\s*([A-Z]\d+):\s*(.+?)\s*\(([^)]+)\)$'
+        return list(self.iter_pylint_findings(output_str.splitlines(), project_path))
+    
+    def iter_pylint_findings(self, lines: Iterable[str], project_path: str) -> Iterator[Finding]:
+        """
+        Parse pylint parseable output từng dòng, yield Finding ngay khi parse được.
         
-        for line in output_str.strip().split('\n'):
-            if not line.strip():
+        Args:
+            lines: Các dòng output (list, file, hoặc pipe đang chạy)
+            project_path: Base project path
+            
+        Yields:
+            Finding: Từng finding
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
                 continue
                 
             # Skip non-message lines
             if not ':' in line or 'rated at' in line.lower():
                 continue
                 
-            match = re.match(pattern, line.strip())
+            match = PYLINT_LINE_PATTERN.match(line)
             if match:
                 file_path, line_num, col_num, msg_type, message, rule_id = match.groups()
                 
-                # Convert to relative path
-                try:
-                    rel_path = os.path.relpath(file_path, project_path)
-                    if not rel_path.startswith('..'):
-                        file_path = rel_path
-                except ValueError:
-                    pass
-                
                 # Classify pylint message
                 severity, finding_type = self._classify_pylint_message(msg_type, rule_id)
                 
-                finding = Finding(
-                    file_path=file_path,
+                yield Finding(
+                    file_path=self._relative_to_project(file_path, project_path),
                     line_number=int(line_num),
                     column_number=int(col_num),
                     severity=severity,
@@ -626,10 +1250,6 @@ class StaticAnalysisIntegratorAgent:
                     message=message.strip(),
                     tool="pylint"
                 )
-                
-                findings.append(finding)
-        
-        return findings
     
     def _classify_pylint_message(self, msg_type: str, rule_id: str) -> Tuple[SeverityLevel, FindingType]:
         """
@@ -661,6 +1281,22 @@ class StaticAnalysisIntegratorAgent:
         else:
             return SeverityLevel.MEDIUM, FindingType.WARNING
     
+    def _build_mypy_command(self, project_path: str, targets: Optional[List[str]] = None) -> List[str]:
+        """Command mypy theo tools_config (targets: files cụ thể thay cho cả project)."""
+        config = self.tools_config.get("mypy", {})
+        cmd = ["mypy", *(targets or [project_path])]
+        
+        # Add configuration options
+        if config.get("ignore_missing_imports", False):
+            cmd.append("--ignore-missing-imports")
+        
+        if config.get("strict", False):
+            cmd.append("--strict")
+        
+        # Show error context
+        cmd.append("--show-error-context")
+        return cmd
+    
     def run_mypy(self, project_path: str) -> AnalysisResult:
         """
         Chạy mypy trên project.
@@ -674,35 +1310,14 @@ class StaticAnalysisIntegratorAgent:
         import time
         start_time = time.time()
         
-        # Build mypy command
-        config = self.tools_config.get("mypy", {})
-        cmd = ["mypy", project_path]
-        
-        # Add configuration options
-        if config.get("ignore_missing_imports", False):
-            cmd.append("--ignore-missing-imports")
-        
-        if config.get("strict", False):
-            cmd.append("--strict")
-        
-        # Show error context
-        cmd.append("--show-error-context")
+        cmd = self._build_mypy_command(project_path)
         
         try:
             logger.debug(f"Chạy command: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
+            # Parse từng dòng (stdout + stderr) trong lúc mypy chạy
+            findings = list(self.stream_findings("mypy", project_path))
             
             execution_time = time.time() - start_time
-            raw_output = result.stdout + result.stderr  # mypy uses stderr
-            
-            # Parse mypy output
-            findings = self.parse_mypy_output(raw_output, project_path)
             
             # Count analyzed files
             analyzed_files = self._count_python_files(project_path)
@@ -715,8 +1330,7 @@ class StaticAnalysisIntegratorAgent:
                 findings=findings,
                 execution_time_seconds=execution_time,
                 success=True,
-                command_executed=" ".join(cmd),
-                raw_output=raw_output
+                command_executed=" ".join(cmd)
             )
             
         except subprocess.TimeoutExpired:
@@ -772,39 +1386,37 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             List[Finding]: Danh sách findings
         """
-        findings = []
-        
-        if not output_str.strip():
-            return findings
-        
-        # Pattern cho mypy output: path:line: error/note: message
-        pattern = r'^(.+?):(\d+):\s*(error|warning|note):\s*(.+)$'
+        return list(self.iter_mypy_findings(output_str.splitlines(), project_path))
+    
+    def iter_mypy_findings(self, lines: Iterable[str], project_path: str) -> Iterator[Finding]:
+        """
+        Parse mypy output từng dòng, yield Finding ngay khi parse được.
         
-        for line in output_str.strip().split('\n'):
-            if not line.strip():
+        Args:
+            lines: Các dòng output (list, file, hoặc pipe đang chạy)
+            project_path: Base project path
+            
+        Yields:
+            Finding: Từng finding
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
                 continue
                 
             # Skip success messages
             if 'success' in line.lower() or 'found' in line.lower():
                 continue
                 
-            match = re.match(pattern, line.strip())
+            match = MYPY_LINE_PATTERN.match(line)
             if match:
                 file_path, line_num, msg_type, message = match.groups()
                 
-                # Convert to relative path
-                try:
-                    rel_path = os.path.relpath(file_path, project_path)
-                    if not rel_path.startswith('..'):
-                        file_path = rel_path
-                except ValueError:
-                    pass
-                
                 # Classify mypy message
                 severity, finding_type = self._classify_mypy_message(msg_type)
                 
-                finding = Finding(
-                    file_path=file_path,
+                yield Finding(
+                    file_path=self._relative_to_project(file_path, project_path),
                     line_number=int(line_num),
                     column_number=0,  # MyPy không cung cấp column
                     severity=severity,
@@ -813,10 +1425,6 @@ class StaticAnalysisIntegratorAgent:
                     message=message.strip(),
                     tool="mypy"
                 )
-                
-                findings.append(finding)
-        
-        return findings
     
     def _classify_mypy_message(self, msg_type: str) -> Tuple[SeverityLevel, FindingType]:
         """
@@ -848,20 +1456,24 @@ class StaticAnalysisIntegratorAgent:
             int: Số file Python
         """
         try:
-            count = 0
-            for root, dirs, files in os.walk(project_path):
-                # Skip common excluded directories
-                dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', '.tox', 'venv', 'env', '.venv']]
-                
-                for file in files:
-                    if file.endswith('.py'):
-                        count += 1
-            
-            return count
+            return len(self._list_python_files(project_path))
         except Exception as e:
             logger.warning(f"Lỗi đếm Python files: {str(e)}")
             return 0
     
+    def _list_python_files(self, project_path: str) -> List[str]:
+        """Đường dẫn tuyệt đối của các file Python trong project (bỏ qua thư mục thường exclude)."""
+        python_files = []
+        for root, dirs, files in os.walk(os.path.abspath(project_path)):
+            # Skip common excluded directories
+            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', '.tox', 'venv', 'env', '.venv']]
+            
+            for file in files:
+                if file.endswith('.py'):
+                    python_files.append(os.path.join(root, file))
+        
+        return sorted(python_files)
+    
     def aggregate_results(self, results: Dict[str, AnalysisResult]) -> Dict[str, Any]:
         """
         Tổng hợp kết quả từ multiple tools.
@@ -872,31 +1484,14 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             Dict[str, Any]: Aggregated statistics
         """
+        from .finding_table import FindingTable
+        
         total_findings = 0
         total_files = 0
         total_execution_time = 0
         successful_tools = []
         failed_tools = []
         
-        severity_counts = {
-            SeverityLevel.LOW: 0,
-            SeverityLevel.MEDIUM: 0,
-            SeverityLevel.HIGH: 0,
-            SeverityLevel.CRITICAL: 0
-        }
-        
-        type_counts = {
-            FindingType.STYLE: 0,
-            FindingType.ERROR: 0,
-            FindingType.WARNING: 0,
-            FindingType.CONVENTION: 0,
-            FindingType.REFACTOR: 0,
-            FindingType.SECURITY: 0,
-            FindingType.PERFORMANCE: 0
-        }
-        
-        all_findings = []
-        
         for tool, result in results.items():
             total_execution_time += result.execution_time_seconds
             
@@ -904,15 +1499,14 @@ class StaticAnalysisIntegratorAgent:
                 successful_tools.append(tool)
                 total_findings += result.total_findings
                 total_files = max(total_files, result.total_files_analyzed)
-                
-                # Count by severity and type
-                for finding in result.findings:
-                    severity_counts[finding.severity] += 1
-                    type_counts[finding.finding_type] += 1
-                    all_findings.append(finding)
             else:
                 failed_tools.append(tool)
         
+        # Bảng cột tham chiếu chính các Finding của tool_results (không sao chép):
+        # breakdowns tính vectorized, FindingAggregatorAgent và ReportGeneratorAgent
+        # nhận trực tiếp bảng này; all_findings là các Finding đó dạng list
+        finding_table = FindingTable.from_analysis_results(results)
+        
         return {
             "summary": {
                 "total_findings": total_findings,
@@ -921,9 +1515,10 @@ class StaticAnalysisIntegratorAgent:
                 "successful_tools": successful_tools,
                 "failed_tools": failed_tools
             },
-            "severity_breakdown": {level.value: count for level, count in severity_counts.items()},
-            "type_breakdown": {ftype.value: count for ftype, count in type_counts.items()},
-            "all_findings": all_findings,
+            "severity_breakdown": finding_table.severity_histogram(),
+            "type_breakdown": finding_table.type_histogram(),
+            "all_findings": finding_table.to_findings(),
+            "finding_table": finding_table,
             "tool_results": results
         }
         
@@ -984,8 +1579,11 @@ class StaticAnalysisIntegratorAgent:
             # Use Google style as default
             cmd.extend(["-c", "google_checks.xml"])
         
-        # Output format
-        cmd.extend(["-f", "xml"])
+        # Output format: XML report ghi ra file tạm rồi parse theo chunks,
+        # không giữ cả report trong stdout
+        report_fd, report_path = tempfile.mkstemp(prefix="checkstyle-", suffix=".xml")
+        os.close(report_fd)
+        cmd.extend(["-f", "xml", "-o", report_path])
         
         # Add project path
         cmd.append(project_path)
@@ -993,18 +1591,17 @@ class StaticAnalysisIntegratorAgent:
         try:
             logger.info(f"Chạy Checkstyle command: {' '.join(cmd)}")
             
-            result = subprocess.run(
+            result = _run_process(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                cwd=project_path
+                cwd=project_path,
+                timeout=self._get_tool_timeout("checkstyle", 300),
+                processes=self._processes
             )
             
             execution_time = time.time() - start_time
             
             # Parse findings
-            findings = self.parse_checkstyle_output(result.stdout, project_path)
+            findings = self.parse_checkstyle_report(report_path, project_path)
             
             return AnalysisResult(
                 tool="checkstyle",
@@ -1059,6 +1656,10 @@ class StaticAnalysisIntegratorAgent:
                 error_message=str(e),
                 command_executed=" ".join(cmd)
             )
+        
+        finally:
+            if os.path.exists(report_path):
+                os.remove(report_path)
     
     def parse_checkstyle_output(self, output_str: str, project_path: str) -> List[Finding]:
         """
@@ -1071,62 +1672,78 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             List[Finding]: Danh sách findings
         """
-        findings = []
-        
         if not output_str.strip():
-            return findings
+            return []
         
         try:
-            import xml.etree.ElementTree as ET
-            
-            # Parse XML
-            root = ET.fromstring(output_str)
-            
-            # Process each file
-            for file_elem in root.findall('file'):
-                file_path = file_elem.get('name', '')
-                
-                # Convert to relative path
-                try:
-                    rel_path = os.path.relpath(file_path, project_path)
-                    if not rel_path.startswith('..'):
-                        file_path = rel_path
-                except ValueError:
-                    pass
-                
-                # Process errors in this file
-                for error_elem in file_elem.findall('error'):
-                    line_num = int(error_elem.get('line', '0'))
-                    column_num = int(error_elem.get('column', '0'))
-                    severity = error_elem.get('severity', 'warning')
-                    source = error_elem.get('source', '')
-                    message = error_elem.get('message', '')
-                    
-                    # Extract rule name from source
-                    rule_id = source.split('.')[-1] if '.' in source else source
-                    
-                    # Classify finding
-                    severity_level, finding_type = self._classify_checkstyle_finding(severity, rule_id)
-                    
-                    finding = Finding(
-                        file_path=file_path,
-                        line_number=line_num,
-                        column_number=column_num,
-                        severity=severity_level,
-                        finding_type=finding_type,
-                        rule_id=rule_id,
-                        message=message,
-                        tool="checkstyle"
-                    )
-                    
-                    findings.append(finding)
-        
+            return list(self.iter_checkstyle_findings([output_str], project_path))
         except Exception as e:
             logger.error(f"Lỗi parse Checkstyle output: {str(e)}")
             # Try to parse as text format fallback
             return self._parse_checkstyle_text_fallback(output_str, project_path)
+    
+    def parse_checkstyle_report(self, report_path: str, project_path: str) -> List[Finding]:
+        """
+        Parse Checkstyle XML report trực tiếp từ file theo chunks (không đọc cả file vào bộ nhớ).
         
-        return findings
+        Chỉ khi XML không hợp lệ mới đọc lại file cho text fallback.
+        
+        Args:
+            report_path: Đường dẫn XML report (checkstyle -o)
+            project_path: Base project path
+            
+        Returns:
+            List[Finding]: Danh sách findings
+        """
+        if not os.path.exists(report_path) or os.path.getsize(report_path) == 0:
+            return []
+        
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                return list(self.iter_checkstyle_findings(_iter_xml_chunks(f), project_path))
+        except ET.ParseError as e:
+            logger.error(f"Lỗi parse Checkstyle report: {str(e)}")
+            with open(report_path, 'r', encoding='utf-8') as f:
+                return self._parse_checkstyle_text_fallback(f.read(), project_path)
+    
+    def iter_checkstyle_findings(self, chunks: Iterable[str], project_path: str) -> Iterator[Finding]:
+        """
+        Parse Checkstyle XML tăng dần (pull parser), yield Finding cho mỗi <error>.
+        
+        Args:
+            chunks: XML theo từng phần (dòng, chunk đọc từ file/pipe, hoặc cả string)
+            project_path: Base project path
+            
+        Yields:
+            Finding: Từng finding
+            
+        Raises:
+            ET.ParseError: XML không hợp lệ
+        """
+        relative_paths: Dict[str, str] = {}
+        for file_name, error in _iter_checkstyle_errors(chunks):
+            if file_name not in relative_paths:
+                relative_paths[file_name] = self._relative_to_project(file_name, project_path)
+            
+            source = error.get('source', '')
+            # Extract rule name from source
+            rule_id = source.split('.')[-1] if '.' in source else source
+            
+            # Classify finding
+            severity_level, finding_type = self._classify_checkstyle_finding(
+                error.get('severity', 'warning'), rule_id
+            )
+            
+            yield Finding(
+                file_path=relative_paths[file_name],
+                line_number=int(error.get('line', '0')),
+                column_number=int(error.get('column', '0')),
+                severity=severity_level,
+                finding_type=finding_type,
+                rule_id=rule_id,
+                message=error.get('message', ''),
+                tool="checkstyle"
+            )
     
     def _parse_checkstyle_text_fallback(self, output_str: str, project_path: str) -> List[Finding]:
         """
@@ -1284,12 +1901,11 @@ class StaticAnalysisIntegratorAgent:
         try:
             logger.info(f"Chạy PMD command: {' '.join(cmd)}")
             
-            result = subprocess.run(
+            result = _run_process(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10 minute timeout
-                cwd=project_path
+                cwd=project_path,
+                timeout=self._get_tool_timeout("pmd", 600),
+                processes=self._processes
             )
             
             execution_time = time.time() - start_time
@@ -1683,12 +2299,11 @@ class StaticAnalysisIntegratorAgent:
         
         try:
             logger.debug(f"Chạy command: {' '.join(cmd)}")
-            result = subprocess.run(
+            result = _run_process(
                 cmd,
                 cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
+                timeout=self._get_tool_timeout("dart_analyze", 300),  # 5 minutes timeout
+                processes=self._processes
             )
             
             execution_time = time.time() - start_time
@@ -2073,12 +2688,11 @@ class StaticAnalysisIntegratorAgent:
         
         try:
             # Run Detekt
-            result = subprocess.run(
+            result = _run_process(
                 cmd,
                 cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
+                timeout=self._get_tool_timeout("detekt", 300),  # 5 minutes timeout
+                processes=self._processes
             )
             
             execution_time = time.time() - start_time
@@ -2088,11 +2702,9 @@ class StaticAnalysisIntegratorAgent:
             raw_output = result.stdout
             
             if os.path.exists(xml_report_path):
-                with open(xml_report_path, 'r', encoding='utf-8') as f:
-                    xml_content = f.read()
-                    findings = self.parse_detekt_output(xml_content, project_path)
-                    # Clean up report file
-                    os.remove(xml_report_path)
+                findings = self.parse_detekt_report(xml_report_path, project_path)
+                # Clean up report file
+                os.remove(xml_report_path)
             else:
                 # Fallback to parsing stderr/stdout
                 findings = self.parse_detekt_text_output(result.stderr + result.stdout, project_path)
@@ -2151,53 +2763,8 @@ class StaticAnalysisIntegratorAgent:
         Returns:
             List[Finding]: Danh sách findings
         """
-        findings = []
-        
         try:
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(xml_content)
-            
-            # Detekt XML format:
-            # <checkstyle>
-            #   <file name="path/to/file.kt">
-            #     <error line="10" column="5" severity="error" message="..." source="detekt.style.MagicNumber"/>
-            #   </file>
-            # </checkstyle>
-            
-            for file_elem in root.findall('.//file'):
-                file_path = file_elem.get('name', '')
-                
-                # Make absolute path
-                if not os.path.isabs(file_path):
-                    file_path = os.path.join(project_path, file_path)
-                
-                for error_elem in file_elem.findall('error'):
-                    line_number = int(error_elem.get('line', '1'))
-                    column_number = int(error_elem.get('column', '1'))
-                    severity_str = error_elem.get('severity', '')
-                    message = error_elem.get('message', '')
-                    source = error_elem.get('source', '')
-                    
-                    # Extract rule name từ source (e.g., "detekt.style.MagicNumber" -> "MagicNumber")
-                    rule_id = source.split('.')[-1] if source else 'unknown'
-                    
-                    # Classify finding
-                    severity, finding_type = self._classify_detekt_finding(severity_str, rule_id, source)
-                    
-                    finding = Finding(
-                        file_path=file_path,
-                        line_number=line_number,
-                        column_number=column_number,
-                        severity=severity,
-                        finding_type=finding_type,
-                        rule_id=rule_id,
-                        message=message,
-                        tool="detekt",
-                        suggestion=self._get_detekt_suggestion(rule_id)
-                    )
-                    
-                    findings.append(finding)
-            
+            findings = list(self.iter_detekt_findings([xml_content], project_path))
         except Exception as e:
             logger.error(f"Lỗi parse Detekt XML: {str(e)}")
             # Fallback to text parsing
@@ -2206,6 +2773,73 @@ class StaticAnalysisIntegratorAgent:
         logger.info(f"Parsed {len(findings)} findings từ Detekt XML output")
         return findings
     
+    def parse_detekt_report(self, report_path: str, project_path: str) -> List[Finding]:
+        """
+        Parse Detekt XML report trực tiếp từ file theo chunks (không đọc cả file vào bộ nhớ).
+        
+        Args:
+            report_path: Đường dẫn XML report
+            project_path: Đường dẫn project
+            
+        Returns:
+            List[Finding]: Danh sách findings
+        """
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                findings = list(self.iter_detekt_findings(_iter_xml_chunks(f), project_path))
+        except Exception as e:
+            logger.error(f"Lỗi parse Detekt XML: {str(e)}")
+            # Fallback to text parsing
+            with open(report_path, 'r', encoding='utf-8') as f:
+                return self.parse_detekt_text_output(f.read(), project_path)
+        
+        logger.info(f"Parsed {len(findings)} findings từ Detekt XML output")
+        return findings
+    
+    def iter_detekt_findings(self, chunks: Iterable[str], project_path: str) -> Iterator[Finding]:
+        """
+        Parse Detekt XML tăng dần (pull parser), yield Finding cho mỗi <error>.
+        
+        Detekt XML format:
+            <checkstyle>
+              <file name="path/to/file.kt">
+                <error line="10" column="5" severity="error" message="..." source="detekt.style.MagicNumber"/>
+              </file>
+            </checkstyle>
+        
+        Args:
+            chunks: XML theo từng phần (chunk đọc từ file, hoặc cả string)
+            project_path: Đường dẫn project
+            
+        Yields:
+            Finding: Từng finding
+            
+        Raises:
+            ET.ParseError: XML không hợp lệ
+        """
+        for file_name, error in _iter_checkstyle_errors(chunks):
+            # Make absolute path
+            file_path = file_name if os.path.isabs(file_name) else os.path.join(project_path, file_name)
+            
+            source = error.get('source', '')
+            # Extract rule name từ source (e.g., "detekt.style.MagicNumber" -> "MagicNumber")
+            rule_id = source.split('.')[-1] if source else 'unknown'
+            
+            # Classify finding
+            severity, finding_type = self._classify_detekt_finding(error.get('severity', ''), rule_id, source)
+            
+            yield Finding(
+                file_path=file_path,
+                line_number=int(error.get('line', '1')),
+                column_number=int(error.get('column', '1')),
+                severity=severity,
+                finding_type=finding_type,
+                rule_id=rule_id,
+                message=error.get('message', ''),
+                tool="detekt",
+                suggestion=self._get_detekt_suggestion(rule_id)
+            )
+    
     def parse_detekt_text_output(self, output_str: str, project_path: str) -> List[Finding]:
         """
         Parse text output từ Detekt khi XML không available.
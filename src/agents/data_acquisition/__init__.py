@@ -8,7 +8,8 @@ Module chịu trách nhiệm thu thập dữ liệu từ repository.
 from .git_operations import (
     GitOperationsAgent,
     RepositoryInfo,
-    PullRequestInfo
+    PullRequestInfo,
+    CommitDiffInfo
 )
 
 from .language_identifier import (
@@ -30,6 +31,7 @@ __all__ = [
     'GitOperationsAgent',
     'RepositoryInfo',
     'PullRequestInfo',
+    'CommitDiffInfo',
     
     # Language Identification  
     'LanguageIdentifierAgent',
@@ -120,6 +120,21 @@ class PullRequestInfo:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class CommitDiffInfo:
+    """Files changed between two commits (paths relative to the repository root)."""
+    base_commit: str
+    head_commit: str
+    files_added: List[str]
+    files_modified: List[str]
+    files_deleted: List[str]
+    
+    @property
+    def changed_files(self) -> List[str]:
+        """Files that exist at head and need to be (re)processed."""
+        return self.files_added + self.files_modified
+
+
 class GitOperationsAgent:
     """Agent responsible for Git repository operations and PR analysis."""
     
@@ -552,6 +567,104 @@ class GitOperationsAgent:
             self._debug_logger.log_error(e, {"path": path, "operation": "detect_basic_languages"})
             return []
     
+    @debug_trace
+    def get_changed_files(
+        self,
+        local_path: str,
+        base_commit: str,
+        head_commit: str = "HEAD"
+    ) -> CommitDiffInfo:
+        """
+        List files added, modified and deleted between two commits.
+        
+        Renamed files are reported as a deletion of the old path and an
+        addition of the new path.
+        
+        Args:
+            local_path: Path to local repository
+            base_commit: Commit (hash, branch or ref) the CKG was built from
+            head_commit: Commit to compare against
+            
+        Returns:
+            CommitDiffInfo with relative paths
+        """
+        self._debug_logger.log_step("Listing changed files", {
+            "local_path": local_path,
+            "base_commit": base_commit,
+            "head_commit": head_commit
+        })
+        
+        try:
+            repo = Repo(local_path)
+            base = repo.commit(base_commit)
+            head = repo.commit(head_commit)
+            
+            files_added = []
+            files_modified = []
+            files_deleted = []
+            
+            for diff in base.diff(head):
+                if diff.change_type == 'A':
+                    files_added.append(diff.b_path)
+                elif diff.change_type == 'D':
+                    files_deleted.append(diff.a_path)
+                elif diff.change_type == 'R':
+                    files_deleted.append(diff.a_path)
+                    files_added.append(diff.b_path)
+                else:
+                    files_modified.append(diff.b_path or diff.a_path)
+            
+            diff_info = CommitDiffInfo(
+                base_commit=base.hexsha,
+                head_commit=head.hexsha,
+                files_added=files_added,
+                files_modified=files_modified,
+                files_deleted=files_deleted
+            )
+            
+            self._debug_logger.log_step("Changed files listed", {
+                "added": len(files_added),
+                "modified": len(files_modified),
+                "deleted": len(files_deleted)
+            })
+            
+            return diff_info
+        except Exception as e:
+            self._debug_logger.log_error(e, {
+                "local_path": local_path,
+                "operation": "get_changed_files"
+            })
+            raise
+    
+    @debug_trace
+    def is_worktree_at_commit(
+        self,
+        local_path: str,
+        commit: str,
+        paths: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Check that the working tree holds the contents of a commit.
+        
+        True when HEAD resolves to the commit and the given paths (or the
+        whole tree) have no staged or unstaged changes. Untracked files are
+        ignored unless listed in paths.
+        
+        Args:
+            local_path: Path to local repository
+            commit: Commit (hash, branch or ref) expected to be checked out
+            paths: Relative paths to check for local changes (default: all)
+            
+        Returns:
+            bool: Whether files read from disk match the commit
+        """
+        repo = Repo(local_path)
+        if repo.head.commit.hexsha != repo.commit(commit).hexsha:
+            return False
+        if paths is not None and not paths:
+            return True
+        return not repo.git.status('--porcelain', '--', *(paths or [])).strip()
+    
     # Pull Request Analysis Methods
     
     @debug_trace
@@ -10,11 +10,13 @@ Provides advanced filtering, sorting, pagination, and export capabilities.
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder, DataReturnMode, GridUpdateMode, JsCode
 import pandas as pd
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from loguru import logger
 import json
 from datetime import datetime
 
+from ..code_analysis import FindingTable
+
 
 class EnhancedDataTablesAgent:
     """
@@ -118,7 +120,7 @@ class EnhancedDataTablesAgent:
     
     def create_findings_table(
         self, 
-        findings_data: List[Dict[str, Any]], 
+        findings_data: Union[List[Dict[str, Any]], FindingTable], 
         title: str = "🔍 Analysis Findings",
         show_export: bool = True
     ) -> Optional[pd.DataFrame]:
@@ -126,7 +128,7 @@ class EnhancedDataTablesAgent:
         Create an interactive findings table.
         
         Args:
-            findings_data: List of finding dictionaries
+            findings_data: List of finding dictionaries or a columnar FindingTable
             title: Table title
             show_export: Whether to show export buttons
             
@@ -134,12 +136,15 @@ class EnhancedDataTablesAgent:
             Selected rows DataFrame or None
         """
         try:
-            if not findings_data:
+            if findings_data is None or len(findings_data) == 0:
                 st.info("No findings to display.")
                 return None
             
             # Convert to DataFrame
-            df = pd.DataFrame(findings_data)
+            if isinstance(findings_data, FindingTable):
+                df = findings_data.to_display_frame()
+            else:
+                df = pd.DataFrame(findings_data)
             
             # Ensure required columns exist
             required_columns = ['severity', 'category', 'message', 'file', 'line']
@@ -12,6 +12,8 @@ from .finding_aggregator import (
     AggregationStrategy
 )
 
+from .finding_dedup import FindingSimilarityIndex, group_duplicate_findings
+
 from .report_generator import (
     ReportGeneratorAgent,
     ReportFormat,
@@ -35,6 +37,8 @@ __all__ = [
     'AggregatedFinding',
     'AggregationResult',
     'AggregationStrategy',
+    'FindingSimilarityIndex',
+    'group_duplicate_findings',
     
     # Report Generator
     'ReportGeneratorAgent',
@@ -6,16 +6,17 @@ Agent tổng hợp findings từ multiple sources (static analysis, CKG analysis
 Thực hiện deduplication, prioritization và categorization.
 """
 
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from loguru import logger
 from collections import defaultdict
 from enum import Enum
 
 from ..code_analysis import (
-    Finding, AnalysisResult, SeverityLevel, FindingType, ContextualFinding,
+    Finding, AnalysisResult, SeverityLevel, FindingType, ContextualFinding, FindingTable,
     ArchitecturalIssue, ArchitecturalAnalysisResult, CircularDependency, UnusedElement, IssueType
 )
+from .finding_dedup import FindingSimilarityIndex
 
 
 class AggregationStrategy(Enum):
@@ -49,6 +50,7 @@ class AggregationResult:
     aggregation_strategy: AggregationStrategy
     success: bool
     error_message: Optional[str] = None
+    finding_table: Optional[FindingTable] = None  # Bảng findings gốc khi input là FindingTable
 
 
 class FindingAggregatorAgent:
@@ -82,21 +84,27 @@ class FindingAggregatorAgent:
         }
     
     def aggregate_findings(self, 
-                          findings_by_source: Dict[str, List[Finding]],
+                          findings_by_source: Union[Dict[str, List[Finding]], FindingTable],
                           strategy: AggregationStrategy = AggregationStrategy.MERGE_DUPLICATES,
                           architectural_result: Optional[ArchitecturalAnalysisResult] = None) -> AggregationResult:
         """
         Aggregate findings từ multiple sources, bao gồm architectural analysis.
         
         Args:
-            findings_by_source: Dict source_name -> findings
+            findings_by_source: Dict source_name -> findings, hoặc FindingTable
+                (ví dụ aggregate_results()["finding_table"]) với source là tool
             strategy: Aggregation strategy
             architectural_result: Optional architectural analysis result
             
         Returns:
             AggregationResult: Kết quả aggregation
         """
+        finding_table = None
         try:
+            if isinstance(findings_by_source, FindingTable):
+                finding_table = findings_by_source
+                findings_by_source = finding_table.findings_by_tool()
+            
             logger.info(f"Aggregating findings từ {len(findings_by_source)} sources với strategy {strategy.value}")
             
             # Add architectural findings nếu có
@@ -127,7 +135,8 @@ class FindingAggregatorAgent:
                     aggregated_findings=[],
                     deduplication_stats={},
                     aggregation_strategy=strategy,
-                    success=True
+                    success=True,
+                    finding_table=finding_table
                 )
             
             # Apply aggregation strategy
@@ -151,7 +160,8 @@ class FindingAggregatorAgent:
                 aggregated_findings=aggregated,
                 deduplication_stats=dedup_stats,
                 aggregation_strategy=strategy,
-                success=True
+                success=True,
+                finding_table=finding_table
             )
             
         except Exception as e:
@@ -172,6 +182,10 @@ class FindingAggregatorAgent:
         """
         Merge duplicate và similar findings.
         
+        Candidates được lấy từ FindingSimilarityIndex (buckets theo file/line
+        window và rule_id, messages tokenize một lần) thay vì so sánh mọi cặp;
+        tiêu chí merge giống _are_findings_similar.
+        
         Args:
             findings: List of findings
             source_mapping: Finding ID to source mapping
@@ -180,24 +194,13 @@ class FindingAggregatorAgent:
             List[AggregatedFinding]: Merged findings
         """
         aggregated = []
-        processed_ids = set()
+        index = FindingSimilarityIndex(findings, message_threshold=self.deduplication_threshold)
         
-        for i, finding in enumerate(findings):
-            if id(finding) in processed_ids:
-                continue
-            
-            # Find similar findings
-            similar_findings = []
+        for primary_index, related_indexes in index.group_duplicates():
+            finding = findings[primary_index]
+            similar_findings = [findings[j] for j in related_indexes]
             similar_sources = set([source_mapping[id(finding)]])
-            
-            for j, other_finding in enumerate(findings[i+1:], i+1):
-                if id(other_finding) in processed_ids:
-                    continue
-                    
-                if self._are_findings_similar(finding, other_finding):
-                    similar_findings.append(other_finding)
-                    similar_sources.add(source_mapping[id(other_finding)])
-                    processed_ids.add(id(other_finding))
+            similar_sources.update(source_mapping[id(other)] for other in similar_findings)
             
             # Create aggregated finding
             confidence_score = self._calculate_confidence_score(finding, similar_findings, similar_sources)
@@ -213,7 +216,6 @@ class FindingAggregatorAgent:
             )
             
             aggregated.append(aggregated_finding)
-            processed_ids.add(id(finding))
         
         # Sort by priority score
         aggregated.sort(key=lambda x: x.priority_score, reverse=True)
@@ -385,6 +387,7 @@ class FindingAggregatorAgent:
         """
         # Same file và close line numbers
         if (finding1.file_path == finding2.file_path and
+            finding1.line_number is not None and finding2.line_number is not None and
             abs(finding1.line_number - finding2.line_number) <= 3):
             
             # Same rule or similar message
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+AI CodeScan - Finding Deduplication Index
+
+Bucketed candidate generation cho FindingAggregatorAgent. Hai findings là
+duplicates khi:
+
+- cùng file, line cách nhau <= line_window và (cùng rule_id hoặc message
+  similarity >= message_threshold), hoặc
+- cùng rule_id (khác rỗng) và message similarity >= rule_threshold.
+
+Message similarity là Jaccard của tập từ lowercase. Messages được tokenize
+một lần thành tập token ids (interned). Candidates chỉ lấy từ line-window
+buckets theo (file, line) và từ prefix-filter postings theo (rule_id, token):
+với global token order cố định, hai tập có Jaccard >= t luôn chia sẻ ít nhất
+một token trong prefix dài ``|s| - ceil(t * |s|) + 1``. Vì vậy kết quả giống
+hệt so sánh từng cặp nhưng chỉ tốn thời gian gần tuyến tính.
+"""
+
+import math
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from ..code_analysis import Finding
+
+
+# Token giả cho message rỗng: hai messages rỗng có similarity 1.0
+_EMPTY_MESSAGE_TOKEN = -1
+
+
+def jaccard_similarity(tokens1: FrozenSet[int], tokens2: FrozenSet[int]) -> float:
+    """Jaccard similarity của hai token sets (1.0 nếu cả hai rỗng)."""
+    if not tokens1 and not tokens2:
+        return 1.0
+    if not tokens1 or not tokens2:
+        return 0.0
+    intersection = len(tokens1 & tokens2)
+    return intersection / (len(tokens1) + len(tokens2) - intersection)
+
+
+class FindingSimilarityIndex:
+    """
+    Index tìm findings tương tự mà không so sánh mọi cặp.
+
+    Args:
+        findings: Findings theo thứ tự aggregate
+        message_threshold: Similarity tối thiểu cho findings gần nhau trong cùng file
+        rule_threshold: Similarity tối thiểu cho findings cùng rule_id ở bất kỳ đâu
+        line_window: Khoảng cách line tối đa để coi là gần nhau
+    """
+
+    def __init__(self,
+                 findings: List[Finding],
+                 message_threshold: float = 0.8,
+                 rule_threshold: float = 0.9,
+                 line_window: int = 3):
+        self.findings = findings
+        self.message_threshold = message_threshold
+        self.rule_threshold = rule_threshold
+        self.line_window = line_window
+
+        vocabulary: Dict[str, int] = {}
+        self.tokens: List[FrozenSet[int]] = [
+            frozenset(vocabulary.setdefault(word, len(vocabulary)) for word in (f.message or "").lower().split())
+            for f in findings
+        ]
+
+        self._line_buckets: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for index, finding in enumerate(findings):
+            if finding.line_number is not None:
+                self._line_buckets[self._line_bucket(finding.file_path, finding.line_number)].append(index)
+
+        # Token hiếm trước để prefixes ngắn và postings nhỏ
+        frequency = Counter(token for tokens in self.tokens for token in tokens)
+        self._prefixes: List[Tuple[int, ...]] = []
+        self._postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for index, finding in enumerate(findings):
+            prefix = self._prefix(self.tokens[index], frequency) if finding.rule_id else ()
+            self._prefixes.append(prefix)
+            for token in prefix:
+                self._postings[(finding.rule_id, token)].append(index)
+
+    def _line_bucket(self, file_path: str, line_number: int) -> Tuple[str, int]:
+        return file_path, line_number // (self.line_window + 1)
+
+    def _prefix(self, tokens: FrozenSet[int], frequency: Counter) -> Tuple[int, ...]:
+        """Prefix-filter tokens cho rule_threshold (dài hơn khi làm tròn để không bỏ sót)."""
+        if not tokens:
+            return (_EMPTY_MESSAGE_TOKEN,)
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        length = len(ordered) - math.ceil(self.rule_threshold * len(ordered) - 1e-9) + 1
+        return tuple(ordered[:max(1, min(length, len(ordered)))])
+
+    def message_similarity(self, index1: int, index2: int) -> float:
+        """Jaccard similarity của messages (tokens đã được tính sẵn)."""
+        return jaccard_similarity(self.tokens[index1], self.tokens[index2])
+
+    def is_similar(self, index1: int, index2: int) -> bool:
+        """Cùng tiêu chí với FindingAggregatorAgent._are_findings_similar."""
+        finding1, finding2 = self.findings[index1], self.findings[index2]
+        same_rule = finding1.rule_id == finding2.rule_id
+
+        if (finding1.file_path == finding2.file_path and
+                finding1.line_number is not None and finding2.line_number is not None and
+                abs(finding1.line_number - finding2.line_number) <= self.line_window):
+            if same_rule or self.message_similarity(index1, index2) >= self.message_threshold:
+                return True
+
+        return (same_rule and finding1.rule_id != "" and
+                self.message_similarity(index1, index2) >= self.rule_threshold)
+
+    def candidates(self, index: int) -> Iterable[int]:
+        """Indexes có thể tương tự với finding ``index`` (superset, chưa lọc)."""
+        finding = self.findings[index]
+        if finding.line_number is not None:
+            file_path, bucket = self._line_bucket(finding.file_path, finding.line_number)
+            for neighbor in (bucket - 1, bucket, bucket + 1):
+                yield from self._line_buckets.get((file_path, neighbor), ())
+        for token in self._prefixes[index]:
+            yield from self._postings.get((finding.rule_id, token), ())
+
+    def group_duplicates(self) -> List[Tuple[int, List[int]]]:
+        """
+        Gom duplicates theo thứ tự như vòng lặp từng cặp.
+
+        Mỗi finding chưa xử lý trở thành primary và nhận mọi finding phía sau
+        (chưa xử lý) tương tự với nó, theo thứ tự ban đầu.
+
+        Returns:
+            List[Tuple[int, List[int]]]: (primary index, related indexes)
+        """
+        processed_ids = set()
+        groups = []
+        for index, finding in enumerate(self.findings):
+            if id(finding) in processed_ids:
+                continue
+
+            related = []
+            for other in sorted(set(self.candidates(index))):
+                if other <= index or id(self.findings[other]) in processed_ids:
+                    continue
+                if self.is_similar(index, other):
+                    related.append(other)
+                    processed_ids.add(id(self.findings[other]))
+
+            groups.append((index, related))
+            processed_ids.add(id(finding))
+        return groups
+
+
+def group_duplicate_findings(findings: List[Finding],
+                             message_threshold: float = 0.8,
+                             rule_threshold: float = 0.9,
+                             line_window: int = 3) -> List[Tuple[int, List[int]]]:
+    """Shortcut: FindingSimilarityIndex(...).group_duplicates()."""
+    return FindingSimilarityIndex(findings, message_threshold, rule_threshold, line_window).group_duplicates()
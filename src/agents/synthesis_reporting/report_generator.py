@@ -16,7 +16,7 @@ from io import StringIO
 from enum import Enum
 
 from .finding_aggregator import AggregatedFinding, AggregationResult, AggregationStrategy
-from ..code_analysis import SeverityLevel, FindingType
+from ..code_analysis import SeverityLevel, FindingType, FindingTable
 
 
 class ReportFormat(Enum):
@@ -218,6 +218,14 @@ class ReportGeneratorAgent:
             lines.append(f"{ftype.upper()}: {count}")
         lines.append("")
         
+        # Findings gốc (trước dedup) theo tool, tính trên bảng cột
+        if result.finding_table is not None and len(result.finding_table):
+            lines.append("ORIGINAL FINDINGS BY TOOL")
+            lines.append("-" * 25)
+            for tool, count in self._count_by_tool(result.finding_table).items():
+                lines.append(f"{tool}: {count}")
+            lines.append("")
+        
         # Architectural Issues Section (nếu có)
         if architectural_issues:
             lines.append("ARCHITECTURAL ISSUES")
@@ -341,6 +349,10 @@ class ReportGeneratorAgent:
             "findings": findings_data
         }
         
+        if result.finding_table is not None:
+            report_data["summary"]["original_severity_breakdown"] = result.finding_table.severity_histogram()
+            report_data["summary"]["original_findings_by_tool"] = self._count_by_tool(result.finding_table)
+        
         return json.dumps(report_data, indent=2, ensure_ascii=False)
     
     def _generate_csv_report(self, 
@@ -349,6 +361,10 @@ class ReportGeneratorAgent:
                             options: Dict[str, Any]) -> str:
         """Generate CSV report."""
         
+        # options["raw_findings"]: xuất findings gốc (trước dedup) trực tiếp từ bảng cột
+        if options.get("raw_findings", False) and result.finding_table is not None:
+            return result.finding_table.to_csv()
+        
         output = StringIO()
         writer = csv.writer(output)
         
@@ -544,6 +560,13 @@ class ReportGeneratorAgent:
                     lines.append(f"- {emoji} **{severity.capitalize()}:** {count}")
             lines.append("")
         
+        if result.finding_table is not None and len(result.finding_table):
+            lines.append("### Original Findings by Tool")
+            lines.append("")
+            for tool, count in self._count_by_tool(result.finding_table).items():
+                lines.append(f"- **{tool}:** {count}")
+            lines.append("")
+        
         # High priority findings
         high_priority = [f for f in result.aggregated_findings if f.priority_score >= 0.7]
         if high_priority:
@@ -567,6 +590,11 @@ class ReportGeneratorAgent:
         
         return "\n".join(lines)
     
+    @staticmethod
+    def _count_by_tool(finding_table: FindingTable) -> Dict[str, int]:
+        """Số findings theo tool, giảm dần."""
+        return {str(tool): int(count) for tool, count in finding_table.count_by('tool').items()}
+    
     def generate_executive_summary(self, 
                                   aggregation_result: AggregationResult,
                                   project_name: str) -> str:
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed static analysis result cache.
+"""
+
+import sys
+
+import pytest
+
+from src.agents.code_analysis import AnalysisResultCache, StaticAnalysisIntegratorAgent
+
+
+# Fake linter: ghi lại files được gửi vào log, in một finding cho mỗi dòng "bad" trong file
+FAKE_LINTER = """
+import sys
+log_path, paths = sys.argv[1], sys.argv[2:]
+with open(log_path, 'a') as log:
+    log.write('\\n'.join(paths) + '\\n')
+for path in paths:
+    for number, line in enumerate(open(path), 1):
+        if 'bad' in line:
+            print(f"{path}:{number}:1: E501 {line.strip()}")
+"""
+
+
+class TestCacheKey:
+    """Test cache key components."""
+
+    def test_key_depends_on_content_tool_version_and_config(self):
+        """Test every key component changes the key."""
+        fingerprint = AnalysisResultCache.config_fingerprint({"max_line_length": 88})
+        key = AnalysisResultCache.make_analysis_key(b"x = 1\n", "flake8", "7.0", fingerprint)
+
+        assert key == AnalysisResultCache.make_analysis_key(b"x = 1\n", "flake8", "7.0", fingerprint)
+        assert key != AnalysisResultCache.make_analysis_key(b"x = 2\n", "flake8", "7.0", fingerprint)
+        assert key != AnalysisResultCache.make_analysis_key(b"x = 1\n", "pylint", "7.0", fingerprint)
+        assert key != AnalysisResultCache.make_analysis_key(b"x = 1\n", "flake8", "7.1", fingerprint)
+        assert key != AnalysisResultCache.make_analysis_key(
+            b"x = 1\n", "flake8", "7.0", AnalysisResultCache.config_fingerprint({"max_line_length": 100}))
+
+    def test_execution_only_settings_are_ignored(self):
+        """Test timeouts and scheduling settings do not invalidate the cache."""
+        assert AnalysisResultCache.config_fingerprint({"ignore": ["E203"], "timeout": 10, "shard_workers": 4}) == \
+            AnalysisResultCache.config_fingerprint({"ignore": ["E203"], "enabled": True})
+
+    def test_project_config_files_change_fingerprint(self, tmp_path):
+        """Test editing .flake8/setup.cfg/pyproject.toml invalidates the cache."""
+        empty = AnalysisResultCache.config_fingerprint({}, str(tmp_path))
+        (tmp_path / ".flake8").write_text("[flake8]\nmax-line-length = 88\n")
+        flake8 = AnalysisResultCache.config_fingerprint({}, str(tmp_path))
+        (tmp_path / ".flake8").write_text("[flake8]\nmax-line-length = 120\n")
+        edited = AnalysisResultCache.config_fingerprint({}, str(tmp_path))
+        (tmp_path / "pyproject.toml").write_text("[tool.pylint]\n")
+
+        assert len({empty, flake8, edited, AnalysisResultCache.config_fingerprint({}, str(tmp_path))}) == 4
+
+
+class TestCachedAnalysis:
+    """Test rescans only send changed files to the tool."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("x = 1  # bad\n")
+        (project / "b.py").write_text("y = 2\n")
+        (project / "c.py").write_text("z = 3\nbad = 4\n")
+        return project
+
+    @pytest.fixture
+    def invocations(self, tmp_path):
+        return tmp_path / "invocations.log"
+
+    def make_agent(self, tmp_path, invocations, version="fake 1.0", **flake8_config):
+        agent = StaticAnalysisIntegratorAgent(
+            tools_config={"flake8": {"enabled": True, **flake8_config}},
+            result_cache=AnalysisResultCache(cache_dir=str(tmp_path / "cache"))
+        )
+        agent._tool_versions["flake8"] = version
+        agent._build_flake8_command = lambda project_path, targets=None: [
+            sys.executable, "-c", FAKE_LINTER, str(invocations), *(targets or [project_path])
+        ]
+        return agent
+
+    def analyzed_files(self, invocations):
+        """Tên các files fake linter nhận được, rồi xóa log."""
+        if not invocations.exists():
+            return []
+        names = sorted(line.rsplit("/", 1)[-1] for line in invocations.read_text().splitlines() if line)
+        invocations.unlink()
+        return names
+
+    def summary(self, result):
+        return sorted((f.file_path, f.line_number, f.message) for f in result.findings)
+
+    def test_rescan_replays_unchanged_files(self, tmp_path, project, invocations):
+        """Test an unchanged rescan runs nothing and returns the same findings."""
+        first = self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])["flake8"]
+        assert self.analyzed_files(invocations) == ["a.py", "b.py", "c.py"]
+
+        second = self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])["flake8"]
+
+        assert self.analyzed_files(invocations) == []
+        assert second.success
+        assert second.total_files_analyzed == 3
+        assert self.summary(second) == self.summary(first) == [("a.py", 1, "x = 1  # bad"), ("c.py", 2, "bad = 4")]
+
+    def test_only_changed_files_are_sent(self, tmp_path, project, invocations):
+        """Test editing one file reruns the tool on that file only."""
+        self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])
+        self.analyzed_files(invocations)
+        (project / "b.py").write_text("y = 2  # bad now\n")
+        (project / "c.py").write_text("z = 3\n")
+
+        result = self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])["flake8"]
+
+        assert self.analyzed_files(invocations) == ["b.py", "c.py"]
+        assert self.summary(result) == [("a.py", 1, "x = 1  # bad"), ("b.py", 1, "y = 2  # bad now")]
+
+    def test_version_and_config_invalidate(self, tmp_path, project, invocations):
+        """Test a new tool version or config reruns every file."""
+        self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])
+        self.analyzed_files(invocations)
+
+        self.make_agent(tmp_path, invocations, version="fake 2.0").run_analysis(str(project), ["flake8"])
+        assert len(self.analyzed_files(invocations)) == 3
+
+        self.make_agent(tmp_path, invocations, version="fake 2.0", timeout=30).run_analysis(str(project), ["flake8"])
+        assert self.analyzed_files(invocations) == []
+
+        self.make_agent(tmp_path, invocations, version="fake 2.0", ignore=["E501"]).run_analysis(
+            str(project), ["flake8"])
+        assert len(self.analyzed_files(invocations)) == 3
+
+    def test_renamed_file_hits_with_new_path(self, tmp_path, project, invocations):
+        """Test content-addressed entries are replayed under the current path."""
+        self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])
+        self.analyzed_files(invocations)
+        (project / "a.py").rename(project / "renamed.py")
+
+        result = self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])["flake8"]
+
+        assert self.analyzed_files(invocations) == []
+        assert ("renamed.py", 1, "x = 1  # bad") in self.summary(result)
+
+    def test_setup_cfg_edit_reruns_every_file(self, tmp_path, project, invocations):
+        """Test a changed project config file is part of the cache key."""
+        self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])
+        self.analyzed_files(invocations)
+        (project / "setup.cfg").write_text("[flake8]\nignore = E501\n")
+
+        self.make_agent(tmp_path, invocations).run_analysis(str(project), ["flake8"])
+
+        assert len(self.analyzed_files(invocations)) == 3
+
+    def test_cross_file_tools_are_not_cached_by_default(self, tmp_path):
+        """Test pylint/mypy opt in through tools_config."""
+        cache = AnalysisResultCache(cache_dir=str(tmp_path / "cache"))
+
+        assert StaticAnalysisIntegratorAgent(result_cache=cache)._is_cached("flake8")
+        assert not StaticAnalysisIntegratorAgent(result_cache=cache)._is_cached("pylint")
+        assert not StaticAnalysisIntegratorAgent(result_cache=cache)._is_cached("mypy")
+        assert StaticAnalysisIntegratorAgent(
+            tools_config={"mypy": {"cache": True}}, result_cache=cache)._is_cached("mypy")
+        assert not StaticAnalysisIntegratorAgent()._is_cached("flake8")
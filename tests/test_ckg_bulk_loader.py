@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Tests for CKGBulkLoader và bulk load mode của ASTtoCKGBuilderAgent.
+"""
+
+import ast
+import pytest
+from unittest.mock import MagicMock
+
+from src.agents.ckg_operations.ckg_bulk_loader import CKGBulkLoader, BulkLoadStats
+from src.agents.ckg_operations.ast_to_ckg_builder import ASTtoCKGBuilderAgent
+from src.agents.ckg_operations.ckg_schema import (
+    NodeType, RelationshipType, NodeProperties, RelationshipProperties, CKGSchema
+)
+from src.agents.ckg_operations.code_parser_coordinator import ParseResult, ParsedFile
+
+
+def create_mock_driver():
+    """Create a mock Neo4j driver that records transaction runs."""
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    tx = session.begin_transaction.return_value.__enter__.return_value
+    return driver, tx
+
+
+def create_node(name: str, node_type: NodeType = NodeType.FUNCTION, line: int = 1) -> NodeProperties:
+    """Create a simple NodeProperties."""
+    return NodeProperties(
+        name=name,
+        type=node_type,
+        file_path="/test/module.py",
+        line_number=line,
+        properties={'id': f"{node_type.value}_{name}", 'docstring': "It's \"quoted\""}
+    )
+
+
+class TestCKGSchemaBulkQueries:
+    """Test UNWIND query helpers in CKGSchema."""
+
+    def test_node_row_uses_builder_id(self):
+        """Test node row keeps the id assigned by the builder."""
+        row = CKGSchema.get_node_row(create_node("foo"))
+
+        assert row['id'] == "Function_foo"
+        assert row['name'] == "foo"
+        assert row['docstring'] == "It's \"quoted\""
+
+    def test_node_row_converts_unsupported_values(self):
+        """Test nested values are converted to Neo4j-compatible types."""
+        node = create_node("foo")
+        node.properties['metadata'] = {'a': 1}
+        node.properties['base_classes'] = ['Base', None, 3]
+
+        row = CKGSchema.get_node_row(node)
+
+        assert row['metadata'] == "{'a': 1}"
+        assert row['base_classes'] == ['Base', 3]
+
+    def test_unwind_queries(self):
+        """Test UNWIND query templates."""
+        node_query = CKGSchema.get_cypher_unwind_create_nodes(NodeType.CLASS)
+        rel_query = CKGSchema.get_cypher_unwind_create_relationships(RelationshipType.CALLS)
+
+        assert node_query.startswith("UNWIND $rows AS row")
+        assert "MERGE (n:Class {id: row.id})" in node_query
+        assert "UNWIND $rows AS row" in rel_query
+        assert "MERGE (source)-[r:CALLS]->(target)" in rel_query
+        assert "CREATE" not in rel_query
+
+
+class TestCKGSchemaParameterizedQueries:
+    """Test parameterized (template + parameters) query generation."""
+
+    def test_node_template_is_fixed_per_label(self):
+        """Test nodes of the same label share one query template."""
+        query_a, params_a = CKGSchema.get_parameterized_create_node(create_node("a", line=1))
+        query_b, params_b = CKGSchema.get_parameterized_create_node(create_node("b", line=2))
+
+        assert query_a == query_b == "MERGE (n:Function {id: $props.id}) SET n = $props RETURN n"
+        assert params_a['props']['name'] == "a"
+        assert params_b['props']['line_number'] == 2
+
+    def test_node_parameters_keep_quotes_unescaped(self):
+        """Test docstrings with quotes are passed as parameters, not inlined."""
+        query, params = CKGSchema.get_parameterized_create_node(create_node("a"))
+
+        assert "quoted" not in query
+        assert params['props']['docstring'] == "It's \"quoted\""
+
+    def test_relationship_template_and_parameters(self):
+        """Test relationship template uses $source_id/$target_id parameters."""
+        rel = RelationshipProperties(
+            type=RelationshipType.CALLS,
+            source_node_id="Function_a",
+            target_node_id="Function_b",
+            properties={'line_number': 3},
+            source_type=NodeType.FUNCTION,
+            target_type=NodeType.FUNCTION
+        )
+
+        query, params = CKGSchema.get_parameterized_create_relationship(rel)
+
+        assert "MATCH (source:Function {id: $source_id})" in query
+        assert "MERGE (source)-[r:CALLS]->(target)" in query
+        assert "Function_a" not in query
+        assert params == {'source_id': "Function_a", 'target_id': "Function_b",
+                          'props': {'line_number': 3}}
+
+    def test_legacy_node_query_uses_builder_id(self):
+        """Test inline node query sets the same id relationships match on."""
+        query = CKGSchema.get_cypher_create_node(create_node("a"))
+
+        assert "SET n.id = 'Function_a'" in query
+
+    def test_builder_executes_parameterized_queries(self):
+        """Test non-bulk build runs template queries with parameter maps."""
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver)
+        builder._schema_bootstrapped = True
+
+        builder.build_ckg_from_ast(ast.parse("def f(a):\n    pass\n"), "/test/a.py")
+        executed = builder.save_to_neo4j(builder._get_parameterized_queries())
+
+        assert executed == len(builder.created_nodes) + len(builder.created_relationships)
+        for call in session.run.call_args_list:
+            query, params = call.args
+            assert "$" in query
+            assert isinstance(params, dict)
+
+
+class TestCKGSchemaLabelScoping:
+    """Test label-scoped relationship queries and schema bootstrap."""
+
+    def test_relationship_query_with_labels(self):
+        """Test relationship MATCH carries source and target labels."""
+        rel = RelationshipProperties(
+            type=RelationshipType.DEFINES_METHOD,
+            source_node_id="Class_A",
+            target_node_id="Method_m",
+            source_type=NodeType.CLASS,
+            target_type=NodeType.METHOD
+        )
+
+        query = CKGSchema.get_cypher_create_relationship(rel)
+
+        assert "MATCH (source:Class {id: 'Class_A'})" in query
+        assert "MATCH (target:Method {id: 'Method_m'})" in query
+
+    def test_relationship_query_without_labels(self):
+        """Test relationship without labels falls back to unlabeled MATCH."""
+        rel = RelationshipProperties(
+            type=RelationshipType.CALLS,
+            source_node_id="a",
+            target_node_id="b"
+        )
+
+        query = CKGSchema.get_cypher_create_relationship(rel)
+
+        assert "MATCH (source {id: 'a'})" in query
+
+    def test_schema_bootstrap_covers_all_labels(self):
+        """Test bootstrap creates id constraint and indexes for every label."""
+        statements = CKGSchema.get_cypher_schema_bootstrap()
+
+        # 3 statements mỗi label + full-text index trên name
+        assert len(statements) == len(NodeType) * 3 + 1
+        assert statements[-1].startswith("CREATE FULLTEXT INDEX ckg_name_fulltext IF NOT EXISTS")
+        assert ("CREATE CONSTRAINT java_class_id_unique IF NOT EXISTS "
+                "FOR (n:JavaClass) REQUIRE n.id IS UNIQUE") in statements
+        assert ("CREATE INDEX function_name_index IF NOT EXISTS "
+                "FOR (n:Function) ON (n.name)") in statements
+        assert ("CREATE INDEX file_file_path_index IF NOT EXISTS "
+                "FOR (n:File) ON (n.file_path)") in statements
+
+    def test_builder_resolves_relationship_labels(self):
+        """Test the builder fills relationship labels from created nodes."""
+        builder = ASTtoCKGBuilderAgent()
+        builder.build_ckg_from_ast(ast.parse("class A:\n    def m(self):\n        pass\n"), "/test/a.py")
+
+        defines_method = [rel for rel in builder.created_relationships
+                          if rel.type == RelationshipType.DEFINES_METHOD]
+        assert defines_method
+        assert defines_method[0].source_type == NodeType.CLASS
+        assert defines_method[0].target_type == NodeType.METHOD
+
+    def test_builder_ensure_schema_runs_once(self):
+        """Test schema bootstrap is executed only once per builder."""
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver)
+
+        statements_count = len(CKGSchema.get_cypher_schema_bootstrap())
+
+        assert builder.ensure_schema() == statements_count
+        assert builder.ensure_schema() == 0
+        assert session.run.call_count == statements_count
+
+
+class TestCKGSchemaInDegreeIndex:
+    """Test the in-degree index used by unused-element reports."""
+
+    def test_refresh_queries_cover_indexed_labels(self):
+        """Test one counting pass per indexed (relationship, label) plus Dart import refs."""
+        queries = CKGSchema.get_cypher_refresh_in_degree_index()
+
+        assert CKGSchema.in_degree_property(RelationshipType.CALLS) == "in_degree_calls"
+        assert len(queries) == sum(len(labels) for labels in CKGSchema.IN_DEGREE_INDEX.values()) + 1
+        assert any("MATCH (n:Function)" in q and "SET n.in_degree_calls = in_degree" in q for q in queries)
+        assert "SET exp.import_refs" in queries[-1]
+        # Dart refs: tách imported_name thành path suffixes rồi MATCH theo name, không CONTAINS
+        assert "CONTAINS" not in queries[-1]
+        assert "MATCH (exp:DartExport {name: name})" in queries[-1]
+
+    def test_scoped_refresh_queries_take_update_scope(self):
+        """Test incremental refresh queries only touch $paths, $ids and $ref_names."""
+        queries = CKGSchema.get_cypher_refresh_in_degree_index(scoped=True)
+
+        assert len(queries) == len(CKGSchema.get_cypher_refresh_in_degree_index())
+        assert all("n.file_path IN $paths OR n.id IN $ids" in q for q in queries[:-1])
+        assert "exp.name IN $ref_names" in queries[-1]
+
+    def test_dart_import_ref_names(self):
+        """Test an import references every '/'-suffix of its URI."""
+        assert set(CKGSchema.dart_import_ref_names("package:app/src/widget.dart")) == {
+            "package:app/src/widget.dart", "app/src/widget.dart", "src/widget.dart", "widget.dart"
+        }
+        assert CKGSchema.dart_import_ref_names("dart:async") == ["dart:async"]
+        assert CKGSchema.dart_import_ref_names(None) == []
+
+    def test_builder_refreshes_index_after_write(self):
+        """Test a build with Neo4j runs the refresh queries after writing."""
+        driver, _ = create_mock_driver()
+        session = driver.session.return_value.__enter__.return_value
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver, bulk_load=True)
+        builder._schema_bootstrapped = True
+
+        builder.build_ckg_from_parse_result(TestASTtoCKGBuilderBulkLoad().create_parse_result())
+
+        executed = [call.args[0] for call in session.run.call_args_list]
+        assert executed == CKGSchema.get_cypher_refresh_in_degree_index()
+
+
+class TestCKGBulkLoader:
+    """Test CKGBulkLoader batching behaviour."""
+
+    def test_invalid_batch_size(self):
+        """Test batch_size must be positive."""
+        with pytest.raises(ValueError):
+            CKGBulkLoader(MagicMock(), batch_size=0)
+
+    def test_flush_groups_by_label_and_batches(self):
+        """Test rows are grouped by label and split into batches."""
+        driver, tx = create_mock_driver()
+        loader = CKGBulkLoader(driver, batch_size=2)
+
+        loader.add_nodes([create_node(f"f{i}", line=i) for i in range(5)])
+        loader.add_node(create_node("C", NodeType.CLASS))
+        loader.add_relationship(RelationshipProperties(
+            type=RelationshipType.DEFINES_METHOD,
+            source_node_id="Class_C",
+            target_node_id="Function_f0"
+        ))
+        assert loader.pending_count() == 7
+
+        stats = loader.flush()
+
+        # 3 batches Function + 1 Class + 1 relationship
+        assert stats.batches_executed == 5
+        assert stats.nodes_written == 6
+        assert stats.relationships_written == 1
+        assert tx.run.call_count == 5
+        assert tx.commit.call_count == 5
+        assert loader.pending_count() == 0
+
+        batch_sizes = [len(call.kwargs['rows']) for call in tx.run.call_args_list]
+        assert batch_sizes == [2, 2, 1, 1, 1]
+
+    def test_flush_records_failed_batches(self):
+        """Test a failing batch is reported without aborting the load."""
+        driver, tx = create_mock_driver()
+        tx.run.side_effect = [Exception("boom"), None]
+        loader = CKGBulkLoader(driver, batch_size=1)
+        loader.add_nodes([create_node("a"), create_node("b")])
+
+        stats = loader.flush()
+
+        assert stats.batches_executed == 1
+        assert stats.batches_failed == 1
+        assert stats.nodes_written == 1
+        assert "boom" in stats.error_messages
+
+    def test_flush_without_connection(self):
+        """Test flush without a connection returns an error."""
+        loader = CKGBulkLoader(None)
+        loader.add_node(create_node("a"))
+
+        stats = loader.flush()
+
+        assert isinstance(stats, BulkLoadStats)
+        assert stats.batches_executed == 0
+        assert stats.error_messages
+
+
+class TestASTtoCKGBuilderBulkLoad:
+    """Test bulk load mode in ASTtoCKGBuilderAgent."""
+
+    def create_parse_result(self) -> ParseResult:
+        """Create a ParseResult with one Python file."""
+        source = "import os\n\nclass A:\n    def m(self, x):\n        pass\n\ndef f(a, b):\n    return a\n"
+        parsed_file = ParsedFile(
+            file_path="/test/a.py",
+            relative_path="a.py",
+            language="Python",
+            ast_tree=ast.parse(source),
+            parse_success=True,
+            nodes_count=20,
+            lines_count=8
+        )
+        return ParseResult(
+            project_path="/test",
+            language_profile=None,
+            total_files=1,
+            successful_files=1,
+            failed_files=0,
+            parsed_files=[parsed_file],
+            parse_errors=[],
+            parsing_stats={}
+        )
+
+    def test_bulk_load_uses_unwind_batches(self):
+        """Test bulk mode writes UNWIND batches instead of per-element queries."""
+        driver, tx = create_mock_driver()
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver, bulk_load=True, batch_size=500)
+
+        result = builder.build_ckg_from_parse_result(self.create_parse_result())
+
+        assert result.build_success
+        queries = [call.args[0] for call in tx.run.call_args_list]
+        assert queries
+        assert all("UNWIND $rows AS row" in query for query in queries)
+        # One batch per label / (relationship type, source label, target label)
+        expected_batches = (len({n.type for n in builder.created_nodes.values()}) +
+                            len({(r.type, r.source_type, r.target_type)
+                                 for r in builder.created_relationships}))
+        assert result.cypher_queries_executed == expected_batches
+
+    def test_connected_build_skips_inline_create_queries(self):
+        """Test connected builds do not generate the unused inline CREATE strings."""
+        driver, _ = create_mock_driver()
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver, bulk_load=True)
+        builder.schema = MagicMock(wraps=builder.schema)
+
+        result = builder.build_ckg_from_parse_result(self.create_parse_result())
+
+        assert result.build_success
+        assert builder.created_nodes
+        builder.schema.get_cypher_create_node.assert_not_called()
+        builder.schema.get_cypher_create_relationship.assert_not_called()
+
+    def test_build_without_connection_exports_queries(self):
+        """Test builds without a database still count the exported CREATE queries."""
+        builder = ASTtoCKGBuilderAgent()
+        builder.schema = MagicMock(wraps=builder.schema)
+
+        result = builder.build_ckg_from_parse_result(self.create_parse_result())
+
+        assert result.build_success
+        assert result.cypher_queries_executed >= len(builder.created_nodes)
+        assert builder.schema.get_cypher_create_node.call_count >= len(builder.created_nodes)
+
+    def test_python_relationships_are_tracked(self):
+        """Test Python relationships are collected for bulk loading."""
+        builder = ASTtoCKGBuilderAgent()
+
+        result = builder.build_ckg_from_parse_result(self.create_parse_result())
+
+        rel_types = {rel.type for rel in builder.created_relationships}
+        assert RelationshipType.DEFINES_CLASS in rel_types
+        assert RelationshipType.DEFINES_METHOD in rel_types
+        assert RelationshipType.HAS_PARAMETER in rel_types
+        assert result.total_relationships_created == len(builder.created_relationships)
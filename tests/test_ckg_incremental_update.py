@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental CKG update từ git diff.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from git import Repo
+
+from src.agents.data_acquisition.git_operations import GitOperationsAgent
+from src.agents.ckg_operations.ast_to_ckg_builder import ASTtoCKGBuilderAgent
+from src.agents.ckg_operations.code_parser_coordinator import CodeParserCoordinatorAgent
+from src.agents.ckg_operations.ckg_schema import CKGSchema, NodeType
+from src.agents.ckg_operations.ckg_operations_agent import CKGOperationsAgent
+from src.agents.ckg_operations.sqlite_backend import SQLiteCKGBackend
+
+
+def commit_all(repo: Repo, message: str) -> str:
+    """Stage everything and commit, returning the commit hash."""
+    repo.git.add(A=True)
+    repo.index.commit(message)
+    return repo.head.commit.hexsha
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a repository with two commits touching several files."""
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    repo = Repo.init(repo_dir)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+
+    (repo_dir / "base.py").write_text("class Base:\n    pass\n")
+    (repo_dir / "old.py").write_text("def old():\n    pass\n")
+    (repo_dir / "keep.py").write_text("x = 1\n")
+    (repo_dir / "moved.py").write_text("y = 2\n")
+    base_commit = commit_all(repo, "initial")
+
+    (repo_dir / "base.py").write_text("class Base:\n    def m(self):\n        pass\n")
+    (repo_dir / "old.py").unlink()
+    (repo_dir / "new.py").write_text("from base import Base\n\nclass Child(Base):\n    pass\n")
+    (repo_dir / "moved.py").rename(repo_dir / "renamed.py")
+    head_commit = commit_all(repo, "change")
+
+    return repo_dir, base_commit, head_commit
+
+
+class TestGitChangedFiles:
+    """Test GitOperationsAgent.get_changed_files."""
+
+    def test_lists_added_modified_deleted(self, git_repo, tmp_path):
+        """Test changed files between two commits are categorized."""
+        repo_dir, base_commit, head_commit = git_repo
+        agent = GitOperationsAgent(temp_dir=str(tmp_path))
+
+        diff_info = agent.get_changed_files(str(repo_dir), base_commit, head_commit)
+
+        assert sorted(diff_info.files_added) == ["new.py", "renamed.py"]
+        assert diff_info.files_modified == ["base.py"]
+        assert sorted(diff_info.files_deleted) == ["moved.py", "old.py"]
+        assert sorted(diff_info.changed_files) == ["base.py", "new.py", "renamed.py"]
+        assert diff_info.head_commit == head_commit
+
+
+class TestIncrementalBuild:
+    """Test ASTtoCKGBuilderAgent.update_ckg_incremental."""
+
+    def test_parse_files_only_parses_requested(self, git_repo):
+        """Test coordinator parses just the given files."""
+        repo_dir, _, _ = git_repo
+
+        parse_result = CodeParserCoordinatorAgent().parse_files(
+            str(repo_dir), ["base.py", "new.py", "missing.py", "README.md"]
+        )
+
+        assert sorted(f.relative_path for f in parse_result.parsed_files) == ["base.py", "new.py"]
+        assert parse_result.successful_files == 2
+
+    def test_update_deletes_rebuilds_and_relinks(self, git_repo):
+        """Test incremental update deletes affected subgraphs then restores saved links."""
+        repo_dir, _, _ = git_repo
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        incoming_links_query = CKGSchema.get_cypher_collect_incoming_links()
+        targets_query, imports_query = CKGSchema.get_cypher_collect_in_degree_scope()
+        responses = {
+            incoming_links_query: [{
+                'source_id': "Module_other",
+                'source_label': "Module",
+                'rel_type': "IMPORTS",
+                'target_label': "Module",
+                'target_file_path': str(repo_dir / "base.py"),
+                'target_name': "base",
+                'properties': {}
+            }],
+            targets_query: [{'id': "Function_other_helper"}],
+            imports_query: [{'imported_name': "package:app/src/old.dart"}]
+        }
+        session.run.side_effect = lambda query, params=None: responses.get(query, [])
+        builder = ASTtoCKGBuilderAgent(neo4j_connection=driver)
+        builder._schema_bootstrapped = True
+        parse_result = CodeParserCoordinatorAgent().parse_files(str(repo_dir), ["base.py", "new.py"])
+        deleted = [str(repo_dir / "old.py")]
+
+        result = builder.update_ckg_incremental(parse_result, deleted)
+
+        assert result.build_success
+        assert result.build_stats['cross_file_links_restored'] == 1
+        calls = [(call.args[0], call.args[1] if len(call.args) > 1 else None)
+                 for call in session.run.call_args_list]
+        queries = [query for query, _ in calls]
+
+        delete_calls = [(q, p) for q, p in calls if "DETACH DELETE" in q]
+        assert len(delete_calls) == len(NodeType)
+        assert set(delete_calls[0][1]['paths']) == {str(repo_dir / "base.py"),
+                                                    str(repo_dir / "new.py"),
+                                                    str(repo_dir / "old.py")}
+        # Xóa trước khi ghi nodes mới
+        first_create = next(i for i, q in enumerate(queries) if q.startswith("MERGE (n:"))
+        assert max(i for i, q in enumerate(queries) if "DETACH DELETE" in q) < first_create
+        assert any("file_path: row.target_file_path" in q for q in queries)
+        assert not any("base_classes" in q for q in queries)
+        # In-degree index chỉ tính lại nodes bị ảnh hưởng
+        refresh_calls = [(q, p) for q, p in calls if q in CKGSchema.get_cypher_refresh_in_degree_index(scoped=True)]
+        assert len(refresh_calls) == len(CKGSchema.get_cypher_refresh_in_degree_index(scoped=True))
+        scope = refresh_calls[0][1]
+        assert scope['ids'] == ["Function_other_helper"]
+        assert set(scope['paths']) == set(delete_calls[0][1]['paths'])
+        assert "src/old.dart" in scope['ref_names']
+        assert not any(q in CKGSchema.get_cypher_refresh_in_degree_index() for q in queries)
+        assert {node.file_path for node in builder.created_nodes.values()} == {
+            str(repo_dir / "base.py"), str(repo_dir / "new.py")
+        }
+
+    def test_update_without_connection(self, git_repo):
+        """Test incremental update requires a Neo4j connection."""
+        repo_dir, _, _ = git_repo
+        parse_result = CodeParserCoordinatorAgent().parse_files(str(repo_dir), ["base.py"])
+
+        result = ASTtoCKGBuilderAgent().update_ckg_incremental(parse_result)
+
+        assert not result.build_success
+        assert result.error_messages
+
+
+class TestUpdateFromGitDiff:
+    """Test CKGOperationsAgent.update_ckg_from_git_diff reads files at head_commit."""
+
+    @pytest.fixture
+    def agent(self, git_repo):
+        backend = SQLiteCKGBackend()
+        yield CKGOperationsAgent(storage_backend=backend)
+        backend.close()
+
+    def test_updates_checked_out_head(self, git_repo, agent):
+        """Test a clean checkout of head_commit is updated."""
+        repo_dir, base_commit, head_commit = git_repo
+
+        result = agent.update_ckg_from_git_diff(str(repo_dir), base_commit, head_commit)
+
+        assert result is not None and result.build_success
+        assert [row["name"] for row in agent.query_interface.get_functions_in_file(str(repo_dir / "base.py")).results] == ["m"]
+
+    def test_refuses_commit_that_is_not_checked_out(self, git_repo, agent):
+        """Test head_commit other than HEAD is rejected instead of parsing the working tree."""
+        repo_dir, base_commit, head_commit = git_repo
+
+        assert agent.update_ckg_from_git_diff(str(repo_dir), head_commit, base_commit) is None
+
+    def test_refuses_local_changes_to_changed_files(self, git_repo, agent):
+        """Test uncommitted edits to a changed file are rejected."""
+        repo_dir, base_commit, head_commit = git_repo
+        (repo_dir / "base.py").write_text("class Base:\n    def local(self):\n        pass\n")
+
+        assert agent.update_ckg_from_git_diff(str(repo_dir), base_commit, head_commit) is None
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for full-text name search và ranking trong CKGQueryInterfaceAgent.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents.ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent
+from src.agents.ckg_operations.name_search import (
+    build_fulltext_query, classify_name_match, looks_like_regex, rank_name_matches
+)
+
+
+@pytest.fixture
+def agent():
+    """Agent with a mock driver; tests set session.run behaviour."""
+    agent = CKGQueryInterfaceAgent(uri="bolt://test:7687", cache_max_entries=0)
+    agent.driver = MagicMock()
+    return agent
+
+
+def session_of(agent):
+    return agent.driver.session.return_value.__enter__.return_value
+
+
+class TestNameSearchHelpers:
+    """Test Lucene query building and ranking."""
+
+    def test_fulltext_query_has_all_match_kinds(self):
+        """Test exact, prefix and substring clauses, with fuzzy only on request."""
+        assert build_fulltext_query("User") == "user^8 OR user*^4 OR *user*^2"
+        assert build_fulltext_query("User", fuzzy=True) == "user^8 OR user*^4 OR *user*^2 OR user~"
+
+    def test_lucene_special_characters_are_escaped(self):
+        """Test user input cannot inject Lucene syntax."""
+        assert build_fulltext_query("a:b", fuzzy=False) == "a\\:b^8 OR a\\:b*^4 OR *a\\:b*^2"
+
+    def test_regex_detection(self):
+        """Test regex patterns are told apart from plain names."""
+        assert looks_like_regex("test_.*")
+        assert looks_like_regex("^get")
+        assert not looks_like_regex("get_user")
+
+    def test_ranking_orders_by_match_tier(self):
+        """Test exact > prefix > substring > fuzzy regardless of index score."""
+        rows = [
+            {"name": "loadUser", "score": 9.0},
+            {"name": "usr", "score": 1.0},
+            {"name": "UserService", "score": 3.0},
+            {"name": "user", "score": 2.0},
+        ]
+
+        ranked = rank_name_matches(rows, "user")
+
+        assert [row["name"] for row in ranked] == ["user", "UserService", "loadUser", "usr"]
+        assert [row["match_type"] for row in ranked] == ["exact", "prefix", "substring", "fuzzy"]
+        assert classify_name_match("getUser", "USER") == "substring"
+        assert len(rank_name_matches(rows, "user", limit=2)) == 2
+
+
+class TestFulltextSearchBackend:
+    """Test search methods use the full-text index with regex fallback."""
+
+    def test_search_by_name_uses_fulltext_index(self, agent):
+        """Test plain names query the full-text index and get ranked."""
+        session_of(agent).run.return_value = [
+            {"name": "parse_file", "types": ["Function"], "score": 5.0},
+            {"name": "parse", "types": ["Function"], "score": 1.0},
+        ]
+
+        result = agent.search_by_name("parse", ["Function"], limit=10)
+        query, params = session_of(agent).run.call_args.args
+
+        assert "db.index.fulltext.queryNodes" in query
+        assert params["skip"] == 0
+        assert [row["name"] for row in result.results] == ["parse", "parse_file"]
+
+    def test_typed_search_pages_past_other_labels(self, agent):
+        """Test label filtering fetches more hits instead of dropping matches."""
+        agent.NAME_SEARCH_CANDIDATES = 2
+        pages = [
+            [{"name": "parse", "types": ["Variable"], "score": 9.0},
+             {"name": "parse", "types": ["Import"], "score": 8.0}],
+            [{"name": "parse_file", "types": ["Function"], "score": 5.0},
+             {"name": "parse", "types": ["Variable"], "score": 4.0}],
+            [{"name": "parse", "types": ["Function"], "score": 1.0}],
+        ]
+        session_of(agent).run.side_effect = lambda query, params: pages[params["skip"] // 2]
+
+        result = agent.search_by_name("parse", ["Function"])
+        skips = [call.args[1]["skip"] for call in session_of(agent).run.call_args_list]
+
+        assert skips == [0, 2, 4]
+        assert [row["name"] for row in result.results] == ["parse", "parse_file"]
+
+    def test_unlimited_search_reads_every_page(self, agent):
+        """Test limit=None pages until the index is exhausted instead of truncating."""
+        agent.NAME_SEARCH_CANDIDATES = 2
+        names = [f"parse_{i}" for i in range(5)]
+        session_of(agent).run.side_effect = lambda query, params: [
+            {"name": name, "types": ["Function"], "score": 1.0}
+            for name in names[params["skip"]:params["skip"] + params["limit"]]
+        ]
+
+        result = agent.search_by_name("parse", ["Function"])
+
+        assert sorted(row["name"] for row in result.results) == names
+        assert agent.search_by_name("parse", ["Function"], limit=1).total_count == 1
+
+    def test_fuzzy_hits_are_opt_in(self, agent):
+        """Test edit-distance hits are dropped unless fuzzy=True."""
+        session_of(agent).run.return_value = [
+            {"name": "Test", "types": ["Class"], "score": 5.0},
+            {"name": "Best", "types": ["Class"], "score": 1.0},
+        ]
+
+        plain = agent.search_by_name("Test")
+        fuzzy = agent.search_by_name("Test", fuzzy=True)
+
+        assert [row["name"] for row in plain.results] == ["Test"]
+        assert "~" not in session_of(agent).run.call_args_list[0].args[1]["search"]
+        assert [row["match_type"] for row in fuzzy.results] == ["exact", "fuzzy"]
+
+    def test_kotlin_search_keeps_exact_regex_match(self, agent):
+        """Test Kotlin search stays a case-sensitive regex match on the whole name."""
+        session_of(agent).run.return_value = [{"name": "User", "types": ["KotlinClass"]}]
+
+        agent.search_kotlin_elements_by_name("User")
+        query, params = session_of(agent).run.call_args.args
+
+        assert "fulltext" not in query
+        assert "=~ $name_pattern" in query
+        assert params == {"name_pattern": "User"}
+
+    def test_regex_pattern_keeps_regex_path(self, agent):
+        """Test regex patterns still use =~ matching."""
+        session_of(agent).run.return_value = []
+
+        agent.search_by_name("test_.*")
+        query, params = session_of(agent).run.call_args.args
+
+        assert "=~" in query
+        assert params == {"pattern": "(?i).*test_.*.*"}
+
+    def test_missing_index_falls_back_to_regex(self, agent):
+        """Test a failing full-text query falls back and is not retried."""
+        def run(query, params):
+            if "fulltext" in query:
+                raise RuntimeError("There is no such fulltext schema index")
+            return [{"name": "DartUser", "type": "DartClass"}]
+        session_of(agent).run.side_effect = run
+
+        first = agent.search_dart_elements_by_name("User")
+        agent.search_dart_elements_by_name("User")
+        queries = [call.args[0] for call in session_of(agent).run.call_args_list]
+
+        assert first.success
+        assert first.results[0]["name"] == "DartUser"
+        assert sum("fulltext" in query for query in queries) == 1
+        assert "=~" in queries[-1]
+
+    def test_other_errors_keep_fulltext_enabled(self, agent):
+        """Test a single failing query (e.g. timeout) does not disable the index."""
+        calls = []
+
+        def run(query, params):
+            calls.append(query)
+            if "fulltext" in query and len(calls) == 1:
+                raise RuntimeError("Transaction timed out")
+            return [{"name": "User", "types": ["Class"], "score": 1.0}]
+        session_of(agent).run.side_effect = run
+
+        agent.search_by_name("User")
+        second = agent.search_by_name("User")
+
+        assert "db.index.fulltext.queryNodes" in calls[-1]
+        assert second.results[0]["match_type"] == "exact"
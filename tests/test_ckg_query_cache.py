@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for QueryResultCache và result caching trong CKGQueryInterfaceAgent.execute_query.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from src.agents.ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent
+from src.agents.ckg_operations.ckg_bulk_loader import CKGBulkLoader
+from src.agents.ckg_operations.ckg_schema import NodeProperties, NodeType
+from src.agents.ckg_operations.query_cache import QueryResultCache, is_write_query
+
+
+class FakeRecord(dict):
+    """Record giống neo4j.Record đủ cho execute_query."""
+
+
+def make_agent(records, **kwargs):
+    """Create an agent whose driver returns the given records."""
+    with patch.object(CKGQueryInterfaceAgent, '_connect'):
+        agent = CKGQueryInterfaceAgent(uri="bolt://test:7687", **kwargs)
+    agent.driver = MagicMock()
+    session = agent.driver.session.return_value.__enter__.return_value
+    session.run.side_effect = lambda query, params: [FakeRecord(r) for r in records]
+    return agent, session
+
+
+class TestQueryResultCache:
+    """Test cache bounds and counters."""
+
+    def test_key_normalizes_whitespace_and_parameter_order(self):
+        """Test formatting differences map to the same key."""
+        key = QueryResultCache.make_key("MATCH (n)\n   RETURN n", {"a": 1, "b": 2})
+
+        assert key == QueryResultCache.make_key("MATCH (n) RETURN n", {"b": 2, "a": 1})
+        assert key != QueryResultCache.make_key("MATCH (n) RETURN n", {"a": 2, "b": 2})
+
+    def test_lru_entry_bound(self):
+        """Test least recently used entries are evicted past max_entries."""
+        cache = QueryResultCache(max_entries=2)
+        cache.put(("a", ""), [{"x": 1}])
+        cache.put(("b", ""), [{"x": 2}])
+        cache.get(("a", ""))
+        cache.put(("c", ""), [{"x": 3}])
+
+        assert cache.get(("b", "")) is None
+        assert cache.get(("a", "")) == [{"x": 1}]
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_memory_bound(self):
+        """Test estimated size stays under max_memory_mb."""
+        cache = QueryResultCache(max_memory_mb=0.01)
+        rows = [{"name": "x" * 100} for _ in range(20)]
+
+        for i in range(10):
+            cache.put((str(i), ""), rows)
+
+        assert 0 < len(cache) < 10
+        assert cache.size_bytes <= cache.max_memory_bytes
+        assert not cache.put(("huge", ""), rows * 50)
+
+    def test_ttl_expiry(self):
+        """Test expired entries count as misses."""
+        cache = QueryResultCache(ttl_seconds=10)
+        with patch('src.agents.ckg_operations.query_cache.time.monotonic', return_value=100.0):
+            cache.put(("a", ""), [])
+        with patch('src.agents.ckg_operations.query_cache.time.monotonic', return_value=111.0):
+            assert cache.get(("a", "")) is None
+
+        assert cache.get_stats()['misses'] == 1
+        assert len(cache) == 0
+
+    def test_write_query_detection(self):
+        """Test write clauses are detected without matching property names."""
+        assert is_write_query("MATCH (n) DETACH DELETE n")
+        assert is_write_query("UNWIND $rows AS row MERGE (n:Function {id: row.id})")
+        assert not is_write_query("MATCH (n) RETURN n.created_at, n.offset SKIP 1")
+
+
+class TestExecuteQueryCache:
+    """Test caching inside CKGQueryInterfaceAgent.execute_query."""
+
+    def test_repeated_query_served_from_cache(self):
+        """Test identical read queries hit Neo4j once."""
+        agent, session = make_agent([{"name": "f"}])
+
+        first = agent.get_functions_in_file("a.py")
+        second = agent.get_functions_in_file("a.py")
+        agent.get_functions_in_file("b.py")
+
+        assert first.results == second.results == [{"name": "f"}]
+        assert session.run.call_count == 2
+        stats = agent.get_cache_stats()
+        assert (stats['hits'], stats['misses']) == (1, 2)
+        assert stats['cache_size'] == 2
+
+    def test_cached_results_are_copies(self):
+        """Test callers mutating results do not corrupt the cache."""
+        agent, _ = make_agent([{"name": "f"}])
+
+        agent.get_functions_in_file("a.py").results[0]["name"] = "changed"
+
+        assert agent.get_functions_in_file("a.py").results == [{"name": "f"}]
+
+    def test_builder_write_invalidates(self):
+        """Test a bulk load in this process drops cached results."""
+        agent, session = make_agent([{"name": "f"}])
+        agent.get_functions_in_file("a.py")
+
+        loader = CKGBulkLoader(MagicMock())
+        loader.add_node(NodeProperties(name="f", type=NodeType.FUNCTION, file_path="a.py", line_number=1))
+        loader.flush()
+        agent.get_functions_in_file("a.py")
+
+        assert session.run.call_count == 2
+        assert agent.get_cache_stats()['invalidations'] == 1
+
+    def test_write_queries_not_cached(self):
+        """Test write queries always run and invalidate other caches."""
+        agent, session = make_agent([])
+        other, other_session = make_agent([{"name": "f"}])
+        other.get_functions_in_file("a.py")
+
+        agent.execute_query("MATCH (n:Function {id: $id}) SET n.flag = true", {"id": "x"})
+        agent.execute_query("MATCH (n:Function {id: $id}) SET n.flag = true", {"id": "x"})
+        other.get_functions_in_file("a.py")
+
+        assert session.run.call_count == 2
+        assert other_session.run.call_count == 2
+
+    def test_cache_disabled(self):
+        """Test use_cache=False and max_entries=0 bypass the cache."""
+        agent, session = make_agent([], cache_max_entries=0)
+        uncached, uncached_session = make_agent([])
+
+        agent.execute_query("MATCH (n) RETURN n")
+        agent.execute_query("MATCH (n) RETURN n")
+        uncached.execute_query("MATCH (n) RETURN n", use_cache=False)
+        uncached.execute_query("MATCH (n) RETURN n", use_cache=False)
+
+        assert session.run.call_count == 2
+        assert uncached_session.run.call_count == 2
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming và keyset pagination trong CKGQueryInterfaceAgent.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents.ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent
+
+
+ROWS = [{"id": f"Function_{i:03d}", "name": f"f{i}"} for i in range(25)]
+
+
+def fake_run(query, params):
+    """Emulate `WHERE id > $cursor ORDER BY id LIMIT $limit` over ROWS."""
+    if "limit" not in params:
+        return [dict(row) for row in ROWS]
+    rows = [row for row in ROWS if row["id"] > params["cursor"]]
+    return [dict(row) for row in rows[:params["limit"]]]
+
+
+@pytest.fixture
+def agent():
+    """Agent with a fake driver."""
+    agent = CKGQueryInterfaceAgent(uri="bolt://test:7687", cache_max_entries=0)
+    agent.driver = MagicMock()
+    session = agent.driver.session.return_value.__enter__.return_value
+    session.run.side_effect = fake_run
+    return agent
+
+
+class TestKeysetPagination:
+    """Test execute_query_page/iter_query_pages."""
+
+    def test_pages_cover_all_rows_once(self, agent):
+        """Test pages follow the cursor without gaps or duplicates."""
+        pages = list(agent.iter_query_pages("MATCH (n) WHERE n.id > $cursor RETURN n.id as id "
+                                            "ORDER BY id LIMIT $limit", page_size=10))
+
+        assert [len(page.results) for page in pages] == [10, 10, 5]
+        assert [page.has_more for page in pages] == [True, True, False]
+        assert pages[0].next_cursor == "Function_009"
+        assert pages[-1].next_cursor is None
+        assert [row["id"] for page in pages for row in page.results] == [row["id"] for row in ROWS]
+
+    def test_exact_multiple_has_no_empty_trailing_page(self, agent):
+        """Test the extra-row probe detects the last full page."""
+        pages = list(agent.iter_query_pages("...", page_size=25))
+
+        assert len(pages) == 1
+        assert not pages[0].has_more
+
+    def test_search_by_name_page_passes_cursor(self, agent):
+        """Test search_by_name_page sends cursor and limit parameters."""
+        page = agent.search_by_name_page("f", ["Function"], cursor="Function_020", page_size=3)
+        session = agent.driver.session.return_value.__enter__.return_value
+        query, params = session.run.call_args.args
+
+        assert params["cursor"] == "Function_020"
+        assert params["limit"] == 4
+        assert "n.id > $cursor" in query and "LIMIT $limit" in query
+        assert [row["id"] for row in page.results] == ["Function_021", "Function_022", "Function_023"]
+        assert page.has_more
+
+    def test_failed_page_stops_iteration(self, agent):
+        """Test iteration stops on a failed page."""
+        agent.driver = None
+
+        pages = list(agent.iter_query_pages("...", page_size=10))
+
+        assert len(pages) == 1
+        assert not pages[0].success
+
+
+class TestStreamQuery:
+    """Test stream_query."""
+
+    def test_streams_records_with_fetch_size(self, agent):
+        """Test records are yielded lazily from a session with fetch_size."""
+        stream = agent.stream_query("MATCH (n) RETURN n.id as id", fetch_size=50)
+        first = next(stream)
+
+        assert first == ROWS[0]
+        assert agent.driver.session.call_args.kwargs["fetch_size"] == 50
+        assert len(list(stream)) == len(ROWS) - 1
+
+    def test_stream_without_connection_raises(self, agent):
+        """Test streaming requires a connection."""
+        agent.driver = None
+
+        with pytest.raises(RuntimeError):
+            list(agent.stream_query("MATCH (n) RETURN n"))
@@ -12,6 +12,7 @@ import shutil
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+import io
 import sys
 import subprocess
 
@@ -25,6 +26,14 @@ from agents.code_analysis.static_analysis_integrator import (
 from agents.code_analysis.contextual_query import (
     ContextualQueryAgent, ContextualFinding, ImpactScore
 )
+from agents.code_analysis.code_element_index import CodeElementIndex
+from agents.ckg_operations.ckg_query_interface import CKGQueryResult
+
+
+def mock_popen_process(output: str, returncode: int = 0) -> Mock:
+    """Mock subprocess.Popen process streaming output qua stdout pipe."""
+    return Mock(stdout=io.StringIO(output), returncode=returncode,
+                wait=Mock(return_value=returncode), poll=Mock(return_value=returncode))
 
 
 class TestStaticAnalysisIntegratorAgent:
@@ -93,16 +102,13 @@ class TestStaticAnalysisIntegratorAgent:
         assert result.execution_time == 1.5
         assert result.files_analyzed == 5
         
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_flake8_success(self, mock_subprocess):
         """Test successful flake8 execution."""
         # Mock flake8 output
         mock_output = "test.py:1:1: E501 line too long (82 > 79 characters)\ntest.py:5:10: F401 'os' imported but unused"
-        mock_subprocess.return_value = Mock(
-            returncode=1,  # flake8 returns 1 when issues found
-            stdout=mock_output,
-            stderr=""
-        )
+        # flake8 returns 1 when issues found
+        mock_subprocess.return_value = mock_popen_process(mock_output, returncode=1)
         
         # Create test file
         test_content = "import os\nprint('This is a very long line that exceeds the maximum line length limit')"
@@ -117,14 +123,10 @@ class TestStaticAnalysisIntegratorAgent:
         assert result.findings[0].rule_id == "E501"
         assert result.findings[1].rule_id == "F401"
         
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_flake8_no_issues(self, mock_subprocess):
         """Test flake8 execution với no issues."""
-        mock_subprocess.return_value = Mock(
-            returncode=0,
-            stdout="",
-            stderr=""
-        )
+        mock_subprocess.return_value = mock_popen_process("")
         
         # Create clean test file
         test_content = "print('Hello, World!')"
@@ -184,16 +186,12 @@ class TestStaticAnalysisIntegratorAgent:
         assert result.findings[0].rule_id == "C0114"
         assert result.findings[0].severity == SeverityLevel.LOW
         
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_mypy_success(self, mock_subprocess):
         """Test successful mypy execution."""
         # Mock mypy output
         mock_output = "test.py:5: error: Function is missing a return type annotation"
-        mock_subprocess.return_value = Mock(
-            returncode=1,
-            stdout=mock_output,
-            stderr=""
-        )
+        mock_subprocess.return_value = mock_popen_process(mock_output, returncode=1)
         
         # Create test file
         test_content = "def hello(): return 'world'"
@@ -315,6 +313,273 @@ test.py:15: note: Consider using Type[Class] instead"""
         assert aggregated.files_analyzed == 1  # Unique files
 
 
+class TestConcurrentToolRunner:
+    """Test chạy tools đồng thời với CPU budget."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        
+    def teardown_method(self):
+        """Cleanup test fixtures."""
+        shutil.rmtree(self.temp_dir)
+        
+    def make_result(self, tool: str) -> AnalysisResult:
+        """Create a successful empty result."""
+        return AnalysisResult(tool=tool, project_path=self.temp_dir, total_files_analyzed=0,
+                              total_findings=0, findings=[], execution_time_seconds=0, success=True)
+        
+    def test_budget_limits_concurrency(self):
+        """Test running tools never exceed the CPU budget."""
+        import threading
+        import time
+        agent = StaticAnalysisIntegratorAgent(cpu_budget=2)
+        lock = threading.Lock()
+        running = {'now': 0, 'peak': 0}
+        
+        def fake_run_tool(tool, project_path):
+            with lock:
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            time.sleep(0.05)
+            with lock:
+                running['now'] -= 1
+            return self.make_result(tool)
+        
+        with patch.object(agent, '_run_tool', side_effect=fake_run_tool):
+            results = agent.run_analysis(self.temp_dir, ["flake8", "pylint", "mypy", "dart_analyze"])
+        
+        assert list(results) == ["flake8", "pylint", "mypy", "dart_analyze"]
+        assert all(result.success for result in results.values())
+        assert running['peak'] == 2
+        
+    def test_results_yielded_as_completed(self):
+        """Test iter_analysis yields fast tools before slow ones."""
+        import time
+        agent = StaticAnalysisIntegratorAgent(cpu_budget=4)
+        delays = {"pylint": 0.3, "flake8": 0.0}
+        
+        def fake_run_tool(tool, project_path):
+            time.sleep(delays[tool])
+            return self.make_result(tool)
+        
+        with patch.object(agent, '_run_tool', side_effect=fake_run_tool):
+            order = [tool for tool, _ in agent.iter_analysis(self.temp_dir, ["pylint", "flake8"])]
+        
+        assert order == ["flake8", "pylint"]
+        
+    def test_cancel_skips_pending_tools(self):
+        """Test cancel_analysis marks tools that have not started as cancelled."""
+        agent = StaticAnalysisIntegratorAgent(cpu_budget=1)
+        
+        def fake_run_tool(tool, project_path):
+            agent.cancel_analysis()
+            return self.make_result(tool)
+        
+        with patch.object(agent, '_run_tool', side_effect=fake_run_tool):
+            results = agent.run_analysis(self.temp_dir, ["flake8", "pylint"])
+        
+        assert results["flake8"].success
+        assert not results["pylint"].success
+        assert results["pylint"].error_message == "Analysis cancelled"
+        
+    @patch('agents.code_analysis.static_analysis_integrator._stream_process_lines')
+    def test_per_tool_timeout_from_config(self, mock_stream):
+        """Test tools_config timeout overrides the default subprocess timeout."""
+        mock_stream.return_value = iter([])
+        agent = StaticAnalysisIntegratorAgent(tools_config={"flake8": {"enabled": True, "timeout": 42}})
+        
+        agent.run_flake8(self.temp_dir)
+        
+        assert mock_stream.call_args.kwargs['timeout'] == 42
+
+
+class TestCodeElementIndex:
+    """Test interval index cho enclosing-element lookup."""
+    
+    def build_index(self) -> CodeElementIndex:
+        """Index with a class, its methods, a nested function and a top-level function."""
+        index = CodeElementIndex()
+        index.add("A", "Class", "/p/a.py", 1, 30)
+        index.add("m", "Method", "/p/a.py", 3, 10)
+        index.add("n", "Method", "/p/a.py", 12, 28)
+        index.add("inner", "Function", "/p/a.py", 14, 18)
+        index.add("f", "Function", "/p/a.py", 32, 40)
+        index.add("g", "Function", "/p/b.py", 1, 5)
+        return index
+        
+    def test_find_innermost_enclosing(self):
+        """Test lookup returns the innermost element around a line."""
+        index = self.build_index()
+        
+        assert index.find_enclosing("/p/a.py", 15).name == "inner"
+        assert index.find_enclosing("/p/a.py", 20).name == "n"
+        assert index.find_enclosing("/p/a.py", 11).name == "A"
+        assert index.find_enclosing("/p/a.py", 31) is None
+        assert index.find_enclosing("/p/a.py", 35).name == "f"
+        assert index.find_enclosing("/p/other.py", 1) is None
+        
+    def test_filter_by_element_type(self):
+        """Test function and class lookups skip other element kinds."""
+        index = self.build_index()
+        
+        assert index.find_enclosing_function("/p/a.py", 20).name == "n"
+        assert index.find_enclosing_class("/p/a.py", 15).name == "A"
+        assert index.find_enclosing_function("/p/a.py", 11) is None
+        assert index.find_enclosing_class("/p/a.py", 35) is None
+        
+    def test_from_parse_result(self):
+        """Test index built from parsed Python files."""
+        import ast
+        from agents.ckg_operations.code_parser_coordinator import ParsedFile
+        source = "class A:\n    def m(self):\n        x = 1\n\ndef f():\n    pass\n"
+        parse_result = Mock(parsed_files=[ParsedFile(
+            file_path="/p/a.py", relative_path="a.py", language="Python",
+            ast_tree=ast.parse(source), parse_success=True
+        )])
+        
+        index = CodeElementIndex.from_parse_result(parse_result)
+        
+        method = index.find_enclosing_function("/p/a.py", 3)
+        assert (method.name, method.element_type) == ("m", "Method")
+        assert index.find_enclosing_function("/p/a.py", 6).element_type == "Function"
+        assert index.find_enclosing_class("/p/a.py", 3).name == "A"
+        
+    def test_contextual_agent_uses_single_index_query(self):
+        """Test enrichment builds the index once instead of scanning per finding."""
+        ckg_agent = Mock()
+        ckg_agent.execute_query.return_value = CKGQueryResult(
+            query="", total_count=1, execution_time_ms=0, success=True,
+            results=[{"name": "f", "type": "Function", "file_path": "/p/a.py",
+                      "line_number": 1, "end_line_number": 50, "docstring": None}]
+        )
+        ckg_agent.find_function_callers.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.find_function_callees.return_value = CKGQueryResult("", [], 0, 0, True)
+        agent = ContextualQueryAgent(ckg_agent)
+        findings = [Finding("/p/a.py", line, 0, SeverityLevel.LOW, FindingType.STYLE,
+                            "E501", "Line too long", "flake8") for line in range(1, 21)]
+        results = {"flake8": AnalysisResult("flake8", "/p", 1, len(findings), findings, 0, True)}
+        
+        result = agent.analyze_findings_with_context(results, "/p")
+        
+        assert result.success
+        assert ckg_agent.execute_query.call_count == 1
+        assert ckg_agent.find_function_callers.call_count == 1
+        ckg_agent.search_by_name.assert_not_called()
+        contexts = [cf.context for cf in result.contextual_findings]
+        assert all(context["nearby_function"]["name"] == "f" for context in contexts)
+
+    def test_relative_finding_paths_match_absolute_ckg_paths(self):
+        """Test project-relative linter paths are resolved before the index lookup."""
+        ckg_agent = Mock()
+        ckg_agent.execute_query.return_value = CKGQueryResult(
+            query="", total_count=1, execution_time_ms=0, success=True,
+            results=[{"name": "f", "type": "Function", "file_path": "/p/pkg/a.py",
+                      "line_number": 1, "end_line_number": 10, "docstring": None}]
+        )
+        ckg_agent.find_function_callers.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.find_function_callees.return_value = CKGQueryResult("", [], 0, 0, True)
+        agent = ContextualQueryAgent(ckg_agent)
+        finding = Finding("pkg/a.py", 5, 0, SeverityLevel.LOW, FindingType.STYLE,
+                          "E501", "Line too long", "flake8")
+        results = {"flake8": AnalysisResult("flake8", "/p", 1, 1, [finding], 0, True)}
+        
+        result = agent.analyze_findings_with_context(results, "/p")
+        
+        assert result.contextual_findings[0].context["nearby_function"]["name"] == "f"
+        ckg_agent.find_function_callees.assert_called_once_with("f", "/p/pkg/a.py")
+
+
+class TestFileContextPrefetch:
+    """Test batched file context prefetch trong ContextualQueryAgent."""
+    
+    def test_findings_share_batched_file_context(self):
+        """Test file context comes from a few UNWIND queries shared across findings."""
+        ckg_agent = Mock()
+        ckg_agent.execute_query.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.get_functions_in_files.return_value = CKGQueryResult("", [
+            {"file_path": "/p/a.py", "name": "f", "line_number": 1},
+            {"file_path": "/p/a.py", "name": "g", "line_number": 9},
+            {"file_path": "/p/b.py", "name": "h", "line_number": 3}
+        ], 3, 0, True)
+        ckg_agent.get_classes_in_files.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.get_imports_in_files.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.get_files_dependencies.return_value = CKGQueryResult("", [
+            {"file_path": "/p/b.py", "dependency": "os", "import_count": 1, "imported_items": ["os"]}
+        ], 1, 0, True)
+        agent = ContextualQueryAgent(ckg_agent)
+        findings = [Finding(path, line, 0, SeverityLevel.LOW, FindingType.STYLE,
+                            "E501", "Line too long", "flake8")
+                    for path in ("/p/a.py", "/p/b.py") for line in range(1, 51)]
+        results = {"flake8": AnalysisResult("flake8", "/p", 2, len(findings), findings, 0, True)}
+        
+        result = agent.analyze_findings_with_context(results, "/p")
+        
+        assert result.total_contextual_findings == 100
+        ckg_agent.get_functions_in_files.assert_called_once_with(["/p/a.py", "/p/b.py"])
+        ckg_agent.get_files_dependencies.assert_called_once()
+        ckg_agent.get_functions_in_file.assert_not_called()
+        ckg_agent.get_file_dependencies.assert_not_called()
+        a_context = result.contextual_findings[0].context
+        b_context = result.contextual_findings[-1].context
+        assert [func["name"] for func in a_context["functions"]] == ["f", "g"]
+        assert a_context["dependencies_count"] == 0
+        assert b_context["functions_count"] == 1
+        assert b_context["dependencies"][0]["dependency"] == "os"
+        
+    def test_prefetch_splits_into_batches(self):
+        """Test prefetch issues one query per batch of files."""
+        ckg_agent = Mock()
+        empty = CKGQueryResult("", [], 0, 0, True)
+        for method in ("get_functions_in_files", "get_classes_in_files",
+                       "get_imports_in_files", "get_files_dependencies"):
+            getattr(ckg_agent, method).return_value = empty
+        agent = ContextualQueryAgent(ckg_agent)
+        agent.FILE_CONTEXT_BATCH_SIZE = 2
+        
+        agent._prefetch_file_contexts(["a.py", "b.py", "c.py"])
+        
+        assert ckg_agent.get_classes_in_files.call_count == 2
+        assert agent._get_file_context("c.py")["classes_count"] == 0
+
+    def test_relative_finding_paths_are_prefetched_as_ckg_paths(self):
+        """Test prefetch queries the absolute CKG paths, not the linter's relative paths."""
+        ckg_agent = Mock()
+        ckg_agent.execute_query.return_value = CKGQueryResult("", [], 0, 0, True)
+        ckg_agent.get_functions_in_files.return_value = CKGQueryResult("", [
+            {"file_path": "/p/a.py", "name": "f", "line_number": 1}
+        ], 1, 0, True)
+        for method in ("get_classes_in_files", "get_imports_in_files", "get_files_dependencies"):
+            getattr(ckg_agent, method).return_value = CKGQueryResult("", [], 0, 0, True)
+        agent = ContextualQueryAgent(ckg_agent)
+        finding = Finding("a.py", 1, 0, SeverityLevel.LOW, FindingType.STYLE, "E501", "Line too long", "flake8")
+        results = {"flake8": AnalysisResult("flake8", "/p", 1, 1, [finding], 0, True)}
+        
+        result = agent.analyze_findings_with_context(results, "/p")
+        
+        ckg_agent.get_functions_in_files.assert_called_once_with(["/p/a.py"])
+        assert result.contextual_findings[0].context["functions_count"] == 1
+        
+    def test_failed_batch_query_falls_back_per_file(self):
+        """Test a failed batched query leaves the file uncached so per-file queries run."""
+        ckg_agent = Mock()
+        ok = CKGQueryResult("", [], 0, 0, True)
+        for method in ("get_functions_in_files", "get_classes_in_files", "get_files_dependencies"):
+            getattr(ckg_agent, method).return_value = ok
+        ckg_agent.get_imports_in_files.return_value = CKGQueryResult("", [], 0, 0, False, "timeout")
+        ckg_agent.get_imports_in_file.return_value = CKGQueryResult("", [{"module_name": "os"}], 1, 0, True)
+        for method in ("get_functions_in_file", "get_classes_in_file", "get_file_dependencies"):
+            getattr(ckg_agent, method).return_value = ok
+        agent = ContextualQueryAgent(ckg_agent)
+        
+        agent._prefetch_file_contexts(["/p/a.py"])
+        context = agent._get_file_context("/p/a.py")
+        
+        assert "/p/a.py" not in agent._file_context_cache
+        ckg_agent.get_imports_in_file.assert_called_once_with("/p/a.py")
+        assert context["imports_count"] == 1
+
+
 class TestContextualQueryAgent:
     """Test ContextualQueryAgent CKG-enhanced analysis functionality."""
     
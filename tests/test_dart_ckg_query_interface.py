@@ -367,7 +367,7 @@ class TestDartCKGQueryInterface(unittest.TestCase):
         mock_session.run.assert_called_once()
         args, _ = mock_session.run.call_args
         self.assertIn('DartExport', args[0])
-        self.assertIn('NOT EXISTS', args[0])
+        self.assertIn('exp.import_refs = 0', args[0])
     
     def test_find_dart_circular_imports(self):
         """Test finding circular imports in Dart code."""
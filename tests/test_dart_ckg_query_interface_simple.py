@@ -167,8 +167,12 @@ class TestDartCKGQueryInterfaceSimple(unittest.TestCase):
         mock_session = Mock()
         mock_result = Mock()
         
-        # Mock result iteration
-        mock_result.__iter__ = Mock(return_value=iter([]))
+        # Mock result iteration: full-text hits of every label
+        mock_result.__iter__ = Mock(return_value=iter([
+            {'name': 'TestWidget', 'types': ['DartClass'], 'score': 2.0},
+            {'name': 'Test', 'types': ['Class'], 'score': 3.0},
+            {'name': 'TestMode', 'types': ['DartEnum'], 'score': 1.0},
+        ]))
         mock_session.run.return_value = mock_result
         
         # Mock context manager for session
@@ -178,27 +182,17 @@ class TestDartCKGQueryInterfaceSimple(unittest.TestCase):
         self.agent.driver = mock_driver
         
         # Test search với default types
-        self.agent.search_dart_elements_by_name("Test")
+        result = self.agent.search_dart_elements_by_name("Test")
         mock_session.run.assert_called()
         query_args = mock_session.run.call_args[0]
+        query_params = query_args[1]
         
-        # Check default Dart element types are included
-        self.assertIn('DartClass', query_args[0])
-        self.assertIn('DartMixin', query_args[0])
-        self.assertIn('DartExtension', query_args[0])
-        self.assertIn('DartFunction', query_args[0])
-        self.assertIn('DartEnum', query_args[0])
-        
-        # Check regex pattern is used
-        self.assertIn('=~', query_args[0])
+        # Only default Dart element types are kept from the full-text hits
+        self.assertEqual(sorted(row['name'] for row in result.results), ['TestMode', 'TestWidget'])
         
-        # Check parameters
-        call_args = mock_session.run.call_args
-        if len(call_args[0]) > 1:
-            query_params = call_args[0][1]
-            self.assertIn('.*Test.*', query_params['pattern'])
-        elif call_args[1]:
-            self.assertIn('.*Test.*', call_args[1]['pattern'])
+        # Check full-text index is used for plain names
+        self.assertIn('db.index.fulltext.queryNodes', query_args[0])
+        self.assertIn('test*', query_params['search'])
     
     def test_find_dart_unused_exports_with_and_without_file(self):
         """Test find_dart_unused_exports với và không có file_path."""
@@ -222,7 +216,7 @@ class TestDartCKGQueryInterfaceSimple(unittest.TestCase):
         mock_session.run.assert_called()
         query_args = mock_session.run.call_args[0]
         self.assertIn('DartExport', query_args[0])
-        self.assertIn('NOT EXISTS', query_args[0])
+        self.assertIn('exp.import_refs = 0', query_args[0])
         
         # Reset mock for next test
         mock_session.run.reset_mock()
@@ -232,7 +226,7 @@ class TestDartCKGQueryInterfaceSimple(unittest.TestCase):
         mock_session.run.assert_called()
         query_args = mock_session.run.call_args[0]
         self.assertIn('DartExport', query_args[0])
-        self.assertIn('NOT EXISTS', query_args[0])
+        self.assertIn('exp.import_refs = 0', query_args[0])
     
     def test_find_dart_circular_imports_query_pattern(self):
         """Test find_dart_circular_imports query pattern."""
@@ -312,11 +306,9 @@ class TestDartCKGQueryInterfaceSimple(unittest.TestCase):
         self.agent.search_dart_elements_by_name(search_pattern)
         mock_session.run.assert_called()
         call_args = mock_session.run.call_args
-        if len(call_args[0]) > 1:
-            query_params = call_args[0][1]
-            self.assertEqual(query_params, {"pattern": f".*{search_pattern}.*"})
-        elif call_args[1]:
-            self.assertEqual(call_args[1], {"pattern": f".*{search_pattern}.*"})
+        query_params = call_args[0][1]
+        self.assertIn("testpattern*", query_params["search"])
+        self.assertEqual(query_params["limit"], self.agent.NAME_SEARCH_CANDIDATES)
 
 
 if __name__ == '__main__':
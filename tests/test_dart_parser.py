@@ -471,5 +471,101 @@ class MyWidget {
         self.assertFalse(agent._is_inside_class_context(lines, 8))
 
 
+class TestDartPackageAnalyze(unittest.TestCase):
+    """Test single dart analyze run per package root."""
+
+    def setUp(self):
+        """Create two packages with two files each."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for package in ('app', 'core'):
+            lib_dir = Path(self.temp_dir) / package / 'lib'
+            lib_dir.mkdir(parents=True)
+            (lib_dir.parent / 'pubspec.yaml').write_text(f"name: {package}\n")
+            for name in ('a.dart', 'b.dart'):
+                path = lib_dir / name
+                path.write_text("class A {}\n")
+                self.files.append(str(path))
+
+        with patch.object(DartParserAgent, '_find_dart_command', return_value="/usr/bin/dart"):
+            self.agent = DartParserAgent()
+        self.agent._dartdoc_json_available = False
+
+    def tearDown(self):
+        """Cleanup."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fake_analyze(self, cmd, **kwargs):
+        """Return one diagnostic for the first file of the analyzed package."""
+        root = cmd[-1]
+        target = next(path for path in self.files if str(Path(path).resolve()).startswith(root))
+        output = {"version": 1, "diagnostics": [
+            {"code": "unused_import", "location": {"file": target}},
+            {"code": "outside", "location": {"file": "/elsewhere/x.dart"}}
+        ]}
+        return Mock(returncode=0, stdout=json.dumps(output), stderr="")
+
+    def test_one_run_per_package_root(self):
+        """Test dart analyze runs once per package and diagnostics are demuxed."""
+        with patch('subprocess.run', side_effect=self.fake_analyze) as mock_run:
+            results = self.agent.parse_files(self.files)
+
+        self.assertEqual(mock_run.call_count, 2)
+        analyzed_roots = sorted(call.args[0][-1] for call in mock_run.call_args_list)
+        self.assertEqual(analyzed_roots, sorted(str(Path(self.temp_dir, p).resolve()) for p in ('app', 'core')))
+        issues = {info.file_path: [d['code'] for d in info.analysis_issues] for info in results}
+        self.assertEqual(issues[self.files[0]], ['unused_import'])
+        self.assertEqual(issues[self.files[1]], [])
+        self.assertEqual(issues[self.files[2]], ['unused_import'])
+
+    def test_nested_roots_are_analyzed_once(self):
+        """Test roots inside another root are merged so diagnostics are not duplicated."""
+        loose = Path(self.temp_dir) / 'loose'
+        (loose / 'lib').mkdir(parents=True)
+        nested = Path(self.temp_dir) / 'app' / 'packages' / 'inner' / 'lib'
+        nested.mkdir(parents=True)
+        (nested.parent / 'pubspec.yaml').write_text("name: inner\n")
+        files = [str(loose / 'a.dart'), str(loose / 'lib' / 'b.dart'), self.files[0], str(nested / 'c.dart')]
+        for path in files:
+            Path(path).write_text("class A {}\n")
+
+        roots = self.agent._group_files_by_package_root(files)
+
+        self.assertEqual(sorted(roots), sorted(str(Path(self.temp_dir, p).resolve()) for p in ('loose', 'app')))
+        self.assertEqual(sorted(roots[str(Path(self.temp_dir, 'app').resolve())]), sorted(files[2:]))
+
+        def fake_analyze(cmd, **kwargs):
+            diagnostics = [{"code": "unused_import", "location": {"file": path}}
+                           for path in files if str(Path(path).resolve()).startswith(cmd[-1])]
+            return Mock(returncode=0, stdout=json.dumps({"version": 1, "diagnostics": diagnostics}), stderr="")
+
+        with patch('subprocess.run', side_effect=fake_analyze) as mock_run:
+            issues = self.agent.analyze_files(files)
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual({path: len(diagnostics) for path, diagnostics in issues.items()},
+                         {path: 1 for path in files})
+
+    def test_pubspec_search_stops_at_project_root(self):
+        """Test a pubspec.yaml above the project root is not used."""
+        (Path(self.temp_dir) / 'pubspec.yaml').write_text("name: outer\n")
+        project = Path(self.temp_dir) / 'plain'
+        (project / 'src').mkdir(parents=True)
+        path = str(project / 'src' / 'main.dart')
+
+        roots = self.agent._group_files_by_package_root([path], project_root=str(project))
+
+        self.assertEqual(list(roots), [str((project / 'src').resolve())])
+
+    def test_parse_dart_files_uses_package_analysis(self):
+        """Test coordinator interface also analyzes per package."""
+        with patch('subprocess.run', side_effect=self.fake_analyze) as mock_run:
+            parsed = self.agent.parse_dart_files([(path, os.path.basename(path)) for path in self.files])
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertTrue(all(f.parse_success for f in parsed))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
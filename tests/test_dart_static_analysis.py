@@ -112,7 +112,7 @@ void main() {
         self.assertEqual(result.tool, "dart_analyze")
         self.assertEqual(result.total_findings, 0)
     
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_dart_analyze_success(self, mock_subprocess):
         """Test successful dart analyze execution."""
         # Mock successful dart analyze output
@@ -120,6 +120,7 @@ void main() {
         mock_result.stdout = "lib/main.dart:10:5 • Prefer const with constant constructors • prefer_const_constructors\n"
         mock_result.stderr = ""
         mock_result.returncode = 0
+        mock_result.communicate.return_value = (mock_result.stdout, mock_result.stderr)
         mock_subprocess.return_value = mock_result
         
         result = self.agent.run_dart_analyze(self.dart_project_path)
@@ -137,7 +138,7 @@ void main() {
         self.assertEqual(finding.rule_id, "prefer_const_constructors")
         self.assertEqual(finding.tool, "dart_analyze")
     
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_dart_analyze_no_issues(self, mock_subprocess):
         """Test dart analyze với no issues."""
         # Mock dart analyze output with no issues
@@ -145,6 +146,7 @@ void main() {
         mock_result.stdout = "Analyzing project...\nNo issues found!\n"
         mock_result.stderr = ""
         mock_result.returncode = 0
+        mock_result.communicate.return_value = (mock_result.stdout, mock_result.stderr)
         mock_subprocess.return_value = mock_result
         
         result = self.agent.run_dart_analyze(self.dart_project_path)
@@ -153,12 +155,12 @@ void main() {
         self.assertEqual(result.total_findings, 0)
         self.assertEqual(len(result.findings), 0)
     
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_dart_analyze_timeout(self, mock_subprocess):
         """Test dart analyze timeout."""
         # Mock timeout exception
         import subprocess
-        mock_subprocess.side_effect = subprocess.TimeoutExpired("dart", 300)
+        mock_subprocess.return_value.communicate.side_effect = subprocess.TimeoutExpired("dart", 300)
         
         result = self.agent.run_dart_analyze(self.dart_project_path)
         
@@ -166,7 +168,7 @@ void main() {
         self.assertIn("timeout", result.error_message)
         self.assertEqual(result.total_findings, 0)
     
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_dart_analyze_not_installed(self, mock_subprocess):
         """Test dart analyze khi Dart SDK không được cài đặt."""
         # Mock FileNotFoundError
@@ -367,11 +369,12 @@ lib/models.dart:20:1: info: Consider making this field final
         self.agent.tools_config["dart_analyze"]["fatal_infos"] = True
         self.agent.tools_config["dart_analyze"]["fatal_warnings"] = True
         
-        with patch('subprocess.run') as mock_subprocess:
+        with patch('subprocess.Popen') as mock_subprocess:
             mock_result = Mock()
             mock_result.stdout = ""
             mock_result.stderr = ""
             mock_result.returncode = 0
+            mock_result.communicate.return_value = (mock_result.stdout, mock_result.stderr)
             mock_subprocess.return_value = mock_result
             
             self.agent.run_dart_analyze(self.dart_project_path)
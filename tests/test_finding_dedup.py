@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for bucketed finding deduplication (FindingSimilarityIndex).
+"""
+
+import random
+import time
+
+import pytest
+
+from src.agents.code_analysis import Finding, SeverityLevel, FindingType
+from src.agents.synthesis_reporting.finding_aggregator import FindingAggregatorAgent, AggregationStrategy
+from src.agents.synthesis_reporting.finding_dedup import FindingSimilarityIndex, group_duplicate_findings
+
+
+def make_finding(file_path, line, rule_id, message, tool="flake8"):
+    """Create a Finding with keyword arguments."""
+    return Finding(file_path=file_path, line_number=line, column_number=1,
+                   severity=SeverityLevel.LOW, finding_type=FindingType.STYLE,
+                   rule_id=rule_id, message=message, tool=tool)
+
+
+def pairwise_groups(agent, findings):
+    """Reference O(n^2) grouping with _are_findings_similar (the old loop)."""
+    groups, processed = [], set()
+    for i, finding in enumerate(findings):
+        if id(finding) in processed:
+            continue
+        related = []
+        for j in range(i + 1, len(findings)):
+            if id(findings[j]) not in processed and agent._are_findings_similar(finding, findings[j]):
+                related.append(j)
+                processed.add(id(findings[j]))
+        groups.append((i, related))
+        processed.add(id(finding))
+    return groups
+
+
+class TestFindingSimilarityIndex:
+    """Test candidate buckets reproduce the pairwise merge."""
+
+    def test_line_window_and_rule_buckets(self):
+        """Test nearby findings and same-rule messages are grouped."""
+        findings = [
+            make_finding("a.py", 10, "E501", "line too long (82 > 79 characters)"),
+            make_finding("a.py", 13, "E501", "something else entirely"),
+            make_finding("a.py", 14, "W291", "trailing whitespace"),
+            make_finding("b.py", 99, "E501", "line too long (82 > 79 characters)"),
+            make_finding("b.py", 5, "C0114", ""),
+            make_finding("c.py", 50, "C0114", ""),
+        ]
+
+        groups = group_duplicate_findings(findings)
+
+        assert groups == [(0, [1, 3]), (2, []), (4, [5])]
+
+    def test_missing_line_numbers_only_use_rule_buckets(self):
+        """Test findings without a line (architectural) do not break grouping."""
+        findings = [
+            make_finding("m", None, "ARCH_CIRCULAR", "cycle a -> b"),
+            make_finding("m", None, "ARCH_CIRCULAR", "cycle a -> b"),
+            make_finding("m", None, "ARCH_OTHER", "unrelated"),
+        ]
+
+        assert group_duplicate_findings(findings) == [(0, [1]), (2, [])]
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_pairwise_reference(self, seed):
+        """Test random findings produce exactly the pairwise groups."""
+        rng = random.Random(seed)
+        words = ["unused", "import", "line", "too", "long", "missing", "docstring", "x", "y", "(85"]
+        findings = [
+            make_finding(f"f{rng.randint(0, 4)}.py", rng.randint(1, 40), rng.choice(["E501", "W291", "", "C0114"]),
+                         " ".join(rng.choice(words) for _ in range(rng.randint(0, 6))))
+            for _ in range(400)
+        ]
+        agent = FindingAggregatorAgent()
+
+        index = FindingSimilarityIndex(findings, message_threshold=agent.deduplication_threshold)
+
+        assert index.group_duplicates() == pairwise_groups(agent, findings)
+
+
+class TestMergeDuplicateFindings:
+    """Test FindingAggregatorAgent uses the index."""
+
+    def test_sources_and_related_findings(self):
+        """Test merged findings keep related findings and all sources."""
+        findings_by_source = {
+            "flake8": [make_finding("a.py", 10, "E501", "line too long")],
+            "pylint": [make_finding("a.py", 11, "E501", "line too long", tool="pylint")],
+        }
+
+        result = FindingAggregatorAgent().aggregate_findings(findings_by_source, AggregationStrategy.MERGE_DUPLICATES)
+
+        assert result.aggregated_findings_count == 1
+        merged = result.aggregated_findings[0]
+        assert sorted(merged.sources) == ["flake8", "pylint"]
+        assert merged.aggregation_reason == "merged_duplicates"
+
+    def test_large_input_is_near_linear(self):
+        """Test 50k findings aggregate in seconds rather than never finishing."""
+        findings = [
+            make_finding(f"pkg/mod{i % 500}.py", i % 2000, f"E{i % 50}", f"issue number {i} in module {i % 500}")
+            for i in range(50000)
+        ]
+
+        start = time.time()
+        groups = FindingSimilarityIndex(findings).group_duplicates()
+
+        assert time.time() - start < 30
+        assert sum(1 + len(related) for _, related in groups) == len(findings)
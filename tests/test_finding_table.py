@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for FindingTable: columnar findings, vectorized rollups và export.
+"""
+
+import json
+
+import pytest
+
+from src.agents.code_analysis import (
+    AnalysisResult, Finding, FindingTable, FindingType, SeverityLevel, StaticAnalysisIntegratorAgent
+)
+from src.agents.synthesis_reporting import (
+    AggregationStrategy, FindingAggregatorAgent, ReportFormat, ReportGeneratorAgent
+)
+
+
+def make_finding(file_path, line, severity, rule_id, tool="flake8", finding_type=FindingType.STYLE):
+    """Create a Finding with keyword arguments."""
+    return Finding(file_path=file_path, line_number=line, column_number=1, severity=severity,
+                   finding_type=finding_type, rule_id=rule_id, message=f"{rule_id} at {line}", tool=tool)
+
+
+@pytest.fixture
+def findings():
+    return [
+        make_finding("a.py", 1, SeverityLevel.LOW, "E501"),
+        make_finding("a.py", 2, SeverityLevel.LOW, "E501"),
+        make_finding("a.py", 3, SeverityLevel.HIGH, "E0602", tool="pylint", finding_type=FindingType.ERROR),
+        make_finding("b.py", 7, SeverityLevel.MEDIUM, "W0611", tool="pylint", finding_type=FindingType.WARNING),
+        make_finding("c.py", None, SeverityLevel.CRITICAL, "ARCH_CYCLE", tool="architectural_analyzer"),
+    ]
+
+
+class TestFindingTable:
+    """Test building and querying the columnar table."""
+
+    def test_categorical_columns(self, findings):
+        """Test repeated strings are stored as categories."""
+        table = FindingTable.from_findings(findings)
+
+        assert len(table) == 5
+        for column in FindingTable.CATEGORICAL_COLUMNS:
+            assert table.frame[column].dtype == "category"
+        assert list(table.frame["severity"].cat.categories) == ["low", "medium", "high", "critical"]
+        assert table.frame["line"].isna().sum() == 1
+
+    def test_round_trip(self, findings):
+        """Test converting back yields the source Finding objects, not copies."""
+        table = FindingTable.from_findings(findings)
+
+        assert all(a is b for a, b in zip(table.to_findings(), findings))
+        assert table.filter(tool="pylint").to_findings()[0] is findings[2]
+        assert FindingTable(table.frame).to_findings() == findings
+
+    def test_histograms_and_counts(self, findings):
+        """Test vectorized severity/type histograms and group counts."""
+        table = FindingTable.from_findings(findings)
+
+        assert table.severity_histogram() == {"low": 2, "medium": 1, "high": 1, "critical": 1}
+        assert table.type_histogram()["style"] == 3
+        assert table.type_histogram()["security"] == 0
+        assert table.count_by("tool").to_dict() == {"flake8": 2, "pylint": 2, "architectural_analyzer": 1}
+        assert table.top_rules(1).index[0] == ("flake8", "E501")
+
+    def test_file_rollup(self, findings):
+        """Test per-file counts ordered by the most severe findings."""
+        rollup = FindingTable.from_findings(findings).file_rollup()
+
+        assert list(rollup.index) == ["c.py", "a.py", "b.py"]
+        assert rollup.loc["a.py", "total"] == 3
+        assert rollup.loc["a.py", "high"] == 1
+        assert rollup.loc["a.py", "tools"] == 2
+
+    def test_filter(self, findings):
+        """Test filtering by scalar, list and enum values."""
+        table = FindingTable.from_findings(findings)
+
+        assert len(table.filter(severity=[SeverityLevel.HIGH, "critical"])) == 2
+        assert len(table.filter(tool="pylint", file="b.py")) == 1
+        with pytest.raises(ValueError):
+            table.filter(unknown="x")
+
+    def test_concat_merges_categories(self, findings):
+        """Test tables with different categories can be concatenated."""
+        table = FindingTable.concat([FindingTable.from_findings(findings[:2]),
+                                     FindingTable.from_findings(findings[2:])])
+
+        assert len(table) == 5
+        assert set(table.frame["tool"].cat.categories) == {"flake8", "pylint", "architectural_analyzer"}
+
+    def test_export(self, findings, tmp_path):
+        """Test CSV and JSON export."""
+        table = FindingTable.from_findings(findings)
+
+        assert table.to_csv().splitlines()[0] == ",".join(FindingTable.EXPORT_COLUMNS)
+        records = json.loads(table.to_json())
+        assert records[2]["severity"] == "high"
+        assert "metadata" not in records[0]
+
+        path = tmp_path / "findings.csv"
+        table.to_csv(str(path))
+        assert len(path.read_text().splitlines()) == 6
+
+    def test_empty_table(self):
+        """Test an empty table answers every query."""
+        table = FindingTable.from_findings([])
+
+        assert len(table) == 0
+        assert table.severity_histogram()["low"] == 0
+        assert table.file_rollup().empty
+
+
+class TestAggregateResultsUsesTable:
+    """Test StaticAnalysisIntegratorAgent.aggregate_results breakdowns."""
+
+    def test_breakdowns(self, findings):
+        """Test breakdowns come from the finding table of successful tools."""
+        results = {
+            "flake8": AnalysisResult("flake8", "/p", 3, 5, findings, 1.0, True),
+            "pylint": AnalysisResult("pylint", "/p", 3, 0, [], 1.0, False, error_message="boom"),
+        }
+
+        aggregated = StaticAnalysisIntegratorAgent().aggregate_results(results)
+
+        assert aggregated["severity_breakdown"] == {"low": 2, "medium": 1, "high": 1, "critical": 1}
+        assert aggregated["type_breakdown"]["error"] == 1
+        assert len(aggregated["finding_table"]) == 5
+        assert all(a is b for a, b in zip(aggregated["all_findings"], findings))
+        assert len(aggregated["all_findings"]) == 5
+        assert aggregated["summary"]["failed_tools"] == ["pylint"]
+
+
+class TestTableConsumers:
+    """Test FindingAggregatorAgent and ReportGeneratorAgent take the table directly."""
+
+    def test_findings_by_tool(self, findings):
+        """Test grouping the table back into per-tool Finding lists."""
+        by_tool = FindingTable.from_findings(findings).findings_by_tool()
+
+        assert by_tool["flake8"] == findings[:2]
+        assert by_tool["flake8"][0] is findings[0]
+        assert by_tool["pylint"] == findings[2:4]
+        assert set(by_tool) == {"flake8", "pylint", "architectural_analyzer"}
+
+    def test_aggregate_and_report_from_table(self, findings):
+        """Test the table from aggregate_results flows through aggregation and reports."""
+        results = {"flake8": AnalysisResult("flake8", "/p", 3, 5, findings, 1.0, True)}
+        table = StaticAnalysisIntegratorAgent().aggregate_results(results)["finding_table"]
+
+        aggregation = FindingAggregatorAgent().aggregate_findings(table, AggregationStrategy.KEEP_ALL)
+
+        assert aggregation.success
+        assert aggregation.original_findings_count == 5
+        assert aggregation.finding_table is table
+        assert all(any(f.primary_finding is source for source in findings)
+                   for f in aggregation.aggregated_findings)
+        assert {f.primary_finding.tool for f in aggregation.aggregated_findings} == \
+            {"flake8", "pylint", "architectural_analyzer"}
+
+        reporter = ReportGeneratorAgent()
+        summary = json.loads(reporter.generate_report(aggregation, "p", ReportFormat.JSON).content)["summary"]
+        assert summary["original_severity_breakdown"] == {"low": 2, "medium": 1, "high": 1, "critical": 1}
+        assert summary["original_findings_by_tool"] == {"flake8": 2, "pylint": 2, "architectural_analyzer": 1}
+        assert "ORIGINAL FINDINGS BY TOOL" in reporter.generate_report(aggregation, "p", ReportFormat.TEXT).content
+        csv_report = reporter.generate_report(aggregation, "p", ReportFormat.CSV, {"raw_findings": True}).content
+        assert csv_report == table.to_csv()
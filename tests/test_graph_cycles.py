@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for SCC-based cycle detection (graph_cycles) và find_circular_dependencies.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents.ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent
+from src.agents.ckg_operations.graph_cycles import (
+    find_cyclic_components, find_dependency_cycles, find_minimal_cycles,
+    shortest_cycle_through, strongly_connected_components
+)
+
+
+class TestStronglyConnectedComponents:
+    """Test the iterative Tarjan walk."""
+
+    def test_components_cover_all_nodes(self):
+        """Test successor-only nodes get their own component."""
+        graph = {"A": ["B"], "B": ["A", "C"]}
+
+        components = strongly_connected_components(graph)
+
+        assert sorted(sorted(component) for component in components) == [["A", "B"], ["C"]]
+
+    def test_reverse_topological_order(self):
+        """Test a component is emitted before the components depending on it."""
+        graph = {"A": ["B"], "B": ["C"], "C": []}
+
+        assert strongly_connected_components(graph) == [["C"], ["B"], ["A"]]
+
+    def test_each_component_reported_once(self):
+        """Test overlapping cycles collapse into one component."""
+        graph = {"A": ["B", "C"], "B": ["A", "C"], "C": ["A"], "D": ["A"]}
+
+        assert find_cyclic_components(graph) == [["A", "B", "C"]]
+
+    def test_self_loop_is_cyclic(self):
+        """Test a node importing itself is reported, an isolated node is not."""
+        graph = {"A": ["A"], "B": []}
+
+        assert find_cyclic_components(graph) == [["A"]]
+
+    def test_deep_chain_does_not_hit_recursion_limit(self):
+        """Test a 20k-node import chain closing on itself."""
+        size = 20000
+        graph = {i: [i + 1] for i in range(size - 1)}
+        graph[size - 1] = [0]
+
+        components = find_cyclic_components(graph)
+
+        assert len(components) == 1
+        assert len(components[0]) == size
+
+
+class TestCycles:
+    """Test representative and minimal cycles per component."""
+
+    def test_shortest_cycle_through_node(self):
+        """Test BFS picks the shorter of two cycles."""
+        graph = {"A": ["B", "D"], "B": ["C"], "C": ["A"], "D": ["A"]}
+
+        assert shortest_cycle_through(graph, "A") == ["A", "D"]
+
+    def test_shortest_cycle_respects_members(self):
+        """Test the search stays inside the given node set."""
+        graph = {"A": ["B", "D"], "B": ["C"], "C": ["A"], "D": ["A"]}
+
+        assert shortest_cycle_through(graph, "A", {"A", "B", "C"}) == ["A", "B", "C"]
+
+    def test_minimal_cycles_are_distinct(self):
+        """Test each cycle is listed once whichever node it is found from."""
+        graph = {"A": ["B"], "B": ["A", "C"], "C": ["B"]}
+
+        cycles = find_minimal_cycles(graph, ["A", "B", "C"])
+
+        assert cycles == [["A", "B"], ["B", "C"]]
+
+    def test_minimal_cycles_cap(self):
+        """Test max_cycles limits the cycles listed."""
+        graph = {"A": ["B"], "B": ["A", "C"], "C": ["B"]}
+
+        assert len(find_minimal_cycles(graph, ["A", "B", "C"], max_cycles=1)) == 1
+
+    def test_dependency_cycles_default_one_cycle_per_component(self):
+        """Test default mode reports one representative cycle per component."""
+        graph = {"A": ["B"], "B": ["A", "C"], "C": ["B"], "X": ["Y"], "Y": ["X"]}
+
+        results = find_dependency_cycles(graph)
+
+        assert [result.component for result in results] == [["A", "B", "C"], ["X", "Y"]]
+        assert [result.cycles for result in results] == [[["A", "B"]], [["X", "Y"]]]
+
+    def test_dependency_cycles_minimal(self):
+        """Test minimal mode lists every distinct shortest cycle."""
+        graph = {"A": ["B"], "B": ["A", "C"], "C": ["B"]}
+
+        results = find_dependency_cycles(graph, minimal_cycles=True)
+
+        assert results[0].size == 3
+        assert results[0].cycles == [["A", "B"], ["B", "C"]]
+
+
+class TestFindCircularDependencies:
+    """Test CKGQueryInterfaceAgent.find_circular_dependencies."""
+
+    @pytest.fixture
+    def agent(self):
+        agent = CKGQueryInterfaceAgent(uri="bolt://test:7687", cache_max_entries=0)
+        agent.driver = MagicMock()
+        return agent
+
+    def _set_edges(self, agent, edges):
+        records = [{"source": source, "target": target} for source, target in edges]
+        session = agent.driver.session.return_value.__enter__.return_value
+        session.run.return_value = records
+        return session
+
+    def test_single_edge_query(self, agent):
+        """Test only IMPORTS edges are fetched, without variable-length paths."""
+        session = self._set_edges(agent, [])
+
+        result = agent.find_circular_dependencies()
+
+        assert result.success
+        assert result.results == []
+        session.run.assert_called_once()
+        assert "*2..10" not in session.run.call_args[0][0]
+
+    def test_cycle_rows(self, agent):
+        """Test each component is one row with a closed cycle_path."""
+        self._set_edges(agent, [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")])
+
+        result = agent.find_circular_dependencies()
+
+        assert result.total_count == 1
+        row = result.results[0]
+        assert row["cycle_path"] == ["a", "b", "c", "a"]
+        assert row["cycle_length"] == 3
+        assert row["component"] == ["a", "b", "c"]
+        assert row["component_size"] == 3
+
+    def test_no_driver(self):
+        """Test the query failure is returned unchanged."""
+        agent = CKGQueryInterfaceAgent(uri="bolt://test:7687")
+        agent.driver = None
+
+        assert not agent.find_circular_dependencies().success
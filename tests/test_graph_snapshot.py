@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for GraphSnapshot: CSR adjacency, array analyses và memory-mapped persistence.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.agents.ckg_operations.graph_snapshot import GraphSnapshot, GraphSnapshotBuilder
+
+
+@pytest.fixture
+def snapshot():
+    """Three modules importing each other in a cycle plus a leaf, and some calls."""
+    builder = GraphSnapshotBuilder()
+    builder.add_node("m:a", "Module", "a", "/repo/a.py")
+    builder.add_node("m:b", "Module", "b", "/repo/b.py")
+    builder.add_node("m:c", "Module", "c", "/repo/c.py")
+    builder.add_node("m:d", "Module", "d", "/repo/d.py")
+    builder.add_node("f:main", "Function", "main", "/repo/a.py", 1)
+    builder.add_node("f:helper", "Function", "helper", "/repo/b.py", 5)
+    builder.add_node("f:unused", "Function", "unused", "/repo/b.py", 9)
+    builder.add_node("f:_private", "Function", "_private", "/repo/c.py", 3)
+    for source, target in [("m:a", "m:b"), ("m:b", "m:c"), ("m:c", "m:a"), ("m:c", "m:d")]:
+        builder.add_edge(source, "IMPORTS", target)
+    builder.add_edge("f:main", "CALLS", "f:helper")
+    builder.add_edge("f:helper", "CALLS", "f:main")
+    return builder.build()
+
+
+class TestGraphSnapshotBuilder:
+    """Test interning and CSR construction."""
+
+    def test_strings_are_interned(self, snapshot):
+        """Test repeated labels and file paths share one string id."""
+        assert snapshot.strings.strings.count("Module") == 1
+        assert snapshot.strings.strings.count("/repo/b.py") == 1
+        assert snapshot.node_labels.dtype == np.int32
+
+    def test_csr_adjacency(self, snapshot):
+        """Test successors come from the CSR arrays per relationship type."""
+        c = snapshot.node_index("m:c")
+
+        assert sorted(snapshot.display_name(n) for n in snapshot.neighbors(c, ["IMPORTS"])) == ["a", "d"]
+        assert snapshot.relationship_types == ["CALLS", "IMPORTS"]
+        assert snapshot.num_edges == 6
+
+    def test_edges_to_unknown_nodes_are_dropped(self):
+        """Test an edge leaving the snapshot is counted and skipped."""
+        builder = GraphSnapshotBuilder()
+        builder.add_node("x", "Module", "x")
+
+        assert builder.add_edge("x", "IMPORTS", "outside") is False
+        assert builder.dropped_edges == 1
+        assert builder.build().num_edges == 0
+
+
+class TestGraphSnapshotAnalyses:
+    """Test degree, unused, reachability and cycle analyses."""
+
+    def test_fan_in_fan_out(self, snapshot):
+        """Test degrees over one relationship type."""
+        rows = snapshot.fan_in_fan_out(["IMPORTS"], labels=["Module"])
+
+        assert rows[0]["name"] == "c"
+        assert (rows[0]["fan_in"], rows[0]["fan_out"]) == (1, 2)
+        assert [row["name"] for row in rows] == ["c", "a", "b", "d"]
+
+    def test_unused_elements(self, snapshot):
+        """Test public functions without incoming CALLS."""
+        rows = snapshot.find_unused_elements(["Function"], ["CALLS"])
+
+        assert [row["name"] for row in rows] == ["unused"]
+        assert rows[0]["line_number"] == 9
+
+    def test_transitive_dependencies(self, snapshot):
+        """Test reachability over IMPORTS, bounded by depth."""
+        d = snapshot.node_index("m:d")
+        a = snapshot.node_index("m:a")
+
+        reachable = snapshot.transitive_dependencies(a, ["IMPORTS"])
+        assert sorted(snapshot.display_name(n) for n in reachable) == ["a", "b", "c", "d"]
+        assert snapshot.transitive_dependencies(d, ["IMPORTS"]).size == 0
+
+        one_level = snapshot.transitive_dependencies(a, ["IMPORTS"], max_depth=1)
+        assert [snapshot.display_name(n) for n in one_level] == ["b"]
+
+    def test_find_cycles(self, snapshot):
+        """Test each cyclic component is reported once per relationship set."""
+        cycles = snapshot.find_cycles(["IMPORTS"])
+
+        assert len(cycles) == 1
+        assert sorted(cycles[0].component) == ["a", "b", "c"]
+        assert cycles[0].cycles == [["a", "b", "c"]]
+
+    def test_find_cycles_with_labels(self, snapshot):
+        """Test a label filter removes edges leaving the labelled nodes."""
+        assert snapshot.find_cycles(["CALLS"], labels=["Module"]) == []
+        assert len(snapshot.find_cycles(["CALLS"], labels=["Function"])) == 1
+
+
+class TestGraphSnapshotPersistence:
+    """Test save/load round trips."""
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_round_trip(self, snapshot, tmp_path, mmap):
+        """Test a loaded snapshot answers the same analyses."""
+        path = str(tmp_path / "graph.ckgsnap")
+        snapshot.save(path)
+
+        loaded = GraphSnapshot.load(path, mmap=mmap)
+
+        assert loaded.num_nodes == snapshot.num_nodes
+        assert loaded.num_edges == snapshot.num_edges
+        assert loaded.node_info(loaded.node_index("f:helper")) == snapshot.node_info(snapshot.node_index("f:helper"))
+        assert loaded.find_cycles(["IMPORTS"])[0].cycles == [["a", "b", "c"]]
+        if mmap:
+            assert isinstance(loaded.node_keys, np.memmap)
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Test a file without the snapshot magic is refused."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a snapshot")
+
+        with pytest.raises(ValueError):
+            GraphSnapshot.load(str(path))
+
+
+class TestGraphSnapshotExport:
+    """Test exporting from the CKG query interface."""
+
+    def test_from_ckg_streams_nodes_and_edges(self):
+        """Test nodes and edges are streamed with the project filter."""
+        query_agent = MagicMock()
+        query_agent.stream_query.side_effect = [
+            iter([{"id": "m:a", "label": "Module", "name": "a", "file_path": "/repo/a.py", "line_number": None},
+                  {"id": "m:b", "label": "Module", "name": "b", "file_path": "/repo/b.py", "line_number": None}]),
+            iter([{"source_id": "m:a", "rel_type": "IMPORTS", "target_id": "m:b"},
+                  {"source_id": "m:b", "rel_type": "IMPORTS", "target_id": "m:external"}])
+        ]
+
+        snapshot = GraphSnapshot.from_ckg(query_agent, project_path="/repo")
+
+        assert snapshot.num_nodes == 2
+        assert snapshot.num_edges == 1
+        params = query_agent.stream_query.call_args_list[0][0][1]
+        assert params["project_path"] == "/repo"
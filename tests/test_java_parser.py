@@ -15,6 +15,13 @@ from src.agents.ckg_operations.java_parser import (
 )
 
 
+def make_agent(**kwargs) -> JavaParserAgent:
+    """Create a JavaParserAgent without looking up Java or the JavaParser JAR."""
+    with patch.object(JavaParserAgent, '_find_java_command', return_value='java'), \
+            patch.object(JavaParserAgent, '_ensure_javaparser_available'):
+        return JavaParserAgent(**kwargs)
+
+
 class TestJavaParserAgent:
     """Test cases for JavaParserAgent."""
     
@@ -363,7 +370,7 @@ public class TestClass {
                 MagicMock(parse_success=True, language='Java')
             ]
             
-            agent = JavaParserAgent.__new__(JavaParserAgent)
+            agent = make_agent()
             parsed_files = agent.parse_java_files(java_files)
             
             assert len(parsed_files) == 2
@@ -433,4 +440,108 @@ class TestJavaParseInfo:
         assert len(info.interfaces) == 1
         assert len(info.methods) == 1
         assert len(info.fields) == 1
-        assert len(info.dependencies) == 1 
\ No newline at end of file
+        assert len(info.dependencies) == 1 
+
+FAKE_WORKER_SCRIPT = '''
+import json
+import os
+import sys
+import time
+
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    path = line.strip()
+    if path.endswith("Slow.java"):
+        time.sleep(5)
+    if not os.path.exists(path):
+        print(json.dumps({"error": "Parsing error: missing " + path}), flush=True)
+        continue
+    name = os.path.splitext(os.path.basename(path))[0]
+    print(json.dumps({"node_type": "CompilationUnit", "imports": [], "pid": os.getpid(),
+                      "types": [{"type": "ClassOrInterfaceDeclaration", "name": name,
+                                 "isInterface": False, "methods": ["run"], "fields": []}]}),
+          flush=True)
+'''
+
+
+class TestJavaParserWorkerPool:
+    """Test cases for the long-lived JavaParser worker pool."""
+    
+    def setup_method(self):
+        """Create a fake worker script speaking the line protocol."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.script = Path(self.temp_dir) / "fake_worker.py"
+        self.script.write_text(FAKE_WORKER_SCRIPT)
+        self.command_calls = 0
+        
+    def teardown_method(self):
+        """Cleanup after each test method."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def command_factory(self):
+        """Return the fake worker command."""
+        import sys
+        self.command_calls += 1
+        return [sys.executable, str(self.script)]
+    
+    def create_java_files(self, count: int):
+        """Create Java files to parse."""
+        files = []
+        for i in range(count):
+            path = Path(self.temp_dir) / f"Test{i}.java"
+            path.write_text(f"public class Test{i} {{}}")
+            files.append((str(path), path.name))
+        return files
+    
+    def test_worker_is_reused_across_files(self):
+        """Test one worker process parses every file."""
+        from src.agents.ckg_operations.javaparser_worker import JavaParserWorkerPool
+        
+        with JavaParserWorkerPool(self.command_factory, size=1) as pool:
+            results = [pool.parse(path) for path, _ in self.create_java_files(3)]
+        
+        assert [r['types'][0]['name'] for r in results] == ['Test0', 'Test1', 'Test2']
+        assert len({r['pid'] for r in results}) == 1
+        assert self.command_calls == 1
+    
+    def test_worker_error_keeps_worker(self):
+        """Test a parse error is raised as CalledProcessError and worker survives."""
+        import subprocess
+        from src.agents.ckg_operations.javaparser_worker import JavaParserWorkerPool
+        
+        with JavaParserWorkerPool(self.command_factory, size=1) as pool:
+            with pytest.raises(subprocess.CalledProcessError) as exc_info:
+                pool.parse(str(Path(self.temp_dir) / "Missing.java"))
+            (path, _), = self.create_java_files(1)
+            assert pool.parse(path)['types'][0]['name'] == 'Test0'
+        
+        assert "missing" in exc_info.value.stderr
+    
+    def test_timeout_replaces_worker(self):
+        """Test a timed-out worker is discarded and a new one started."""
+        import subprocess
+        from src.agents.ckg_operations.javaparser_worker import JavaParserWorkerPool
+        
+        slow = Path(self.temp_dir) / "Slow.java"
+        slow.write_text("class Slow {}")
+        
+        with JavaParserWorkerPool(self.command_factory, size=1, timeout=0.5) as pool:
+            with pytest.raises(subprocess.TimeoutExpired):
+                pool.parse(str(slow))
+            (path, _), = self.create_java_files(1)
+            assert pool.parse(path)['types'][0]['name'] == 'Test0'
+            assert len(pool._workers) == 1
+    
+    def test_parse_java_files_with_worker_pool(self):
+        """Test JavaParserAgent parses files concurrently through the pool."""
+        agent = make_agent(worker_count=2, timeout=10.0)
+        agent._get_worker_command = self.command_factory
+        java_files = self.create_java_files(4)
+        
+        parsed_files = agent.parse_java_files(java_files)
+        
+        assert [f.relative_path for f in parsed_files] == [rel for _, rel in java_files]
+        assert all(f.parse_success for f in parsed_files)
+        assert parsed_files[0].ast_tree['parse_info']['classes'] == ['Test0']
+        assert agent._worker_pool is None
@@ -111,7 +111,7 @@ public class TestClass {
         shutil.rmtree(temp_dir)
     
     @patch('src.agents.code_analysis.static_analysis_integrator.StaticAnalysisIntegratorAgent._get_checkstyle_jar')
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_checkstyle_success(self, mock_subprocess, mock_get_jar):
         """Test successful Checkstyle execution."""
         project_path = self.create_temp_java_project()
@@ -119,18 +119,21 @@ public class TestClass {
         # Mock JAR path
         mock_get_jar.return_value = "/mock/checkstyle.jar"
         
-        # Mock subprocess result
-        mock_result = Mock()
-        mock_result.stdout = '''<?xml version="1.0" encoding="UTF-8"?>
+        # Mock subprocess: Checkstyle ghi XML report ra file của -o
+        report_xml = '''<?xml version="1.0" encoding="UTF-8"?>
 <checkstyle version="10.12.4">
     <file name="/test/TestClass.java">
         <error line="10" column="5" severity="warning" message="Unused variable" source="com.puppycrawl.tools.checkstyle.checks.coding.UnusedLocalVariableCheck"/>
         <error line="15" column="1" severity="error" message="Method too long" source="com.puppycrawl.tools.checkstyle.checks.sizes.MethodLengthCheck"/>
     </file>
 </checkstyle>'''
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_subprocess.return_value = mock_result
+        
+        def fake_popen(cmd, **kwargs):
+            report_path = cmd[cmd.index("-o") + 1]
+            Path(report_path).write_text(report_xml)
+            return Mock(returncode=0, communicate=Mock(return_value=("Audit done.\n", "")))
+        
+        mock_subprocess.side_effect = fake_popen
         
         # Run Checkstyle
         result = self.integrator.run_checkstyle(project_path)
@@ -153,6 +156,10 @@ public class TestClass {
         assert finding2.severity == SeverityLevel.HIGH
         assert "Method too long" in finding2.message
         
+        # Report tạm được xóa sau khi parse
+        report_path = mock_subprocess.call_args[0][0][mock_subprocess.call_args[0][0].index("-o") + 1]
+        assert not os.path.exists(report_path)
+        
         # Cleanup
         import shutil
         shutil.rmtree(project_path)
@@ -231,6 +238,25 @@ public class TestClass {
         assert finding3.severity == SeverityLevel.LOW
         assert finding3.rule_id == "MissingJavadocMethodCheck"
     
+    def test_parse_checkstyle_report_from_file(self, tmp_path):
+        """Test the report is parsed from disk, with text fallback only for invalid XML."""
+        report = tmp_path / "checkstyle.xml"
+        report.write_text('''<checkstyle version="10.12.4">
+    <file name="/project/src/A.java">
+        <error line="3" column="1" severity="error" message="Bad" source="x.y.BadCheck"/>
+    </file>
+</checkstyle>''')
+
+        findings = self.integrator.parse_checkstyle_report(str(report), "/project")
+        assert [(f.file_path, f.rule_id) for f in findings] == [("src/A.java", "BadCheck")]
+
+        report.write_text("[ERROR] /project/src/A.java:3:1: Bad [BadCheck]")
+        findings = self.integrator.parse_checkstyle_report(str(report), "/project")
+        assert [(f.line_number, f.severity) for f in findings] == [(3, SeverityLevel.HIGH)]
+
+        report.write_text("")
+        assert self.integrator.parse_checkstyle_report(str(report), "/project") == []
+
     def test_parse_checkstyle_text_fallback(self):
         """Test Checkstyle text fallback parser."""
         text_output = """[WARN] /project/src/Test.java:10:5: Unused variable
@@ -269,7 +295,7 @@ public class TestClass {
         assert type_refactor == FindingType.REFACTOR
     
     @patch('src.agents.code_analysis.static_analysis_integrator.StaticAnalysisIntegratorAgent._get_pmd_jar')
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_pmd_success(self, mock_subprocess, mock_get_jar):
         """Test successful PMD execution."""
         project_path = self.create_temp_java_project()
@@ -292,6 +318,7 @@ public class TestClass {
 </pmd>'''
         mock_result.stderr = ""
         mock_result.returncode = 0
+        mock_result.communicate.return_value = (mock_result.stdout, mock_result.stderr)
         mock_subprocess.return_value = mock_result
         
         # Run PMD
@@ -457,7 +484,7 @@ public class TestClass {
     
     @patch('src.agents.code_analysis.static_analysis_integrator.StaticAnalysisIntegratorAgent._get_checkstyle_jar')
     @patch('src.agents.code_analysis.static_analysis_integrator.StaticAnalysisIntegratorAgent._get_pmd_jar')
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_analysis_java_tools(self, mock_subprocess, mock_get_pmd_jar, mock_get_checkstyle_jar):
         """Test running analysis with Java tools."""
         project_path = self.create_temp_java_project()
@@ -471,6 +498,7 @@ public class TestClass {
         mock_result.stdout = '<?xml version="1.0" encoding="UTF-8"?><checkstyle version="10.12.4"></checkstyle>'
         mock_result.stderr = ""
         mock_result.returncode = 0
+        mock_result.communicate.return_value = (mock_result.stdout, mock_result.stderr)
         mock_subprocess.return_value = mock_result
         
         # Run analysis with Java tools
@@ -385,5 +385,78 @@ sealed class Result<T> {
             self.assertFalse(result)
 
 
+class TestKotlinBatchSyntaxCheck(unittest.TestCase):
+    """Test batch kotlinc syntax check theo module."""
+
+    def setUp(self):
+        """Tạo hai modules, mỗi module hai files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for module in ('app', 'lib'):
+            module_dir = os.path.join(self.temp_dir, module)
+            os.makedirs(os.path.join(module_dir, 'src'))
+            open(os.path.join(module_dir, 'build.gradle.kts'), 'w').close()
+            for name in ('A.kt', 'B.kt'):
+                path = os.path.join(module_dir, 'src', name)
+                with open(path, 'w') as f:
+                    f.write('class X\n')
+                self.files.append(path)
+
+        self.parser = self._make_parser(syntax_check=True)
+
+    @staticmethod
+    def _make_parser(**kwargs):
+        """Tạo KotlinParserAgent với kotlinc giả lập."""
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout='/usr/bin/kotlinc\n')
+            return KotlinParserAgent(**kwargs)
+
+    def tearDown(self):
+        """Cleanup."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_invocation_per_module(self):
+        """Test mỗi module chỉ gọi kotlinc một lần và diagnostics map về file."""
+        app_a = self.files[0]
+        stderr = (f"{app_a}:3:5: error: expecting ')'\n"
+                  f"{self.files[1]}:1:1: warning: unused variable\n")
+
+        def fake_run(cmd, **kwargs):
+            has_error = app_a in cmd
+            return Mock(returncode=1 if has_error else 0, stderr=stderr if has_error else '')
+
+        with patch('subprocess.run', side_effect=fake_run) as mock_run:
+            results = self.parser.parse_kotlin_files(self.files)
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(len(mock_run.call_args_list[0].args[0]), 3 + 2)
+        infos = dict(results)
+        self.assertFalse(infos[app_a].syntax_valid)
+        self.assertEqual(infos[app_a].syntax_errors, ["3:5: expecting ')'"])
+        self.assertTrue(infos[self.files[1]].syntax_valid)
+        self.assertTrue(infos[self.files[2]].syntax_valid)
+
+    def test_parallel_modules(self):
+        """Test modules được kiểm tra song song khi có nhiều workers."""
+        parser = self._make_parser(syntax_check=True, syntax_check_workers=2)
+
+        with patch('subprocess.run', return_value=Mock(returncode=0, stderr='')) as mock_run:
+            errors = parser.check_kotlin_syntax_batch(self.files)
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(errors, {path: [] for path in self.files})
+
+    def test_syntax_check_is_opt_in(self):
+        """Test mặc định không gọi kotlinc khi parse."""
+        parser = self._make_parser()
+
+        with patch('subprocess.run') as mock_run:
+            results = parser.parse_kotlin_files(self.files)
+
+        mock_run.assert_not_called()
+        self.assertIsNone(results[0][1].syntax_valid)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded linter execution: size-balanced shards, work stealing và merge.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from src.agents.code_analysis import (
+    Shard, StaticAnalysisIntegratorAgent, WorkStealingPool, build_size_balanced_shards
+)
+
+
+# Fake linter: in một finding flake8-format cho mỗi file, cộng một finding chung
+# (giống mypy báo lại lỗi của module được import); sleep lâu nếu có file slow_*.py
+FAKE_LINTER = """
+import os, sys, time
+for path in sys.argv[1:]:
+    if os.path.basename(path).startswith('slow_'):
+        time.sleep(30)
+    print(f"{path}:1:1: E501 line too long", flush=True)
+print("shared.py:3:1: F401 'os' imported but unused")
+"""
+
+
+def write_files(directory, sizes):
+    """Tạo files với kích thước cho trước."""
+    paths = []
+    for name, size in sizes.items():
+        path = directory / name
+        path.write_text("x" * size)
+        paths.append(str(path))
+    return paths
+
+
+class TestBuildShards:
+    """Test size-balanced sharding."""
+
+    def test_shards_are_balanced_by_bytes(self, tmp_path):
+        """Test LPT assignment keeps shard totals close."""
+        paths = write_files(tmp_path, {f"f{i}.py": size for i, size in enumerate([900, 500, 400, 300, 300, 100, 100])})
+
+        shards = build_size_balanced_shards(paths, 3)
+
+        assert len(shards) == 3
+        assert sorted(f for shard in shards for f in shard.files) == sorted(paths)
+        assert [shard.total_bytes for shard in shards] == [900, 900, 800]
+
+    def test_never_more_shards_than_files(self, tmp_path):
+        """Test empty shards are dropped."""
+        paths = write_files(tmp_path, {"a.py": 10, "b.py": 20})
+
+        assert len(build_size_balanced_shards(paths, 8)) == 2
+        assert build_size_balanced_shards([], 4) == []
+
+
+class TestWorkStealingPool:
+    """Test the worker pool."""
+
+    def test_idle_workers_steal_from_busy_worker(self):
+        """Test shards queued behind a slow shard are stolen by other workers."""
+        shards = [Shard(index=i, files=[f"f{i}"], total_bytes=100 - i) for i in range(8)]
+        seen = {}
+
+        def run_shard(shard):
+            seen[shard.index] = threading.current_thread().name
+            time.sleep(0.5 if shard.index == 0 else 0.01)
+            return shard.index
+
+        pool = WorkStealingPool(2)
+        start = time.time()
+        outcomes = pool.run(shards, run_shard)
+
+        assert [outcome.result for outcome in outcomes] == list(range(8))
+        assert pool.steals > 0
+        # Worker giữ shard chậm chỉ chạy shard đó; worker còn lại làm hết phần còn lại
+        assert sum(1 for name in seen.values() if name == seen[0]) == 1
+        assert time.time() - start < 1.5
+
+    def test_errors_do_not_stop_other_shards(self):
+        """Test an exception is kept in the outcome of its shard only."""
+        shards = [Shard(index=i, files=[f"f{i}"]) for i in range(4)]
+
+        def run_shard(shard):
+            if shard.index == 2:
+                raise RuntimeError("boom")
+            return shard.index
+
+        outcomes = WorkStealingPool(3).run(shards, run_shard)
+
+        assert [outcome.success for outcome in outcomes] == [True, True, False, True]
+        assert str(outcomes[2].error) == "boom"
+
+    def test_cancel_stops_taking_new_shards(self):
+        """Test a set cancel event leaves shards unrun."""
+        cancel = threading.Event()
+        cancel.set()
+
+        assert WorkStealingPool(2, cancel).run([Shard(index=0, files=["a"])], lambda shard: 1) == []
+
+
+class TestRunSharded:
+    """Test StaticAnalysisIntegratorAgent sharding mode."""
+
+    @pytest.fixture
+    def agent(self):
+        agent = StaticAnalysisIntegratorAgent(
+            tools_config={"flake8": {"enabled": True, "timeout": 3, "shards_per_worker": 2}},
+            shard_workers=3
+        )
+        agent._build_flake8_command = lambda project_path, targets=None: [sys.executable, "-c", FAKE_LINTER,
+                                                                        *(targets or [project_path])]
+        return agent
+
+    def test_merges_and_deduplicates(self, agent, tmp_path):
+        """Test findings from every shard are merged and shared findings kept once."""
+        write_files(tmp_path, {f"m{i}.py": 10 * (i + 1) for i in range(10)})
+
+        result = agent.run_analysis(str(tmp_path), ["flake8"])["flake8"]
+
+        assert result.success
+        assert result.error_message is None
+        assert result.total_files_analyzed == 10
+        assert sorted(f.file_path for f in result.findings) == sorted([f"m{i}.py" for i in range(10)] + ["shared.py"])
+        assert result.total_findings == 11
+
+    def test_slow_shard_does_not_fail_run(self, agent, tmp_path):
+        """Test a shard hitting the timeout only loses its own files."""
+        write_files(tmp_path, {"slow_one.py": 5000, **{f"m{i}.py": 100 for i in range(8)}})
+
+        start = time.time()
+        result = agent.run_sharded("flake8", str(tmp_path))
+
+        assert time.time() - start < 20
+        assert result.success
+        assert "1 shards timeout" in result.error_message
+        assert "slow_one.py" not in {f.file_path for f in result.findings}
+        assert {f"m{i}.py" for i in range(8)} <= {f.file_path for f in result.findings}
+
+    def test_cancel_kills_running_shards(self, agent, tmp_path):
+        """Test cancel_analysis kills shard processes instead of waiting for the timeout."""
+        agent.tools_config["flake8"]["timeout"] = 60
+        write_files(tmp_path, {f"slow_{i}.py": 100 for i in range(3)})
+        threading.Timer(1.0, agent.cancel_analysis).start()
+
+        start = time.time()
+        results = dict(agent.iter_analysis(str(tmp_path), ["flake8"]))
+
+        assert time.time() - start < 20
+        assert not results["flake8"].success
+        assert results["flake8"].error_message == "Analysis cancelled"
+
+    def test_sharding_is_opt_in(self, tmp_path):
+        """Test the default agent runs one invocation and non-line tools are never sharded."""
+        agent = StaticAnalysisIntegratorAgent()
+        sharded = StaticAnalysisIntegratorAgent(shard_workers=4)
+
+        assert not agent._is_sharded("flake8")
+        assert sharded._is_sharded("mypy")
+        assert not sharded._is_sharded("checkstyle")
+        assert sharded._get_tool_cpu_cost("pylint") == 4
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for Neo4jDriverRegistry và shared driver trong CKGQueryInterfaceAgent.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents.ckg_operations import neo4j_driver_registry
+from src.agents.ckg_operations.neo4j_driver_registry import Neo4jDriverRegistry
+from src.agents.ckg_operations.ckg_query_interface import CKGQueryInterfaceAgent
+
+
+@pytest.fixture
+def graph_database():
+    """Patch GraphDatabase so each driver() call returns a new mock driver."""
+    with patch.object(neo4j_driver_registry, 'GraphDatabase') as mock_graph_database:
+        mock_graph_database.driver.side_effect = lambda *args, **kwargs: MagicMock()
+        yield mock_graph_database
+
+
+@pytest.fixture
+def registry(graph_database):
+    """Fresh process-wide registry for the test."""
+    fresh = Neo4jDriverRegistry()
+    with patch.object(neo4j_driver_registry, '_registry', fresh):
+        yield fresh
+
+
+class TestNeo4jDriverRegistry:
+    """Test driver sharing, pool size and liveness checks."""
+
+    def test_same_database_shares_driver(self, registry, graph_database):
+        """Test one driver per (uri, user, password)."""
+        first = registry.get_driver("bolt://db:7687", "neo4j", "pw", max_connection_pool_size=10)
+        second = registry.get_driver("bolt://db:7687", "neo4j", "pw")
+        other = registry.get_driver("bolt://other:7687", "neo4j", "pw")
+
+        assert first is second
+        assert other is not first
+        assert graph_database.driver.call_count == 2
+        assert graph_database.driver.call_args_list[0].kwargs['max_connection_pool_size'] == 10
+
+    def test_concurrent_get_creates_one_driver(self, registry, graph_database):
+        """Test concurrent callers get the same driver."""
+        drivers = []
+        threads = [threading.Thread(target=lambda: drivers.append(
+            registry.get_driver("bolt://db:7687", "neo4j", "pw"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(driver) for driver in drivers}) == 1
+        assert registry.get_stats()['drivers_created'] == 1
+
+    def test_dead_driver_is_replaced(self, registry):
+        """Test a driver failing its liveness check is closed and recreated."""
+        registry.liveness_check_interval = 0
+        first = registry.get_driver("bolt://db:7687", "neo4j", "pw")
+        first.verify_connectivity.side_effect = ConnectionError("gone")
+
+        second = registry.get_driver("bolt://db:7687", "neo4j", "pw")
+
+        assert second is not first
+        first.close.assert_called_once()
+        assert registry.get_stats()['open_drivers'] == 1
+
+    def test_unreachable_database_raises(self, registry, graph_database):
+        """Test drivers that cannot connect are not cached."""
+        failing = MagicMock()
+        failing.verify_connectivity.side_effect = ConnectionError("refused")
+        graph_database.driver.side_effect = None
+        graph_database.driver.return_value = failing
+
+        with pytest.raises(ConnectionError):
+            registry.get_driver("bolt://db:7687", "neo4j", "pw")
+
+        failing.close.assert_called_once()
+        assert registry.get_stats()['open_drivers'] == 0
+
+    def test_slow_database_does_not_block_others(self, registry, graph_database):
+        """Test connecting to one slow database does not hold the registry lock."""
+        connecting = threading.Event()
+        release = threading.Event()
+
+        def make_driver(uri, **kwargs):
+            driver = MagicMock()
+            if uri == "bolt://slow:7687":
+                def slow_verify():
+                    connecting.set()
+                    release.wait(5)
+                driver.verify_connectivity.side_effect = slow_verify
+            return driver
+
+        graph_database.driver.side_effect = make_driver
+        slow_thread = threading.Thread(
+            target=lambda: registry.get_driver("bolt://slow:7687", "neo4j", "pw"))
+        slow_thread.start()
+        try:
+            assert connecting.wait(5)
+            fast = []
+            fast_thread = threading.Thread(
+                target=lambda: fast.append(registry.get_driver("bolt://fast:7687", "neo4j", "pw")))
+            fast_thread.start()
+            fast_thread.join(2)
+
+            assert fast, "get_driver for another database blocked on the slow one"
+        finally:
+            release.set()
+            slow_thread.join()
+        assert registry.get_stats()['open_drivers'] == 2
+
+
+class TestSharedDriverInQueryInterface:
+    """Test CKGQueryInterfaceAgent connects lazily through the registry."""
+
+    def test_agents_share_driver_lazily(self, registry, graph_database):
+        """Test construction does not connect and agents reuse one driver."""
+        first = CKGQueryInterfaceAgent(uri="bolt://db:7687")
+        second = CKGQueryInterfaceAgent(uri="bolt://db:7687")
+        assert graph_database.driver.call_count == 0
+
+        assert first.driver is second.driver
+        assert graph_database.driver.call_count == 1
+
+    def test_close_keeps_shared_driver_open(self, registry):
+        """Test closing one agent does not close the driver for others."""
+        first = CKGQueryInterfaceAgent(uri="bolt://db:7687")
+        second = CKGQueryInterfaceAgent(uri="bolt://db:7687")
+        driver = first.driver
+
+        first.close()
+
+        assert first.driver is None
+        assert second.driver is driver
+        driver.close.assert_not_called()
+        assert first.get_connection() is driver
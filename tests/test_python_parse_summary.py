@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for PythonParseInfo summary, parse song song và parse cache
+trong CodeParserCoordinatorAgent.
+"""
+
+import ast
+import pickle
+
+from src.agents.ckg_operations.python_parser import PythonParseInfo, extract_python_parse_info
+from src.agents.ckg_operations.code_parser_coordinator import (
+    CodeParserCoordinatorAgent, ParsedFile, parse_python_file
+)
+from src.agents.ckg_operations.ast_to_ckg_builder import ASTtoCKGBuilderAgent
+from src.agents.ckg_operations.parse_cache import ParseCache, ParseCacheEntry
+
+
+SOURCE = '''
+import os
+from typing import List as L
+
+class A(Base):
+    """Class A."""
+
+    @staticmethod
+    def m(x: int):
+        pass
+
+    async def n(self):
+        pass
+
+def f(a, b: L):
+    def inner():
+        pass
+    return a
+'''
+
+
+def build_nodes(ast_tree) -> dict:
+    """Build CKG nodes from either an AST or a PythonParseInfo."""
+    builder = ASTtoCKGBuilderAgent()
+    parsed_file = ParsedFile(
+        file_path="/test/a.py",
+        relative_path="a.py",
+        language="Python",
+        ast_tree=ast_tree,
+        parse_success=True
+    )
+    builder._process_file(parsed_file)
+    return builder
+
+
+class TestPythonParseInfo:
+    """Test summary extraction."""
+
+    def test_extracts_declarations(self):
+        """Test imports, classes, methods and functions are extracted."""
+        info = extract_python_parse_info(ast.parse(SOURCE))
+
+        assert [i.imported_name for i in info.imports] == ["os", "typing.List"]
+        assert info.imports[1].alias == "L"
+        assert info.classes[0].base_classes == ["Base"]
+        assert [m.name for m in info.classes[0].methods] == ["m", "n"]
+        assert info.classes[0].methods[0].is_static
+        assert info.classes[0].methods[1].is_async
+        assert {fn.name for fn in info.functions} == {"m", "n", "f", "inner"}
+        assert info.imports_count == 2
+        assert info.classes_count == 1
+        # Chỉ đếm FunctionDef (không tính async)
+        assert info.functions_count == 3
+        assert info.nodes_count == sum(1 for _ in ast.walk(ast.parse(SOURCE)))
+
+    def test_summary_is_picklable(self):
+        """Test summary can cross process boundaries."""
+        info = extract_python_parse_info(ast.parse(SOURCE))
+
+        restored = pickle.loads(pickle.dumps(info))
+
+        assert restored == info
+
+    def test_builder_output_matches_ast_path(self):
+        """Test builder creates the same nodes from summary and from AST."""
+        from_ast = build_nodes(ast.parse(SOURCE))
+        from_summary = build_nodes(extract_python_parse_info(ast.parse(SOURCE)))
+
+        assert set(from_ast.created_nodes) == set(from_summary.created_nodes)
+        assert len(from_ast.created_relationships) == len(from_summary.created_relationships)
+
+
+class TestParallelPythonParsing:
+    """Test process-pool parsing in CodeParserCoordinatorAgent."""
+
+    def create_files(self, tmp_path, count: int = 4):
+        """Create Python files on disk."""
+        files = []
+        for i in range(count):
+            path = tmp_path / f"mod{i}.py"
+            path.write_text(SOURCE if i != 2 else "def broken(:\n")
+            files.append((str(path), path.name))
+        return files
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Test parallel parsing returns the same results in the same order."""
+        files = self.create_files(tmp_path)
+
+        sequential = CodeParserCoordinatorAgent()._parse_python_files(files)
+        parallel = CodeParserCoordinatorAgent(parallel_workers=2)._parse_python_files(files)
+
+        assert [f.relative_path for f in parallel] == [f.relative_path for f in sequential]
+        assert [f.parse_success for f in parallel] == [True, True, False, True]
+        assert [f.nodes_count for f in parallel] == [f.nodes_count for f in sequential]
+        assert isinstance(parallel[0].ast_tree, PythonParseInfo)
+        assert isinstance(sequential[0].ast_tree, ast.Module)
+        assert "Syntax error" in parallel[2].error_message
+
+    def test_parse_python_file_summary(self, tmp_path):
+        """Test module-level parser returns a summary when requested."""
+        (path, relative_path), = self.create_files(tmp_path, count=1)
+
+        parsed = parse_python_file(path, relative_path, summarize=True)
+
+        assert parsed.parse_success
+        assert parsed.ast_tree.classes[0].name == "A"
+        assert parsed.lines_count == len(SOURCE.splitlines())
+
+
+class TestParseCache:
+    """Test on-disk parse cache."""
+
+    def test_rescan_uses_cache(self, tmp_path):
+        """Test unchanged files are served from cache and changed ones reparsed."""
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        files = []
+        for i in range(3):
+            path = source_dir / f"mod{i}.py"
+            path.write_text(SOURCE)
+            files.append((str(path), path.name))
+
+        cache = ParseCache(str(tmp_path / "cache"))
+        coordinator = CodeParserCoordinatorAgent(parse_cache=cache)
+        first = coordinator._parse_python_files(files)
+        assert cache.get_stats()['misses'] == 3
+
+        (source_dir / "mod1.py").write_text("def g():\n    pass\n")
+        rescan_cache = ParseCache(str(tmp_path / "cache"))
+        second = CodeParserCoordinatorAgent(parse_cache=rescan_cache)._parse_python_files(files)
+
+        # mod0 và mod2 có cùng nội dung nên chỉ có một entry cho chúng
+        assert rescan_cache.get_stats()['hits'] == 2
+        assert rescan_cache.get_stats()['misses'] == 1
+        assert second[0].ast_tree == first[0].ast_tree
+        assert second[0].nodes_count == first[0].nodes_count
+        assert [fn.name for fn in second[1].ast_tree.functions] == ["g"]
+
+    def test_lru_eviction(self, tmp_path):
+        """Test cache evicts least recently used entries past its size bound."""
+        cache = ParseCache(str(tmp_path), max_size_mb=0.001)
+        entry = ParseCacheEntry(parse_info="x" * 300)
+
+        cache.put("a", entry)
+        cache.put("b", entry)
+        cache.get("a")
+        cache.put("c", entry)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.evictions >= 1
+        assert cache.get_stats()['size_bytes'] <= cache.max_size_bytes
+
+    def test_key_depends_on_language_and_version(self):
+        """Test cache key changes with parser language and version."""
+        key = ParseCache.make_key(b"x = 1", "Python", "1")
+
+        assert key == ParseCache.make_key(b"x = 1", "Python", "1")
+        assert key != ParseCache.make_key(b"x = 1", "Python", "2")
+        assert key != ParseCache.make_key(b"x = 1", "Java", "1")
+        assert key != ParseCache.make_key(b"x = 2", "Python", "1")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Tests for SQLiteCKGBackend: build, query và incremental update không cần Neo4j.
+"""
+
+import pytest
+
+from src.agents.ckg_operations.ast_to_ckg_builder import ASTtoCKGBuilderAgent
+from src.agents.ckg_operations.code_parser_coordinator import CodeParserCoordinatorAgent
+from src.agents.ckg_operations.ckg_schema import (
+    NodeProperties, NodeType, RelationshipProperties, RelationshipType
+)
+from src.agents.ckg_operations.sqlite_backend import SQLiteCKGBackend
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Small Python project with an import cycle, inheritance and calls."""
+    (tmp_path / "base.py").write_text(
+        "import child\n\n"
+        "class Base:\n"
+        "    def run(self):\n"
+        "        pass\n\n"
+        "def helper(a, b):\n"
+        "    return a\n\n"
+        "def unused_public():\n"
+        "    pass\n"
+    )
+    (tmp_path / "child.py").write_text(
+        "import base\n"
+        "from base import Base, helper\n\n"
+        "class Child(Base):\n"
+        "    pass\n\n"
+        "def main():\n"
+        "    helper(1, 2)\n\n"
+        "def _private():\n"
+        "    pass\n"
+    )
+    return tmp_path
+
+
+def link(backend, source_label, source_name, rel_type, target_label, target_name):
+    """Thêm một cross-file edge giữa hai nodes theo (label, name)."""
+    def node_id(label, name):
+        return backend.execute_sql("SELECT id FROM nodes WHERE label = ? AND name = ?",
+                                   [label, name]).results[0]["id"]
+    backend.write_graph([], [RelationshipProperties(
+        type=RelationshipType(rel_type),
+        source_node_id=node_id(source_label, source_name),
+        target_node_id=node_id(target_label, target_name))])
+
+
+def write_sql(backend, sql):
+    """Chạy câu lệnh ghi trực tiếp (execute_sql chỉ dùng cho SELECT)."""
+    with backend._connection:
+        backend._connection.execute(sql)
+
+
+def graph_snapshot(backend):
+    """Nodes và edges dạng (label, file_path, name) để so sánh hai lần build."""
+    nodes = backend.execute_sql("SELECT label, file_path, name FROM nodes").results
+    edges = backend.execute_sql(
+        "SELECT s.label AS sl, s.file_path AS sf, s.name AS sn, e.rel_type AS rel, "
+        "t.label AS tl, t.file_path AS tf, t.name AS tn "
+        "FROM edges e JOIN nodes s ON s.id = e.source_id JOIN nodes t ON t.id = e.target_id").results
+    return (sorted(tuple(row.values()) for row in nodes),
+            sorted(tuple(row.values()) for row in edges))
+
+
+@pytest.fixture
+def built(project):
+    """Project built into an in-memory SQLite CKG."""
+    backend = SQLiteCKGBackend()
+    builder = ASTtoCKGBuilderAgent(storage_backend=backend)
+    parse_result = CodeParserCoordinatorAgent().parse_files(str(project), ["base.py", "child.py"])
+    result = builder.build_ckg_from_parse_result(parse_result)
+    yield project, backend, builder, result
+    backend.close()
+
+
+class TestSQLiteBuild:
+    """Test building a CKG through the storage backend."""
+
+    def test_build_writes_graph(self, built):
+        """Test nodes and relationships land in SQLite instead of being dropped."""
+        _, backend, builder, result = built
+
+        assert result.build_success
+        stats = backend.get_project_statistics().results[0]
+        assert stats["files_count"] == 2
+        assert stats["functions_count"] == len(
+            [n for n in builder.created_nodes.values() if n.type == NodeType.FUNCTION])
+        assert stats["relationships_count"] > 0
+
+    def test_relationships_to_missing_nodes_are_skipped(self):
+        """Test edges are only stored when both endpoints exist, like MATCH in Neo4j."""
+        backend = SQLiteCKGBackend()
+        node = NodeProperties(name="f", type=NodeType.FUNCTION, file_path="a.py", line_number=1,
+                              properties={"id": "f"})
+        backend.write_graph([node], [
+            RelationshipProperties(type=RelationshipType.CALLS, source_node_id="f", target_node_id="f"),
+            RelationshipProperties(type=RelationshipType.CALLS, source_node_id="f", target_node_id="missing")
+        ])
+
+        assert backend.get_project_statistics().results[0]["relationships_count"] == 1
+
+
+class TestSQLiteInDegreeIndex:
+    """Test unused-element reports read the in-degree index."""
+
+    @staticmethod
+    def node(name, node_type, file_path="a.kt", **properties):
+        return NodeProperties(name=name, type=node_type, file_path=file_path, line_number=1,
+                              properties={"id": name, **properties})
+
+    def test_unused_elements_follow_index(self):
+        """Test CALLS, KOTLIN_USES_TYPE and Dart import refs after a refresh."""
+        backend = SQLiteCKGBackend()
+        backend.write_graph(
+            [self.node("called", NodeType.FUNCTION), self.node("caller", NodeType.FUNCTION),
+             self.node("Used", NodeType.KOTLIN_OBJECT), self.node("Idle", NodeType.KOTLIN_OBJECT),
+             self.node("Widget", NodeType.DART_EXPORT, "w.dart"),
+             self.node("Orphan", NodeType.DART_EXPORT, "w.dart"),
+             self.node("main.dart", NodeType.FILE, "main.dart"),
+             self.node("imp", NodeType.DART_IMPORT, "main.dart", imported_name="package:app/Widget")],
+            [RelationshipProperties(type=RelationshipType.CALLS, source_node_id="caller", target_node_id="called"),
+             RelationshipProperties(type=RelationshipType.KOTLIN_USES_TYPE, source_node_id="caller",
+                                    target_node_id="Used"),
+             RelationshipProperties(type=RelationshipType.IMPORTS, source_node_id="main.dart",
+                                    target_node_id="imp")])
+        backend.refresh_in_degree_index()
+
+        assert [row["name"] for row in backend.get_unused_public_functions().results] == ["caller"]
+        assert [row["object_name"] for row in backend.find_kotlin_unused_objects().results] == ["Idle"]
+        assert [row["export_name"] for row in backend.find_dart_unused_exports().results] == ["Orphan"]
+
+    def test_missing_index_falls_back_to_edges(self):
+        """Test graphs written without a refresh still report unused elements."""
+        backend = SQLiteCKGBackend()
+        backend.write_graph(
+            [self.node("called", NodeType.FUNCTION), self.node("caller", NodeType.FUNCTION),
+             self.node("Idle", NodeType.KOTLIN_OBJECT),
+             self.node("src/widget.dart", NodeType.DART_EXPORT, "w.dart"),
+             self.node("main.dart", NodeType.FILE, "main.dart"),
+             self.node("imp", NodeType.DART_IMPORT, "main.dart", imported_name="package:app/src/widget.dart")],
+            [RelationshipProperties(type=RelationshipType.CALLS, source_node_id="caller", target_node_id="called"),
+             RelationshipProperties(type=RelationshipType.IMPORTS, source_node_id="main.dart",
+                                    target_node_id="imp")])
+
+        assert [row["name"] for row in backend.get_unused_public_functions().results] == ["caller"]
+        assert [row["object_name"] for row in backend.find_kotlin_unused_objects().results] == ["Idle"]
+        assert backend.find_dart_unused_exports().results == []
+
+    def test_dart_refs_match_path_suffixes(self):
+        """Test full and scoped refreshes count imports by '/'-suffix, not substring."""
+        backend = SQLiteCKGBackend()
+        backend.write_graph(
+            [self.node("src/widget.dart", NodeType.DART_EXPORT, "w.dart"),
+             self.node("widget.dart", NodeType.DART_EXPORT, "w.dart"),
+             self.node("idget.dart", NodeType.DART_EXPORT, "w.dart"),
+             self.node("main.dart", NodeType.FILE, "main.dart"),
+             self.node("imp", NodeType.DART_IMPORT, "main.dart", imported_name="package:app/src/widget.dart")],
+            [RelationshipProperties(type=RelationshipType.IMPORTS, source_node_id="main.dart",
+                                    target_node_id="imp")])
+
+        def refs():
+            rows = backend.execute_sql(
+                "SELECT name, json_extract(properties, '$.import_refs') AS refs "
+                "FROM nodes WHERE label = 'DartExport' ORDER BY name").results
+            return {row["name"]: row["refs"] for row in rows}
+
+        backend.refresh_in_degree_index()
+        assert refs() == {"idget.dart": 0, "src/widget.dart": 1, "widget.dart": 1}
+
+        write_sql(backend, "UPDATE nodes SET properties = json_remove(properties, '$.import_refs')")
+        backend.refresh_in_degree_index({"paths": ["w.dart"], "ids": [], "ref_names": []})
+        assert refs() == {"idget.dart": 0, "src/widget.dart": 1, "widget.dart": 1}
+
+    def test_incremental_refresh_is_scoped(self, built):
+        """Test an update recounts targets of deleted edges but leaves other nodes alone."""
+        project, backend, builder, _ = built
+        link(backend, "Function", "main", "CALLS", "Function", "unused_public")
+        builder.refresh_in_degree_index()
+        assert "unused_public" not in [row["name"] for row in backend.get_unused_public_functions().results]
+        # Đánh dấu một node ngoài phạm vi để thấy nó không bị tính lại
+        write_sql(backend,
+                  "UPDATE nodes SET properties = json_set(properties, '$.in_degree_calls', 7) WHERE name = 'helper'")
+
+        builder.update_ckg_incremental(
+            CodeParserCoordinatorAgent().parse_files(str(project), ["child.py"]))
+        names = [row["name"] for row in backend.get_unused_public_functions().results]
+
+        assert "unused_public" in names
+        assert backend.execute_sql(
+            "SELECT json_extract(properties, '$.in_degree_calls') AS d FROM nodes WHERE name = 'helper'"
+        ).results == [{"d": 7}]
+
+
+class TestSQLiteQueries:
+    """Test the CKGQueryInterfaceAgent query methods on SQLite."""
+
+    def test_functions_in_file(self, built):
+        """Test per-file function listing with Neo4j result columns."""
+        project, backend, _, _ = built
+
+        rows = backend.get_functions_in_file(str(project / "base.py")).results
+
+        assert [row["name"] for row in rows] == ["run", "helper", "unused_public"]
+        assert rows[1]["params_count"] == 2
+        assert set(rows[0]) == {"name", "line_number", "params_count", "docstring"}
+
+    def test_unused_public_functions(self, built):
+        """Test public functions without incoming CALLS, with keyset paging."""
+        _, backend, _, _ = built
+
+        names = [row["name"] for row in backend.get_unused_public_functions().results]
+        assert "unused_public" in names
+        assert "_private" not in names
+
+        page = backend.get_unused_public_functions_page(page_size=1)
+        assert len(page.results) == 1
+        assert page.has_more and page.next_cursor == page.results[0]["id"]
+
+    def test_circular_dependencies(self, built):
+        """Test module import cycles over Module IMPORTS Module edges."""
+        _, backend, _, _ = built
+        assert backend.find_circular_dependencies().results == []
+
+        link(backend, "Module", "base", "IMPORTS", "Module", "child")
+        link(backend, "Module", "child", "IMPORTS", "Module", "base")
+        rows = backend.find_circular_dependencies().results
+
+        assert len(rows) == 1
+        assert sorted(rows[0]["component"]) == ["base", "child"]
+
+    def test_search_by_name(self, built):
+        """Test plain names are ranked and regex patterns use REGEXP."""
+        _, backend, _, _ = built
+
+        ranked = backend.search_by_name("helper").results
+        assert ranked[0]["name"] == "helper"
+        assert ranked[0]["type"] == "Function"
+
+        regex = backend.search_by_name("^_priv.*", ["Function"]).results
+        assert [row["name"] for row in regex] == ["_private"]
+
+    def test_cypher_is_not_supported(self, built):
+        """Test execute_query fails cleanly while execute_sql works."""
+        _, backend, _, _ = built
+
+        assert backend.execute_query("MATCH (n) RETURN n").success is False
+        result = backend.execute_sql("SELECT COUNT(*) AS count FROM nodes WHERE label = ?", ["File"])
+        assert result.results == [{"count": 2}]
+
+
+class TestSQLiteIncrementalUpdate:
+    """Test update_ckg_incremental against the SQLite backend."""
+
+    def test_rebuild_file_restores_incoming_links(self, built):
+        """Test rebuilding base.py restores Child INHERITS_FROM Base and child IMPORTS base."""
+        project, backend, builder, _ = built
+        link(backend, "Class", "Child", "INHERITS_FROM", "Class", "Base")
+        link(backend, "Module", "child", "IMPORTS", "Module", "base")
+        (project / "base.py").write_text(
+            "import child\n\n"
+            "class Base:\n"
+            "    pass\n\n"
+            "def helper(a, b, c):\n"
+            "    return a\n"
+        )
+        parse_result = CodeParserCoordinatorAgent().parse_files(str(project), ["base.py"])
+
+        result = builder.update_ckg_incremental(parse_result)
+
+        assert result.build_success
+        assert result.build_stats["cross_file_links_restored"] == 2
+        names = [row["name"] for row in backend.get_functions_in_file(str(project / "base.py")).results]
+        assert names == ["helper"]
+        hierarchy = backend.get_class_hierarchy("Base").results[0]
+        assert hierarchy["derived_classes"] == ["Child"]
+        # Không suy ra base IMPORTS child, nên không có cycle
+        assert backend.find_circular_dependencies().results == []
+
+    def test_incremental_update_matches_full_build(self, built):
+        """Test rebuilding an unchanged file leaves the same graph as a full build."""
+        project, backend, builder, _ = built
+        before = graph_snapshot(backend)
+
+        builder.update_ckg_incremental(
+            CodeParserCoordinatorAgent().parse_files(str(project), ["child.py"]))
+
+        assert graph_snapshot(backend) == before
+        assert backend.find_circular_dependencies().results == []
+
+    def test_deleted_file_is_removed(self, built):
+        """Test deleted files leave no nodes or dangling edges."""
+        project, backend, builder, _ = built
+        parse_result = CodeParserCoordinatorAgent().parse_files(str(project), [])
+
+        builder.update_ckg_incremental(parse_result, [str(project / "child.py")])
+
+        assert backend.get_functions_in_file(str(project / "child.py")).results == []
+        assert backend.get_class_hierarchy("Base").results[0]["derived_classes"] == []
+        assert backend.find_circular_dependencies().results == []
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming linter parsers: pipe line reader, incremental findings và XML pull parsing.
+"""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.agents.code_analysis import StaticAnalysisIntegratorAgent
+from src.agents.code_analysis.static_analysis_integrator import (
+    AnalysisCancelled, _ProcessRegistry, _run_process, _stream_process_lines
+)
+
+
+CHECKSTYLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<checkstyle version="10.12.4">
+    <file name="/project/src/main/java/A.java">
+        <error line="10" column="5" severity="warning" message="Unused import" source="com.puppycrawl.tools.checkstyle.checks.imports.UnusedImportsCheck"/>
+        <error line="20" column="1" severity="error" message="Line too long" source="com.puppycrawl.tools.checkstyle.checks.sizes.LineLengthCheck"/>
+    </file>
+    <file name="/project/src/main/java/B.java">
+        <error line="5" column="1" severity="info" message="Missing javadoc" source="com.puppycrawl.tools.checkstyle.checks.javadoc.MissingJavadocMethodCheck"/>
+    </file>
+</checkstyle>"""
+
+
+@pytest.fixture
+def agent():
+    return StaticAnalysisIntegratorAgent()
+
+
+def python_command(script):
+    """Command chạy một đoạn Python trong process riêng."""
+    return [sys.executable, "-c", script]
+
+
+class TestStreamProcessLines:
+    """Test reading a subprocess pipe line by line."""
+
+    def test_yields_lines_before_process_exits(self):
+        """Test the first line arrives while the process is still running."""
+        script = "import sys, time; print('first', flush=True); time.sleep(2); print('second')"
+        start = time.time()
+        lines = _stream_process_lines(python_command(script), cwd=".", timeout=30)
+
+        assert next(lines) == "first"
+        assert time.time() - start < 1.5
+        assert list(lines) == ["second"]
+
+    def test_merge_stderr(self):
+        """Test stderr is only read when merged into stdout."""
+        script = "import sys; print('out'); sys.stdout.flush(); print('err', file=sys.stderr)"
+
+        assert list(_stream_process_lines(python_command(script), cwd=".", timeout=30)) == ["out"]
+        assert list(_stream_process_lines(python_command(script), cwd=".", timeout=30,
+                                          merge_stderr=True)) == ["out", "err"]
+
+    def test_timeout_kills_process(self):
+        """Test a hung process is killed and TimeoutExpired is raised."""
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            list(_stream_process_lines(python_command("import time; time.sleep(30)"), cwd=".", timeout=0.5))
+        assert time.time() - start < 10
+
+    def test_cancel_kills_registered_process(self):
+        """Test kill_all stops a running process and the reader raises AnalysisCancelled."""
+        cancel = threading.Event()
+        registry = _ProcessRegistry(cancel)
+        lines = _stream_process_lines(python_command("import time; print('up', flush=True); time.sleep(30)"),
+                                      cwd=".", timeout=60, processes=registry)
+        assert next(lines) == "up"
+
+        start = time.time()
+        cancel.set()
+        assert registry.kill_all() == 1
+        with pytest.raises(AnalysisCancelled):
+            list(lines)
+        assert time.time() - start < 10
+        assert registry.kill_all() == 0
+
+    def test_missing_command_raises_file_not_found(self):
+        """Test a missing executable surfaces like subprocess.run."""
+        with pytest.raises(FileNotFoundError):
+            list(_stream_process_lines(["definitely-not-a-linter-xyz"], cwd=".", timeout=5))
+
+
+class TestRunProcess:
+    """Test the cancellable subprocess.run replacement used by checkstyle/pmd/dart/detekt."""
+
+    def test_captures_output(self):
+        """Test stdout, stderr and returncode are returned like subprocess.run."""
+        script = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+
+        result = _run_process(python_command(script), cwd=".", timeout=30)
+
+        assert (result.returncode, result.stdout, result.stderr) == (3, "out\n", "err\n")
+
+    def test_timeout_kills_process(self):
+        """Test a hung process is killed and TimeoutExpired is raised."""
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run_process(python_command("import time; time.sleep(30)"), cwd=".", timeout=0.5)
+        assert time.time() - start < 10
+
+    def test_cancel_kills_process(self):
+        """Test cancel from another thread kills the process and raises AnalysisCancelled."""
+        cancel = threading.Event()
+        registry = _ProcessRegistry(cancel)
+
+        def cancel_soon():
+            cancel.set()
+            registry.kill_all()
+        threading.Timer(0.5, cancel_soon).start()
+
+        start = time.time()
+        with pytest.raises(AnalysisCancelled):
+            _run_process(python_command("import time; time.sleep(30)"), cwd=".", timeout=60, processes=registry)
+        assert time.time() - start < 10
+
+
+class TestIncrementalLineParsers:
+    """Test iter_*_findings parse lines as they come."""
+
+    def test_flake8_lines_are_parsed_lazily(self, agent):
+        """Test findings are yielded before the input is exhausted."""
+        consumed = []
+
+        def lines():
+            for line in ["/p/a.py:1:1: E501 line too long", "garbage", "/p/b.py:2:5: F401 'os' imported but unused"]:
+                consumed.append(line)
+                yield line
+
+        findings = agent.iter_flake8_findings(lines(), "/p")
+        first = next(findings)
+
+        assert (first.file_path, first.rule_id) == ("a.py", "E501")
+        assert len(consumed) == 1
+        assert [f.rule_id for f in findings] == ["F401"]
+
+    def test_list_parsers_match_iterators(self, agent):
+        """Test parse_*_output returns the same findings as the iterators."""
+        pylint = "/p/a.py:3:0: C0114: Missing module docstring (missing-module-docstring)\n" \
+                 "Your code has been rated at 9.00/10"
+        mypy = "/p/a.py:5: error: Incompatible return value\nFound 1 error in 1 file"
+
+        assert agent.parse_pylint_output(pylint, "/p") == list(agent.iter_pylint_findings(pylint.splitlines(), "/p"))
+        assert [f.rule_id for f in agent.parse_pylint_output(pylint, "/p")] == ["missing-module-docstring"]
+        assert [f.line_number for f in agent.parse_mypy_output(mypy, "/p")] == [5]
+
+    def test_stream_findings_rejects_unsupported_tool(self, agent):
+        """Test only line-oriented tools can be streamed."""
+        with pytest.raises(ValueError):
+            list(agent.stream_findings("checkstyle", "."))
+
+
+class TestXMLPullParsing:
+    """Test Checkstyle/Detekt XML parsed from chunks."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+    def test_checkstyle_chunks_match_whole_document(self, agent, chunk_size):
+        """Test any chunking of the XML yields the same findings."""
+        chunks = [CHECKSTYLE_XML[i:i + chunk_size] for i in range(0, len(CHECKSTYLE_XML), chunk_size)]
+
+        findings = list(agent.iter_checkstyle_findings(chunks, "/project"))
+
+        assert findings == agent.parse_checkstyle_output(CHECKSTYLE_XML, "/project")
+        assert [(f.file_path, f.line_number, f.rule_id) for f in findings] == [
+            ("src/main/java/A.java", 10, "UnusedImportsCheck"),
+            ("src/main/java/A.java", 20, "LineLengthCheck"),
+            ("src/main/java/B.java", 5, "MissingJavadocMethodCheck"),
+        ]
+
+    def test_findings_are_yielded_before_document_ends(self, agent):
+        """Test an <error> is emitted as soon as its element is complete."""
+        cut = CHECKSTYLE_XML.index("<error line=\"20\"")
+
+        findings = agent.iter_checkstyle_findings(iter([CHECKSTYLE_XML[:cut]]), "/project")
+
+        assert next(findings).line_number == 10
+
+    def test_detekt_report_from_file(self, agent, tmp_path):
+        """Test the Detekt report is parsed from disk, with text fallback on bad XML."""
+        report = tmp_path / "detekt-report.xml"
+        report.write_text(CHECKSTYLE_XML.replace("com.puppycrawl.tools.checkstyle.checks", "detekt"))
+
+        findings = agent.parse_detekt_report(str(report), "/project")
+
+        assert len(findings) == 3
+        assert findings[0].tool == "detekt"
+        assert findings[0].file_path == "/project/src/main/java/A.java"
+
+        report.write_text("<checkstyle><file name='a.kt'>")
+        assert agent.parse_detekt_report(str(report), "/project") == []